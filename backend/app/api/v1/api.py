@@ -1,5 +1,5 @@
 from fastapi import APIRouter
-from app.api.v1.endpoints import products, transactions, reports, login, companies, expenses
+from app.api.v1.endpoints import products, transactions, reports, login, companies, expenses, customers, sync, events, invoices, export, reorders
 
 api_router = APIRouter()
 
@@ -13,5 +13,11 @@ api_router.include_router(login.router, tags=["login"])
 api_router.include_router(companies.router, prefix="/companies", tags=["companies"])
 api_router.include_router(products.router, prefix="/products", tags=["products"])
 api_router.include_router(transactions.router, tags=["transactions"])
+api_router.include_router(invoices.router, prefix="/invoices", tags=["invoices"])
 api_router.include_router(expenses.router, prefix="/expenses", tags=["expenses"])
+api_router.include_router(customers.router, prefix="/customers", tags=["customers"])
+api_router.include_router(sync.router, tags=["sync"])
+api_router.include_router(events.router, tags=["events"])
 api_router.include_router(reports.router, prefix="/reports", tags=["reports"])
+api_router.include_router(export.router, prefix="/export", tags=["export"])
+api_router.include_router(reorders.router, prefix="/reorders", tags=["reorders"])
@@ -1,9 +1,10 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, status
 from sqlalchemy.orm import Session
-from typing import List
+from datetime import date
+from typing import List, Optional
 from uuid import UUID
 from app.db.session import get_db
-from app.schemas.company import Company, CompanyCreate, CompanyUpdate
+from app.schemas.company import Company, CompanyCreate, CompanyUpdate, CompanySummaryReport
 from app.crud import crud_company
 from app.api import deps
 from app.models.models import User
@@ -18,6 +19,20 @@ def read_companies(
 ):
     return crud_company.get_companies(db, skip=skip, limit=limit)
 
+@router.get("/summary", response_model=CompanySummaryReport)
+def read_company_summary(
+    start_date: Optional[date] = Query(None, description="First day of the sales period"),
+    end_date: Optional[date] = Query(None, description="Last day of the sales period"),
+    db: Session = Depends(get_db)
+):
+    """
+    Stock and sales totals for every company in one request:
+    - Product count, on-hand units and stock value
+    - Low-stock product count
+    - Sales count, quantity, revenue and profit for the period
+    """
+    return crud_company.get_company_summary(db, start_date=start_date, end_date=end_date)
+
 @router.post("/", response_model=Company, status_code=status.HTTP_201_CREATED)
 def create_company(
     company: CompanyCreate, 
@@ -0,0 +1,51 @@
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlalchemy.orm import Session
+from typing import List, Literal, Optional
+from uuid import UUID
+from app.db.session import get_db
+from app.schemas.customer import CustomerBalancePage, CustomerPayment, CustomerPaymentCreate
+from app.crud import crud_customer
+
+router = APIRouter()
+
+@router.get("/balances", response_model=CustomerBalancePage)
+def read_customer_balances(
+    skip: int = 0,
+    limit: int = Query(50, le=500),
+    sort: Literal['outstanding_desc', 'outstanding_asc', 'name', 'recent'] = 'outstanding_desc',
+    search: Optional[str] = Query(None, description="Match customer name or phone"),
+    status: Literal['all', 'outstanding', 'settled'] = 'all',
+    db: Session = Depends(get_db)
+):
+    """
+    Paginated customer receivables, served from the per-customer balance table
+    (no aggregation over sales history)
+    """
+    return crud_customer.get_balances(
+        db, skip=skip, limit=limit, sort=sort, search=search, status=status
+    )
+
+@router.post("/payments", response_model=CustomerPayment, status_code=status.HTTP_201_CREATED)
+def create_customer_payment(payment: CustomerPaymentCreate, db: Session = Depends(get_db)):
+    """Record a payment received from a customer against their credit sales"""
+    return crud_customer.create_payment(db, payment)
+
+@router.delete("/payments/{payment_id}", status_code=status.HTTP_204_NO_CONTENT)
+def delete_customer_payment(payment_id: UUID, db: Session = Depends(get_db)):
+    """Soft delete a payment (the amount becomes outstanding again)"""
+    db_payment = crud_customer.delete_payment(db, payment_id)
+    if not db_payment:
+        raise HTTPException(status_code=404, detail="Payment not found")
+    return None
+
+@router.get("/{customer_id}/payments", response_model=List[CustomerPayment])
+def read_customer_payments(
+    customer_id: UUID,
+    skip: int = 0,
+    limit: int = 100,
+    db: Session = Depends(get_db)
+):
+    """Payments received from a customer, newest first"""
+    if not crud_customer.get_customer(db, customer_id):
+        raise HTTPException(status_code=404, detail="Customer not found")
+    return crud_customer.get_payments(db, customer_id, skip=skip, limit=limit)
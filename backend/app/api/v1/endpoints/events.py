@@ -0,0 +1,40 @@
+import asyncio
+import json
+from fastapi import APIRouter, Request
+from fastapi.responses import StreamingResponse
+from app.core.events import event_bus
+
+router = APIRouter()
+
+KEEPALIVE_SECONDS = 15
+
+@router.get("/events")
+async def stream_events(request: Request):
+    """
+    Server-Sent Events stream of live updates:
+    - sale.created / sale.updated / sale.deleted
+    - stock.changed (new stock balance of a product)
+    - stock.low (a product just dropped to or below its min_stock)
+    - dashboard.changed (change to a day's revenue, profit, expense and sales count)
+    """
+    subscription = event_bus.subscribe()
+
+    async def stream():
+        try:
+            yield "retry: 3000\n\n"
+            while not await request.is_disconnected():
+                try:
+                    event = await asyncio.wait_for(subscription.get(), timeout=KEEPALIVE_SECONDS)
+                except asyncio.TimeoutError:
+                    # Comment line keeps proxies from closing an idle stream
+                    yield ": keep-alive\n\n"
+                    continue
+                yield f"event: {event['type']}\ndata: {json.dumps(event)}\n\n"
+        finally:
+            event_bus.unsubscribe(subscription)
+
+    return StreamingResponse(
+        stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
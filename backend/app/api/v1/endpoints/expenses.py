@@ -1,11 +1,11 @@
 from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.orm import Session
-from typing import List, Optional
+from typing import List, Literal, Optional
 from datetime import date, datetime
 from uuid import UUID
 
 from app.db.session import get_db
-from app.schemas.expense import Expense, ExpenseCreate, ExpenseUpdate
+from app.schemas.expense import Expense, ExpenseCreate, ExpenseUpdate, ExpenseAnalytics
 from app.crud import crud_expense
 
 router = APIRouter()
@@ -58,6 +58,22 @@ def get_expenses_by_date_range(
         for exp in expenses
     ]
 
+@router.get("/analytics", response_model=ExpenseAnalytics)
+def get_expense_analytics(
+    period: Literal['month', 'quarter', 'year'] = Query('month', description="Breakdown period"),
+    start_date: Optional[date] = Query(None, description="First month to include"),
+    end_date: Optional[date] = Query(None, description="Last month to include"),
+    category: Optional[str] = Query(None, description="Only this category"),
+    db: Session = Depends(get_db)
+):
+    """
+    Expense and income totals per month, quarter or year with a per-category
+    breakdown, served from the monthly rollup
+    """
+    return crud_expense.get_expense_analytics(
+        db, period=period, start_date=start_date, end_date=end_date, category=category
+    )
+
 @router.get("/{expense_id}", response_model=Expense)
 def read_expense(expense_id: UUID, db: Session = Depends(get_db)):
     """Get a specific expense by ID"""
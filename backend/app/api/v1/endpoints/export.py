@@ -0,0 +1,41 @@
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import StreamingResponse
+from sqlalchemy.orm import Session
+from datetime import date
+from typing import List, Optional
+from app.db.session import get_db
+from app.crud import crud_export
+from app.api import deps
+from app.models.models import User
+
+router = APIRouter()
+
+@router.get("/{table}.parquet")
+def export_parquet(
+    table: str,
+    columns: Optional[List[str]] = Query(None, description="Columns to export (repeated or comma-separated); all by default"),
+    start_date: Optional[date] = Query(None, description="First day (created_at; expense_date for expenses)"),
+    end_date: Optional[date] = Query(None, description="Last day"),
+    include_deleted: bool = Query(False, description="Include soft-deleted rows"),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(deps.get_current_active_user)
+):
+    """
+    Stream sales, stock_transactions, expenses or products as a Parquet
+    file for analytics tools (pandas.read_parquet, DuckDB, Spark). Types
+    are preserved - UUID, DECIMAL, UTC timestamps - and text columns are
+    dictionary-encoded. Rows are fetched through a server-side cursor and
+    written one row group per batch.
+    """
+    if columns:
+        columns = [name.strip() for value in columns for name in value.split(",") if name.strip()]
+    try:
+        chunks = crud_export.stream_parquet(db, table, columns, start_date, end_date, include_deleted)
+    except ValueError as e:
+        status_code = 404 if table not in crud_export.EXPORT_TABLES else 400
+        raise HTTPException(status_code=status_code, detail=str(e))
+    return StreamingResponse(
+        chunks,
+        media_type="application/vnd.apache.parquet",
+        headers={"Content-Disposition": f'attachment; filename="{table}.parquet"'}
+    )
@@ -0,0 +1,46 @@
+from fastapi import APIRouter, Depends, Header, HTTPException, status
+from sqlalchemy.orm import Session
+from typing import List, Optional
+from uuid import UUID
+from app.db.session import get_db
+from app.schemas.invoice import SaleInvoice, SaleInvoiceCreate, SaleInvoiceSummary
+from app.crud import crud_invoice, crud_idempotency
+
+router = APIRouter()
+
+@router.post("/", response_model=SaleInvoice, status_code=status.HTTP_201_CREATED)
+def create_invoice(
+    invoice: SaleInvoiceCreate,
+    db: Session = Depends(get_db),
+    idempotency_key: Optional[str] = Header(None, alias="Idempotency-Key")
+):
+    """
+    Sell several products to one customer in a single request. Each line
+    becomes a sale with its own OUT stock transaction, all in one transaction.
+    Retries with the same Idempotency-Key return the first response.
+    """
+    return crud_idempotency.run_once(
+        db, idempotency_key, "POST /invoices", invoice,
+        lambda: crud_invoice.add_invoice(db=db, invoice=invoice),
+        SaleInvoice, after_commit=crud_invoice.publish_invoice_created
+    )
+
+@router.get("/", response_model=List[SaleInvoiceSummary])
+def read_invoices(skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
+    """Invoice headers with stored totals, newest first"""
+    return crud_invoice.get_invoices(db, skip=skip, limit=limit)
+
+@router.get("/{invoice_id}", response_model=SaleInvoice)
+def read_invoice(invoice_id: UUID, db: Session = Depends(get_db)):
+    db_invoice = crud_invoice.get_invoice_detail(db, invoice_id)
+    if not db_invoice:
+        raise HTTPException(status_code=404, detail="Invoice not found")
+    return db_invoice
+
+@router.delete("/{invoice_id}", status_code=status.HTTP_204_NO_CONTENT)
+def delete_invoice(invoice_id: UUID, db: Session = Depends(get_db)):
+    """Soft delete an invoice together with its lines and stock transactions"""
+    db_invoice = crud_invoice.delete_invoice(db, invoice_id)
+    if not db_invoice:
+        raise HTTPException(status_code=404, detail="Invoice not found")
+    return None
@@ -1,15 +1,71 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, status
 from sqlalchemy.orm import Session
 from typing import List
 from uuid import UUID
+from datetime import date
 from app.db.session import get_db
-from app.schemas.product import Product, ProductCreate, ProductUpdate
-from app.crud import crud_product
+from app.schemas.product import Product, ProductCreate, ProductUpdate, ProductDetail, StockAsOfReport, StockHistory, PriceHistoryEntry
+from app.crud import crud_product, crud_stock, crud_price_history
 from app.api import deps
 from app.models.models import User
 
 router = APIRouter()
 
+@router.get("/stock-as-of", response_model=StockAsOfReport)
+def read_stock_as_of(
+    as_of: date = Query(..., alias="date", description="Balance as of the end of this day"),
+    db: Session = Depends(get_db)
+):
+    """
+    Stock balance of every product at the end of a past date.
+    Built from the latest month-end snapshot plus the ledger since then.
+    """
+    return {
+        "as_of": as_of,
+        "products": crud_stock.get_stock_as_of(db, as_of)
+    }
+
+@router.get("/{product_id}/detail", response_model=ProductDetail)
+def read_product_detail(
+    product_id: UUID,
+    skip: int = 0,
+    limit: int = Query(50, ge=1, le=500),
+    db: Session = Depends(get_db)
+):
+    """Product with stock and sales totals and one page of its ledger movements"""
+    detail = crud_product.get_product_detail(db, product_id, skip=skip, limit=limit)
+    if detail is None:
+        raise HTTPException(status_code=404, detail="Product not found")
+    return detail
+
+@router.get("/{product_id}/stock-history", response_model=StockHistory)
+def read_stock_history(
+    product_id: UUID,
+    start_date: date = Query(..., description="Start date of the period"),
+    end_date: date = Query(..., description="End date of the period"),
+    skip: int = 0,
+    limit: int = 100,
+    db: Session = Depends(get_db)
+):
+    """Ledger entries of a product with the running stock balance after each entry"""
+    if not crud_product.get_product(db, product_id):
+        raise HTTPException(status_code=404, detail="Product not found")
+    return crud_stock.get_stock_history(
+        db, product_id, start_date, end_date, skip=skip, limit=limit
+    )
+
+@router.get("/{product_id}/price-history", response_model=List[PriceHistoryEntry])
+def read_price_history(
+    product_id: UUID,
+    skip: int = 0,
+    limit: int = 100,
+    db: Session = Depends(get_db)
+):
+    """Purchase price changes of a product, newest first"""
+    if not crud_product.get_product(db, product_id):
+        raise HTTPException(status_code=404, detail="Product not found")
+    return crud_price_history.get_price_history(db, product_id, skip=skip, limit=limit)
+
 @router.put("/{product_id}", response_model=Product)
 def update_product(
     product_id: UUID,
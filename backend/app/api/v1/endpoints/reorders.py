@@ -0,0 +1,71 @@
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlalchemy.orm import Session
+from typing import List, Literal, Optional
+from uuid import UUID
+from app.db.session import get_db
+from app.schemas.reorder import (
+    ReorderSuggestions, ReorderDraft, ReorderDraftSummary, ReorderDraftCreate, ReorderDraftLinesUpdate
+)
+from app.crud import crud_reorder, crud_forecast
+
+router = APIRouter()
+
+@router.get("/suggestions", response_model=ReorderSuggestions)
+def read_suggestions(
+    lead_time_days: int = Query(crud_reorder.DEFAULT_LEAD_TIME_DAYS, ge=0, le=365, description="Days between ordering and receiving"),
+    safety_days: int = Query(crud_reorder.DEFAULT_SAFETY_DAYS, ge=0, le=365, description="Days of demand kept as safety stock (never below min_stock)"),
+    review_days: int = Query(crud_reorder.DEFAULT_REVIEW_DAYS, ge=1, le=365, description="Days of demand an order should cover after it arrives"),
+    company_id: Optional[UUID] = Query(None, description="Only this supplier"),
+    window_days: int = Query(crud_forecast.DEFAULT_WINDOW_DAYS, ge=1, le=365, description="Days of OUT history (ending yesterday)"),
+    alpha: float = Query(crud_forecast.DEFAULT_ALPHA, gt=0, le=1, description="Exponential smoothing factor"),
+    db: Session = Depends(get_db)
+):
+    """
+    Suggested order quantities for every product at or below its reorder
+    point, grouped by supplier (the product's company), computed in one
+    pass over all products from smoothed daily demand
+    """
+    return crud_reorder.get_reorder_suggestions(
+        db, lead_time_days, safety_days, review_days, company_id, window_days, alpha
+    )
+
+@router.post("/drafts", response_model=List[ReorderDraft], status_code=status.HTTP_201_CREATED)
+def create_drafts(request: ReorderDraftCreate, db: Session = Depends(get_db)):
+    """Turn the current suggestions into one editable purchase draft per supplier"""
+    return crud_reorder.create_drafts(db, **request.model_dump())
+
+@router.get("/drafts", response_model=List[ReorderDraftSummary])
+def read_drafts(
+    status: Optional[Literal['draft', 'received', 'cancelled']] = None,
+    skip: int = 0,
+    limit: int = 100,
+    db: Session = Depends(get_db)
+):
+    """Draft headers with stored totals, newest first"""
+    return crud_reorder.get_drafts(db, status=status, skip=skip, limit=limit)
+
+@router.get("/drafts/{draft_id}", response_model=ReorderDraft)
+def read_draft(draft_id: UUID, db: Session = Depends(get_db)):
+    db_draft = crud_reorder.get_draft_detail(db, draft_id)
+    if not db_draft:
+        raise HTTPException(status_code=404, detail="Reorder draft not found")
+    return db_draft
+
+@router.put("/drafts/{draft_id}/lines", response_model=ReorderDraft)
+def update_draft_lines(draft_id: UUID, request: ReorderDraftLinesUpdate, db: Session = Depends(get_db)):
+    """Edit ordered quantities or unit costs of an open draft; quantity 0 removes a line"""
+    return crud_reorder.update_draft_lines(db, draft_id, request.lines)
+
+@router.post("/drafts/{draft_id}/receive", response_model=ReorderDraft)
+def receive_draft(draft_id: UUID, db: Session = Depends(get_db)):
+    """
+    Receive an open draft: every line becomes an IN stock transaction at its
+    unit cost, all in one transaction. A draft can be received only once.
+    """
+    return crud_reorder.receive_draft(db, draft_id)
+
+@router.delete("/drafts/{draft_id}", status_code=status.HTTP_204_NO_CONTENT)
+def cancel_draft(draft_id: UUID, db: Session = Depends(get_db)):
+    """Cancel an open draft"""
+    crud_reorder.cancel_draft(db, draft_id)
+    return None
@@ -1,10 +1,10 @@
-from fastapi import APIRouter, Depends, Query
+from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.orm import Session
 from app.db.session import get_db
-from app.schemas.reports import DashboardReport
-from app.crud import crud_report
+from app.schemas.reports import DashboardReport, InventoryValuation, CreditAgingReport, Leaderboards, StockForecast
+from app.crud import crud_report, crud_valuation, crud_leaderboard, crud_forecast
 from datetime import date
-from typing import Optional
+from typing import List, Optional, Literal
 
 router = APIRouter()
 
@@ -36,3 +36,90 @@ def get_period_summary(
     - Credit/Debit information
     """
     return crud_report.get_period_financial_summary(db, start_date, end_date)
+
+def _parse_period(value: str):
+    try:
+        start, end = (date.fromisoformat(part) for part in value.split(":"))
+    except ValueError:
+        raise HTTPException(status_code=400, detail=f"Invalid period '{value}', expected YYYY-MM-DD:YYYY-MM-DD")
+    if end < start:
+        raise HTTPException(status_code=400, detail=f"Period '{value}' ends before it starts")
+    return start, end
+
+@router.get("/compare")
+def compare_periods(
+    periods: List[str] = Query(
+        ...,
+        description="Periods as start:end dates (YYYY-MM-DD:YYYY-MM-DD), repeated; earlier period first"
+    ),
+    db: Session = Depends(get_db)
+):
+    """
+    Period-over-period comparison: every period-summary metric for each
+    period, computed in one pass, with the delta and percentage change
+    from each period to the next
+    """
+    if not 2 <= len(periods) <= crud_report.MAX_COMPARE_PERIODS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Compare between 2 and {crud_report.MAX_COMPARE_PERIODS} periods"
+        )
+    return crud_report.get_period_comparison(db, [_parse_period(value) for value in periods])
+
+@router.get("/leaderboards", response_model=Leaderboards)
+def get_leaderboards(
+    period: Literal['today', 'week', 'month', 'custom'] = Query('month', description="Leaderboard period"),
+    start_date: Optional[date] = Query(None, description="First day (custom period)"),
+    end_date: Optional[date] = Query(None, description="Last day (custom period)"),
+    limit: int = Query(10, ge=1, le=100, description="Entries per leaderboard"),
+    db: Session = Depends(get_db)
+):
+    """
+    Top products by revenue, profit and quantity and top customers by spend
+    and credit. today, week and month are served from incrementally
+    maintained counters; custom needs start_date and end_date.
+    """
+    if period == 'custom':
+        if start_date is None or end_date is None:
+            raise HTTPException(status_code=400, detail="A custom period needs start_date and end_date")
+        if end_date < start_date:
+            raise HTTPException(status_code=400, detail="end_date is before start_date")
+    return crud_leaderboard.get_leaderboards(db, period, start_date, end_date, limit)
+
+@router.get("/stock-forecast", response_model=StockForecast)
+def get_stock_forecast(
+    window_days: int = Query(crud_forecast.DEFAULT_WINDOW_DAYS, ge=1, le=365, description="Days of OUT history (ending yesterday)"),
+    alpha: float = Query(crud_forecast.DEFAULT_ALPHA, gt=0, le=1, description="Exponential smoothing factor"),
+    horizon_days: int = Query(crud_forecast.DEFAULT_HORIZON_DAYS, ge=1, le=365, description="At risk when stock runs out within this many days"),
+    at_risk_only: bool = Query(False, description="Only out-of-stock and at-risk products"),
+    db: Session = Depends(get_db)
+):
+    """
+    Stock depletion forecast for every product: moving-average and
+    exponentially smoothed daily demand, days of cover, projected stock-out
+    and min-stock dates. Cached until the next stock write.
+    """
+    return crud_forecast.get_stock_forecast(db, window_days, alpha, horizon_days, at_risk_only)
+
+@router.get("/inventory-valuation", response_model=InventoryValuation)
+def get_inventory_valuation(
+    method: Literal['fifo', 'average'] = Query('fifo', description="Costing method"),
+    db: Session = Depends(get_db)
+):
+    """
+    On-hand inventory value per product from the stock ledger:
+    - fifo: remaining units priced at their original receipt cost layers
+    - average: moving weighted-average cost
+    """
+    return crud_valuation.get_inventory_valuation(db, method=method)
+
+@router.get("/credit-aging", response_model=CreditAgingReport)
+def get_credit_aging(
+    as_of: Optional[date] = Query(None, description="Age receivables as of this date (default: today)"),
+    db: Session = Depends(get_db)
+):
+    """
+    Outstanding credit per customer split into 0-30, 31-60, 61-90 and 90+ day
+    buckets by sale date. Payments settle the oldest credit sales first.
+    """
+    return crud_report.get_credit_aging(db, as_of=as_of)
@@ -0,0 +1,23 @@
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.orm import Session
+from typing import Optional
+from app.db.session import get_db
+from app.schemas.sync import SyncChanges
+from app.crud import crud_sync
+
+router = APIRouter()
+
+@router.get("/sync", response_model=SyncChanges)
+def read_changes(
+    since: Optional[str] = Query(None, description="Token from the previous sync call"),
+    db: Session = Depends(get_db)
+):
+    """
+    Delta sync for the frontend data cache:
+    - companies / products / transactions / sales / payments / invoices /
+      expenses created or changed since the token
+    - customers: balance rows of customers whose details or totals changed
+    - deleted: rows soft- or hard-deleted since the token
+    - token: pass as `since` on the next call
+    """
+    return crud_sync.get_changes(db, since=since)
@@ -1,10 +1,12 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Response, status
 from sqlalchemy.orm import Session
-from typing import List
+from typing import List, Literal, Optional
 from uuid import UUID
+from datetime import date
 from app.db.session import get_db
 from app.schemas.transactions import Sale, SaleCreate, SaleUpdate, StockTransaction, StockTransactionCreate
-from app.crud import crud_transaction
+from app.crud import crud_transaction, crud_idempotency, crud_ingest
+from app.core.config import settings
 
 router = APIRouter()
 
@@ -14,17 +16,75 @@ def read_transactions(skip: int = 0, limit: int = 100, db: Session = Depends(get
     return crud_transaction.get_transactions(db, skip=skip, limit=limit)
 
 @router.post("/transactions", response_model=StockTransaction, status_code=status.HTTP_201_CREATED)
-def create_transaction(transaction: StockTransactionCreate, db: Session = Depends(get_db)):
-    return crud_transaction.create_transaction(db=db, transaction=transaction)
+def create_transaction(
+    transaction: StockTransactionCreate,
+    db: Session = Depends(get_db),
+    idempotency_key: Optional[str] = Header(None, alias="Idempotency-Key")
+):
+    """Retries with the same Idempotency-Key return the first response instead of a new row"""
+    if settings.WRITE_QUEUE_ENABLED:
+        return crud_idempotency.run_once(
+            db, idempotency_key, "POST /transactions", transaction,
+            lambda claim, respond: crud_ingest.submit_transaction(transaction, claim=claim, respond=respond),
+            StockTransaction, queued=True
+        )
+    return crud_idempotency.run_once(
+        db, idempotency_key, "POST /transactions", transaction,
+        lambda: crud_transaction.add_transaction(db=db, transaction=transaction),
+        StockTransaction, after_commit=crud_transaction.publish_transaction_created
+    )
 
 # --- Sales ---
 @router.get("/sales", response_model=List[Sale])
-def read_sales(skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
-    return crud_transaction.get_sales(db, skip=skip, limit=limit)
+def read_sales(
+    response: Response,
+    skip: int = 0,
+    limit: int = 100,
+    start_date: Optional[date] = Query(None, description="Sales on or after this day"),
+    end_date: Optional[date] = Query(None, description="Sales on or before this day"),
+    product_id: Optional[UUID] = None,
+    company_id: Optional[UUID] = None,
+    payment_type: Optional[Literal['Credit', 'Debit']] = None,
+    customer: Optional[str] = Query(None, description="Search customer name or phone"),
+    sort: Literal["newest", "oldest", "amount_desc", "amount_asc", "customer"] = "newest",
+    db: Session = Depends(get_db)
+):
+    """
+    One page of sales, filtered and sorted in the database. The number of
+    matching sales is returned in X-Total-Count; X-Total-Count-Estimated is
+    "true" when it is a planner estimate (very large result sets).
+    """
+    filters = dict(
+        start_date=start_date,
+        end_date=end_date,
+        product_id=product_id,
+        company_id=company_id,
+        payment_type=payment_type,
+        customer=customer
+    )
+    total, estimated = crud_transaction.count_sales(db, **filters)
+    response.headers["X-Total-Count"] = str(total)
+    response.headers["X-Total-Count-Estimated"] = "true" if estimated else "false"
+    return crud_transaction.get_sales(db, skip=skip, limit=limit, sort=sort, **filters)
 
 @router.post("/sales", response_model=Sale, status_code=status.HTTP_201_CREATED)
-def create_sale(sale: SaleCreate, db: Session = Depends(get_db)):
-    return crud_transaction.create_sale(db=db, sale=sale)
+def create_sale(
+    sale: SaleCreate,
+    db: Session = Depends(get_db),
+    idempotency_key: Optional[str] = Header(None, alias="Idempotency-Key")
+):
+    """Retries with the same Idempotency-Key return the first response instead of a new sale"""
+    if settings.WRITE_QUEUE_ENABLED:
+        return crud_idempotency.run_once(
+            db, idempotency_key, "POST /sales", sale,
+            lambda claim, respond: crud_ingest.submit_sale(sale, claim=claim, respond=respond),
+            Sale, queued=True
+        )
+    return crud_idempotency.run_once(
+        db, idempotency_key, "POST /sales", sale,
+        lambda: crud_transaction.add_sale(db=db, sale=sale),
+        Sale, after_commit=crud_transaction.publish_sale_created
+    )
 
 @router.put("/sales/{sale_id}", response_model=Sale)
 def update_sale(sale_id: UUID, sale: SaleUpdate, db: Session = Depends(get_db)):
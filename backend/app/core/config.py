@@ -18,6 +18,41 @@ class Settings(BaseSettings):
     API_HOST: str = os.getenv("API_HOST", "0.0.0.0")
     API_PORT: int = int(os.getenv("API_PORT", "8000"))
     
+    # Live events (SSE): "memory" delivers within this process only,
+    # "postgres" fans out to every worker through LISTEN/NOTIFY
+    EVENT_BUS_BACKEND: str = os.getenv("EVENT_BUS_BACKEND", "memory")
+    
+    # How long a stored Idempotency-Key response can be replayed
+    IDEMPOTENCY_TTL_HOURS: int = int(os.getenv("IDEMPOTENCY_TTL_HOURS", "24"))
+    
+    # Sales and OUT transactions are rejected (400) when they would take a
+    # product's on-hand quantity below zero, unless this is enabled
+    ALLOW_NEGATIVE_STOCK: bool = os.getenv("ALLOW_NEGATIVE_STOCK", "false").lower() == "true"
+    
+    # Group commit: queue sale and stock-transaction writes and commit them
+    # in batches collected over a short window (one fsync per batch)
+    WRITE_QUEUE_ENABLED: bool = os.getenv("WRITE_QUEUE_ENABLED", "false").lower() == "true"
+    WRITE_QUEUE_WINDOW_MS: float = float(os.getenv("WRITE_QUEUE_WINDOW_MS", "5"))
+    WRITE_QUEUE_MAX_BATCH: int = int(os.getenv("WRITE_QUEUE_MAX_BATCH", "100"))
+    
+    # Period reports cache the totals of days older than this many days
+    # (closed days); newer days are always queried live
+    REPORT_CACHE_CLOSED_AFTER_DAYS: int = int(os.getenv("REPORT_CACHE_CLOSED_AFTER_DAYS", "3"))
+    
+    # Parquet exports read this many rows per server-side cursor fetch and
+    # write each batch as one row group
+    EXPORT_BATCH_ROWS: int = int(os.getenv("EXPORT_BATCH_ROWS", "50000"))
+    
+    # Report backend for closed days: "primary" (this database, with the
+    # closed-day cache) or "duckdb" (embedded analytical mirror, needs
+    # requirements-analytics.txt). The mirror is refreshed by watermark when
+    # older than ANALYTICS_MIRROR_REFRESH_SECONDS and groups days in
+    # ANALYTICS_MIRROR_TIMEZONE (keep it equal to the database's TimeZone)
+    REPORT_BACKEND: str = os.getenv("REPORT_BACKEND", "primary")
+    ANALYTICS_MIRROR_PATH: str = os.getenv("ANALYTICS_MIRROR_PATH", "./analytics.duckdb")
+    ANALYTICS_MIRROR_REFRESH_SECONDS: float = float(os.getenv("ANALYTICS_MIRROR_REFRESH_SECONDS", "60"))
+    ANALYTICS_MIRROR_TIMEZONE: str = os.getenv("ANALYTICS_MIRROR_TIMEZONE", os.getenv("TZ", "UTC"))
+    
     # CORS Settings - Allow all origins (for development/production)
     # In production, you can restrict this to specific Vercel domain
     CORS_ORIGINS: List[str] = ["*"]
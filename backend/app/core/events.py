@@ -0,0 +1,165 @@
+"""
+Event bus for live updates
+
+CRUD write paths publish small events (sale created, stock changed, ...)
+after they commit; the SSE endpoint subscribes and streams them to open
+dashboards. Publishing is thread-safe: sync endpoints run in the threadpool
+while subscribers live on the event loop.
+
+With EVENT_BUS_BACKEND=postgres, events go through Postgres NOTIFY and a
+LISTEN thread in each worker delivers them to that worker's subscribers,
+so a sale made through one uvicorn worker reaches dashboards on all others.
+"""
+import asyncio
+import json
+import logging
+import select
+import threading
+import time
+from datetime import datetime, timezone
+
+from sqlalchemy.engine import make_url
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+CHANNEL = "agrimanage_events"
+
+
+class Subscription:
+    """Bounded queue of events for one SSE client"""
+
+    def __init__(self, loop: asyncio.AbstractEventLoop, maxsize: int):
+        self.loop = loop
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize)
+
+    def _put(self, event: dict):
+        # A slow client loses its oldest events instead of growing without bound
+        if self.queue.full():
+            self.queue.get_nowait()
+        self.queue.put_nowait(event)
+
+    async def get(self) -> dict:
+        return await self.queue.get()
+
+
+class EventBus:
+    """In-process publish/subscribe"""
+
+    def __init__(self):
+        self._subscribers = set()
+        self._lock = threading.Lock()
+
+    @property
+    def active(self) -> bool:
+        """Whether anyone can receive events - lets publishers skip building payloads"""
+        return bool(self._subscribers)
+
+    def subscribe(self, maxsize: int = 256) -> Subscription:
+        subscription = Subscription(asyncio.get_running_loop(), maxsize)
+        with self._lock:
+            self._subscribers.add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription):
+        with self._lock:
+            self._subscribers.discard(subscription)
+
+    def publish(self, event_type: str, **data):
+        event = {
+            "type": event_type,
+            "data": json.loads(json.dumps(data, default=str)),
+            "at": datetime.now(timezone.utc).isoformat()
+        }
+        self._send(event)
+
+    def _send(self, event: dict):
+        self.dispatch(event)
+
+    def dispatch(self, event: dict):
+        """Hand an event to every local subscriber on its own event loop"""
+        with self._lock:
+            subscribers = list(self._subscribers)
+        for subscription in subscribers:
+            try:
+                subscription.loop.call_soon_threadsafe(subscription._put, event)
+            except RuntimeError:
+                # Loop already closed (worker shutting down)
+                self.unsubscribe(subscription)
+
+
+class PostgresEventBus(EventBus):
+    """Cross-worker fan-out through LISTEN/NOTIFY"""
+
+    def __init__(self, database_url: str, channel: str = CHANNEL):
+        super().__init__()
+        self.dsn = make_url(database_url).set(drivername="postgresql").render_as_string(hide_password=False)
+        self.channel = channel
+        self._notify_conn = None
+        self._notify_lock = threading.Lock()
+        self._listener = None
+
+    @property
+    def active(self) -> bool:
+        # Subscribers may be connected to other workers
+        return True
+
+    def subscribe(self, maxsize: int = 256) -> Subscription:
+        self._ensure_listener()
+        return super().subscribe(maxsize)
+
+    def _send(self, event: dict):
+        import psycopg2
+
+        payload = json.dumps(event)
+        with self._notify_lock:
+            try:
+                if self._notify_conn is None or self._notify_conn.closed:
+                    self._notify_conn = psycopg2.connect(self.dsn)
+                    self._notify_conn.autocommit = True
+                with self._notify_conn.cursor() as cursor:
+                    cursor.execute("SELECT pg_notify(%s, %s)", (self.channel, payload))
+            except psycopg2.Error as e:
+                # Live events are best effort; the write itself is already committed
+                logger.warning("Event %s not published: %s", event["type"], e)
+                self._notify_conn = None
+
+    def _ensure_listener(self):
+        with self._lock:
+            if self._listener is None or not self._listener.is_alive():
+                self._listener = threading.Thread(target=self._listen, name="event-bus-listener", daemon=True)
+                self._listener.start()
+
+    def _listen(self):
+        import psycopg2
+
+        while True:
+            conn = None
+            try:
+                conn = psycopg2.connect(self.dsn)
+                conn.autocommit = True
+                with conn.cursor() as cursor:
+                    cursor.execute(f'LISTEN "{self.channel}"')
+                while True:
+                    if select.select([conn], [], [], 5.0) == ([], [], []):
+                        continue
+                    conn.poll()
+                    while conn.notifies:
+                        notify = conn.notifies.pop(0)
+                        self.dispatch(json.loads(notify.payload))
+            except psycopg2.Error as e:
+                logger.warning("Event listener disconnected, reconnecting: %s", e)
+                time.sleep(1)
+            finally:
+                if conn is not None:
+                    conn.close()
+
+
+def _create_event_bus() -> EventBus:
+    if settings.EVENT_BUS_BACKEND == "postgres":
+        return PostgresEventBus(settings.DATABASE_URL)
+    return EventBus()
+
+
+event_bus = _create_event_bus()
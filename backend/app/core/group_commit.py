@@ -0,0 +1,155 @@
+"""
+Group commit for high-volume writes
+
+Callers hand a unit of work to an in-process queue instead of committing it
+themselves. A single writer thread collects whatever arrives within a short
+window (a few milliseconds, bounded by a batch size), runs each unit in its
+own savepoint and commits the whole batch once, so many requests share one
+fsync. Each caller blocks until its batch has committed and then gets its
+own result - or its own exception, which does not affect the other units.
+"""
+import logging
+import queue
+import threading
+import time
+from collections import defaultdict
+from typing import Any, Callable, Optional
+
+from sqlalchemy import inspect as sa_inspect
+from sqlalchemy.orm import Session
+
+from app.db.session import begin_write
+
+logger = logging.getLogger(__name__)
+
+
+class _Job:
+    __slots__ = ("work", "after_commit", "done", "result", "error")
+
+    def __init__(self, work: Callable[[Session], Any], after_commit: Optional[Callable[[Session, Any], Any]]):
+        self.work = work
+        self.after_commit = after_commit
+        self.done = threading.Event()
+        self.result = None
+        self.error: Optional[BaseException] = None
+
+
+class GroupCommitQueue:
+    """Batches units of work from many threads into shared commits"""
+
+    def __init__(self, session_factory: Callable[[], Session], window_ms: float = 5, max_batch: int = 100):
+        self.session_factory = session_factory
+        self.window = window_ms / 1000
+        self.max_batch = max_batch
+        self.batches = 0
+        self.jobs = 0
+        self._queue: "queue.Queue[_Job]" = queue.Queue()
+        self._lock = threading.Lock()
+        self._writer = None
+
+    def submit(
+        self,
+        work: Callable[[Session], Any],
+        after_commit: Optional[Callable[[Session, Any], Any]] = None
+    ):
+        """
+        Run `work(db)` in the next batch and return its result once the batch
+        has committed. `work` must not commit. ORM objects it returns are
+        reloaded after the commit and handed back detached. `after_commit(db,
+        result)` runs on the writer after the commit (e.g. to publish events).
+        """
+        self._ensure_writer()
+        job = _Job(work, after_commit)
+        self._queue.put(job)
+        job.done.wait()
+        if job.error is not None:
+            raise job.error
+        return job.result
+
+    def _ensure_writer(self):
+        with self._lock:
+            if self._writer is None or not self._writer.is_alive():
+                self._writer = threading.Thread(target=self._run, name="group-commit-writer", daemon=True)
+                self._writer.start()
+
+    def _collect(self) -> list:
+        batch = [self._queue.get()]
+        deadline = time.monotonic() + self.window
+        while len(batch) < self.max_batch:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(self._queue.get(timeout=remaining))
+            except queue.Empty:
+                break
+        return batch
+
+    def _run(self):
+        while True:
+            batch = self._collect()
+            try:
+                self._commit(batch)
+            except Exception as e:
+                # The shared commit failed (lost connection, serialization
+                # failure, ...): retry every unit in a transaction of its own
+                logger.warning("Group commit of %d writes failed, retrying one by one: %s", len(batch), e)
+                for job in batch:
+                    try:
+                        self._commit([job])
+                    except Exception as job_error:
+                        job.error = job_error
+                        job.done.set()
+
+    def _commit(self, batch: list):
+        db = self.session_factory()
+        begin_write(db)
+        try:
+            succeeded = []
+            for job in batch:
+                try:
+                    with db.begin_nested():
+                        job.result = job.work(db)
+                    succeeded.append(job)
+                except Exception as e:
+                    job.error = e
+            try:
+                db.commit()
+            except Exception:
+                db.rollback()
+                for job in batch:
+                    job.result, job.error = None, None
+                raise
+            self.batches += 1
+            self.jobs += len(batch)
+
+            # Committed: nothing below may fail the batch (it would be retried)
+            try:
+                self._reload([job.result for job in succeeded])
+            except Exception:
+                logger.exception("Reloading group-committed results failed")
+            db.expunge_all()
+            for job in batch:
+                job.done.set()
+
+            for job in succeeded:
+                if job.after_commit is not None:
+                    try:
+                        job.after_commit(db, job.result)
+                    except Exception:
+                        logger.exception("after_commit hook failed")
+        finally:
+            db.close()
+
+    @staticmethod
+    def _reload(results: list):
+        """Refresh committed ORM results with one SELECT per mapped class"""
+        by_class = defaultdict(dict)
+        for result in results:
+            state = sa_inspect(result, raiseerr=False)
+            if state is not None and state.session is not None and state.identity:
+                by_class[type(result)][state.identity[0]] = state.session
+        for cls, objects in by_class.items():
+            db = next(iter(objects.values()))
+            primary_key = sa_inspect(cls).primary_key[0]
+            db.query(cls).filter(primary_key.in_(list(objects))).populate_existing().all()
@@ -0,0 +1,76 @@
+"""
+Time-ordered UUID generation (UUIDv7, RFC 9562)
+
+uuid4 primary keys land at random positions in the PK btree, so every insert
+into sales / stock_transactions touches a random leaf page. UUIDv7 keys start
+with a millisecond timestamp, so new rows are appended to the right edge of
+the index and ids sort in creation order (usable as a keyset tiebreaker).
+"""
+import os
+import threading
+import time
+import uuid
+from datetime import datetime, timezone
+
+_lock = threading.Lock()
+_last_ms = 0
+_counter = 0
+
+_COUNTER_MAX = 0xFFF  # 12-bit rand_a field used as a per-millisecond sequence
+
+
+def uuid7() -> uuid.UUID:
+    """
+    Generate a UUIDv7.
+
+    Layout: 48-bit unix ms timestamp | version (7) | 12-bit sequence |
+    variant (0b10) | 62 random bits. The sequence is seeded randomly every
+    millisecond and incremented for ids created within the same millisecond,
+    so ids from one process are strictly increasing.
+    """
+    global _last_ms, _counter
+
+    with _lock:
+        now_ms = time.time_ns() // 1_000_000
+        if now_ms > _last_ms:
+            _last_ms = now_ms
+            # Leave headroom so the sequence rarely overflows within one ms
+            _counter = int.from_bytes(os.urandom(2), "big") & 0x7FF
+        else:
+            _counter += 1
+            if _counter > _COUNTER_MAX:
+                # Sequence exhausted (or clock went backwards): borrow the next ms
+                _last_ms += 1
+                _counter = 0
+        ms = _last_ms
+        seq = _counter
+
+    rand_b = int.from_bytes(os.urandom(8), "big") & 0x3FFFFFFFFFFFFFFF
+
+    value = (ms & 0xFFFFFFFFFFFF) << 80
+    value |= 0x7 << 76
+    value |= seq << 64
+    value |= 0b10 << 62
+    value |= rand_b
+    return uuid.UUID(int=value)
+
+
+def uuid7_time(value: uuid.UUID) -> datetime:
+    """Extract the creation timestamp (UTC, millisecond precision) from a UUIDv7"""
+    ms = value.int >> 80
+    return datetime.fromtimestamp(ms / 1000, tz=timezone.utc)
+
+
+def uuid7_floor(moment: datetime) -> uuid.UUID:
+    """
+    Smallest UUIDv7 that can be generated at `moment`.
+
+    Useful as a lower bound for keyset scans: `WHERE id >= uuid7_floor(ts)`.
+    """
+    if moment.tzinfo is None:
+        moment = moment.replace(tzinfo=timezone.utc)
+    ms = int(moment.timestamp() * 1000)
+    value = (ms & 0xFFFFFFFFFFFF) << 80
+    value |= 0x7 << 76
+    value |= 0b10 << 62
+    return uuid.UUID(int=value)
@@ -0,0 +1,114 @@
+"""
+Integer minor-unit money
+
+Money columns are Numeric(12, 2). Report and aggregation code works in whole
+paisa (1/100 PKR) as Python ints instead of Decimal/float: int arithmetic is
+exact and much cheaper than Decimal, and SQL sums of BIGINT paisa avoid
+numeric accumulation. Values are converted back to Decimal/float only when
+building the API response.
+"""
+from decimal import Decimal, ROUND_HALF_UP
+from typing import Union
+
+from sqlalchemy import BigInteger, cast, func
+
+_CENT = Decimal("0.01")
+
+
+class Money:
+    """Exact amount in paisa. Immutable; supports +, -, abs, int scaling and comparison."""
+
+    __slots__ = ("paisa",)
+
+    def __init__(self, paisa: int = 0):
+        object.__setattr__(self, "paisa", int(paisa))
+
+    def __setattr__(self, name, value):
+        raise AttributeError("Money is immutable")
+
+    @classmethod
+    def from_decimal(cls, value: Union[Decimal, float, int, str, None]) -> "Money":
+        """Convert a rupee amount (DB Numeric, request payload) to paisa, rounding half up"""
+        if value is None:
+            return cls(0)
+        if not isinstance(value, Decimal):
+            value = Decimal(str(value))
+        return cls(int((value * 100).quantize(Decimal(1), rounding=ROUND_HALF_UP)))
+
+    @classmethod
+    def from_paisa(cls, value) -> "Money":
+        """Wrap an integer paisa value coming back from SQL (None -> 0)"""
+        return cls(value or 0)
+
+    def to_decimal(self) -> Decimal:
+        return (Decimal(self.paisa) / 100).quantize(_CENT)
+
+    def __float__(self) -> float:
+        return self.paisa / 100
+
+    def __int__(self) -> int:
+        return self.paisa
+
+    def __add__(self, other: "Money") -> "Money":
+        if not isinstance(other, Money):
+            return NotImplemented
+        return Money(self.paisa + other.paisa)
+
+    def __radd__(self, other) -> "Money":
+        # sum() starts from int 0
+        if isinstance(other, int) and other == 0:
+            return self
+        return self.__add__(other)
+
+    def __sub__(self, other: "Money") -> "Money":
+        if not isinstance(other, Money):
+            return NotImplemented
+        return Money(self.paisa - other.paisa)
+
+    def __mul__(self, factor: int) -> "Money":
+        if not isinstance(factor, int):
+            return NotImplemented
+        return Money(self.paisa * factor)
+
+    __rmul__ = __mul__
+
+    def __neg__(self) -> "Money":
+        return Money(-self.paisa)
+
+    def __abs__(self) -> "Money":
+        return Money(abs(self.paisa))
+
+    def __bool__(self) -> bool:
+        return self.paisa != 0
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, Money):
+            return self.paisa == other.paisa
+        return NotImplemented
+
+    def __lt__(self, other: "Money") -> bool:
+        return self.paisa < other.paisa
+
+    def __le__(self, other: "Money") -> bool:
+        return self.paisa <= other.paisa
+
+    def __gt__(self, other: "Money") -> bool:
+        return self.paisa > other.paisa
+
+    def __ge__(self, other: "Money") -> bool:
+        return self.paisa >= other.paisa
+
+    def __hash__(self) -> int:
+        return hash(self.paisa)
+
+    def __repr__(self) -> str:
+        return f"Money({self.to_decimal()})"
+
+    def ratio(self, other: "Money") -> float:
+        """self / other as a float (0 when other is zero) - for margins and percentages"""
+        return self.paisa / other.paisa if other.paisa else 0.0
+
+
+def paisa(column):
+    """SQL expression converting a Numeric(12, 2) rupee column to BIGINT paisa"""
+    return cast(func.round(column * 100), BigInteger)
@@ -1,10 +1,78 @@
 from sqlalchemy.orm import Session
-from app.models.models import Company
+from sqlalchemy import select, func, case
+from app.models.models import Company, Product, ProductStock, Sale
+from app.schemas import company as company_schemas
 from app.schemas.company import CompanyCreate, CompanyUpdate
+from app.db.projection import columns_for
+from app.core.money import Money, paisa
+from app.crud import crud_sync, crud_forecast
+from app.crud.crud_stock import day_start
+from datetime import date, timedelta
+from typing import Optional
 from uuid import UUID
 
 def get_companies(db: Session, skip: int = 0, limit: int = 100):
-    return db.query(Company).offset(skip).limit(limit).all()
+    """Companies as response-column rows"""
+    query = select(*columns_for(Company, company_schemas.Company))
+    return db.execute(query.offset(skip).limit(limit)).all()
+
+def get_company_summary(db: Session, start_date: Optional[date] = None, end_date: Optional[date] = None):
+    """
+    Per-company stock and sales totals in one grouped query: product count,
+    on-hand units, stock value at current purchase price, low-stock count and
+    sales for the period (all time when no dates are given)
+    """
+    sale_filters = [Sale.is_deleted == False]
+    if start_date:
+        sale_filters.append(Sale.created_at >= day_start(start_date))
+    if end_date:
+        sale_filters.append(Sale.created_at < day_start(end_date + timedelta(days=1)))
+
+    sales = select(
+        Sale.product_id,
+        func.count(Sale.id).label("sales_count"),
+        func.sum(Sale.quantity).label("quantity_sold"),
+        func.sum(paisa(Sale.total_amount)).label("revenue"),
+        func.sum(paisa(Sale.total_amount) - paisa(Sale.purchase_price) * Sale.quantity).label("profit")
+    ).where(*sale_filters).group_by(Sale.product_id).subquery()
+
+    on_hand = func.coalesce(ProductStock.quantity, 0)
+    rows = db.execute(
+        select(
+            Company.id.label("company_id"),
+            Company.name.label("company_name"),
+            func.count(Product.id).label("product_count"),
+            func.coalesce(func.sum(on_hand), 0).label("total_stock"),
+            func.sum(case((on_hand > 0, on_hand * paisa(Product.purchase_price)), else_=0)).label("stock_value"),
+            func.count(case((on_hand <= Product.min_stock, Product.id))).label("low_stock_count"),
+            func.coalesce(func.sum(sales.c.sales_count), 0).label("sales_count"),
+            func.coalesce(func.sum(sales.c.quantity_sold), 0).label("quantity_sold"),
+            func.sum(sales.c.revenue).label("revenue"),
+            func.sum(sales.c.profit).label("profit")
+        )
+        .outerjoin(Product, Product.company_id == Company.id)
+        .outerjoin(ProductStock, ProductStock.product_id == Product.id)
+        .outerjoin(sales, sales.c.product_id == Product.id)
+        .group_by(Company.id, Company.name)
+        .order_by(Company.name)
+    ).all()
+
+    companies = [
+        {
+            "company_id": row.company_id,
+            "company_name": row.company_name,
+            "product_count": row.product_count,
+            "total_stock": int(row.total_stock),
+            "stock_value": Money.from_paisa(row.stock_value).to_decimal(),
+            "low_stock_count": row.low_stock_count,
+            "sales_count": int(row.sales_count),
+            "quantity_sold": int(row.quantity_sold),
+            "revenue": Money.from_paisa(row.revenue).to_decimal(),
+            "profit": Money.from_paisa(row.profit).to_decimal()
+        }
+        for row in rows
+    ]
+    return {"start_date": start_date, "end_date": end_date, "companies": companies}
 
 def get_company(db: Session, company_id: UUID):
     return db.query(Company).filter(Company.id == company_id).first()
@@ -22,11 +90,14 @@ def update_company(db: Session, company_id: UUID, company: CompanyUpdate):
         db_company.name = company.name
         db.commit()
         db.refresh(db_company)
+        crud_forecast.invalidate_forecast()
     return db_company
 
 def delete_company(db: Session, company_id: UUID):
     db_company = db.query(Company).filter(Company.id == company_id).first()
     if db_company:
         db.delete(db_company)
+        crud_sync.record_tombstone(db, "companies", company_id)
         db.commit()
+        crud_forecast.invalidate_forecast()
     return db_company
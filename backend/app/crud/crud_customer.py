@@ -0,0 +1,231 @@
+from sqlalchemy.orm import Session
+from sqlalchemy import func, case, or_
+from sqlalchemy.exc import IntegrityError
+from app.models.models import Customer, CustomerBalance, CustomerPayment, Sale
+from app.schemas.customer import CustomerPaymentCreate
+from uuid import UUID
+from datetime import datetime
+from decimal import Decimal
+from typing import Optional
+
+BALANCE_SORTS = {
+    "outstanding_desc": (CustomerBalance.outstanding.desc(), Customer.name_key),
+    "outstanding_asc": (CustomerBalance.outstanding.asc(), Customer.name_key),
+    "name": (Customer.name_key,),
+    "recent": (CustomerBalance.last_transaction_at.desc(), Customer.name_key),
+}
+
+def customer_key(name: str) -> str:
+    """Normalized customer identity - same as SQL lower(trim(name))"""
+    return name.strip().lower()
+
+def get_or_create_customer(db: Session, name: str, phone: Optional[str] = None) -> Customer:
+    """Find a customer by normalized name, creating it with an empty balance row if new"""
+    key = customer_key(name)
+    customer = db.query(Customer).filter(Customer.name_key == key).first()
+    if customer:
+        if phone and customer.phone != phone:
+            customer.phone = phone
+        return customer
+
+    try:
+        # Savepoint: a concurrent request may create the same customer first
+        with db.begin_nested():
+            customer = Customer(name=name.strip(), name_key=key, phone=phone)
+            customer.balance = CustomerBalance(
+                total_credit=0, total_cash=0, total_paid=0, outstanding=0, sales_count=0
+            )
+            db.add(customer)
+    except IntegrityError:
+        customer = db.query(Customer).filter(Customer.name_key == key).one()
+    return customer
+
+def _apply_balance_delta(
+    db: Session,
+    customer_id: UUID,
+    credit: Decimal = 0,
+    cash: Decimal = 0,
+    paid: Decimal = 0,
+    sales: int = 0,
+    at=None
+):
+    """Atomically add deltas to a balance row (UPDATE ... SET x = x + :delta)"""
+    values = {
+        CustomerBalance.total_credit: CustomerBalance.total_credit + credit,
+        CustomerBalance.total_cash: CustomerBalance.total_cash + cash,
+        CustomerBalance.total_paid: CustomerBalance.total_paid + paid,
+        CustomerBalance.outstanding: CustomerBalance.outstanding + credit - paid,
+        CustomerBalance.sales_count: CustomerBalance.sales_count + sales,
+    }
+    if at is not None:
+        values[CustomerBalance.last_transaction_at] = case(
+            (or_(CustomerBalance.last_transaction_at == None, CustomerBalance.last_transaction_at < at), at),
+            else_=CustomerBalance.last_transaction_at
+        )
+    db.query(CustomerBalance).filter(
+        CustomerBalance.customer_id == customer_id
+    ).update(values, synchronize_session=False)
+
+def record_sale(
+    db: Session,
+    customer_name: str,
+    customer_phone: Optional[str],
+    total_amount: Decimal,
+    payment_type: str,
+    at: Optional[datetime] = None,
+    sign: int = 1,
+    sales: int = 1
+):
+    """
+    Apply a sale (sign=1) or its reversal (sign=-1) to the customer's balance.
+    `sales` is the number of sale rows behind total_amount (invoice lines).
+    Does not commit; runs inside the caller's transaction.
+    """
+    customer = get_or_create_customer(db, customer_name, customer_phone if sign > 0 else None)
+    amount = Decimal(total_amount) * sign
+    _apply_balance_delta(
+        db,
+        customer.id,
+        credit=amount if payment_type == 'Credit' else 0,
+        cash=amount if payment_type == 'Debit' else 0,
+        sales=sales * sign,
+        at=(at or func.now()) if sign > 0 else None
+    )
+
+def create_payment(db: Session, payment: CustomerPaymentCreate):
+    """Record money received from a customer and reduce their outstanding balance"""
+    customer = get_or_create_customer(db, payment.customer_name, payment.customer_phone)
+    db_payment = CustomerPayment(
+        customer_id=customer.id,
+        amount=payment.amount,
+        notes=payment.notes
+    )
+    if payment.paid_at:
+        db_payment.paid_at = payment.paid_at
+    db.add(db_payment)
+    _apply_balance_delta(db, customer.id, paid=payment.amount, at=payment.paid_at or func.now())
+    db.commit()
+    db.refresh(db_payment)
+    return db_payment
+
+def delete_payment(db: Session, payment_id: UUID):
+    """Soft delete a payment and add its amount back to the outstanding balance"""
+    db_payment = db.query(CustomerPayment).filter(
+        CustomerPayment.id == payment_id,
+        CustomerPayment.is_deleted == False
+    ).first()
+
+    if db_payment:
+        db_payment.is_deleted = True
+        db_payment.deleted_at = datetime.utcnow()
+        _apply_balance_delta(db, db_payment.customer_id, paid=-db_payment.amount)
+        db.commit()
+        db.refresh(db_payment)
+
+    return db_payment
+
+def get_payments(db: Session, customer_id: UUID, skip: int = 0, limit: int = 100):
+    """Payments of a customer, newest first"""
+    return db.query(CustomerPayment).filter(
+        CustomerPayment.customer_id == customer_id,
+        CustomerPayment.is_deleted == False
+    ).order_by(CustomerPayment.paid_at.desc()).offset(skip).limit(limit).all()
+
+def get_customer(db: Session, customer_id: UUID):
+    return db.query(Customer).filter(Customer.id == customer_id).first()
+
+def get_balances(
+    db: Session,
+    skip: int = 0,
+    limit: int = 50,
+    sort: str = "outstanding_desc",
+    search: Optional[str] = None,
+    status: str = "all"
+):
+    """One page of customer balances plus the total number of matching customers"""
+    query = db.query(
+        Customer.id.label("customer_id"),
+        Customer.name.label("customer_name"),
+        Customer.phone.label("customer_phone"),
+        CustomerBalance.total_credit,
+        CustomerBalance.total_cash,
+        CustomerBalance.total_paid,
+        CustomerBalance.outstanding,
+        CustomerBalance.sales_count,
+        CustomerBalance.last_transaction_at
+    ).join(CustomerBalance, CustomerBalance.customer_id == Customer.id)
+
+    if search:
+        query = query.filter(or_(
+            Customer.name_key.contains(customer_key(search)),
+            Customer.phone.contains(search.strip())
+        ))
+    if status == "outstanding":
+        query = query.filter(CustomerBalance.outstanding > 0)
+    elif status == "settled":
+        query = query.filter(CustomerBalance.outstanding <= 0)
+
+    total = query.count()
+    items = query.order_by(*BALANCE_SORTS[sort]).offset(skip).limit(limit).all()
+
+    totals = db.query(
+        func.coalesce(func.sum(case((CustomerBalance.outstanding > 0, CustomerBalance.outstanding), else_=0)), 0).label("outstanding"),
+        func.coalesce(func.sum(CustomerBalance.total_paid), 0).label("paid"),
+        func.count(case((CustomerBalance.outstanding > 0, 1))).label("customers_with_debt"),
+        func.count(CustomerBalance.customer_id).label("customers")
+    ).first()
+
+    return {
+        "total": total,
+        "skip": skip,
+        "limit": limit,
+        "total_outstanding": totals.outstanding,
+        "total_paid": totals.paid,
+        "customers_with_debt": totals.customers_with_debt,
+        "total_customers": totals.customers,
+        "items": items
+    }
+
+def rebuild_customer_balances(db: Session) -> int:
+    """
+    Recompute every balance row from sales and payments in two grouped
+    queries. Used to backfill existing data; normal writes are incremental.
+    """
+    name_key = func.lower(func.trim(Sale.customer_name))
+    sales = db.query(
+        name_key.label("name_key"),
+        func.max(Sale.customer_name).label("name"),
+        func.max(Sale.customer_phone).label("phone"),
+        func.sum(case((Sale.payment_type == 'Credit', Sale.total_amount), else_=0)).label("credit"),
+        func.sum(case((Sale.payment_type == 'Debit', Sale.total_amount), else_=0)).label("cash"),
+        func.count(Sale.id).label("sales_count"),
+        func.max(Sale.created_at).label("last_at")
+    ).filter(Sale.is_deleted == False).group_by(name_key).all()
+
+    for row in sales:
+        get_or_create_customer(db, row.name, row.phone)
+    db.flush()
+
+    customers = {c.name_key: c for c in db.query(Customer).all()}
+    paid = dict(
+        db.query(CustomerPayment.customer_id, func.sum(CustomerPayment.amount))
+        .filter(CustomerPayment.is_deleted == False)
+        .group_by(CustomerPayment.customer_id).all()
+    )
+    by_key = {row.name_key: row for row in sales}
+
+    for key, customer in customers.items():
+        row = by_key.get(key)
+        credit = Decimal(row.credit or 0) if row else Decimal('0.00')
+        customer_paid = Decimal(paid.get(customer.id) or 0)
+        balance = customer.balance or CustomerBalance(customer_id=customer.id)
+        balance.total_credit = credit
+        balance.total_cash = Decimal(row.cash or 0) if row else Decimal('0.00')
+        balance.total_paid = customer_paid
+        balance.outstanding = credit - customer_paid
+        balance.sales_count = row.sales_count if row else 0
+        balance.last_transaction_at = row.last_at if row else None
+        customer.balance = balance
+
+    db.commit()
+    return len(customers)
@@ -0,0 +1,83 @@
+from sqlalchemy.orm import Session
+from app.models.models import Product, Sale
+from app.core.events import event_bus
+from app.core.money import Money
+from app.crud.crud_stock import get_on_hand
+from app.crud import crud_forecast
+from app.schemas import transactions
+from uuid import UUID
+from datetime import date
+from decimal import Decimal
+
+# Publishers for live events. Called after commit, so subscribers never see
+# a write that was rolled back.
+
+def publish_sale(event_type: str, db_sale: Sale):
+    """sale.created / sale.updated / sale.deleted with the sale as the API returns it"""
+    if not event_bus.active:
+        return
+    event_bus.publish(event_type, sale=transactions.Sale.model_validate(db_sale).model_dump(mode="json"))
+
+def publish_stock_change(db: Session, product_id: UUID, delta: int):
+    """
+    stock.changed with the new balance, plus stock.low when this write took
+    the product from above min_stock to at or below it. Every committed
+    stock write passes here, so it also drops the cached stock forecast.
+    """
+    crud_forecast.invalidate_forecast()
+    if not event_bus.active or product_id is None:
+        return
+    product = db.query(Product.name, Product.min_stock).filter(Product.id == product_id).first()
+    if not product:
+        return
+    balance = get_on_hand(db, product_id)
+
+    event_bus.publish("stock.changed", product_id=product_id, stock_balance=balance)
+    if balance - delta > product.min_stock >= balance:
+        event_bus.publish(
+            "stock.low",
+            product_id=product_id,
+            product_name=product.name,
+            stock_balance=balance,
+            min_stock=product.min_stock
+        )
+
+def publish_dashboard_change(
+    day: date,
+    revenue: Decimal = 0,
+    profit: Decimal = 0,
+    expense: Decimal = 0,
+    sales_count: int = 0
+):
+    """dashboard.changed with the change to that day's totals"""
+    if not event_bus.active:
+        return
+    event_bus.publish(
+        "dashboard.changed",
+        date=day.isoformat(),
+        revenue=float(Money.from_decimal(revenue)),
+        profit=float(Money.from_decimal(profit)),
+        expense=float(Money.from_decimal(expense)),
+        sales_count=sales_count
+    )
+
+def sale_totals(db_sale: Sale):
+    """(day, revenue, profit) a sale contributes to the dashboard"""
+    day = db_sale.created_at.date() if db_sale.created_at else date.today()
+    return day, db_sale.total_amount, db_sale.total_amount - db_sale.purchase_price * db_sale.quantity
+
+def publish_sale_totals(db_sale: Sale, sign: int = 1, previous=None):
+    """
+    Dashboard delta of adding (sign=1) or removing (sign=-1) a sale. For an
+    edit pass the sale_totals() captured before the change as `previous`.
+    """
+    day, revenue, profit = sale_totals(db_sale)
+    if previous is not None:
+        old_day, old_revenue, old_profit = previous
+        if old_day != day:
+            publish_dashboard_change(old_day, revenue=-old_revenue, profit=-old_profit, sales_count=-1)
+            publish_dashboard_change(day, revenue=revenue, profit=profit, sales_count=1)
+        else:
+            publish_dashboard_change(day, revenue=revenue - old_revenue, profit=profit - old_profit)
+        return
+    publish_dashboard_change(day, revenue=revenue * sign, profit=profit * sign, sales_count=sign)
@@ -1,10 +1,18 @@
 from sqlalchemy.orm import Session
-from sqlalchemy import func, and_
-from app.models.models import Expense
+from sqlalchemy import func, and_, case, extract, select, literal
+from sqlalchemy.exc import IntegrityError
+from app.models.models import Expense, ExpenseMonthlyRollup
+from app.schemas import expense as expense_schemas
 from app.schemas.expense import ExpenseCreate, ExpenseUpdate
+from app.db.projection import columns_for
+from app.crud.crud_events import publish_dashboard_change
+from app.crud.crud_report import invalidate_report_day
 from uuid import UUID
-from datetime import datetime, date
+from datetime import datetime, date, timezone
 from decimal import Decimal
+from typing import Optional
+
+DEFAULT_CATEGORY = "General"
 
 def get_expenses(
     db: Session, 
@@ -13,19 +21,19 @@ def get_expenses(
     expense_date: date = None,
     include_deleted: bool = False
 ):
-    """Get expenses, optionally filtered by date"""
-    query = db.query(Expense)
+    """Get expenses as response-column rows, optionally filtered by date"""
+    query = select(*columns_for(Expense, expense_schemas.Expense))
     
     # Filter out soft-deleted records unless explicitly requested
     if not include_deleted:
-        query = query.filter(Expense.is_deleted == False)
+        query = query.where(Expense.is_deleted == False)
     
     # Filter by date if provided
     if expense_date:
-        query = query.filter(func.date(Expense.expense_date) == expense_date)
+        query = query.where(func.date(Expense.expense_date) == expense_date)
     
     # Order by most recent first (newest entries at top)
-    return query.order_by(Expense.created_at.desc()).offset(skip).limit(limit).all()
+    return db.execute(query.order_by(Expense.created_at.desc()).offset(skip).limit(limit)).all()
 
 def get_expense(db: Session, expense_id: UUID):
     """Get a single expense by ID"""
@@ -36,10 +44,17 @@ def get_expense(db: Session, expense_id: UUID):
 
 def create_expense(db: Session, expense: ExpenseCreate):
     """Create a new expense"""
-    db_expense = Expense(**expense.model_dump())
+    data = expense.model_dump()
+    data["category"] = normalize_category(data.get("category"))
+    if data.get("expense_date") is None:
+        data["expense_date"] = datetime.now(timezone.utc)
+    _apply_to_rollup(db, data["expense_date"], data["category"], data["amount"], 1)
+    invalidate_report_day(db, data["expense_date"])
+    db_expense = Expense(**data)
     db.add(db_expense)
     db.commit()
     db.refresh(db_expense)
+    publish_dashboard_change(db_expense.expense_date.date(), expense=db_expense.amount)
     return db_expense
 
 def update_expense(db: Session, expense_id: UUID, expense: ExpenseUpdate):
@@ -50,11 +65,31 @@ def update_expense(db: Session, expense_id: UUID, expense: ExpenseUpdate):
     ).first()
     
     if db_expense:
+        old_day, old_amount = db_expense.expense_date.date(), db_expense.amount
         update_data = expense.model_dump(exclude_unset=True)
+        if update_data.get("expense_date") is None:
+            update_data.pop("expense_date", None)
+        if "category" in update_data:
+            update_data["category"] = normalize_category(update_data["category"])
+        
+        old_key = (db_expense.expense_date, normalize_category(db_expense.category), db_expense.amount)
+        new_key = (
+            update_data.get("expense_date", db_expense.expense_date),
+            update_data.get("category", normalize_category(db_expense.category)),
+            update_data.get("amount", db_expense.amount)
+        )
+        if new_key != old_key:
+            _apply_to_rollup(db, *old_key, -1)
+            _apply_to_rollup(db, *new_key, 1)
+            invalidate_report_day(db, old_key[0])
+            invalidate_report_day(db, new_key[0])
+        
         for key, value in update_data.items():
             setattr(db_expense, key, value)
         db.commit()
         db.refresh(db_expense)
+        publish_dashboard_change(old_day, expense=-old_amount)
+        publish_dashboard_change(db_expense.expense_date.date(), expense=db_expense.amount)
     
     return db_expense
 
@@ -66,10 +101,15 @@ def delete_expense(db: Session, expense_id: UUID):
     ).first()
     
     if db_expense:
+        _apply_to_rollup(
+            db, db_expense.expense_date, normalize_category(db_expense.category), db_expense.amount, -1
+        )
+        invalidate_report_day(db, db_expense.expense_date)
         db_expense.is_deleted = True
         db_expense.deleted_at = datetime.utcnow()
         db.commit()
         db.refresh(db_expense)
+        publish_dashboard_change(db_expense.expense_date.date(), expense=-db_expense.amount)
     
     return db_expense
 
@@ -97,3 +137,170 @@ def get_expenses_by_date_range(db: Session, start_date: date, end_date: date):
     ).group_by(func.date(Expense.expense_date)).all()
     
     return expenses
+
+
+def normalize_category(category: Optional[str]) -> str:
+    """Stored category of an expense; blank or missing means DEFAULT_CATEGORY"""
+    category = (category or "").strip()
+    return category or DEFAULT_CATEGORY
+
+def _month_start(value: date) -> date:
+    return date(value.year, value.month, 1)
+
+def _sql_month(value) -> tuple:
+    """(year, month) of a timestamp as the database sees it, in its session time zone"""
+    return extract("year", value), extract("month", value)
+
+def _expense_month(db: Session, expense_date: datetime) -> date:
+    """
+    Rollup month of an expense date, bucketed in SQL like
+    rebuild_expense_rollups so an offset near a month boundary lands in the
+    same month live and after a rebuild
+    """
+    year, month = db.query(*_sql_month(literal(expense_date, Expense.expense_date.type))).one()
+    return date(int(year), int(month), 1)
+
+def _next_month(month: date) -> date:
+    return date(month.year + month.month // 12, month.month % 12 + 1, 1)
+
+def _rollup_values(amount: Decimal, sign: int) -> dict:
+    """Column increments for adding (sign=1) or removing (sign=-1) one expense"""
+    amount = Decimal(amount)
+    return {
+        ExpenseMonthlyRollup.expense_total: ExpenseMonthlyRollup.expense_total + (amount * sign if amount < 0 else 0),
+        ExpenseMonthlyRollup.income_total: ExpenseMonthlyRollup.income_total + (amount * sign if amount > 0 else 0),
+        ExpenseMonthlyRollup.count: ExpenseMonthlyRollup.count + sign
+    }
+
+def _update_rollup(db: Session, month: date, category: str, amount: Decimal, sign: int) -> int:
+    return db.query(ExpenseMonthlyRollup).filter(
+        ExpenseMonthlyRollup.month == month,
+        ExpenseMonthlyRollup.category == category
+    ).update(_rollup_values(amount, sign), synchronize_session=False)
+
+def _ensure_rollup_row(db: Session, month: date, category: str):
+    """
+    Create a missing rollup row seeded from the expenses already recorded
+    for that month and category. Callers run this before their own change
+    reaches the expenses table, so the seed excludes it.
+    """
+    totals = db.query(
+        func.sum(case((Expense.amount < 0, Expense.amount), else_=0)),
+        func.sum(case((Expense.amount > 0, Expense.amount), else_=0)),
+        func.count(Expense.id)
+    ).filter(
+        Expense.expense_date >= datetime.combine(month, datetime.min.time()),
+        Expense.expense_date < datetime.combine(_next_month(month), datetime.min.time()),
+        func.coalesce(Expense.category, DEFAULT_CATEGORY) == category,
+        Expense.is_deleted == False
+    ).one()
+    try:
+        # Savepoint: a concurrent request may create the same row first
+        with db.begin_nested():
+            db.add(ExpenseMonthlyRollup(
+                month=month,
+                category=category,
+                expense_total=totals[0] or 0,
+                income_total=totals[1] or 0,
+                count=totals[2]
+            ))
+    except IntegrityError:
+        pass
+
+def _apply_to_rollup(db: Session, expense_date: datetime, category: str, amount: Decimal, sign: int):
+    """
+    Add (sign=1) or remove (sign=-1) one live expense from its month's
+    rollup with UPDATE ... SET total = total + :amount. Must run before the
+    expense row itself changes. Does not commit.
+    """
+    month = _expense_month(db, expense_date)
+    if not _update_rollup(db, month, category, amount, sign):
+        _ensure_rollup_row(db, month, category)
+        _update_rollup(db, month, category, amount, sign)
+
+def rebuild_expense_rollups(db: Session) -> int:
+    """
+    Recompute every monthly rollup from the expenses table in one grouped
+    query. Used to backfill existing data; normal writes are incremental.
+    """
+    year, month = _sql_month(Expense.expense_date)
+    category = func.coalesce(Expense.category, DEFAULT_CATEGORY)
+    totals = db.query(
+        year, month, category,
+        func.sum(case((Expense.amount < 0, Expense.amount), else_=0)),
+        func.sum(case((Expense.amount > 0, Expense.amount), else_=0)),
+        func.count(Expense.id)
+    ).filter(Expense.is_deleted == False).group_by(year, month, category).all()
+
+    db.query(ExpenseMonthlyRollup).delete(synchronize_session=False)
+    for row_year, row_month, row_category, expense_total, income_total, count in totals:
+        db.add(ExpenseMonthlyRollup(
+            month=date(int(row_year), int(row_month), 1),
+            category=row_category,
+            expense_total=expense_total or 0,
+            income_total=income_total or 0,
+            count=count
+        ))
+    db.commit()
+    return len(totals)
+
+def _period_of(month: date, period: str) -> tuple:
+    """(label, first day) of the month/quarter/year containing `month`"""
+    if period == "year":
+        return str(month.year), date(month.year, 1, 1)
+    if period == "quarter":
+        quarter = (month.month - 1) // 3
+        return f"{month.year}-Q{quarter + 1}", date(month.year, quarter * 3 + 1, 1)
+    return month.strftime("%Y-%m"), month
+
+def _empty_totals() -> dict:
+    return {"expense_total": Decimal("0.00"), "income_total": Decimal("0.00"), "net": Decimal("0.00"), "count": 0}
+
+def _add_totals(totals: dict, row: ExpenseMonthlyRollup):
+    totals["expense_total"] += row.expense_total
+    totals["income_total"] += row.income_total
+    totals["net"] += row.expense_total + row.income_total
+    totals["count"] += row.count
+
+def get_expense_analytics(
+    db: Session,
+    period: str = "month",
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+    category: Optional[str] = None
+):
+    """
+    Expense and income totals per month, quarter or year, broken down by
+    category. Reads only the monthly rollup - one row per month and
+    category - so the cost does not depend on how many expenses exist.
+    Dates select whole months.
+    """
+    query = db.query(ExpenseMonthlyRollup).filter(ExpenseMonthlyRollup.count != 0)
+    if start_date:
+        query = query.filter(ExpenseMonthlyRollup.month >= _month_start(start_date))
+    if end_date:
+        query = query.filter(ExpenseMonthlyRollup.month <= _month_start(end_date))
+    if category:
+        query = query.filter(ExpenseMonthlyRollup.category == normalize_category(category))
+
+    periods = {}
+    categories = {}
+    totals = _empty_totals()
+    for row in query.order_by(ExpenseMonthlyRollup.month, ExpenseMonthlyRollup.category).all():
+        label, period_start = _period_of(row.month, period)
+        entry = periods.setdefault(label, {"period": label, "start_date": period_start, **_empty_totals(), "categories": {}})
+        _add_totals(entry, row)
+        _add_totals(entry["categories"].setdefault(row.category, {"category": row.category, **_empty_totals()}), row)
+        _add_totals(categories.setdefault(row.category, {"category": row.category, **_empty_totals()}), row)
+        _add_totals(totals, row)
+
+    for entry in periods.values():
+        entry["categories"] = sorted(entry["categories"].values(), key=lambda c: c["category"])
+    return {
+        "period_type": period,
+        "start_date": start_date,
+        "end_date": end_date,
+        "periods": list(periods.values()),
+        "categories": sorted(categories.values(), key=lambda c: c["category"]),
+        **totals
+    }
@@ -0,0 +1,165 @@
+"""
+Columnar Parquet export of the ledgers for analytics tooling
+
+Rows are read from a server-side cursor (stream_results) in batches of
+EXPORT_BATCH_ROWS and each batch becomes one Parquet row group, so memory
+stays bounded by one batch whatever the table size. Columns keep their
+logical types: UUID, DECIMAL(p, s), timestamps in UTC, DATE, and
+dictionary-encoded text.
+"""
+import io
+from datetime import date, timedelta
+from typing import Iterator, List, Optional
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+from sqlalchemy import BigInteger, Boolean, Date, DateTime, Integer, Numeric, select
+from sqlalchemy.dialects.postgresql import UUID as PG_UUID
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.crud.crud_stock import day_start
+from app.models.models import Sale, StockTransaction, Expense, Product
+
+# table -> (model, column the date filters apply to)
+EXPORT_TABLES = {
+    "sales": (Sale, Sale.created_at),
+    "stock_transactions": (StockTransaction, StockTransaction.created_at),
+    "expenses": (Expense, Expense.expense_date),
+    "products": (Product, None),
+}
+
+def arrow_type(column) -> pa.DataType:
+    """Arrow type of a mapped column"""
+    sql_type = column.type
+    if isinstance(sql_type, PG_UUID):
+        return pa.uuid()
+    if isinstance(sql_type, Numeric):
+        return pa.decimal128(sql_type.precision or 38, sql_type.scale or 0)
+    if isinstance(sql_type, DateTime):
+        return pa.timestamp("us", tz="UTC" if sql_type.timezone else None)
+    if isinstance(sql_type, Date):
+        return pa.date32()
+    if isinstance(sql_type, Boolean):
+        return pa.bool_()
+    if isinstance(sql_type, BigInteger):
+        return pa.int64()
+    if isinstance(sql_type, Integer):
+        return pa.int32()
+    return pa.string()
+
+def export_columns(table: str, columns: Optional[List[str]] = None) -> list:
+    """Mapped columns to export, in table order unless `columns` picks a subset"""
+    if table not in EXPORT_TABLES:
+        raise ValueError(f"Unknown table '{table}', expected one of: {', '.join(EXPORT_TABLES)}")
+    available = {column.key: column for column in EXPORT_TABLES[table][0].__table__.columns}
+    if not columns:
+        return list(available.values())
+    unknown = [name for name in columns if name not in available]
+    if unknown:
+        raise ValueError(f"Unknown column(s) for {table}: {', '.join(unknown)}")
+    return [available[name] for name in dict.fromkeys(columns)]
+
+def export_query(
+    table: str,
+    columns: Optional[List[str]] = None,
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+    include_deleted: bool = False
+):
+    """(select, columns) for one export; raises ValueError on bad input"""
+    selected = export_columns(table, columns)
+    model, date_column = EXPORT_TABLES[table]
+    query = select(*selected)
+    if start_date or end_date:
+        if date_column is None:
+            raise ValueError(f"{table} has no date column to filter on")
+        if start_date and end_date and end_date < start_date:
+            raise ValueError("end_date must not be before start_date")
+        if start_date:
+            query = query.where(date_column >= day_start(start_date))
+        if end_date:
+            query = query.where(date_column < day_start(end_date + timedelta(days=1)))
+    if not include_deleted and hasattr(model, "is_deleted"):
+        query = query.where(model.is_deleted == False)
+    return query.order_by(*model.__table__.primary_key.columns), selected
+
+def arrow_schema(columns: list) -> pa.Schema:
+    return pa.schema([pa.field(column.key, arrow_type(column), nullable=column.nullable) for column in columns])
+
+def record_batch(rows: list, schema: pa.Schema) -> pa.RecordBatch:
+    """Result rows (in schema column order) as an Arrow record batch"""
+    arrays = []
+    for i, field in enumerate(schema):
+        values = [row[i] for row in rows]
+        if field.type == pa.uuid():
+            values = [value.bytes if value is not None else None for value in values]
+        arrays.append(pa.array(values, type=field.type))
+    return pa.RecordBatch.from_arrays(arrays, schema=schema)
+
+def _write_batches(db: Session, query, columns: list, sink, batch_size: int) -> Iterator[int]:
+    """Write one row group per cursor batch to `sink`, yielding after each"""
+    schema = arrow_schema(columns)
+    text_columns = [field.name for field in schema if field.type == pa.string()]
+    result = db.execute(query.execution_options(stream_results=True, yield_per=batch_size))
+    with pq.ParquetWriter(sink, schema, use_dictionary=text_columns or False, compression="zstd") as writer:
+        for rows in result.partitions():
+            writer.write_batch(record_batch(rows, schema), row_group_size=batch_size)
+            yield len(rows)
+    yield 0  # the footer, written on close
+
+def write_parquet(
+    db: Session,
+    table: str,
+    sink,
+    columns: Optional[List[str]] = None,
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+    include_deleted: bool = False,
+    batch_size: Optional[int] = None
+) -> int:
+    """Export `table` to `sink` (a path or binary file) and return the row count"""
+    query, selected = export_query(table, columns, start_date, end_date, include_deleted)
+    return sum(_write_batches(db, query, selected, sink, batch_size or settings.EXPORT_BATCH_ROWS))
+
+class _ChunkSink(io.RawIOBase):
+    """Write-only file that hands the written bytes back in chunks"""
+
+    def __init__(self):
+        self.chunks = []
+
+    def writable(self):
+        return True
+
+    def write(self, data):
+        self.chunks.append(bytes(data))
+        return len(data)
+
+    def take(self) -> bytes:
+        data, self.chunks = b"".join(self.chunks), []
+        return data
+
+def stream_parquet(
+    db: Session,
+    table: str,
+    columns: Optional[List[str]] = None,
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+    include_deleted: bool = False,
+    batch_size: Optional[int] = None
+) -> Iterator[bytes]:
+    """
+    Parquet file bytes of `table`, yielded one row group at a time (the
+    footer comes last). The query is validated before the first chunk, so
+    ValueError is raised by this call rather than mid-stream.
+    """
+    query, selected = export_query(table, columns, start_date, end_date, include_deleted)
+    sink = _ChunkSink()
+
+    def chunks():
+        for _ in _write_batches(db, query, selected, sink, batch_size or settings.EXPORT_BATCH_ROWS):
+            data = sink.take()
+            if data:
+                yield data
+
+    return chunks()
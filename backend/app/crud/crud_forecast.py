@@ -0,0 +1,181 @@
+from sqlalchemy.orm import Session
+from sqlalchemy import func
+from app.models.models import Product, ProductStock, StockTransaction, Company
+from app.crud.crud_stock import day_start
+from datetime import date, timedelta
+from typing import Optional
+import threading
+import numpy as np
+
+DEFAULT_WINDOW_DAYS = 28
+DEFAULT_ALPHA = 0.3
+DEFAULT_HORIZON_DAYS = 14
+MAX_CACHED = 16
+
+# Forecasts are cached until the next committed stock write (or product
+# change) bumps the generation. A result computed while a write commits is
+# stored under the generation read before computing, so it is never reused.
+_cache = {}
+_generation = 0
+_lock = threading.Lock()
+
+def invalidate_forecast():
+    """Drop cached forecasts - call after a stock or product write has committed"""
+    global _generation
+    with _lock:
+        _generation += 1
+        _cache.clear()
+
+def _smoothing_weights(window_days: int, alpha: float) -> np.ndarray:
+    """
+    Weights w such that demand @ w is the exponentially smoothed level after
+    the last day, with the first day as the initial level:
+    s_0 = x_0, s_t = alpha * x_t + (1 - alpha) * s_(t-1)
+    """
+    ages = np.arange(window_days - 1, -1, -1)  # days before the last day
+    weights = alpha * (1 - alpha) ** ages
+    weights[0] = (1 - alpha) ** (window_days - 1)
+    return weights
+
+def _as_date(value) -> date:
+    """func.date() result as a date (SQLite returns 'YYYY-MM-DD' strings)"""
+    return value if isinstance(value, date) else date.fromisoformat(str(value))
+
+def _compute(db: Session, window_days: int, alpha: float, today: date) -> dict:
+    products = db.query(
+        Product.id,
+        Product.name,
+        Product.unit,
+        Product.company_id,
+        Company.name,
+        func.coalesce(Product.min_stock, 0),
+        func.coalesce(ProductStock.quantity, 0),
+        func.coalesce(Product.purchase_price, 0)
+    ).outerjoin(Company, Company.id == Product.company_id).outerjoin(
+        ProductStock, ProductStock.product_id == Product.id
+    ).order_by(Product.name, Product.id).all()
+
+    # Complete days only: the window ends yesterday
+    first_day = today - timedelta(days=window_days)
+    day = func.date(StockTransaction.created_at)
+    daily_out = db.query(StockTransaction.product_id, day, func.sum(StockTransaction.quantity)).filter(
+        StockTransaction.type == 'OUT',
+        StockTransaction.is_deleted == False,
+        StockTransaction.created_at >= day_start(first_day),
+        StockTransaction.created_at < day_start(today)
+    ).group_by(StockTransaction.product_id, day).all()
+
+    index = {row[0]: i for i, row in enumerate(products)}
+    rows, offsets, quantities = [], [], []
+    for product_id, value, quantity in daily_out:
+        if product_id in index:
+            rows.append(index[product_id])
+            offsets.append((_as_date(value) - first_day).days)
+            quantities.append(quantity)
+    demand = np.zeros((len(products), window_days))
+    np.add.at(demand, (np.array(rows, dtype=np.intp), np.array(offsets, dtype=np.intp)), np.array(quantities, dtype=float))
+
+    return {
+        "products": products,
+        "stock": np.array([row[6] for row in products], dtype=float),
+        "min_stock": np.array([row[5] for row in products], dtype=float),
+        "moving_average": demand.mean(axis=1),
+        "smoothed": demand @ _smoothing_weights(window_days, alpha),
+        "window_total": demand.sum(axis=1)
+    }
+
+def demand_forecast(
+    db: Session,
+    window_days: int = DEFAULT_WINDOW_DAYS,
+    alpha: float = DEFAULT_ALPHA,
+    today: Optional[date] = None
+) -> dict:
+    """
+    Per-product demand arrays over the last `window_days` complete days,
+    aligned with "products" (id, name, unit, company_id, company_name,
+    min_stock, stock_balance, purchase_price): stock, min_stock, moving_average and
+    smoothed (exponentially smoothed) daily demand, window_total. OUT
+    quantities come from one grouped query; the math runs on all
+    products at once. Cached until invalidate_forecast().
+    """
+    today = today or date.today()
+    key = (today, window_days, alpha)
+    with _lock:
+        generation = _generation
+        cached = _cache.get(key)
+    if cached is not None:
+        return cached
+
+    result = _compute(db, window_days, alpha, today)
+    with _lock:
+        if generation == _generation:
+            if len(_cache) >= MAX_CACHED:
+                _cache.clear()
+            _cache[key] = result
+    return result
+
+def get_stock_forecast(
+    db: Session,
+    window_days: int = DEFAULT_WINDOW_DAYS,
+    alpha: float = DEFAULT_ALPHA,
+    horizon_days: int = DEFAULT_HORIZON_DAYS,
+    at_risk_only: bool = False
+):
+    """
+    Days of cover per product (stock balance / smoothed daily demand), the
+    projected stock-out date and the day the balance reaches min_stock.
+    A product is at risk when it runs out within `horizon_days`. Sorted
+    by days of cover, products without demand last.
+    """
+    today = date.today()
+    forecast = demand_forecast(db, window_days, alpha, today)
+    stock, min_stock, smoothed = forecast["stock"], forecast["min_stock"], forecast["smoothed"]
+
+    has_demand = smoothed > 0
+    with np.errstate(divide="ignore", invalid="ignore"):
+        cover = np.where(has_demand, np.maximum(stock, 0) / smoothed, np.inf)
+        to_min = np.where(has_demand, np.maximum(stock - min_stock, 0) / smoothed, np.inf)
+    status = np.select(
+        [stock <= 0, has_demand & (cover <= horizon_days), stock <= min_stock, ~has_demand],
+        ["out_of_stock", "at_risk", "low_stock", "no_demand"],
+        default="ok"
+    )
+
+    def finite(values, i):
+        return round(float(values[i]), 2) if np.isfinite(values[i]) else None
+
+    # Sparse demand can put cover millions of days out, past date.max
+    last_day = (date.max - today).days
+
+    def day_after(values, i):
+        return today + timedelta(days=int(values[i])) if values[i] <= last_day else None
+
+    items = []
+    for i in np.lexsort((-forecast["window_total"], cover)):
+        if at_risk_only and status[i] not in ("out_of_stock", "at_risk"):
+            continue
+        product_id, name, unit, company_id, company_name, product_min_stock, balance, _ = forecast["products"][i]
+        items.append({
+            "product_id": product_id,
+            "product_name": name,
+            "unit": unit,
+            "company_id": company_id,
+            "company_name": company_name,
+            "stock_balance": int(balance),
+            "min_stock": int(product_min_stock),
+            "moving_average": round(float(forecast["moving_average"][i]), 2),
+            "smoothed_demand": round(float(smoothed[i]), 2),
+            "days_of_cover": finite(cover, i),
+            "stockout_date": day_after(cover, i),
+            "min_stock_date": day_after(to_min, i),
+            "status": str(status[i])
+        })
+
+    return {
+        "as_of": today,
+        "window_days": window_days,
+        "alpha": alpha,
+        "horizon_days": horizon_days,
+        "counts": {name: int((status == name).sum()) for name in ("out_of_stock", "at_risk", "low_stock", "ok", "no_demand")},
+        "products": items
+    }
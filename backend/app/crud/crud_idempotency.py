@@ -0,0 +1,176 @@
+from sqlalchemy.orm import Session, object_session
+from sqlalchemy.exc import IntegrityError
+from fastapi import HTTPException
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+from app.models.models import IdempotencyKey
+from app.core.config import settings
+from datetime import datetime, timedelta, timezone
+from collections import OrderedDict
+from typing import Callable, Optional, Type
+import hashlib
+import json
+import threading
+
+# Front cache of completed responses: (endpoint, key) -> (request_hash, status, body, expires_at).
+# Replays from the same worker skip the database entirely.
+CACHE_SIZE = 2048
+_cache: "OrderedDict[tuple, tuple]" = OrderedDict()
+_cache_lock = threading.Lock()
+
+# Expired rows are purged at most this often per worker
+PURGE_INTERVAL = timedelta(minutes=10)
+_last_purge = datetime.min
+
+def _cache_get(endpoint: str, key: str):
+    with _cache_lock:
+        entry = _cache.get((endpoint, key))
+        if entry is None:
+            return None
+        if entry[3] <= datetime.utcnow():
+            del _cache[(endpoint, key)]
+            return None
+        _cache.move_to_end((endpoint, key))
+        return entry
+
+def _cache_put(endpoint: str, key: str, entry: tuple):
+    with _cache_lock:
+        _cache[(endpoint, key)] = entry
+        _cache.move_to_end((endpoint, key))
+        while len(_cache) > CACHE_SIZE:
+            _cache.popitem(last=False)
+
+def _naive_utc(moment: datetime) -> datetime:
+    """Stored timestamps as naive UTC, the way datetime.utcnow() compares"""
+    if moment.tzinfo is not None:
+        moment = moment.astimezone(timezone.utc).replace(tzinfo=None)
+    return moment
+
+def request_hash(payload: BaseModel) -> str:
+    return hashlib.sha256(payload.model_dump_json().encode()).hexdigest()
+
+def _replay(entry: tuple, request_digest: str):
+    stored_hash, status_code, body, _ = entry
+    if stored_hash != request_digest:
+        raise HTTPException(
+            status_code=422,
+            detail="Idempotency-Key was already used with a different request body"
+        )
+    return JSONResponse(status_code=status_code, content=json.loads(body), headers={"Idempotent-Replayed": "true"})
+
+def _stored(db: Session, endpoint: str, key: str) -> Optional[IdempotencyKey]:
+    return db.query(IdempotencyKey).filter(
+        IdempotencyKey.key == key,
+        IdempotencyKey.endpoint == endpoint
+    ).first()
+
+def purge_expired(db: Session) -> int:
+    """Delete idempotency rows past their TTL"""
+    deleted = db.query(IdempotencyKey).filter(
+        IdempotencyKey.expires_at < datetime.utcnow()
+    ).delete(synchronize_session=False)
+    db.commit()
+    return deleted
+
+def run_once(
+    db: Session,
+    key: Optional[str],
+    endpoint: str,
+    payload: BaseModel,
+    create: Callable,
+    response_schema: Type[BaseModel],
+    status_code: int = 201,
+    queued: bool = False,
+    after_commit: Optional[Callable] = None
+):
+    """
+    Run `create` at most once per Idempotency-Key and commit its writes.
+
+    `create()` writes without committing. The key row is added to the
+    session first and the response is stored on it before the one commit,
+    so the key, the created rows and the stored response commit atomically.
+    A concurrent duplicate fails on the (key, endpoint) unique constraint,
+    its whole transaction rolls back, and it replays the winner's response
+    instead. No lock is taken. `after_commit(db, result)` runs once the
+    writes are committed (event publishing).
+
+    With `queued=True`, `create(claim, respond)` gets the key row instead and
+    must insert it and call `respond(result)` before the created rows commit
+    (group-commit writes, which commit in another session).
+    """
+    if not key:
+        if queued:
+            return create(None, None)
+        result = create()
+        db.commit()
+        if after_commit is not None:
+            after_commit(db, result)
+        return result
+
+    global _last_purge
+    digest = request_hash(payload)
+
+    cached = _cache_get(endpoint, key)
+    if cached:
+        return _replay(cached, digest)
+
+    now = datetime.utcnow()
+    if now - _last_purge > PURGE_INTERVAL:
+        _last_purge = now
+        purge_expired(db)
+
+    existing = _stored(db, endpoint, key)
+    if existing and _naive_utc(existing.expires_at) <= now:
+        db.delete(existing)
+        db.commit()
+        existing = None
+    if existing:
+        return _replay_stored(existing, digest)
+
+    expires_at = now + timedelta(hours=settings.IDEMPOTENCY_TTL_HOURS)
+    db_key = IdempotencyKey(key=key, endpoint=endpoint, request_hash=digest, expires_at=expires_at)
+
+    body = None
+
+    def respond(result):
+        nonlocal body
+        # Body from the flushed row as stored (e.g. NUMERIC scale), not the request values
+        object_session(result).refresh(result)
+        body = response_schema.model_validate(result).model_dump_json()
+        db_key.status_code = status_code
+        db_key.response_body = body
+
+    try:
+        if queued:
+            # End this session's transaction so it holds no locks (on SQLite, the
+            # write lock) while the writer thread commits
+            db.commit()
+            result = create(db_key, respond)
+        else:
+            db.add(db_key)
+            result = create()
+            db.flush()
+            respond(result)
+            db.commit()
+    except IntegrityError:
+        db.rollback()
+        existing = _stored(db, endpoint, key)
+        if existing is None:
+            if queued:
+                # The winner is in the same batch and has not committed yet
+                raise HTTPException(status_code=409, detail="A request with this Idempotency-Key is still in progress")
+            raise
+        return _replay_stored(existing, digest)
+
+    if not queued and after_commit is not None:
+        after_commit(db, result)
+    _cache_put(endpoint, key, (digest, status_code, body, expires_at))
+    return result
+
+def _replay_stored(existing: IdempotencyKey, digest: str):
+    if existing.status_code is None:
+        # Stored before responses committed together with the key row
+        raise HTTPException(status_code=409, detail="A request with this Idempotency-Key is still in progress")
+    entry = (existing.request_hash, existing.status_code, existing.response_body, _naive_utc(existing.expires_at))
+    _cache_put(existing.endpoint, existing.key, entry)
+    return _replay(entry, digest)
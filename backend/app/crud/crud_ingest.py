@@ -0,0 +1,59 @@
+from sqlalchemy.orm import Session
+from app.core.config import settings
+from app.core.group_commit import GroupCommitQueue
+from app.db.session import SessionLocal
+from app.models.models import IdempotencyKey
+from app.schemas import transactions
+from app.crud import crud_transaction
+from typing import Callable, Optional
+import threading
+
+# Group-commit ingestion (WRITE_QUEUE_ENABLED): sales and stock transactions
+# are written by one writer thread per process, many requests per commit.
+
+_queue: Optional[GroupCommitQueue] = None
+_queue_lock = threading.Lock()
+
+def get_write_queue() -> GroupCommitQueue:
+    global _queue
+    with _queue_lock:
+        if _queue is None:
+            _queue = GroupCommitQueue(
+                SessionLocal,
+                window_ms=settings.WRITE_QUEUE_WINDOW_MS,
+                max_batch=settings.WRITE_QUEUE_MAX_BATCH
+            )
+        return _queue
+
+def _with_claim(claim: Optional[IdempotencyKey], add, respond: Optional[Callable] = None):
+    """
+    Unit of work that also inserts the Idempotency-Key row, in the same
+    savepoint, with the response stored on it before the batch commits
+    """
+    def work(db: Session):
+        if claim is not None:
+            db.add(claim)
+        result = add(db)
+        if respond is not None:
+            db.flush()
+            respond(result)
+        return result
+    return work
+
+def submit_sale(sale: transactions.SaleCreate, claim: Optional[IdempotencyKey] = None, respond: Optional[Callable] = None):
+    """Create a sale in the next group commit and return it once committed"""
+    return get_write_queue().submit(
+        _with_claim(claim, lambda db: crud_transaction.add_sale(db, sale), respond),
+        after_commit=crud_transaction.publish_sale_created
+    )
+
+def submit_transaction(
+    transaction: transactions.StockTransactionCreate,
+    claim: Optional[IdempotencyKey] = None,
+    respond: Optional[Callable] = None
+):
+    """Create a stock transaction in the next group commit and return it once committed"""
+    return get_write_queue().submit(
+        _with_claim(claim, lambda db: crud_transaction.add_transaction(db, transaction), respond),
+        after_commit=crud_transaction.publish_transaction_created
+    )
@@ -0,0 +1,243 @@
+from sqlalchemy.orm import Session
+from sqlalchemy import func, insert
+from fastapi import HTTPException
+from app.models.models import Product, Sale, SaleInvoice, StockTransaction
+from app.schemas.invoice import SaleInvoiceCreate, SaleInvoiceSummary
+from app.core.ids import uuid7
+from app.db.session import begin_write
+from app.crud.crud_stock import invalidate_stock_snapshots, adjust_stock, take_stock
+from app.crud.crud_valuation import invalidate_valuation
+from app.crud.crud_report import invalidate_report_day
+from app.crud import crud_price_history, crud_customer, crud_events, crud_leaderboard
+from uuid import UUID
+from datetime import datetime
+from decimal import Decimal
+from collections import Counter
+
+def add_invoice(db: Session, invoice: SaleInvoiceCreate):
+    """
+    Write an invoice header and all of its lines without committing.
+
+    Products (and, for backdated invoices, as-of purchase prices) are resolved
+    in one query each; sale lines and their OUT stock transactions are inserted
+    with one bulk INSERT per table. The customer balance is updated once with
+    the invoice total. Stock is taken per product in id order, so two
+    invoices sharing products lock them in the same order and cannot deadlock.
+    """
+    begin_write(db)
+    product_ids = {line.product_id for line in invoice.lines}
+    prices = dict(
+        db.query(Product.id, Product.purchase_price).filter(Product.id.in_(product_ids)).all()
+    )
+    missing = product_ids - prices.keys()
+    if missing:
+        raise HTTPException(status_code=404, detail=f"Product not found: {', '.join(map(str, missing))}")
+
+    for product_id, quantity in sorted(_quantities(invoice.lines).items()):
+        take_stock(db, product_id, quantity)
+
+    # Backdated invoices are costed at the purchase price in effect on the invoice date
+    if invoice.created_at:
+        as_of = crud_price_history.resolve_purchase_prices(
+            db, [(product_id, invoice.created_at) for product_id in product_ids]
+        )
+        prices = {product_id: as_of[(product_id, invoice.created_at)] for product_id in product_ids}
+
+    db_invoice = SaleInvoice(
+        id=uuid7(),
+        customer_name=invoice.customer_name,
+        customer_phone=invoice.customer_phone,
+        payment_type=invoice.payment_type
+    )
+    if invoice.created_at:
+        db_invoice.created_at = invoice.created_at
+
+    sale_rows, transaction_rows = [], []
+    total_amount = total_cost = Decimal("0.00")
+    for line in invoice.lines:
+        purchase_price = prices[line.product_id] or Decimal("0.00")
+        amount = line.selling_price * line.quantity
+        sale_id = uuid7()
+        sale_rows.append({
+            "id": sale_id,
+            "invoice_id": db_invoice.id,
+            "product_id": line.product_id,
+            "customer_name": invoice.customer_name,
+            "customer_phone": invoice.customer_phone,
+            "quantity": line.quantity,
+            "selling_price": line.selling_price,
+            "purchase_price": purchase_price,
+            "total_amount": amount,
+            "payment_type": invoice.payment_type,
+            "is_deleted": False
+        })
+        transaction_rows.append({
+            "id": uuid7(),
+            "product_id": line.product_id,
+            "quantity": line.quantity,
+            "party_name": f"Sale to {invoice.customer_name}",
+            "purchase_price": purchase_price,
+            "type": 'OUT',
+            "sale_id": sale_id,
+            "is_deleted": False
+        })
+        total_amount += amount
+        total_cost += purchase_price * line.quantity
+
+    if invoice.created_at:
+        # Backdated invoice may land in an already snapshotted, valued or reported period
+        for product_id in product_ids:
+            invalidate_stock_snapshots(db, product_id, invoice.created_at)
+            invalidate_valuation(db, product_id, invoice.created_at)
+        invalidate_report_day(db, invoice.created_at)
+
+    db_invoice.line_count = len(sale_rows)
+    db_invoice.total_quantity = sum(line.quantity for line in invoice.lines)
+    db_invoice.total_amount = total_amount
+    db_invoice.total_cost = total_cost
+    db.add(db_invoice)
+    db.flush()
+    # Lines carry the stored invoice time, so the counters below use the same
+    # day as the deletes and rebuild_counters, which read it back from the DB
+    db.refresh(db_invoice, ["created_at"])
+    for row in sale_rows + transaction_rows:
+        row["created_at"] = db_invoice.created_at
+
+    db.execute(insert(Sale), sale_rows)
+    db.execute(insert(StockTransaction), transaction_rows)
+    crud_customer.record_sale(
+        db, invoice.customer_name, invoice.customer_phone, total_amount, invoice.payment_type,
+        at=invoice.created_at, sales=len(sale_rows)
+    )
+    crud_leaderboard.record_sales(db, sale_rows)
+    return db_invoice
+
+def publish_invoice_created(db: Session, db_invoice: SaleInvoice):
+    for line in db_invoice.lines:
+        crud_events.publish_sale("sale.created", line)
+    for product_id, quantity in _quantities(db_invoice.lines).items():
+        crud_events.publish_stock_change(db, product_id, -quantity)
+    crud_events.publish_dashboard_change(
+        db_invoice.created_at.date(),
+        revenue=db_invoice.total_amount,
+        profit=db_invoice.total_amount - db_invoice.total_cost,
+        sales_count=db_invoice.line_count
+    )
+
+def create_invoice(db: Session, invoice: SaleInvoiceCreate):
+    """Create an invoice header and all of its lines in one transaction"""
+    db_invoice = add_invoice(db, invoice)
+    db.commit()
+    db.refresh(db_invoice)
+    publish_invoice_created(db, db_invoice)
+    return db_invoice
+
+def _quantities(lines) -> Counter:
+    quantities = Counter()
+    for line in lines:
+        quantities[line.product_id] += line.quantity
+    return quantities
+
+def get_invoices(db: Session, skip: int = 0, limit: int = 100):
+    """Invoice headers, newest first - no line rows are read"""
+    return db.query(SaleInvoice).filter(
+        SaleInvoice.is_deleted == False
+    ).order_by(SaleInvoice.created_at.desc()).offset(skip).limit(limit).all()
+
+def get_invoice_detail(db: Session, invoice_id: UUID):
+    """Invoice header with its live lines, or None"""
+    db_invoice = get_invoice(db, invoice_id)
+    if not db_invoice:
+        return None
+    return {
+        **SaleInvoiceSummary.model_validate(db_invoice).model_dump(),
+        "lines": get_invoice_lines(db, invoice_id)
+    }
+
+def get_invoice(db: Session, invoice_id: UUID):
+    return db.query(SaleInvoice).filter(
+        SaleInvoice.id == invoice_id,
+        SaleInvoice.is_deleted == False
+    ).first()
+
+def get_invoice_lines(db: Session, invoice_id: UUID):
+    """Live lines of an invoice in entry order"""
+    return db.query(Sale).filter(
+        Sale.invoice_id == invoice_id,
+        Sale.is_deleted == False
+    ).order_by(Sale.id).all()
+
+def refresh_invoice_totals(db: Session, invoice_id: UUID):
+    """
+    Recompute stored header totals from the live lines after a line was
+    edited or deleted through the single-sale endpoints. Does not commit.
+    """
+    db.flush()
+    totals = db.query(
+        func.count(Sale.id).label("line_count"),
+        func.coalesce(func.sum(Sale.quantity), 0).label("total_quantity"),
+        func.coalesce(func.sum(Sale.total_amount), 0).label("total_amount"),
+        func.coalesce(func.sum(Sale.purchase_price * Sale.quantity), 0).label("total_cost")
+    ).filter(
+        Sale.invoice_id == invoice_id,
+        Sale.is_deleted == False
+    ).first()
+    values = {
+        SaleInvoice.line_count: totals.line_count,
+        SaleInvoice.total_quantity: totals.total_quantity,
+        SaleInvoice.total_amount: totals.total_amount,
+        SaleInvoice.total_cost: totals.total_cost
+    }
+    # Deleting the last line deletes the invoice
+    if totals.line_count == 0:
+        values[SaleInvoice.is_deleted] = True
+        values[SaleInvoice.deleted_at] = datetime.utcnow()
+    db.query(SaleInvoice).filter(SaleInvoice.id == invoice_id).update(values, synchronize_session=False)
+
+def delete_invoice(db: Session, invoice_id: UUID):
+    """Soft delete an invoice with all of its lines and their stock transactions"""
+    db_invoice = get_invoice(db, invoice_id)
+    if not db_invoice:
+        return None
+
+    lines = get_invoice_lines(db, invoice_id)
+    now = datetime.utcnow()
+    sale_ids = [line.id for line in lines]
+    for product_id, quantity in sorted(_quantities(lines).items()):
+        adjust_stock(db, product_id, quantity)
+
+    db_invoice.is_deleted = True
+    db_invoice.deleted_at = now
+    db.query(Sale).filter(Sale.id.in_(sale_ids)).update(
+        {Sale.is_deleted: True, Sale.deleted_at: now}, synchronize_session=False
+    )
+    db.query(StockTransaction).filter(
+        StockTransaction.sale_id.in_(sale_ids),
+        StockTransaction.is_deleted == False
+    ).update(
+        {StockTransaction.is_deleted: True, StockTransaction.deleted_at: now}, synchronize_session=False
+    )
+    for product_id in {line.product_id for line in lines}:
+        invalidate_stock_snapshots(db, product_id, db_invoice.created_at)
+        invalidate_valuation(db, product_id, db_invoice.created_at)
+    invalidate_report_day(db, db_invoice.created_at)
+
+    crud_customer.record_sale(
+        db, db_invoice.customer_name, db_invoice.customer_phone, db_invoice.total_amount,
+        db_invoice.payment_type, sign=-1, sales=len(lines)
+    )
+    crud_leaderboard.record_sales(db, lines, sign=-1)
+    db.commit()
+
+    for line in lines:
+        db.refresh(line)
+        crud_events.publish_sale("sale.deleted", line)
+    for product_id, quantity in _quantities(lines).items():
+        crud_events.publish_stock_change(db, product_id, quantity)
+    crud_events.publish_dashboard_change(
+        db_invoice.created_at.date(),
+        revenue=-db_invoice.total_amount,
+        profit=-(db_invoice.total_amount - db_invoice.total_cost),
+        sales_count=-len(lines)
+    )
+    return db_invoice
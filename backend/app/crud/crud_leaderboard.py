@@ -0,0 +1,240 @@
+from sqlalchemy.orm import Session
+from sqlalchemy import func, case, and_
+from sqlalchemy.exc import IntegrityError
+from app.models.models import Sale, Product, Customer, LeaderboardCounter
+from app.core.money import Money, paisa
+from app.crud.crud_customer import customer_key
+from app.crud.crud_stock import day_start
+from app.crud import crud_report
+from app.db import analytics
+from collections import defaultdict
+from datetime import date, timedelta
+from typing import Iterable, Optional
+from uuid import UUID
+
+PRODUCT_METRICS = ("revenue", "profit", "quantity")
+CUSTOMER_METRICS = ("spend", "credit")
+COUNTER_PERIODS = ("today", "week", "month")
+COUNTED = ("revenue", "profit", "credit", "quantity", "sales_count")
+
+def period_bounds(period: str, today: Optional[date] = None) -> tuple:
+    """(start_date, end_date) of today, this week (from Monday) or this month"""
+    today = today or date.today()
+    if period == "week":
+        return today - timedelta(days=today.weekday()), today
+    if period == "month":
+        return today.replace(day=1), today
+    return today, today
+
+def tracked_from(today: Optional[date] = None) -> date:
+    """First day the counters cover: the start of this week or this month, whichever is earlier"""
+    return min(period_bounds("week", today)[0], period_bounds("month", today)[0])
+
+def _field(sale, name):
+    return sale[name] if isinstance(sale, dict) else getattr(sale, name)
+
+def _sale_day(sale) -> date:
+    return _field(sale, "created_at").date()
+
+def _update_counter(db: Session, key: tuple, deltas: dict) -> int:
+    day, entity, entity_key = key
+    return db.query(LeaderboardCounter).filter(
+        LeaderboardCounter.day == day,
+        LeaderboardCounter.entity == entity,
+        LeaderboardCounter.entity_key == entity_key
+    ).update(
+        {getattr(LeaderboardCounter, name): getattr(LeaderboardCounter, name) + value for name, value in deltas.items()},
+        synchronize_session=False
+    )
+
+def record_sales(db: Session, sales: Iterable, sign: int = 1):
+    """
+    Add (sign=1) or remove (sign=-1) sales - Sale objects or sale row
+    dicts - from the per-day product and customer counters with
+    UPDATE ... SET x = x + :delta, one statement per touched counter. Sales
+    dated before tracked_from() are skipped. Does not commit.
+    """
+    first_day = tracked_from()
+    deltas = defaultdict(lambda: dict.fromkeys(COUNTED, 0))
+    for sale in sales:
+        day = _sale_day(sale)
+        if day < first_day:
+            continue
+        revenue = Money.from_decimal(_field(sale, "total_amount")).paisa
+        cost = Money.from_decimal(_field(sale, "purchase_price")).paisa * _field(sale, "quantity")
+        values = {
+            "revenue": revenue * sign,
+            "profit": (revenue - cost) * sign,
+            "credit": revenue * sign if _field(sale, "payment_type") == 'Credit' else 0,
+            "quantity": _field(sale, "quantity") * sign,
+            "sales_count": sign
+        }
+        product = (day, "product", str(_field(sale, "product_id")))
+        customer = (day, "customer", customer_key(_field(sale, "customer_name")))
+        for key in (product, customer):
+            for field, value in values.items():
+                deltas[key][field] += value
+
+    for key, values in sorted(deltas.items()):
+        if not _update_counter(db, key, values):
+            try:
+                # Savepoint: a concurrent sale may create the same counter first
+                with db.begin_nested():
+                    db.add(LeaderboardCounter(
+                        day=key[0], entity=key[1], entity_key=key[2], **dict.fromkeys(COUNTED, 0)
+                    ))
+            except IntegrityError:
+                pass
+            _update_counter(db, key, values)
+
+def rebuild_counters(db: Session) -> int:
+    """
+    Recompute the counters of every tracked day from the sales table and
+    drop counters of days that fell out of the current week and month.
+    Run at startup; normal writes are incremental.
+    """
+    first_day = tracked_from()
+    day = func.date(Sale.created_at)
+    revenue = paisa(Sale.total_amount)
+    totals = (
+        func.sum(revenue),
+        func.sum(revenue - paisa(Sale.purchase_price) * Sale.quantity),
+        func.sum(case((Sale.payment_type == 'Credit', revenue), else_=0)),
+        func.sum(Sale.quantity),
+        func.count(Sale.id)
+    )
+    live = and_(Sale.is_deleted == False, Sale.product_id != None, Sale.created_at >= day_start(first_day))
+    customer = func.lower(func.trim(Sale.customer_name))
+    by_product = db.query(day, Sale.product_id, *totals).filter(live).group_by(day, Sale.product_id).all()
+    by_customer = db.query(day, customer, *totals).filter(live).group_by(day, customer).all()
+
+    db.query(LeaderboardCounter).delete(synchronize_session=False)
+    for entity, rows in (("product", by_product), ("customer", by_customer)):
+        for row_day, key, *values in rows:
+            db.add(LeaderboardCounter(
+                day=row_day if isinstance(row_day, date) else date.fromisoformat(str(row_day)),
+                entity=entity,
+                entity_key=str(key),
+                **{name: int(value or 0) for name, value in zip(COUNTED, values)}
+            ))
+    db.commit()
+    return len(by_product) + len(by_customer)
+
+def _entries(db: Session, products: dict, customers: dict) -> tuple:
+    """
+    Leaderboard rows -> response entries, with product and customer names
+    looked up once. Product rows are (product_id, revenue, profit,
+    quantity, sales_count); customer rows (name_key, spend, credit, sales_count).
+    """
+    ids = {UUID(str(row[0])) for rows in products.values() for row in rows}
+    keys = {row[0] for rows in customers.values() for row in rows}
+    product_names = dict(db.query(Product.id, Product.name).filter(Product.id.in_(ids)).all()) if ids else {}
+    customer_names = dict(db.query(Customer.name_key, Customer.name).filter(Customer.name_key.in_(keys)).all()) if keys else {}
+
+    def product(product_id, revenue, profit, quantity, sales_count):
+        product_id = UUID(str(product_id))
+        return {
+            "product_id": product_id,
+            "product_name": product_names.get(product_id, "Unknown"),
+            "revenue": Money.from_paisa(revenue).to_decimal(),
+            "profit": Money.from_paisa(profit).to_decimal(),
+            "quantity": int(quantity or 0),
+            "sales_count": int(sales_count or 0)
+        }
+
+    def customer(key, spend, credit, sales_count):
+        return {
+            "customer_name": customer_names.get(key, key),
+            "spend": Money.from_paisa(spend).to_decimal(),
+            "credit": Money.from_paisa(credit).to_decimal(),
+            "sales_count": int(sales_count or 0)
+        }
+
+    return (
+        {metric: [product(*row) for row in rows] for metric, rows in products.items()},
+        {metric: [customer(*row) for row in rows] for metric, rows in customers.items()}
+    )
+
+def _from_counters(db: Session, start_date: date, end_date: date, limit: int) -> tuple:
+    C = LeaderboardCounter
+    in_range = (C.day >= start_date, C.day <= end_date)
+    revenue, profit, quantity = func.sum(C.revenue), func.sum(C.profit), func.sum(C.quantity)
+    credit, sales_count = func.sum(C.credit), func.sum(C.sales_count)
+
+    products = {
+        metric: db.query(C.entity_key, revenue, profit, quantity, sales_count).filter(
+            C.entity == "product", *in_range
+        ).group_by(C.entity_key).having(column > 0).order_by(column.desc(), C.entity_key).limit(limit).all()
+        for metric, column in zip(PRODUCT_METRICS, (revenue, profit, quantity))
+    }
+    customers = {
+        metric: db.query(C.entity_key, revenue, credit, sales_count).filter(
+            C.entity == "customer", *in_range
+        ).group_by(C.entity_key).having(column > 0).order_by(column.desc(), C.entity_key).limit(limit).all()
+        for metric, column in zip(CUSTOMER_METRICS, (revenue, credit))
+    }
+    return _entries(db, products, customers)
+
+def _from_sales(db: Session, start_date: date, end_date: date, limit: int, source: Optional[Session] = None) -> tuple:
+    """Grouped ORDER BY ... LIMIT over the sales of `source` (default `db`); names come from `db`"""
+    source = source or db
+    in_range = (
+        Sale.is_deleted == False,
+        Sale.created_at >= day_start(start_date),
+        Sale.created_at < day_start(end_date + timedelta(days=1))
+    )
+    revenue = func.sum(paisa(Sale.total_amount))
+    profit = func.sum(paisa(Sale.total_amount) - paisa(Sale.purchase_price) * Sale.quantity)
+    quantity = func.sum(Sale.quantity)
+    credit = func.sum(case((Sale.payment_type == 'Credit', paisa(Sale.total_amount)), else_=0))
+    sales_count = func.count(Sale.id)
+    customer = func.lower(func.trim(Sale.customer_name))
+
+    products = {
+        metric: source.query(Sale.product_id, revenue, profit, quantity, sales_count).filter(
+            Sale.product_id != None, *in_range
+        ).group_by(Sale.product_id).having(column > 0).order_by(column.desc(), Sale.product_id).limit(limit).all()
+        for metric, column in zip(PRODUCT_METRICS, (revenue, profit, quantity))
+    }
+    customers = {
+        metric: source.query(customer, revenue, credit, sales_count).filter(*in_range).group_by(
+            customer
+        ).having(column > 0).order_by(column.desc(), customer).limit(limit).all()
+        for metric, column in zip(CUSTOMER_METRICS, (revenue, credit))
+    }
+    return _entries(db, products, customers)
+
+def get_leaderboards(
+    db: Session,
+    period: str = "month",
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+    limit: int = 10
+):
+    """
+    Top products by revenue, profit and quantity and top customers by spend
+    and credit. today / week / month read the incremental counters; a
+    custom start_date..end_date runs grouped ORDER BY ... LIMIT queries over
+    the created_at range of the sales table (of the analytical mirror with
+    REPORT_BACKEND=duckdb, when the range holds only closed days).
+    """
+    if period in COUNTER_PERIODS:
+        start_date, end_date = period_bounds(period)
+        products, customers = _from_counters(db, start_date, end_date, limit)
+        source = "counters"
+    else:
+        mirror = analytics.get_mirror() if end_date < crud_report.first_open_day() else None
+        if mirror is not None:
+            with mirror.session(db) as mirror_db:
+                products, customers = _from_sales(db, start_date, end_date, limit, source=mirror_db)
+        else:
+            products, customers = _from_sales(db, start_date, end_date, limit)
+        source = "sales"
+    return {
+        "period": period,
+        "start_date": start_date,
+        "end_date": end_date,
+        "source": source,
+        "products": products,
+        "customers": customers
+    }
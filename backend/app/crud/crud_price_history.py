@@ -0,0 +1,108 @@
+from sqlalchemy.orm import Session
+from sqlalchemy import func, select, literal, union_all, DateTime
+from sqlalchemy.dialects.postgresql import UUID as PG_UUID
+from app.models.models import Product, ProductPriceHistory
+from uuid import UUID
+from datetime import datetime
+from decimal import Decimal
+from typing import Dict, Iterable, Optional, Tuple
+
+def record_price(
+    db: Session,
+    product_id: UUID,
+    purchase_price: Decimal,
+    effective_at: Optional[datetime] = None,
+    transaction_id: Optional[UUID] = None
+):
+    """Append a price history row. Does not commit; runs inside the caller's transaction."""
+    db_price = ProductPriceHistory(
+        product_id=product_id,
+        purchase_price=purchase_price,
+        effective_at=effective_at or func.now(),
+        transaction_id=transaction_id
+    )
+    db.add(db_price)
+    return db_price
+
+def remove_transaction_price(db: Session, product_id: UUID, transaction_id: UUID):
+    """
+    Drop the history row set by an IN receipt that is being soft deleted and
+    put the product's purchase price back to the latest remaining history
+    row, so new sales are not costed at the deleted receipt's price. Does
+    not commit.
+    """
+    db.query(ProductPriceHistory).filter(
+        ProductPriceHistory.transaction_id == transaction_id
+    ).delete(synchronize_session=False)
+    latest = select(ProductPriceHistory.purchase_price).where(
+        ProductPriceHistory.product_id == product_id
+    ).order_by(
+        ProductPriceHistory.effective_at.desc(), ProductPriceHistory.id.desc()
+    ).limit(1).scalar_subquery()
+    db.query(Product).filter(Product.id == product_id).update(
+        {Product.purchase_price: func.coalesce(latest, Product.purchase_price)},
+        synchronize_session=False
+    )
+
+def resolve_purchase_prices(
+    db: Session,
+    lookups: Iterable[Tuple[UUID, Optional[datetime]]]
+) -> Dict[Tuple[UUID, Optional[datetime]], Decimal]:
+    """
+    Purchase price of each (product_id, moment) pair as of that moment, in one query.
+
+    Each pair is answered by a correlated `ORDER BY effective_at DESC LIMIT 1`
+    probe on (product_id, effective_at). A moment before the product's first
+    recorded price gets the earliest recorded price; a moment of None (or a
+    product without history) gets the current Product.purchase_price.
+    """
+    pairs = list(dict.fromkeys(lookups))
+    if not pairs:
+        return {}
+
+    rows = [
+        select(
+            literal(index).label("idx"),
+            literal(product_id, PG_UUID(as_uuid=True)).label("product_id"),
+            literal(moment, DateTime(timezone=True)).label("at")
+        )
+        for index, (product_id, moment) in enumerate(pairs)
+    ]
+    requested = (union_all(*rows) if len(rows) > 1 else rows[0]).subquery("requested")
+
+    as_of_price = select(ProductPriceHistory.purchase_price).where(
+        ProductPriceHistory.product_id == requested.c.product_id,
+        ProductPriceHistory.effective_at <= requested.c.at
+    ).order_by(
+        ProductPriceHistory.effective_at.desc()
+    ).limit(1).correlate(requested).scalar_subquery()
+
+    earliest_price = select(ProductPriceHistory.purchase_price).where(
+        ProductPriceHistory.product_id == requested.c.product_id,
+        requested.c.at != None
+    ).order_by(
+        ProductPriceHistory.effective_at.asc()
+    ).limit(1).correlate(requested).scalar_subquery()
+
+    results = db.execute(
+        select(
+            requested.c.idx,
+            func.coalesce(as_of_price, earliest_price, Product.purchase_price).label("purchase_price")
+        ).select_from(requested).outerjoin(
+            Product, Product.id == requested.c.product_id
+        )
+    ).all()
+
+    return {pairs[row.idx]: row.purchase_price for row in results}
+
+def resolve_purchase_price(db: Session, product_id: UUID, moment: Optional[datetime]) -> Optional[Decimal]:
+    """Single-pair convenience wrapper around resolve_purchase_prices"""
+    return resolve_purchase_prices(db, [(product_id, moment)]).get((product_id, moment))
+
+def get_price_history(db: Session, product_id: UUID, skip: int = 0, limit: int = 100):
+    """Price history of a product, newest first"""
+    return db.query(ProductPriceHistory).filter(
+        ProductPriceHistory.product_id == product_id
+    ).order_by(
+        ProductPriceHistory.effective_at.desc()
+    ).offset(skip).limit(limit).all()
@@ -1,18 +1,27 @@
 from sqlalchemy import func, case, and_
 from sqlalchemy.orm import Session
-from app.models.models import Product, StockTransaction
+from app.models.models import Company, Product, ProductStock, Sale, StockTransaction
 from app.schemas.product import ProductCreate, ProductUpdate
+from app.crud import crud_price_history
 from uuid import UUID
-from typing import Optional
+from app.crud import crud_sync, crud_report, crud_forecast, crud_customer, crud_leaderboard, crud_reorder
+from typing import List, Optional
 
 def update_product(db: Session, product_id: UUID, product: ProductUpdate):
     db_product = db.query(Product).filter(Product.id == product_id).first()
     if db_product:
         update_data = product.model_dump(exclude_unset=True)
+        price_changed = (
+            update_data.get("purchase_price") is not None
+            and update_data["purchase_price"] != db_product.purchase_price
+        )
         for key, value in update_data.items():
             setattr(db_product, key, value)
+        if price_changed:
+            crud_price_history.record_price(db, product_id, db_product.purchase_price)
         db.commit()
         db.refresh(db_product)
+        crud_forecast.invalidate_forecast()
     return db_product
 
 def get_products(
@@ -20,7 +29,8 @@ def get_products(
     skip: int = 0, 
     limit: int = 100, 
     search: Optional[str] = None, 
-    category: Optional[str] = None
+    category: Optional[str] = None,
+    ids: Optional[List[UUID]] = None
 ):
     # Calculate stock balance: (Sum of IN) - (Sum of OUT)
     # Only count non-deleted transactions for accurate stock levels
@@ -48,6 +58,8 @@ def get_products(
         query = query.filter(Product.name.ilike(f"%{search}%"))
     if category:
         query = query.filter(Product.category == category)
+    if ids is not None:
+        query = query.filter(Product.id.in_(ids))
 
     results = query.group_by(Product.id).offset(skip).limit(limit).all()
     
@@ -62,6 +74,83 @@ def get_products(
 def get_product(db: Session, product_id: UUID):
     return db.query(Product).filter(Product.id == product_id).first()
 
+def get_product_detail(db: Session, product_id: UUID, skip: int = 0, limit: int = 50):
+    """
+    Everything the product page shows, without the client downloading the
+    ledger: on-hand stock, IN/OUT totals, sales totals, last purchase price
+    and one page of movements (newest first). Every query is a primary key
+    lookup or a range scan of one product on the (product_id, created_at)
+    indexes of stock_transactions and sales.
+    """
+    row = db.query(Product, Company.name, ProductStock.quantity).outerjoin(
+        Company, Company.id == Product.company_id
+    ).outerjoin(
+        ProductStock, ProductStock.product_id == Product.id
+    ).filter(Product.id == product_id).first()
+    if not row:
+        return None
+    product, company_name, on_hand = row
+
+    live_ledger = and_(StockTransaction.product_id == product_id, StockTransaction.is_deleted == False)
+    ledger = db.query(
+        func.coalesce(func.sum(case((StockTransaction.type == 'IN', StockTransaction.quantity), else_=0)), 0).label("total_in"),
+        func.coalesce(func.sum(case((StockTransaction.type == 'OUT', StockTransaction.quantity), else_=0)), 0).label("total_out"),
+        func.count(StockTransaction.id).label("movements")
+    ).filter(live_ledger).first()
+
+    sales = db.query(
+        func.count(Sale.id).label("count"),
+        func.coalesce(func.sum(Sale.total_amount), 0).label("revenue"),
+        func.coalesce(func.sum(Sale.purchase_price * Sale.quantity), 0).label("cost")
+    ).filter(Sale.product_id == product_id, Sale.is_deleted == False).first()
+
+    last_purchase = db.query(
+        StockTransaction.purchase_price, StockTransaction.created_at
+    ).filter(
+        live_ledger,
+        StockTransaction.type == 'IN',
+        StockTransaction.purchase_price != None
+    ).order_by(StockTransaction.created_at.desc()).first()
+
+    movements = db.query(
+        StockTransaction.id,
+        StockTransaction.created_at,
+        StockTransaction.type,
+        StockTransaction.quantity,
+        StockTransaction.party_name,
+        StockTransaction.purchase_price,
+        StockTransaction.sale_id,
+        Sale.customer_name,
+        Sale.customer_phone,
+        Sale.payment_type,
+        Sale.total_amount
+    ).outerjoin(
+        Sale, Sale.id == StockTransaction.sale_id
+    ).filter(live_ledger).order_by(
+        StockTransaction.created_at.desc(), StockTransaction.id.desc()
+    ).offset(skip).limit(limit).all()
+
+    # The maintained product_stock balance, as in the list and stock endpoints;
+    # the ledger totals only stand in for products that predate the table
+    current_stock = on_hand if on_hand is not None else int(ledger.total_in) - int(ledger.total_out)
+    product.current_stock = current_stock
+    return {
+        "product": product,
+        "company_name": company_name,
+        "current_stock": current_stock,
+        "total_in": int(ledger.total_in),
+        "total_out": int(ledger.total_out),
+        "sales_count": sales.count,
+        "revenue": sales.revenue,
+        "profit": sales.revenue - sales.cost,
+        "last_purchase_price": last_purchase.purchase_price if last_purchase else product.purchase_price,
+        "last_purchase_at": last_purchase.created_at if last_purchase else None,
+        "movements_total": ledger.movements,
+        "skip": skip,
+        "limit": limit,
+        "movements": movements
+    }
+
 def create_product(db: Session, product: ProductCreate):
     db_product = Product(
         name=product.name,
@@ -71,14 +160,36 @@ def create_product(db: Session, product: ProductCreate):
         min_stock=product.min_stock,
         company_id=product.company_id
     )
+    db_product.stock = ProductStock(quantity=0)
     db.add(db_product)
+    db.flush()
+    crud_price_history.record_price(db, db_product.id, db_product.purchase_price or 0)
     db.commit()
     db.refresh(db_product)
+    crud_forecast.invalidate_forecast()
     return db_product
 
+def _reverse_customer_balances(db: Session, sales: List[Sale]):
+    """Take the sales out of their customers' balances, one update per customer and payment type"""
+    totals = {}
+    for sale in sales:
+        key = (crud_customer.customer_key(sale.customer_name), sale.payment_type)
+        name, amount, count = totals.get(key, (sale.customer_name, 0, 0))
+        totals[key] = (name, amount + sale.total_amount, count + 1)
+    for (_, payment_type), (name, amount, count) in sorted(totals.items()):
+        crud_customer.record_sale(db, name, None, amount, payment_type, sign=-1, sales=count)
+
 def delete_product(db: Session, product_id: UUID):
     db_product = db.query(Product).filter(Product.id == product_id).first()
     if db_product:
+        # Its sales go with it (cascade): cached report days holding them are stale
+        crud_report.invalidate_report_days_of_product(db, product_id)
+        live_sales = db.query(Sale).filter(Sale.product_id == product_id, Sale.is_deleted == False).all()
+        _reverse_customer_balances(db, live_sales)
+        crud_leaderboard.record_sales(db, live_sales, sign=-1)
+        crud_reorder.remove_product_lines(db, product_id)
         db.delete(db_product)
+        crud_sync.record_tombstone(db, "products", product_id)
         db.commit()
+        crud_forecast.invalidate_forecast()
     return db_product
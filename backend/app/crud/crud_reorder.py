@@ -0,0 +1,372 @@
+"""
+Reorder planner: suggested order quantities per product, grouped by
+supplier (the product's company), and purchase drafts built from them.
+
+Suggestions come from one vectorized pass over the demand arrays of
+crud_forecast.demand_forecast, so a catalogue of thousands of SKUs costs
+two queries plus array math. Per product, with d the smoothed daily demand:
+
+    safety stock   = max(min_stock, ceil(d * safety_days))
+    reorder point  = ceil(d * lead_time_days) + safety stock
+    target stock   = reorder point + ceil(d * review_days)
+    position       = stock balance + quantity on open drafts
+    suggested qty  = target stock - position, when position <= reorder point
+
+Quantity already on open drafts counts as ordered, so drafting the same
+shortfall twice (or again before the receipt) suggests nothing new.
+
+Receiving a draft writes one IN stock transaction per line with bulk
+INSERTs, in a single database transaction.
+"""
+from sqlalchemy.orm import Session
+from sqlalchemy import bindparam, func, insert, update
+from fastapi import HTTPException
+from app.models.models import Company, Product, ProductPriceHistory, ReorderDraft, ReorderDraftLine, StockTransaction
+from app.core.ids import uuid7
+from app.crud.crud_stock import adjust_stock
+from app.crud.crud_forecast import demand_forecast, DEFAULT_WINDOW_DAYS, DEFAULT_ALPHA
+from app.crud import crud_events
+from uuid import UUID
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Iterable, List, Optional
+import numpy as np
+
+DEFAULT_LEAD_TIME_DAYS = 7
+DEFAULT_SAFETY_DAYS = 7
+DEFAULT_REVIEW_DAYS = 14
+
+def _on_order(db: Session, products: list) -> np.ndarray:
+    """Quantity on open drafts per product, aligned with the forecast's products"""
+    ordered = dict(
+        db.query(ReorderDraftLine.product_id, func.sum(ReorderDraftLine.quantity)).join(
+            ReorderDraft, ReorderDraft.id == ReorderDraftLine.draft_id
+        ).filter(ReorderDraft.status == 'draft').group_by(ReorderDraftLine.product_id).all()
+    )
+    return np.array([ordered.get(row[0], 0) for row in products], dtype=float)
+
+def _suggest(forecast: dict, on_order: np.ndarray, lead_time_days: int, safety_days: int, review_days: int) -> dict:
+    """Reorder point, target stock and suggested quantity arrays for all products at once"""
+    demand = forecast["smoothed"]
+    safety = np.maximum(forecast["min_stock"], np.ceil(demand * safety_days))
+    reorder_point = np.ceil(demand * lead_time_days) + safety
+    target = reorder_point + np.ceil(demand * review_days)
+    position = forecast["stock"] + on_order
+    quantity = np.where(position <= reorder_point, target - position, 0)
+    return {"reorder_point": reorder_point, "target": target, "quantity": np.maximum(quantity, 0)}
+
+def get_reorder_suggestions(
+    db: Session,
+    lead_time_days: int = DEFAULT_LEAD_TIME_DAYS,
+    safety_days: int = DEFAULT_SAFETY_DAYS,
+    review_days: int = DEFAULT_REVIEW_DAYS,
+    company_id: Optional[UUID] = None,
+    window_days: int = DEFAULT_WINDOW_DAYS,
+    alpha: float = DEFAULT_ALPHA
+):
+    """
+    Products at or below their reorder point, counting quantity on open
+    drafts, with the quantity that brings them back to target stock,
+    grouped by supplier. Suppliers are sorted by name (products without a
+    company last), lines by days of cover.
+    """
+    today = date.today()
+    forecast = demand_forecast(db, window_days, alpha, today)
+    products = forecast["products"]
+    on_order = _on_order(db, products)
+    plan = _suggest(forecast, on_order, lead_time_days, safety_days, review_days)
+    demand = forecast["smoothed"]
+
+    selected = plan["quantity"] > 0
+    if company_id is not None:
+        selected &= np.array([row[3] == company_id for row in products], dtype=bool)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        cover = np.where(demand > 0, np.maximum(forecast["stock"], 0) / demand, np.inf)
+
+    suppliers = {}
+    for i in np.flatnonzero(selected)[np.argsort(cover[selected], kind="stable")]:
+        product_id, name, unit, product_company_id, company_name, min_stock, balance, purchase_price = products[i]
+        quantity = int(plan["quantity"][i])
+        unit_cost = Decimal(purchase_price)
+        supplier = suppliers.setdefault(product_company_id, {
+            "company_id": product_company_id,
+            "company_name": company_name,
+            "line_count": 0,
+            "total_quantity": 0,
+            "total_cost": Decimal("0.00"),
+            "lines": []
+        })
+        supplier["lines"].append({
+            "product_id": product_id,
+            "product_name": name,
+            "unit": unit,
+            "stock_balance": int(balance),
+            "on_order": int(on_order[i]),
+            "min_stock": int(min_stock),
+            "daily_demand": round(float(demand[i]), 2),
+            "days_of_cover": round(float(cover[i]), 2) if np.isfinite(cover[i]) else None,
+            "reorder_point": int(plan["reorder_point"][i]),
+            "target_stock": int(plan["target"][i]),
+            "suggested_quantity": quantity,
+            "unit_cost": unit_cost,
+            "line_cost": unit_cost * quantity
+        })
+        supplier["line_count"] += 1
+        supplier["total_quantity"] += quantity
+        supplier["total_cost"] += unit_cost * quantity
+
+    ordered = sorted(suppliers.values(), key=lambda s: (s["company_name"] is None, (s["company_name"] or "").lower()))
+    return {
+        "as_of": today,
+        "lead_time_days": lead_time_days,
+        "safety_days": safety_days,
+        "review_days": review_days,
+        "window_days": window_days,
+        "alpha": alpha,
+        "products_checked": len(products),
+        "line_count": sum(s["line_count"] for s in ordered),
+        "total_cost": sum((s["total_cost"] for s in ordered), Decimal("0.00")),
+        "suppliers": ordered
+    }
+
+def create_drafts(
+    db: Session,
+    lead_time_days: int = DEFAULT_LEAD_TIME_DAYS,
+    safety_days: int = DEFAULT_SAFETY_DAYS,
+    review_days: int = DEFAULT_REVIEW_DAYS,
+    company_id: Optional[UUID] = None,
+    product_ids: Optional[Iterable[UUID]] = None,
+    window_days: int = DEFAULT_WINDOW_DAYS,
+    alpha: float = DEFAULT_ALPHA
+) -> List[dict]:
+    """
+    One draft per supplier from the current suggestions (optionally only
+    one supplier's, or only `product_ids`). Lines are bulk inserted and
+    everything commits together. Returns the new drafts with their lines.
+    """
+    suggestions = get_reorder_suggestions(
+        db, lead_time_days, safety_days, review_days, company_id, window_days, alpha
+    )
+    wanted = set(product_ids) if product_ids else None
+
+    draft_ids, line_rows = [], []
+    for supplier in suggestions["suppliers"]:
+        lines = [line for line in supplier["lines"] if wanted is None or line["product_id"] in wanted]
+        if not lines:
+            continue
+        db_draft = ReorderDraft(
+            id=uuid7(),
+            company_id=supplier["company_id"],
+            status='draft',
+            lead_time_days=lead_time_days,
+            safety_days=safety_days,
+            review_days=review_days,
+            line_count=len(lines),
+            total_quantity=sum(line["suggested_quantity"] for line in lines),
+            total_cost=sum((line["line_cost"] for line in lines), Decimal("0.00"))
+        )
+        db.add(db_draft)
+        draft_ids.append(db_draft.id)
+        line_rows.extend({
+            "id": uuid7(),
+            "draft_id": db_draft.id,
+            "product_id": line["product_id"],
+            "suggested_quantity": line["suggested_quantity"],
+            "quantity": line["suggested_quantity"],
+            "unit_cost": line["unit_cost"]
+        } for line in lines)
+
+    if not draft_ids:
+        return []
+    db.flush()
+    db.execute(insert(ReorderDraftLine), line_rows)
+    db.commit()
+    return [get_draft_detail(db, draft_id) for draft_id in draft_ids]
+
+def _summaries(db: Session):
+    return db.query(ReorderDraft, Company.name).outerjoin(Company, Company.id == ReorderDraft.company_id)
+
+def _summary(db_draft: ReorderDraft, company_name: Optional[str]) -> dict:
+    return {
+        "id": db_draft.id,
+        "company_id": db_draft.company_id,
+        "company_name": company_name,
+        "status": db_draft.status,
+        "lead_time_days": db_draft.lead_time_days,
+        "safety_days": db_draft.safety_days,
+        "review_days": db_draft.review_days,
+        "line_count": db_draft.line_count,
+        "total_quantity": db_draft.total_quantity,
+        "total_cost": db_draft.total_cost,
+        "created_at": db_draft.created_at,
+        "received_at": db_draft.received_at
+    }
+
+def get_drafts(db: Session, status: Optional[str] = None, skip: int = 0, limit: int = 100):
+    """Draft headers with stored totals, newest first - no line rows are read"""
+    query = _summaries(db)
+    if status:
+        query = query.filter(ReorderDraft.status == status)
+    rows = query.order_by(ReorderDraft.created_at.desc(), ReorderDraft.id.desc()).offset(skip).limit(limit).all()
+    return [_summary(db_draft, company_name) for db_draft, company_name in rows]
+
+def get_draft(db: Session, draft_id: UUID):
+    return db.query(ReorderDraft).filter(ReorderDraft.id == draft_id).first()
+
+def get_draft_lines(db: Session, draft_id: UUID):
+    """Lines of a draft with product names, in entry order"""
+    rows = db.query(ReorderDraftLine, Product.name).join(
+        Product, Product.id == ReorderDraftLine.product_id
+    ).filter(ReorderDraftLine.draft_id == draft_id).order_by(ReorderDraftLine.id).all()
+    return [
+        {
+            "id": line.id,
+            "product_id": line.product_id,
+            "product_name": name,
+            "suggested_quantity": line.suggested_quantity,
+            "quantity": line.quantity,
+            "unit_cost": line.unit_cost,
+            "transaction_id": line.transaction_id
+        }
+        for line, name in rows
+    ]
+
+def get_draft_detail(db: Session, draft_id: UUID):
+    """Draft header with its lines, or None"""
+    row = _summaries(db).filter(ReorderDraft.id == draft_id).first()
+    if not row:
+        return None
+    return {**_summary(*row), "lines": get_draft_lines(db, draft_id)}
+
+def remove_product_lines(db: Session, product_id: UUID):
+    """
+    Drop a product's lines from every draft before the product is hard
+    deleted (the foreign key cascades them away anyway) and recompute the
+    stored totals of the drafts that held them. Does not commit.
+    """
+    draft_ids = [
+        row.draft_id for row in
+        db.query(ReorderDraftLine.draft_id).filter(ReorderDraftLine.product_id == product_id).distinct()
+    ]
+    if not draft_ids:
+        return
+    db.query(ReorderDraftLine).filter(ReorderDraftLine.product_id == product_id).delete(synchronize_session=False)
+    totals = {
+        row.draft_id: row for row in db.query(
+            ReorderDraftLine.draft_id,
+            func.count(ReorderDraftLine.id).label("line_count"),
+            func.sum(ReorderDraftLine.quantity).label("total_quantity"),
+            func.sum(ReorderDraftLine.unit_cost * ReorderDraftLine.quantity).label("total_cost")
+        ).filter(ReorderDraftLine.draft_id.in_(draft_ids)).group_by(ReorderDraftLine.draft_id)
+    }
+    for db_draft in db.query(ReorderDraft).filter(ReorderDraft.id.in_(draft_ids)):
+        row = totals.get(db_draft.id)
+        db_draft.line_count = row.line_count if row else 0
+        db_draft.total_quantity = row.total_quantity if row else 0
+        db_draft.total_cost = row.total_cost if row else Decimal("0.00")
+
+def _open_draft(db: Session, draft_id: UUID) -> ReorderDraft:
+    """A draft that can still change, locked for the rest of the transaction"""
+    db_draft = db.query(ReorderDraft).filter(ReorderDraft.id == draft_id).with_for_update().first()
+    if not db_draft:
+        raise HTTPException(status_code=404, detail="Reorder draft not found")
+    if db_draft.status != 'draft':
+        raise HTTPException(status_code=409, detail=f"Reorder draft is already {db_draft.status}")
+    return db_draft
+
+def update_draft_lines(db: Session, draft_id: UUID, changes) -> dict:
+    """
+    Set the ordered quantity (and optionally unit cost) of draft lines;
+    quantity 0 removes a line. Header totals are recomputed.
+    """
+    db_draft = _open_draft(db, draft_id)
+    lines = {line.product_id: line for line in db_draft.lines}
+    unknown = [str(change.product_id) for change in changes if change.product_id not in lines]
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Product not on this draft: {', '.join(unknown)}")
+
+    for change in changes:
+        line = lines[change.product_id]
+        if change.quantity == 0:
+            db_draft.lines.remove(line)
+            continue
+        line.quantity = change.quantity
+        if change.unit_cost is not None:
+            line.unit_cost = change.unit_cost
+
+    db_draft.line_count = len(db_draft.lines)
+    db_draft.total_quantity = sum(line.quantity for line in db_draft.lines)
+    db_draft.total_cost = sum((Decimal(line.unit_cost) * line.quantity for line in db_draft.lines), Decimal("0.00"))
+    db.commit()
+    return get_draft_detail(db, draft_id)
+
+def receive_draft(db: Session, draft_id: UUID) -> dict:
+    """
+    Book a draft as received: one IN stock transaction per line at the
+    line's unit cost, written with one bulk INSERT, plus the purchase price
+    updates and price history rows an IN receipt makes. Stock is adjusted
+    per product in id order and everything commits in one transaction.
+    The draft row is locked first, so it is received at most once (409
+    otherwise).
+    """
+    db_draft = _open_draft(db, draft_id)
+    lines = db.query(ReorderDraftLine).filter(ReorderDraftLine.draft_id == draft_id).order_by(ReorderDraftLine.id).all()
+    if not lines:
+        raise HTTPException(status_code=400, detail="Reorder draft has no lines")
+    db_draft.status = 'received'
+    db_draft.received_at = func.now()
+    company_name = db.query(Company.name).join(
+        ReorderDraft, ReorderDraft.company_id == Company.id
+    ).filter(ReorderDraft.id == draft_id).scalar()
+    party_name = f"Reorder from {company_name}" if company_name else "Reorder receipt"
+
+    for line in sorted(lines, key=lambda line: line.product_id):
+        adjust_stock(db, line.product_id, line.quantity)
+
+    transaction_rows, price_rows, line_links = [], [], []
+    for line in lines:
+        transaction_id = uuid7()
+        transaction_rows.append({
+            "id": transaction_id,
+            "product_id": line.product_id,
+            "quantity": line.quantity,
+            "party_name": party_name,
+            "purchase_price": line.unit_cost,
+            "type": 'IN',
+            "is_deleted": False
+        })
+        line_links.append({"b_id": line.id, "b_transaction_id": transaction_id})
+        if line.unit_cost:
+            price_rows.append({
+                "id": uuid7(),
+                "product_id": line.product_id,
+                "purchase_price": line.unit_cost,
+                "transaction_id": transaction_id
+            })
+
+    db.execute(insert(StockTransaction), transaction_rows)
+    lines_table = ReorderDraftLine.__table__
+    db.execute(
+        update(lines_table).where(lines_table.c.id == bindparam("b_id")).values(transaction_id=bindparam("b_transaction_id")),
+        line_links
+    )
+    if price_rows:
+        # Same as a single IN receipt: the product's purchase price becomes the received cost
+        db.execute(insert(ProductPriceHistory).values(effective_at=func.now()), price_rows)
+        products_table = Product.__table__
+        db.execute(
+            update(products_table).where(products_table.c.id == bindparam("b_id")).values(purchase_price=bindparam("b_price")),
+            [{"b_id": row["product_id"], "b_price": row["purchase_price"]} for row in price_rows]
+        )
+    db.commit()
+
+    for line in lines:
+        crud_events.publish_stock_change(db, line.product_id, line.quantity)
+    return get_draft_detail(db, draft_id)
+
+def cancel_draft(db: Session, draft_id: UUID):
+    """Cancel an open draft; received drafts stay as the record of their receipt"""
+    db_draft = _open_draft(db, draft_id)
+    db_draft.status = 'cancelled'
+    db.commit()
+    return db_draft
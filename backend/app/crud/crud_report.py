@@ -1,11 +1,26 @@
 from sqlalchemy.orm import Session
-from sqlalchemy import func, case, and_
-from app.models.models import Product, StockTransaction, Sale, Expense
+from sqlalchemy import func, case, and_, select, true
+from sqlalchemy.exc import IntegrityError
+from app.models.models import Product, StockTransaction, Sale, Expense, Customer, CustomerPayment, CogsEntry, DailyReportCache
+from app.core.config import settings
+from app.core.money import Money, paisa
+from app.crud import crud_valuation
+from app.crud.crud_stock import day_start
+from app.db import analytics
+from app.db.session import write_session
 from datetime import datetime, date, timedelta
-from decimal import Decimal
+from typing import Optional
+from uuid import UUID
+
+AGING_BUCKETS = ("days_0_30", "days_31_60", "days_61_90", "days_over_90")
+MAX_COMPARE_PERIODS = 12
 
 def get_dashboard_stats(db: Session):
-    # 1. Calculate Inventory Value and Stock Levels
+    # Inventory value at FIFO cost from the valuation engine's cost layers
+    # (synced before this session's first read)
+    total_value = crud_valuation.get_inventory_value(db, method="fifo")
+
+    # 1. Calculate Stock Levels
     # Only count non-deleted transactions for accurate stock levels
     in_stock = func.coalesce(func.sum(case((
         and_(StockTransaction.type == 'IN', StockTransaction.is_deleted == False), 
@@ -21,26 +36,22 @@ def get_dashboard_stats(db: Session):
 
     product_stats_query = db.query(
         Product.id,
-        Product.purchase_price,
         Product.min_stock,
         current_stock.label("stock_balance")
     ).outerjoin(StockTransaction).group_by(Product.id).all()
 
-    total_value = Decimal('0.00')
     low_stock_count = 0
     total_products = len(product_stats_query)
 
     for p in product_stats_query:
-        if p.stock_balance > 0:
-            total_value += (p.purchase_price * p.stock_balance)
         if p.stock_balance <= p.min_stock:
             low_stock_count += 1
 
     # 2. Today's Sales Performance - only count non-deleted sales
     today = date.today()
     today_sales = db.query(
-        func.sum(Sale.total_amount).label("revenue"),
-        func.sum(Sale.total_amount - (Sale.purchase_price * Sale.quantity)).label("profit"),
+        func.sum(paisa(Sale.total_amount)).label("revenue"),
+        func.sum(paisa(Sale.total_amount) - paisa(Sale.purchase_price) * Sale.quantity).label("profit"),
         func.count(Sale.id).label("count")
     ).filter(
         func.date(Sale.created_at) == today,
@@ -49,7 +60,7 @@ def get_dashboard_stats(db: Session):
 
     # 3. Today's Expenses - Get total expenses (will be negative) and income (positive)
     today_expenses_query = db.query(
-        func.sum(Expense.amount).label("total")
+        func.sum(paisa(Expense.amount)).label("total")
     ).filter(
         func.date(Expense.expense_date) == today,
         Expense.is_deleted == False
@@ -57,12 +68,12 @@ def get_dashboard_stats(db: Session):
 
     # Total expense includes both expenses (negative) and income (positive)
     # So if you have -5000 expense and +1000 income, total will be -4000
-    total_expense_amount = today_expenses_query.total or Decimal('0.00')
+    total_expense_amount = Money.from_paisa(today_expenses_query.total)
     
     # Calculate Net Profit = Sales Profit + Expense Total
     # (Expense total is already negative for expenses, positive for income)
-    sales_profit = today_sales.profit or Decimal('0.00')
-    sales_revenue = today_sales.revenue or Decimal('0.00')
+    sales_profit = Money.from_paisa(today_sales.profit)
+    sales_revenue = Money.from_paisa(today_sales.revenue)
     net_profit = sales_profit + total_expense_amount
 
     # 4. Weekly sales data for chart (last 7 days)
@@ -70,7 +81,7 @@ def get_dashboard_stats(db: Session):
     for i in range(6, -1, -1):  # Last 7 days
         day = today - timedelta(days=i)
         day_sales = db.query(
-            func.sum(Sale.total_amount).label("revenue")
+            func.sum(paisa(Sale.total_amount)).label("revenue")
         ).filter(
             func.date(Sale.created_at) == day,
             Sale.is_deleted == False
@@ -78,135 +89,215 @@ def get_dashboard_stats(db: Session):
         
         weekly_data.append({
             "date": day.strftime("%a"),  # Mon, Tue, etc.
-            "sales": float(day_sales.revenue or 0)
+            "sales": float(Money.from_paisa(day_sales.revenue))
         })
     
+    # Convert back to Decimal at the API boundary
     return {
         "stats": {
-            "total_inventory_value": total_value,
+            "total_inventory_value": total_value.to_decimal(),
             "total_products": total_products,
             "low_stock_count": low_stock_count,
-            "today_sales_revenue": sales_revenue,
-            "today_sales_profit": sales_profit,
-            "total_expense": total_expense_amount,
-            "net_profit": net_profit,
+            "today_sales_revenue": sales_revenue.to_decimal(),
+            "today_sales_profit": sales_profit.to_decimal(),
+            "total_expense": total_expense_amount.to_decimal(),
+            "net_profit": net_profit.to_decimal(),
             "recent_sales_count": today_sales.count or 0
         },
         "weekly_sales": weekly_data
     }
 
-def get_period_financial_summary(db: Session, start_date: date, end_date: date):
+def _within(column, start_date: date, end_date: date):
+    """`column` falls on a day from start_date to end_date (index-friendly bounds)"""
+    return and_(column >= day_start(start_date), column < day_start(end_date + timedelta(days=1)))
+
+def _sales_metrics(within):
+    revenue = paisa(Sale.total_amount)
+    cost = paisa(Sale.purchase_price) * Sale.quantity
+    credit = and_(within, Sale.payment_type == 'Credit')
+    cash = and_(within, Sale.payment_type == 'Debit')
+    return {
+        "sales_count": func.count(case((within, Sale.id))),
+        "quantity_sold": func.sum(case((within, Sale.quantity), else_=0)),
+        "revenue": func.sum(case((within, revenue), else_=0)),
+        "cost": func.sum(case((within, cost), else_=0)),
+        "gross_profit": func.sum(case((within, revenue - cost), else_=0)),
+        "total_credit": func.sum(case((credit, revenue), else_=0)),
+        "total_cash": func.sum(case((cash, revenue), else_=0)),
+        "credit_count": func.count(case((credit, 1))),
+        "cash_count": func.count(case((cash, 1)))
+    }
+
+def _expense_metrics(within):
+    amount = paisa(Expense.amount)
+    return {
+        "total_expenses": func.sum(case((and_(within, Expense.amount < 0), amount), else_=0)),
+        "total_income": func.sum(case((and_(within, Expense.amount > 0), amount), else_=0)),
+        "net_expense": func.sum(case((within, amount), else_=0)),
+        "expense_count": func.count(case((within, Expense.id)))
+    }
+
+# Per-day totals kept in daily_report_cache
+DAY_TOTALS = tuple(_sales_metrics(true())) + tuple(_expense_metrics(true()))
+
+def _cogs_metrics(within):
+    return {
+        "cogs_fifo": func.sum(case((within, CogsEntry.fifo_cost), else_=0)),
+        "cogs_average": func.sum(case((within, CogsEntry.average_cost), else_=0))
+    }
+
+def _conditional_totals(db: Session, periods: list, column, metrics, *filters) -> list:
     """
-    Get comprehensive financial summary for a date range
-    Returns sales, expenses, profit, and credit/debit information
+    One aggregate row with every metric once per period, each summed only
+    over rows inside that period (SUM(CASE WHEN in_period_i ...)). Periods
+    may overlap; the table is scanned once over their combined range.
     """
-    
-    # 1. Sales Summary - only count non-deleted sales
-    sales_summary = db.query(
-        func.count(Sale.id).label("total_sales_count"),
-        func.sum(Sale.quantity).label("total_quantity_sold"),
-        func.sum(Sale.total_amount).label("total_revenue"),
-        func.sum(Sale.purchase_price * Sale.quantity).label("total_cost"),
-        func.sum(Sale.total_amount - (Sale.purchase_price * Sale.quantity)).label("gross_profit")
-    ).filter(
-        and_(
-            func.date(Sale.created_at) >= start_date,
-            func.date(Sale.created_at) <= end_date,
-            Sale.is_deleted == False
-        )
-    ).first()
-    
-    # 2. Expense Summary - split into expenses (negative) and income (positive)
-    expenses_data = db.query(
-        func.sum(case(
-            (Expense.amount < 0, Expense.amount),
-            else_=0
-        )).label("total_expenses"),
-        func.sum(case(
-            (Expense.amount > 0, Expense.amount),
-            else_=0
-        )).label("total_income"),
-        func.sum(Expense.amount).label("net_expense_total"),
-        func.count(Expense.id).label("expense_count")
-    ).filter(
-        and_(
-            func.date(Expense.expense_date) >= start_date,
-            func.date(Expense.expense_date) <= end_date,
-            Expense.is_deleted == False
-        )
-    ).first()
-    
-    # 3. Credit/Debit Summary from Sales (payment_status)
-    credit_debit_summary = db.query(
-        func.sum(case(
-            (Sale.payment_type == 'Credit', Sale.total_amount),
-            else_=0
-        )).label("total_credit"),
-        func.sum(case(
-            (Sale.payment_type == 'Debit', Sale.total_amount),
-            else_=0
-        )).label("total_cash"),
-        func.count(case(
-            (Sale.payment_type == 'Credit', 1)
-        )).label("credit_count"),
-        func.count(case(
-            (Sale.payment_type == 'Debit', 1)
-        )).label("cash_count")
-    ).filter(
-        and_(
-            func.date(Sale.created_at) >= start_date,
-            func.date(Sale.created_at) <= end_date,
-            Sale.is_deleted == False
-        )
-    ).first()
-    
-    # 4. Calculate comprehensive metrics
-    total_revenue = float(sales_summary.total_revenue or 0)
-    total_cost = float(sales_summary.total_cost or 0)
-    gross_profit = float(sales_summary.gross_profit or 0)
+    columns = [
+        expr.label(f"{name}_{i}")
+        for i, (start_date, end_date) in enumerate(periods)
+        for name, expr in metrics(_within(column, start_date, end_date)).items()
+    ]
+    first = min(start_date for start_date, _ in periods)
+    last = max(end_date for _, end_date in periods)
+    row = db.query(*columns).filter(*filters, _within(column, first, last)).one()
+    names = list(metrics(_within(column, first, last)).keys())
+    return [{name: int(getattr(row, f"{name}_{i}") or 0) for name in names} for i in range(len(periods))]
+
+def _as_date(value) -> date:
+    """func.date() result as a date (SQLite returns 'YYYY-MM-DD' strings)"""
+    return value if isinstance(value, date) else date.fromisoformat(str(value))
+
+def _days(start_date: date, end_date: date) -> list:
+    return [start_date + timedelta(days=i) for i in range((end_date - start_date).days + 1)]
+
+def _grouped_by_day(db: Session, column, metrics, start_date: date, end_date: date, *filters) -> dict:
+    day = func.date(column)
+    rows = db.query(
+        day.label("day"),
+        *[expr.label(name) for name, expr in metrics(true()).items()]
+    ).filter(*filters, _within(column, start_date, end_date)).group_by(day).all()
+    names = list(metrics(true()).keys())
+    return {_as_date(row.day): {name: int(getattr(row, name) or 0) for name in names} for row in rows}
+
+def _compute_days(db: Session, start_date: date, end_date: date) -> dict:
+    """Live sales and expense totals of every day in the range (two grouped queries)"""
+    sales = _grouped_by_day(db, Sale.created_at, _sales_metrics, start_date, end_date, Sale.is_deleted == False)
+    expenses = _grouped_by_day(
+        db, Expense.expense_date, _expense_metrics, start_date, end_date, Expense.is_deleted == False
+    )
+    empty = {name: 0 for name in DAY_TOTALS}
+    return {day: {**empty, **sales.get(day, {}), **expenses.get(day, {})} for day in _days(start_date, end_date)}
+
+def first_open_day() -> date:
+    """Days before this one are closed and their report totals cached"""
+    return date.today() - timedelta(days=settings.REPORT_CACHE_CLOSED_AFTER_DAYS)
+
+def invalidate_report_day(db: Session, moment):
+    """
+    Drop the cached report totals of the day `moment` falls on, after a
+    backdated write or an edit or soft delete of a row on that day. Other
+    days stay cached. Does not commit.
+    """
+    if moment is None:
+        return
+    day = moment.date() if isinstance(moment, datetime) else moment
+    if day >= first_open_day():
+        return
+    db.query(DailyReportCache).filter(DailyReportCache.day == day).delete(synchronize_session=False)
+
+def invalidate_report_days_of_product(db: Session, product_id: UUID):
+    """Drop the cached days holding sales of a product that is being hard deleted. Does not commit."""
+    sale_days = select(func.date(Sale.created_at)).where(Sale.product_id == product_id, Sale.is_deleted == False)
+    db.query(DailyReportCache).filter(DailyReportCache.day.in_(sale_days)).delete(synchronize_session=False)
+
+def get_daily_totals(db: Session, start_date: date, end_date: date) -> list:
+    """
+    (day, totals) for every day in the range. Closed days come from
+    daily_report_cache, computing and storing the missing ones in one
+    grouped pass - or, with REPORT_BACKEND=duckdb, from one grouped pass
+    over the analytical mirror. Open days are always queried live.
+    """
+    days = {}
+    open_from = first_open_day()
+    closed_until = min(end_date, open_from - timedelta(days=1))
+    mirror = analytics.get_mirror()
+    if start_date <= closed_until and mirror is not None:
+        with mirror.session(db) as source:
+            days.update(_compute_days(source, start_date, closed_until))
+    elif start_date <= closed_until:
+        cached = db.query(DailyReportCache).filter(
+            DailyReportCache.day >= start_date,
+            DailyReportCache.day <= closed_until
+        ).all()
+        days.update({row.day: {name: getattr(row, name) for name in DAY_TOTALS} for row in cached})
+        missing = [day for day in _days(start_date, closed_until) if day not in days]
+        if missing:
+            # Computed and stored in a write transaction of its own: a read
+            # request does not commit its session
+            with write_session(db) as session:
+                computed = _compute_days(session, missing[0], missing[-1])
+                fresh = {day: computed[day] for day in missing}
+                try:
+                    # Savepoint: a concurrent report may cache the same days first
+                    with session.begin_nested():
+                        session.add_all([DailyReportCache(day=day, **totals) for day, totals in fresh.items()])
+                except IntegrityError:
+                    pass
+                session.commit()
+            days.update(fresh)
+    if max(start_date, open_from) <= end_date:
+        days.update(_compute_days(db, max(start_date, open_from), end_date))
+    return [(day, days[day]) for day in _days(start_date, end_date)]
+
+def get_period_totals(db: Session, periods: list, daily: Optional[list] = None) -> list:
+    """
+    Additive totals (integer paisa and counts) of sales, expenses and cost of
+    goods sold for each (start_date, end_date) in `periods`. Sales and
+    expenses are summed from get_daily_totals() over the combined range
+    (or `daily` if the caller already has it); cost of goods sold comes
+    from one conditional aggregate over cogs_entries. Callers passing
+    `daily` run crud_valuation.sync_valuation() before reading it.
+    """
+    first = min(start_date for start_date, _ in periods)
+    last = max(end_date for _, end_date in periods)
+    if daily is None:
+        crud_valuation.sync_valuation(db)
+        daily = get_daily_totals(db, first, last)
+    cogs = _conditional_totals(db, periods, CogsEntry.occurred_at, _cogs_metrics)
+
+    results = []
+    for (start_date, end_date), period_cogs in zip(periods, cogs):
+        totals = {name: 0 for name in DAY_TOTALS}
+        for day, day_totals in daily:
+            if start_date <= day <= end_date:
+                for name in DAY_TOTALS:
+                    totals[name] += day_totals[name]
+        results.append({**totals, **period_cogs})
+    return results
+
+def _financial_summary(start_date: date, end_date: date, totals: dict) -> dict:
+    """Period summary response sections from get_period_totals() values"""
+    # Exact integer paisa until the response
+    total_revenue = Money.from_paisa(totals["revenue"])
+    total_cost = Money.from_paisa(totals["cost"])
+    gross_profit = Money.from_paisa(totals["gross_profit"])
     
     # Expenses are negative, income is positive in DB
-    total_expenses = abs(float(expenses_data.total_expenses or 0))  # Convert to positive for display
-    total_income_from_expenses = float(expenses_data.total_income or 0)
-    net_expense = float(expenses_data.net_expense_total or 0)  # This will be negative if more expenses than income
+    total_expenses = abs(Money.from_paisa(totals["total_expenses"]))  # Convert to positive for display
+    total_income_from_expenses = Money.from_paisa(totals["total_income"])
+    net_expense = Money.from_paisa(totals["net_expense"])  # This will be negative if more expenses than income
     
     # Net Profit = Gross Profit from Sales + Net Expense Total
     # (Net expense total is negative for expenses, so it reduces profit)
     net_profit = gross_profit + net_expense
     
     # Credit/Debit
-    total_credit = float(credit_debit_summary.total_credit or 0)
-    total_cash = float(credit_debit_summary.total_cash or 0)
+    total_credit = Money.from_paisa(totals["total_credit"])
+    total_cash = Money.from_paisa(totals["total_cash"])
     
-    # Daily breakdown for charts
-    daily_data = []
-    current_date = start_date
-    while current_date <= end_date:
-        # Get daily sales
-        day_sales = db.query(
-            func.sum(Sale.total_amount).label("revenue"),
-            func.sum(Sale.total_amount - (Sale.purchase_price * Sale.quantity)).label("profit")
-        ).filter(
-            func.date(Sale.created_at) == current_date,
-            Sale.is_deleted == False
-        ).first()
-        
-        # Get daily expenses
-        day_expenses = db.query(
-            func.sum(Expense.amount).label("total")
-        ).filter(
-            func.date(Expense.expense_date) == current_date,
-            Expense.is_deleted == False
-        ).first()
-        
-        daily_data.append({
-            "date": current_date.strftime("%Y-%m-%d"),
-            "revenue": float(day_sales.revenue or 0),
-            "profit": float(day_sales.profit or 0),
-            "expenses": float(day_expenses.total or 0)
-        })
-        
-        current_date += timedelta(days=1)
+    # Cost of goods sold from the valuation engine (FIFO and moving average)
+    cogs_fifo = Money.from_paisa(totals["cogs_fifo"])
+    cogs_average = Money.from_paisa(totals["cogs_average"])
     
     return {
         "period": {
@@ -215,29 +306,188 @@ def get_period_financial_summary(db: Session, start_date: date, end_date: date):
             "days": (end_date - start_date).days + 1
         },
         "sales_summary": {
-            "total_sales_count": sales_summary.total_sales_count or 0,
-            "total_quantity_sold": float(sales_summary.total_quantity_sold or 0),
-            "total_revenue": total_revenue,
-            "total_cost": total_cost,
-            "gross_profit": gross_profit,
-            "profit_margin": round((gross_profit / total_revenue * 100), 2) if total_revenue > 0 else 0
+            "total_sales_count": totals["sales_count"],
+            "total_quantity_sold": float(totals["quantity_sold"]),
+            "total_revenue": float(total_revenue),
+            "total_cost": float(total_cost),
+            "gross_profit": float(gross_profit),
+            "profit_margin": round(gross_profit.ratio(total_revenue) * 100, 2) if total_revenue > Money(0) else 0
         },
         "expense_summary": {
-            "total_expenses": total_expenses,
-            "total_income": total_income_from_expenses,
-            "net_expense": net_expense,
-            "expense_count": expenses_data.expense_count or 0
+            "total_expenses": float(total_expenses),
+            "total_income": float(total_income_from_expenses),
+            "net_expense": float(net_expense),
+            "expense_count": totals["expense_count"]
         },
         "credit_debit": {
-            "total_credit": total_credit,
-            "total_cash": total_cash,
-            "credit_count": credit_debit_summary.credit_count or 0,
-            "cash_count": credit_debit_summary.cash_count or 0,
-            "credit_percentage": round((total_credit / total_revenue * 100), 2) if total_revenue > 0 else 0
+            "total_credit": float(total_credit),
+            "total_cash": float(total_cash),
+            "credit_count": totals["credit_count"],
+            "cash_count": totals["cash_count"],
+            "credit_percentage": round(total_credit.ratio(total_revenue) * 100, 2) if total_revenue > Money(0) else 0
         },
-        "overall": {
-            "net_profit": net_profit,
-            "total_transactions": (sales_summary.total_sales_count or 0) + (expenses_data.expense_count or 0)
+        "cost_of_goods_sold": {
+            "fifo": float(cogs_fifo),
+            "moving_average": float(cogs_average),
+            "fifo_gross_profit": float(total_revenue - cogs_fifo)
         },
-        "daily_breakdown": daily_data
+        "overall": {
+            "net_profit": float(net_profit),
+            "total_transactions": totals["sales_count"] + totals["expense_count"]
+        }
+    }
+
+def get_period_financial_summary(db: Session, start_date: date, end_date: date):
+    """
+    Get comprehensive financial summary for a date range
+    Returns sales, expenses, profit, and credit/debit information
+    """
+    crud_valuation.sync_valuation(db)
+    daily = get_daily_totals(db, start_date, end_date)
+    summary = _financial_summary(start_date, end_date, get_period_totals(db, [(start_date, end_date)], daily)[0])
+    
+    # Daily breakdown for charts
+    daily_data = [
+        {
+            "date": day.strftime("%Y-%m-%d"),
+            "revenue": float(Money.from_paisa(totals["revenue"])),
+            "profit": float(Money.from_paisa(totals["gross_profit"])),
+            "expenses": float(Money.from_paisa(totals["net_expense"]))
+        }
+        for day, totals in daily
+    ]
+    
+    summary["daily_breakdown"] = daily_data
+    return summary
+
+def _change(current: float, previous: float) -> dict:
+    delta = round(current - previous, 2)
+    return {
+        "delta": delta,
+        "percent_change": round(delta / abs(previous) * 100, 2) if previous else None
+    }
+
+def get_period_comparison(db: Session, periods: list):
+    """
+    Financial summaries of several (start_date, end_date) periods computed
+    together, plus the change of every metric from each period to the next
+    in the order given (list the earlier period first for "vs last month")
+    """
+    summaries = [
+        _financial_summary(start_date, end_date, totals)
+        for (start_date, end_date), totals in zip(periods, get_period_totals(db, periods))
+    ]
+    changes = []
+    for previous, current in zip(summaries, summaries[1:]):
+        changes.append({
+            "from_period": previous["period"],
+            "to_period": current["period"],
+            "metrics": {
+                section: {name: _change(value, previous[section][name]) for name, value in metrics.items()}
+                for section, metrics in current.items()
+                if section != "period"
+            }
+        })
+    return {"periods": summaries, "changes": changes}
+
+def get_credit_aging(db: Session, as_of: Optional[date] = None):
+    """
+    Receivables aging per customer at the end of `as_of`, in one grouped query.
+
+    Payments are applied to each customer's oldest credit sales first: a
+    running sum of credit per customer (window over created_at, id) minus
+    the customer's total paid gives the unpaid part of every sale, which is
+    then summed into 0-30 / 31-60 / 61-90 / 90+ day buckets by sale date.
+    """
+    if as_of is None:
+        as_of = date.today()
+    end = day_start(as_of + timedelta(days=1))
+    name_key = func.lower(func.trim(Sale.customer_name))
+
+    credit = select(
+        name_key.label("name_key"),
+        Sale.customer_name,
+        Sale.customer_phone,
+        Sale.created_at,
+        paisa(Sale.total_amount).label("amount"),
+        func.sum(paisa(Sale.total_amount)).over(
+            partition_by=name_key,
+            order_by=(Sale.created_at, Sale.id)
+        ).label("running")
+    ).where(
+        Sale.payment_type == 'Credit',
+        Sale.is_deleted == False,
+        Sale.created_at < end
+    ).subquery("credit")
+
+    paid = select(
+        CustomerPayment.customer_id,
+        func.sum(paisa(CustomerPayment.amount)).label("amount")
+    ).where(
+        CustomerPayment.is_deleted == False,
+        CustomerPayment.paid_at < end
+    ).group_by(CustomerPayment.customer_id).subquery("paid")
+
+    # Part of the running credit not yet covered by payments, capped at the sale amount
+    uncovered = credit.c.running - func.coalesce(paid.c.amount, 0)
+    unpaid = case(
+        (uncovered <= 0, 0),
+        (uncovered >= credit.c.amount, credit.c.amount),
+        else_=uncovered
+    )
+
+    def bucket(newer_than: Optional[int], older_than: Optional[int]):
+        conditions = []
+        if newer_than is not None:
+            conditions.append(credit.c.created_at >= day_start(as_of - timedelta(days=newer_than)))
+        if older_than is not None:
+            conditions.append(credit.c.created_at < day_start(as_of - timedelta(days=older_than)))
+        return func.coalesce(func.sum(case((and_(*conditions), unpaid), else_=0)), 0)
+
+    total_unpaid = func.coalesce(func.sum(unpaid), 0)
+    rows = db.execute(
+        select(
+            Customer.id.label("customer_id"),
+            func.coalesce(func.max(Customer.name), func.max(credit.c.customer_name)).label("customer_name"),
+            func.coalesce(func.max(Customer.phone), func.max(credit.c.customer_phone)).label("customer_phone"),
+            bucket(30, None).label("days_0_30"),
+            bucket(60, 30).label("days_31_60"),
+            bucket(90, 60).label("days_61_90"),
+            bucket(None, 90).label("days_over_90"),
+            total_unpaid.label("total_outstanding"),
+            func.min(case((unpaid > 0, credit.c.created_at))).label("oldest_unpaid_at")
+        ).select_from(credit).outerjoin(
+            Customer, Customer.name_key == credit.c.name_key
+        ).outerjoin(
+            paid, paid.c.customer_id == Customer.id
+        ).group_by(
+            # One customer per name_key; PostgreSQL has no max(uuid)
+            credit.c.name_key, Customer.id
+        ).having(
+            total_unpaid > 0
+        ).order_by(
+            total_unpaid.desc()
+        )
+    ).all()
+
+    totals = {name: Money(0) for name in AGING_BUCKETS + ("total_outstanding",)}
+    customers = []
+    for row in rows:
+        entry = {
+            "customer_id": row.customer_id,
+            "customer_name": row.customer_name,
+            "customer_phone": row.customer_phone,
+            "oldest_unpaid_at": row.oldest_unpaid_at
+        }
+        for name in totals:
+            amount = Money.from_paisa(getattr(row, name))
+            totals[name] += amount
+            entry[name] = amount.to_decimal()
+        customers.append(entry)
+
+    return {
+        "as_of": as_of,
+        "customer_count": len(customers),
+        "totals": {name: amount.to_decimal() for name, amount in totals.items()},
+        "customers": customers
     }
@@ -0,0 +1,315 @@
+from sqlalchemy.orm import Session
+from sqlalchemy import func, case, and_, or_, exists
+from sqlalchemy.exc import IntegrityError
+from fastapi import HTTPException
+from app.models.models import Product, ProductStock, StockTransaction, StockSnapshot
+from app.core.config import settings
+from uuid import UUID
+from datetime import date, datetime, time, timedelta
+from typing import Optional
+
+# +quantity for IN, -quantity for OUT
+SIGNED_QUANTITY = case(
+    (StockTransaction.type == 'IN', StockTransaction.quantity),
+    else_=-StockTransaction.quantity
+)
+
+def day_start(day: date) -> datetime:
+    """Start of a calendar day - used as an index-friendly created_at bound"""
+    return datetime.combine(day, time.min)
+
+def _latest_snapshots(db: Session, as_of: date):
+    """Latest snapshot per product taken on or before `as_of`"""
+    latest = db.query(
+        StockSnapshot.product_id,
+        func.max(StockSnapshot.snapshot_date).label("snapshot_date")
+    ).filter(
+        StockSnapshot.snapshot_date <= as_of
+    ).group_by(StockSnapshot.product_id).subquery()
+
+    return db.query(
+        StockSnapshot.product_id,
+        StockSnapshot.snapshot_date,
+        StockSnapshot.cutoff_at,
+        StockSnapshot.balance
+    ).join(
+        latest,
+        and_(
+            StockSnapshot.product_id == latest.c.product_id,
+            StockSnapshot.snapshot_date == latest.c.snapshot_date
+        )
+    ).subquery()
+
+def get_stock_as_of(db: Session, as_of: date, product_id: Optional[UUID] = None):
+    """
+    Stock balance per product at the end of `as_of`.
+
+    Starts from each product's latest snapshot on or before the date and adds
+    only the ledger rows created after that snapshot, so with up-to-date
+    month-end snapshots at most one month of stock_transactions is scanned.
+    """
+    snapshot = _latest_snapshots(db, as_of)
+    end = day_start(as_of + timedelta(days=1))
+
+    query = db.query(
+        Product.id.label("product_id"),
+        Product.name.label("product_name"),
+        snapshot.c.snapshot_date,
+        (func.coalesce(snapshot.c.balance, 0) + func.coalesce(func.sum(SIGNED_QUANTITY), 0)).label("stock_balance")
+    ).outerjoin(
+        snapshot, snapshot.c.product_id == Product.id
+    ).outerjoin(
+        StockTransaction,
+        and_(
+            StockTransaction.product_id == Product.id,
+            StockTransaction.is_deleted == False,
+            StockTransaction.created_at < end,
+            or_(snapshot.c.cutoff_at == None, StockTransaction.created_at >= snapshot.c.cutoff_at)
+        )
+    )
+
+    if product_id:
+        query = query.filter(Product.id == product_id)
+
+    return query.group_by(
+        Product.id, Product.name, snapshot.c.snapshot_date, snapshot.c.balance
+    ).order_by(Product.name).all()
+
+def get_stock_history(
+    db: Session,
+    product_id: UUID,
+    start_date: date,
+    end_date: date,
+    skip: int = 0,
+    limit: int = 100
+):
+    """
+    Ledger entries of one product in a date range with the running balance
+    after each entry. Opening balance comes from get_stock_as_of, the running
+    sum is a window function over (created_at, id).
+    """
+    opening_rows = get_stock_as_of(db, start_date - timedelta(days=1), product_id=product_id)
+    opening_balance = int(opening_rows[0].stock_balance) if opening_rows else 0
+
+    running = func.sum(SIGNED_QUANTITY).over(
+        order_by=(StockTransaction.created_at, StockTransaction.id)
+    )
+
+    entries = db.query(
+        StockTransaction.id,
+        StockTransaction.created_at,
+        StockTransaction.type,
+        StockTransaction.quantity,
+        StockTransaction.party_name,
+        (opening_balance + running).label("balance")
+    ).filter(
+        StockTransaction.product_id == product_id,
+        StockTransaction.is_deleted == False,
+        StockTransaction.created_at >= day_start(start_date),
+        StockTransaction.created_at < day_start(end_date + timedelta(days=1))
+    ).order_by(
+        StockTransaction.created_at, StockTransaction.id
+    ).offset(skip).limit(limit).all()
+
+    return {
+        "product_id": product_id,
+        "start_date": start_date,
+        "end_date": end_date,
+        "opening_balance": opening_balance,
+        "entries": entries
+    }
+
+def write_stock_snapshots(db: Session, snapshot_date: date, product_ids: Optional[list] = None) -> int:
+    """
+    Write (or rewrite) the closing balance of every product - or only of
+    `product_ids` - for `snapshot_date`. Each snapshot is computed from the
+    previous one plus one period of ledger.
+    """
+    balances = get_stock_as_of(db, snapshot_date)
+
+    stale = db.query(StockSnapshot).filter(StockSnapshot.snapshot_date == snapshot_date)
+    if product_ids is not None:
+        wanted = set(product_ids)
+        balances = [row for row in balances if row.product_id in wanted]
+        stale = stale.filter(StockSnapshot.product_id.in_(wanted))
+    stale.delete(synchronize_session=False)
+
+    cutoff = day_start(snapshot_date + timedelta(days=1))
+    db.add_all([
+        StockSnapshot(
+            product_id=row.product_id,
+            snapshot_date=snapshot_date,
+            cutoff_at=cutoff,
+            balance=int(row.stock_balance)
+        )
+        for row in balances
+    ])
+    db.commit()
+    return len(balances)
+
+def month_ends(start: date, through: date):
+    """Last day of every month from `start`'s month up to `through` (inclusive)"""
+    current = date(start.year, start.month, 1)
+    while True:
+        next_month = date(current.year + current.month // 12, current.month % 12 + 1, 1)
+        month_end = next_month - timedelta(days=1)
+        if month_end > through:
+            return
+        yield month_end
+        current = next_month
+
+def _unsnapshotted_products(db: Session, snapshot_date: date) -> list:
+    """Products with ledger rows by the end of `snapshot_date` but no snapshot for it"""
+    cutoff = day_start(snapshot_date + timedelta(days=1))
+    return [row.id for row in db.query(Product.id).filter(
+        exists().where(StockTransaction.product_id == Product.id, StockTransaction.created_at < cutoff),
+        ~exists().where(StockSnapshot.product_id == Product.id, StockSnapshot.snapshot_date == snapshot_date)
+    )]
+
+def write_month_end_snapshots(db: Session, through: Optional[date] = None) -> list:
+    """
+    Snapshot job: fill in every missing month-end snapshot up to `through`
+    (defaults to the last completed month). Months that already have a
+    snapshot for every product are skipped, so re-runs are cheap. In a
+    partly snapshotted month (a product added later, or one invalidated by a
+    backdated write) only the products that had ledger rows by then and lack
+    a snapshot are written.
+    """
+    if through is None:
+        through = date.today().replace(day=1) - timedelta(days=1)
+
+    first_transaction = db.query(func.min(StockTransaction.created_at)).scalar()
+    if first_transaction is None:
+        return []
+
+    product_count = db.query(func.count(Product.id)).scalar()
+    existing = dict(
+        db.query(StockSnapshot.snapshot_date, func.count(StockSnapshot.id))
+        .group_by(StockSnapshot.snapshot_date).all()
+    )
+
+    written = []
+    for month_end in month_ends(first_transaction.date(), through):
+        if existing.get(month_end, 0) >= product_count:
+            continue
+        if not existing.get(month_end):
+            write_stock_snapshots(db, month_end)
+        else:
+            missing = _unsnapshotted_products(db, month_end)
+            if not missing:
+                continue
+            write_stock_snapshots(db, month_end, missing)
+        written.append(month_end)
+    return written
+
+def invalidate_stock_snapshots(db: Session, product_id: UUID, moment: Optional[datetime]):
+    """
+    Drop snapshots of a product that already include `moment` - called when a
+    backdated, edited or soft-deleted ledger row changes a closed period.
+    As-of queries fall back to the previous snapshot until the job reruns.
+    Does not commit; runs inside the caller's transaction.
+    """
+    if product_id is None or moment is None:
+        return
+    db.query(StockSnapshot).filter(
+        StockSnapshot.product_id == product_id,
+        StockSnapshot.cutoff_at > moment
+    ).delete(synchronize_session=False)
+
+def ledger_balance(db: Session, product_id: UUID) -> int:
+    """On-hand quantity of one product summed from the ledger"""
+    return int(db.query(func.coalesce(func.sum(SIGNED_QUANTITY), 0)).filter(
+        StockTransaction.product_id == product_id,
+        StockTransaction.is_deleted == False
+    ).scalar())
+
+def _ensure_stock_row(db: Session, product_id: UUID):
+    """
+    Create the product_stock row of a product that predates the table,
+    seeded from the ledger. Callers run this before adding their own ledger
+    change, so the balance excludes it.
+    """
+    try:
+        # Savepoint: a concurrent request may create the same row first
+        with db.begin_nested():
+            db.add(ProductStock(product_id=product_id, quantity=ledger_balance(db, product_id)))
+    except IntegrityError:
+        pass
+
+def _update_stock(db: Session, product_id: UUID, delta: int, require_available: bool) -> int:
+    query = db.query(ProductStock).filter(ProductStock.product_id == product_id)
+    if require_available:
+        query = query.filter(ProductStock.quantity >= -delta)
+    return query.update({ProductStock.quantity: ProductStock.quantity + delta}, synchronize_session=False)
+
+def adjust_stock(db: Session, product_id: UUID, delta: int):
+    """
+    Add `delta` to a product's on-hand quantity (UPDATE ... SET quantity =
+    quantity + :delta). Used for receipts and reversals, which never need a
+    check. Does not commit; runs inside the caller's transaction.
+    """
+    if product_id is None or delta == 0:
+        return
+    if not _update_stock(db, product_id, delta, require_available=False):
+        _ensure_stock_row(db, product_id)
+        _update_stock(db, product_id, delta, require_available=False)
+
+def reserve_stock(db: Session, product_id: UUID, quantity: int) -> bool:
+    """
+    Take `quantity` units of a product if they are on hand:
+    UPDATE product_stock SET quantity = quantity - :n WHERE quantity >= :n.
+
+    The row lock taken by the UPDATE serializes concurrent sales of the same
+    product and the condition is re-checked against the committed quantity,
+    so two sales can never both take the last units. Returns False (and
+    changes nothing) when there is not enough stock. Does not commit.
+    """
+    if quantity <= 0:
+        raise ValueError(f"Stock can only be taken in positive quantities, got {quantity}")
+    if product_id is None:
+        return True
+    if settings.ALLOW_NEGATIVE_STOCK:
+        adjust_stock(db, product_id, -quantity)
+        return True
+    if _update_stock(db, product_id, -quantity, require_available=True):
+        return True
+    exists = db.query(ProductStock.product_id).filter(ProductStock.product_id == product_id).first()
+    if exists:
+        return False
+    _ensure_stock_row(db, product_id)
+    return bool(_update_stock(db, product_id, -quantity, require_available=True))
+
+def take_stock(db: Session, product_id: UUID, quantity: int):
+    """reserve_stock() that raises 400 when the product does not have `quantity` on hand"""
+    if not reserve_stock(db, product_id, quantity):
+        available = db.query(ProductStock.quantity).filter(ProductStock.product_id == product_id).scalar()
+        raise HTTPException(
+            status_code=400,
+            detail=f"Insufficient stock: {available or 0} available, {quantity} requested"
+        )
+
+def get_on_hand(db: Session, product_id: UUID) -> int:
+    """Current on-hand quantity of one product"""
+    quantity = db.query(ProductStock.quantity).filter(ProductStock.product_id == product_id).scalar()
+    return quantity if quantity is not None else ledger_balance(db, product_id)
+
+def rebuild_product_stock(db: Session) -> int:
+    """
+    Recompute every product_stock row from the ledger in one grouped query.
+    Used to backfill existing data; normal writes are incremental.
+    """
+    balances = dict(
+        db.query(Product.id, func.coalesce(func.sum(SIGNED_QUANTITY), 0)).outerjoin(
+            StockTransaction,
+            and_(StockTransaction.product_id == Product.id, StockTransaction.is_deleted == False)
+        ).group_by(Product.id).all()
+    )
+    rows = {row.product_id: row for row in db.query(ProductStock).all()}
+    for product_id, balance in balances.items():
+        row = rows.get(product_id)
+        if row is None:
+            db.add(ProductStock(product_id=product_id, quantity=int(balance)))
+        else:
+            row.quantity = int(balance)
+    db.commit()
+    return len(balances)
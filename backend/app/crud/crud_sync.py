@@ -0,0 +1,111 @@
+from sqlalchemy.orm import Session
+from sqlalchemy import func, or_
+from fastapi import HTTPException
+from app.models.models import (
+    Company, Product, StockTransaction, Sale, SyncTombstone,
+    Customer, CustomerBalance, CustomerPayment, SaleInvoice, Expense
+)
+from app.crud import crud_product
+from uuid import UUID
+from datetime import datetime, timedelta
+from typing import Optional
+
+# Rows are matched on updated_at > token - SYNC_OVERLAP. The overlap covers
+# write transactions that started (and stamped now()) before the token was
+# issued but committed after it; clients upsert by id, so repeats are harmless.
+SYNC_OVERLAP = timedelta(seconds=10)
+
+def record_tombstone(db: Session, table_name: str, row_id: UUID):
+    """Remember a hard delete for sync clients. Does not commit."""
+    db.add(SyncTombstone(table_name=table_name, row_id=row_id))
+
+def current_token(db: Session) -> str:
+    """Sync token for 'now', taken from the database clock (the one updated_at uses)"""
+    return db.query(func.now()).scalar().isoformat()
+
+def parse_token(token: str) -> datetime:
+    try:
+        return datetime.fromisoformat(token)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid sync token")
+
+def get_changes(db: Session, since: Optional[str] = None):
+    """
+    Rows created, changed or deleted since `since`, plus the token for the
+    next call. Without `since` only a fresh token is returned - clients load
+    the lists once, then stay current with deltas. Customers are sent as
+    balance rows whenever the customer or its receivables totals change.
+    """
+    token = current_token(db)
+    changes = {
+        "token": token,
+        "companies": [],
+        "products": [],
+        "transactions": [],
+        "sales": [],
+        "customers": [],
+        "payments": [],
+        "invoices": [],
+        "expenses": [],
+        "deleted": []
+    }
+    if since is None:
+        return changes
+
+    cutoff = parse_token(since) - SYNC_OVERLAP
+
+    changes["companies"] = db.query(Company).filter(Company.updated_at > cutoff).all()
+
+    transactions = db.query(StockTransaction).filter(
+        StockTransaction.updated_at > cutoff,
+        StockTransaction.product_id != None
+    ).all()
+    sales = db.query(Sale).filter(
+        Sale.updated_at > cutoff,
+        Sale.product_id != None
+    ).all()
+
+    # A product's current_stock changes with any of its ledger rows
+    product_ids = {p for (p,) in db.query(Product.id).filter(Product.updated_at > cutoff)}
+    product_ids.update(t.product_id for t in transactions)
+    if product_ids:
+        changes["products"] = crud_product.get_products(db, limit=None, ids=list(product_ids))
+
+    changes["customers"] = db.query(
+        Customer.id.label("customer_id"),
+        Customer.name.label("customer_name"),
+        Customer.phone.label("customer_phone"),
+        CustomerBalance.total_credit,
+        CustomerBalance.total_cash,
+        CustomerBalance.total_paid,
+        CustomerBalance.outstanding,
+        CustomerBalance.sales_count,
+        CustomerBalance.last_transaction_at
+    ).join(CustomerBalance, CustomerBalance.customer_id == Customer.id).filter(
+        or_(Customer.updated_at > cutoff, CustomerBalance.updated_at > cutoff)
+    ).all()
+
+    soft_deleted = (
+        ("transactions", transactions),
+        ("sales", sales),
+        ("payments", db.query(CustomerPayment).filter(CustomerPayment.updated_at > cutoff).all()),
+        ("invoices", db.query(SaleInvoice).filter(SaleInvoice.updated_at > cutoff).all()),
+        ("expenses", db.query(Expense).filter(Expense.updated_at > cutoff).all())
+    )
+    deleted = []
+    for table_name, rows in soft_deleted:
+        live = []
+        for row in rows:
+            if row.is_deleted:
+                deleted.append({"table": table_name, "id": row.id})
+            else:
+                live.append(row)
+        changes[table_name] = live
+
+    deleted.extend(
+        {"table": table_name, "id": row_id}
+        for table_name, row_id in db.query(SyncTombstone.table_name, SyncTombstone.row_id)
+        .filter(SyncTombstone.deleted_at > cutoff)
+    )
+    changes["deleted"] = deleted
+    return changes
@@ -1,22 +1,54 @@
 from sqlalchemy.orm import Session
+from sqlalchemy import select, func, or_
 from app.models.models import StockTransaction, Sale, Product
+from app.crud.crud_stock import invalidate_stock_snapshots, adjust_stock, take_stock, day_start
+from app.crud.crud_valuation import invalidate_valuation
+from app.crud.crud_report import invalidate_report_day
+from app.crud import crud_price_history, crud_customer, crud_events, crud_invoice, crud_leaderboard
         
 from app.schemas import transactions
+from app.db.projection import columns_for
+from app.db.counting import count_with_estimate
+from app.db.session import begin_write
 from uuid import UUID
 from fastapi import HTTPException
-from datetime import datetime
+from datetime import date, datetime, timedelta
+from typing import Optional
+
+SALE_SORTS = {
+    "newest": (Sale.created_at.desc(), Sale.id.desc()),
+    "oldest": (Sale.created_at.asc(), Sale.id.asc()),
+    "amount_desc": (Sale.total_amount.desc(), Sale.created_at.desc()),
+    "amount_asc": (Sale.total_amount.asc(), Sale.created_at.desc()),
+    "customer": (func.lower(Sale.customer_name), Sale.created_at.desc()),
+}
+
+def _ledger_changed(db: Session, product_id: UUID, moment: datetime):
+    """Invalidate state derived from a product's ledger at or after `moment`"""
+    invalidate_stock_snapshots(db, product_id, moment)
+    invalidate_valuation(db, product_id, moment)
 
 # --- Stock Transaction CRUD ---
 def get_transactions(db: Session, skip: int = 0, limit: int = 100, include_deleted: bool = False):
-    """Get stock transactions, by default excludes soft-deleted records"""
-    query = db.query(StockTransaction).filter(StockTransaction.product_id != None)
+    """Get stock transactions as response-column rows, by default excludes soft-deleted records"""
+    query = select(*columns_for(StockTransaction, transactions.StockTransaction)).where(
+        StockTransaction.product_id != None
+    )
     
     if not include_deleted:
-        query = query.filter(StockTransaction.is_deleted == False)
+        query = query.where(StockTransaction.is_deleted == False)
     
-    return query.offset(skip).limit(limit).all()
+    return db.execute(query.offset(skip).limit(limit)).all()
 
-def create_transaction(db: Session, transaction: transactions.StockTransactionCreate):
+def add_transaction(db: Session, transaction: transactions.StockTransactionCreate):
+    """Write a stock transaction and its side effects without committing"""
+    begin_write(db)
+    # Move the on-hand quantity first: an OUT is rejected before anything is written
+    if transaction.type == 'IN':
+        adjust_stock(db, transaction.product_id, transaction.quantity)
+    else:
+        take_stock(db, transaction.product_id, transaction.quantity)
+    
     db_transaction = StockTransaction(**transaction.model_dump())
     db.add(db_transaction)
     
@@ -25,9 +57,25 @@ def create_transaction(db: Session, transaction: transactions.StockTransactionCr
         db_product = db.query(Product).filter(Product.id == transaction.product_id).first()
         if db_product:
             db_product.purchase_price = transaction.purchase_price
-            
+            # Keep the old price reachable for backdated cost lookups
+            db.flush()
+            crud_price_history.record_price(
+                db, transaction.product_id, transaction.purchase_price,
+                transaction_id=db_transaction.id
+            )
+    return db_transaction
+
+def publish_transaction_created(db: Session, db_transaction: StockTransaction):
+    crud_events.publish_stock_change(
+        db, db_transaction.product_id,
+        db_transaction.quantity if db_transaction.type == 'IN' else -db_transaction.quantity
+    )
+
+def create_transaction(db: Session, transaction: transactions.StockTransactionCreate):
+    db_transaction = add_transaction(db, transaction)
     db.commit()
     db.refresh(db_transaction)
+    publish_transaction_created(db, db_transaction)
     return db_transaction
 
 def delete_transaction(db: Session, transaction_id: UUID):
@@ -38,30 +86,95 @@ def delete_transaction(db: Session, transaction_id: UUID):
     ).first()
     
     if db_transaction:
+        adjust_stock(
+            db, db_transaction.product_id,
+            -db_transaction.quantity if db_transaction.type == 'IN' else db_transaction.quantity
+        )
         # Soft delete - mark as deleted with timestamp
         db_transaction.is_deleted = True
         db_transaction.deleted_at = datetime.utcnow()
+        _ledger_changed(db, db_transaction.product_id, db_transaction.created_at)
+        if db_transaction.type == 'IN':
+            crud_price_history.remove_transaction_price(db, db_transaction.product_id, db_transaction.id)
         db.commit()
         db.refresh(db_transaction)
+        crud_events.publish_stock_change(
+            db, db_transaction.product_id,
+            -db_transaction.quantity if db_transaction.type == 'IN' else db_transaction.quantity
+        )
     
     return db_transaction
 
 # --- Sales CRUD ---
-def get_sales(db: Session, skip: int = 0, limit: int = 100, include_deleted: bool = False):
-    """Get sales, by default excludes soft-deleted records"""
-    query = db.query(Sale).filter(Sale.product_id != None)
+def _sales_query(
+    include_deleted: bool = False,
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+    product_id: Optional[UUID] = None,
+    company_id: Optional[UUID] = None,
+    payment_type: Optional[str] = None,
+    customer: Optional[str] = None
+):
+    query = select(*columns_for(Sale, transactions.Sale)).where(Sale.product_id != None)
     
     if not include_deleted:
-        query = query.filter(Sale.is_deleted == False)
-    
-    return query.offset(skip).limit(limit).all()
+        query = query.where(Sale.is_deleted == False)
+    if start_date:
+        query = query.where(Sale.created_at >= day_start(start_date))
+    if end_date:
+        query = query.where(Sale.created_at < day_start(end_date + timedelta(days=1)))
+    if product_id:
+        query = query.where(Sale.product_id == product_id)
+    if company_id:
+        query = query.where(Sale.product_id.in_(
+            select(Product.id).where(Product.company_id == company_id)
+        ))
+    if payment_type:
+        query = query.where(Sale.payment_type == payment_type)
+    if customer and customer.strip():
+        search = customer.strip()
+        query = query.where(or_(
+            func.lower(Sale.customer_name).contains(search.lower()),
+            Sale.customer_phone.contains(search)
+        ))
+    return query
 
-def create_sale(db: Session, sale: transactions.SaleCreate):
+def get_sales(
+    db: Session,
+    skip: int = 0,
+    limit: int = 100,
+    include_deleted: bool = False,
+    sort: str = "newest",
+    **filters
+):
+    """
+    Get sales as response-column rows, by default excludes soft-deleted records.
+    `filters` are the keyword arguments of _sales_query (date range, product,
+    company, payment type, customer search).
+    """
+    query = _sales_query(include_deleted, **filters)
+    return db.execute(query.order_by(*SALE_SORTS[sort]).offset(skip).limit(limit)).all()
+
+def count_sales(db: Session, include_deleted: bool = False, **filters):
+    """(total, estimated) number of sales matching the same filters as get_sales"""
+    return count_with_estimate(db, _sales_query(include_deleted, **filters))
+
+def add_sale(db: Session, sale: transactions.SaleCreate):
+    """Write a sale, its OUT transaction and the customer balance change without committing"""
+    begin_write(db)
     # Fetch product to get historical purchase price
     db_product = db.query(Product).filter(Product.id == sale.product_id).first()
     if not db_product:
         raise HTTPException(status_code=404, detail="Product not found")
     
+    # Backdated sales are costed at the purchase price in effect on the sale date
+    purchase_price = db_product.purchase_price
+    if sale.created_at:
+        purchase_price = crud_price_history.resolve_purchase_price(db, sale.product_id, sale.created_at)
+    
+    # Atomic conditional decrement - concurrent sales cannot oversell
+    take_stock(db, sale.product_id, sale.quantity)
+    
     # Calculate total amount
     total_amount = sale.selling_price * sale.quantity
     
@@ -69,7 +182,7 @@ def create_sale(db: Session, sale: transactions.SaleCreate):
     sale_data = sale.model_dump(exclude={'created_at'})
     db_sale = Sale(
         **sale_data,
-        purchase_price=db_product.purchase_price,
+        purchase_price=purchase_price,
         total_amount=total_amount
     )
     
@@ -78,14 +191,17 @@ def create_sale(db: Session, sale: transactions.SaleCreate):
         db_sale.created_at = sale.created_at
     
     db.add(db_sale)
-    db.flush() 
+    db.flush()
+    # Count the sale on the day stored in the DB, as delete_sale and rebuild_counters do
+    db.refresh(db_sale, ["created_at"])
+    crud_leaderboard.record_sales(db, [db_sale])
     
     # Log an 'OUT' transaction automatically for the sale
     db_transaction = StockTransaction(
         product_id=sale.product_id,
         quantity=sale.quantity,
         party_name=f"Sale to {sale.customer_name}",
-        purchase_price=db_product.purchase_price,
+        purchase_price=purchase_price,
         type='OUT',
         sale_id=db_sale.id
     )
@@ -93,10 +209,26 @@ def create_sale(db: Session, sale: transactions.SaleCreate):
     # Match stock transaction date with sale date
     if sale.created_at:
         db_transaction.created_at = sale.created_at
+        # Backdated sale may land in an already snapshotted, valued or reported period
+        _ledger_changed(db, sale.product_id, sale.created_at)
+        invalidate_report_day(db, sale.created_at)
     
     db.add(db_transaction)
+    crud_customer.record_sale(
+        db, sale.customer_name, sale.customer_phone, total_amount, sale.payment_type, at=sale.created_at
+    )
+    return db_sale
+
+def publish_sale_created(db: Session, db_sale: Sale):
+    crud_events.publish_sale("sale.created", db_sale)
+    crud_events.publish_stock_change(db, db_sale.product_id, -db_sale.quantity)
+    crud_events.publish_sale_totals(db_sale)
+
+def create_sale(db: Session, sale: transactions.SaleCreate):
+    db_sale = add_sale(db, sale)
     db.commit()
     db.refresh(db_sale)
+    publish_sale_created(db, db_sale)
     return db_sale
 
 def update_sale(db: Session, sale_id: UUID, sale_update: transactions.SaleUpdate):
@@ -113,18 +245,43 @@ def update_sale(db: Session, sale_id: UUID, sale_update: transactions.SaleUpdate
     quantity_changed = sale_update.quantity is not None and sale_update.quantity != db_sale.quantity
     product_changed = sale_update.product_id is not None and sale_update.product_id != db_sale.product_id
     
+    if quantity_changed or product_changed:
+        _ledger_changed(db, db_sale.product_id, db_sale.created_at)
+        if product_changed:
+            _ledger_changed(db, sale_update.product_id, db_sale.created_at)
+    
+    old_product_id, old_quantity = db_sale.product_id, db_sale.quantity
+    old_totals = crud_events.sale_totals(db_sale)
+    invalidate_report_day(db, db_sale.created_at)
+    
+    if product_changed:
+        if not db.query(Product.id).filter(Product.id == sale_update.product_id).first():
+            raise HTTPException(status_code=404, detail="Product not found")
+        adjust_stock(db, old_product_id, old_quantity)
+        take_stock(db, sale_update.product_id, sale_update.quantity or old_quantity)
+    elif quantity_changed:
+        if sale_update.quantity > old_quantity:
+            take_stock(db, old_product_id, sale_update.quantity - old_quantity)
+        else:
+            adjust_stock(db, old_product_id, old_quantity - sale_update.quantity)
+    
+    # Reverse the old sale on its customer's balance and the leaderboards; re-applied below
+    crud_customer.record_sale(
+        db, db_sale.customer_name, db_sale.customer_phone, db_sale.total_amount, db_sale.payment_type, sign=-1
+    )
+    crud_leaderboard.record_sales(db, [db_sale], sign=-1)
+    
     # Update fields that were provided
     update_data = sale_update.model_dump(exclude_unset=True)
     
     for field, value in update_data.items():
         setattr(db_sale, field, value)
     
-    # If product changed, update purchase_price
+    # If product changed, update purchase_price as of the sale date
     if product_changed:
-        db_product = db.query(Product).filter(Product.id == db_sale.product_id).first()
-        if not db_product:
-            raise HTTPException(status_code=404, detail="Product not found")
-        db_sale.purchase_price = db_product.purchase_price
+        db_sale.purchase_price = crud_price_history.resolve_purchase_price(
+            db, db_sale.product_id, db_sale.created_at
+        )
     
     # Recalculate total_amount if quantity or selling_price changed
     if sale_update.quantity is not None or sale_update.selling_price is not None:
@@ -142,16 +299,28 @@ def update_sale(db: Session, sale_id: UUID, sale_update: transactions.SaleUpdate
                 db_stock_transaction.quantity = db_sale.quantity
             if product_changed:
                 db_stock_transaction.product_id = db_sale.product_id
-                db_product = db.query(Product).filter(Product.id == db_sale.product_id).first()
-                if db_product:
-                    db_stock_transaction.purchase_price = db_product.purchase_price
+                db_stock_transaction.purchase_price = db_sale.purchase_price
             
             # Update party name if customer name changed
             if sale_update.customer_name is not None:
                 db_stock_transaction.party_name = f"Sale to {db_sale.customer_name}"
     
+    crud_customer.record_sale(
+        db, db_sale.customer_name, db_sale.customer_phone, db_sale.total_amount, db_sale.payment_type,
+        at=db_sale.created_at
+    )
+    crud_leaderboard.record_sales(db, [db_sale])
+    if db_sale.invoice_id:
+        crud_invoice.refresh_invoice_totals(db, db_sale.invoice_id)
     db.commit()
     db.refresh(db_sale)
+    crud_events.publish_sale("sale.updated", db_sale)
+    if product_changed:
+        crud_events.publish_stock_change(db, old_product_id, old_quantity)
+        crud_events.publish_stock_change(db, db_sale.product_id, -db_sale.quantity)
+    elif quantity_changed:
+        crud_events.publish_stock_change(db, db_sale.product_id, old_quantity - db_sale.quantity)
+    crud_events.publish_sale_totals(db_sale, previous=old_totals)
     return db_sale
 
 def delete_sale(db: Session, sale_id: UUID):
@@ -162,22 +331,36 @@ def delete_sale(db: Session, sale_id: UUID):
     ).first()
     
     if db_sale:
-        # Soft delete the sale
-        db_sale.is_deleted = True
-        db_sale.deleted_at = datetime.utcnow()
-        
-        # Also soft delete the associated stock transaction
         db_stock_transaction = db.query(StockTransaction).filter(
             StockTransaction.sale_id == sale_id,
             StockTransaction.is_deleted == False
         ).first()
+        if db_stock_transaction:
+            adjust_stock(db, db_stock_transaction.product_id, db_stock_transaction.quantity)
         
+        # Soft delete the sale
+        db_sale.is_deleted = True
+        db_sale.deleted_at = datetime.utcnow()
+        invalidate_report_day(db, db_sale.created_at)
+        crud_customer.record_sale(
+            db, db_sale.customer_name, db_sale.customer_phone, db_sale.total_amount, db_sale.payment_type, sign=-1
+        )
+        crud_leaderboard.record_sales(db, [db_sale], sign=-1)
+        
+        # Also soft delete the associated stock transaction
         if db_stock_transaction:
             db_stock_transaction.is_deleted = True
             db_stock_transaction.deleted_at = datetime.utcnow()
+            _ledger_changed(db, db_stock_transaction.product_id, db_stock_transaction.created_at)
         
+        if db_sale.invoice_id:
+            crud_invoice.refresh_invoice_totals(db, db_sale.invoice_id)
         db.commit()
         db.refresh(db_sale)
+        crud_events.publish_sale("sale.deleted", db_sale)
+        if db_stock_transaction:
+            crud_events.publish_stock_change(db, db_stock_transaction.product_id, db_stock_transaction.quantity)
+        crud_events.publish_sale_totals(db_sale, sign=-1)
     
     return db_sale
 
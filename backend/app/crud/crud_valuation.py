@@ -0,0 +1,301 @@
+from sqlalchemy.orm import Session
+from sqlalchemy import func, and_, or_, select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm.exc import StaleDataError
+from app.models.models import Product, StockTransaction, ValuationState, CostLayer, CogsEntry
+from app.core.money import Money, paisa
+from app.crud.crud_stock import day_start
+from app.db.session import write_session
+from uuid import UUID
+from datetime import date, datetime, timedelta
+from typing import Optional
+from collections import defaultdict
+
+VALUATION_METHODS = ("fifo", "average")
+
+# created_at is set at transaction start, so a row can commit after a sync
+# has moved the watermark past it. Rows within this window before the
+# watermark are rechecked, as /sync does with SYNC_OVERLAP; a late row found
+# there replays its product.
+VALUATION_OVERLAP = timedelta(seconds=10)
+
+def _pending_ledger_rows(db: Session):
+    """
+    Ledger rows not yet processed, for all products, in (product, created_at, id)
+    order, plus each product's recheck window behind its watermark. Rows in
+    the window carry `valued` (a cost layer or COGS entry exists) so late
+    commits can be told apart. Each product resumes near its own watermark,
+    so the engine only reads recent rows.
+    """
+    return db.query(
+        StockTransaction.id,
+        StockTransaction.product_id,
+        StockTransaction.type,
+        StockTransaction.quantity,
+        StockTransaction.created_at,
+        func.coalesce(paisa(StockTransaction.purchase_price), paisa(Product.purchase_price), 0).label("unit_cost"),
+        ValuationState.last_created_at,
+        ValuationState.last_transaction_id,
+        or_(CostLayer.id != None, CogsEntry.transaction_id != None).label("valued")
+    ).join(
+        Product, Product.id == StockTransaction.product_id
+    ).outerjoin(
+        ValuationState, ValuationState.product_id == StockTransaction.product_id
+    ).outerjoin(
+        CostLayer, CostLayer.transaction_id == StockTransaction.id
+    ).outerjoin(
+        CogsEntry, CogsEntry.transaction_id == StockTransaction.id
+    ).filter(
+        StockTransaction.is_deleted == False,
+        or_(
+            ValuationState.product_id == None,
+            StockTransaction.created_at > func.coalesce(ValuationState.recheck_from, ValuationState.last_created_at),
+            and_(
+                StockTransaction.created_at == ValuationState.last_created_at,
+                StockTransaction.id > ValuationState.last_transaction_id
+            )
+        )
+    ).order_by(
+        StockTransaction.product_id, StockTransaction.created_at, StockTransaction.id
+    ).all()
+
+def _behind_watermark(row) -> bool:
+    return row.last_created_at is not None and (
+        (row.created_at, row.id) <= (row.last_created_at, row.last_transaction_id)
+    )
+
+def _receive(state: ValuationState, layers: list, row, db: Session):
+    unit_cost = row.unit_cost or state.last_unit_cost
+    quantity = row.quantity
+
+    # FIFO: units already sold on credit of stock are settled first
+    absorbed = min(state.fifo_deficit, quantity)
+    state.fifo_deficit -= absorbed
+    # A fully absorbed receipt still gets an (empty) layer: it marks the row valued
+    layer = CostLayer(
+        product_id=row.product_id,
+        transaction_id=row.id,
+        received_at=row.created_at,
+        unit_cost=unit_cost,
+        quantity_remaining=quantity - absorbed
+    )
+    db.add(layer)
+    if layer.quantity_remaining > 0:
+        layers.append(layer)
+
+    # Moving average: blend new receipt into on-hand value
+    if state.quantity_on_hand < 0:
+        state.average_cost_total = max(state.quantity_on_hand + quantity, 0) * unit_cost
+    else:
+        state.average_cost_total += quantity * unit_cost
+
+    state.quantity_on_hand += quantity
+    state.last_unit_cost = unit_cost
+
+def _issue(state: ValuationState, layers: list, row, db: Session):
+    fallback_cost = row.unit_cost or state.last_unit_cost
+    remaining = row.quantity
+
+    # FIFO: consume oldest layers first
+    fifo_cost = 0
+    while remaining > 0 and layers:
+        layer = layers[0]
+        take = min(layer.quantity_remaining, remaining)
+        fifo_cost += take * layer.unit_cost
+        layer.quantity_remaining -= take
+        remaining -= take
+        if layer.quantity_remaining == 0:
+            layers.pop(0)  # kept as a marker until pruned
+    if remaining > 0:
+        state.fifo_deficit += remaining
+        fifo_cost += remaining * fallback_cost
+
+    # Moving average: issue at current average unit cost
+    on_hand = state.quantity_on_hand
+    if on_hand > 0:
+        take = min(row.quantity, on_hand)
+        average_cost = (state.average_cost_total * take + on_hand // 2) // on_hand
+        state.average_cost_total -= average_cost
+        average_cost += (row.quantity - take) * fallback_cost
+    else:
+        average_cost = row.quantity * fallback_cost
+
+    state.quantity_on_hand -= row.quantity
+    if state.quantity_on_hand <= 0:
+        state.average_cost_total = 0
+
+    db.add(CogsEntry(
+        transaction_id=row.id,
+        product_id=row.product_id,
+        occurred_at=row.created_at,
+        quantity=row.quantity,
+        fifo_cost=fifo_cost,
+        average_cost=average_cost
+    ))
+
+def sync_valuation(db: Session) -> int:
+    """
+    Process ledger rows added since the last run and persist the updated
+    cost layers, moving-average state and COGS entries. A row that
+    committed late behind a watermark replays its product. Returns the
+    number of ledger rows processed.
+
+    Runs and commits in a write transaction of its own, so the read
+    endpoints calling it never commit their session; call it before the
+    caller's first query.
+    """
+    with write_session(db) as session:
+        return _sync(session)
+
+def _sync(db: Session) -> int:
+    rows = _pending_ledger_rows(db)
+    late = {row.product_id for row in rows if not row.valued and _behind_watermark(row)}
+    if late:
+        for product_id in late:
+            _reset_valuation(db, product_id)
+        rows = _pending_ledger_rows(db)
+    rows = [row for row in rows if not row.valued]
+    if not rows:
+        return 0
+
+    by_product = defaultdict(list)
+    for row in rows:
+        by_product[row.product_id].append(row)
+    product_ids = list(by_product)
+
+    states = {
+        s.product_id: s
+        for s in db.query(ValuationState).filter(ValuationState.product_id.in_(product_ids))
+    }
+    layers = defaultdict(list)
+    for layer in db.query(CostLayer).filter(
+        CostLayer.product_id.in_(product_ids),
+        CostLayer.quantity_remaining > 0
+    ).order_by(CostLayer.product_id, CostLayer.received_at, CostLayer.id):
+        layers[layer.product_id].append(layer)
+
+    for product_id, product_rows in by_product.items():
+        state = states.get(product_id)
+        if state is None:
+            state = ValuationState(
+                product_id=product_id,
+                quantity_on_hand=0,
+                fifo_deficit=0,
+                average_cost_total=0,
+                last_unit_cost=0
+            )
+            db.add(state)
+
+        for row in product_rows:
+            if row.type == 'IN':
+                _receive(state, layers[product_id], row, db)
+            else:
+                _issue(state, layers[product_id], row, db)
+
+        state.last_created_at = product_rows[-1].created_at
+        state.last_transaction_id = product_rows[-1].id
+        state.recheck_from = state.last_created_at - VALUATION_OVERLAP
+
+    try:
+        db.flush()
+        # Exhausted layers behind the recheck window are no longer needed as markers
+        db.query(CostLayer).filter(
+            CostLayer.product_id.in_(product_ids),
+            CostLayer.quantity_remaining == 0,
+            CostLayer.received_at <= select(ValuationState.recheck_from).where(
+                ValuationState.product_id == CostLayer.product_id
+            ).scalar_subquery()
+        ).delete(synchronize_session=False)
+        db.commit()
+    except (IntegrityError, StaleDataError):
+        # Another worker processed the same rows first, or a write invalidated
+        # a product mid-sync: the next sync picks up from what was committed
+        db.rollback()
+        return 0
+    return len(rows)
+
+def _reset_valuation(db: Session, product_id: UUID):
+    """Drop a product's valuation so the next pass replays its whole ledger. Does not commit."""
+    db.query(CogsEntry).filter(CogsEntry.product_id == product_id).delete(synchronize_session=False)
+    db.query(CostLayer).filter(CostLayer.product_id == product_id).delete(synchronize_session=False)
+    db.query(ValuationState).filter(ValuationState.product_id == product_id).delete(synchronize_session=False)
+
+def invalidate_valuation(db: Session, product_id: UUID, moment: Optional[datetime]):
+    """
+    Drop the valuation state of a product whose already-processed history
+    changed (backdated row, edit or soft delete at/before the watermark).
+    The next sync replays that product only. Does not commit.
+    """
+    if product_id is None or moment is None:
+        return
+    stale = db.query(ValuationState.product_id).filter(
+        ValuationState.product_id == product_id,
+        ValuationState.last_created_at >= moment
+    ).first()
+    if not stale:
+        return
+    _reset_valuation(db, product_id)
+
+def get_inventory_valuation(db: Session, method: str = "fifo"):
+    """Per-product on-hand quantity and value under the given method"""
+    sync_valuation(db)
+
+    fifo_value = db.query(
+        CostLayer.product_id,
+        func.sum(CostLayer.unit_cost * CostLayer.quantity_remaining).label("value")
+    ).group_by(CostLayer.product_id).subquery()
+
+    rows = db.query(
+        Product.id.label("product_id"),
+        Product.name.label("product_name"),
+        func.coalesce(ValuationState.quantity_on_hand, 0).label("quantity"),
+        func.coalesce(fifo_value.c.value, 0).label("fifo_value"),
+        func.coalesce(ValuationState.average_cost_total, 0).label("average_value")
+    ).outerjoin(
+        ValuationState, ValuationState.product_id == Product.id
+    ).outerjoin(
+        fifo_value, fifo_value.c.product_id == Product.id
+    ).order_by(Product.name).all()
+
+    products = []
+    total = Money(0)
+    for row in rows:
+        value = Money.from_paisa(row.fifo_value if method == "fifo" else row.average_value)
+        total += value
+        products.append({
+            "product_id": row.product_id,
+            "product_name": row.product_name,
+            "quantity": row.quantity,
+            "value": value.to_decimal(),
+            "unit_cost": (Money(value.paisa // row.quantity) if row.quantity > 0 else Money(0)).to_decimal()
+        })
+
+    return {
+        "method": method,
+        "total_value": total.to_decimal(),
+        "products": products
+    }
+
+def get_inventory_value(db: Session, method: str = "fifo") -> Money:
+    """Total on-hand inventory value under the given method"""
+    sync_valuation(db)
+    if method == "fifo":
+        value = db.query(func.sum(CostLayer.unit_cost * CostLayer.quantity_remaining)).scalar()
+    else:
+        value = db.query(func.sum(ValuationState.average_cost_total)).scalar()
+    return Money.from_paisa(value)
+
+def get_period_cogs(db: Session, start_date: date, end_date: date) -> dict:
+    """Cost of goods sold in a date range under FIFO and moving average"""
+    sync_valuation(db)
+    result = db.query(
+        func.sum(CogsEntry.fifo_cost).label("fifo"),
+        func.sum(CogsEntry.average_cost).label("average")
+    ).filter(
+        CogsEntry.occurred_at >= day_start(start_date),
+        CogsEntry.occurred_at < day_start(end_date + timedelta(days=1))
+    ).first()
+    return {
+        "fifo": Money.from_paisa(result.fifo),
+        "average": Money.from_paisa(result.average)
+    }
@@ -0,0 +1,177 @@
+"""
+Analytical mirror for heavy reports
+
+With REPORT_BACKEND=duckdb, report aggregations over closed days (period
+summaries, period comparisons, custom-range leaderboards) run against an
+embedded DuckDB file instead of the primary database, so multi-year scans
+do not compete with checkout writes. The mirror holds copies of the sales
+and expenses tables under the same names and columns, so the report
+queries in crud_report run unchanged on a mirror session.
+
+The mirror is refreshed incrementally: rows whose updated_at moved past
+the previous watermark (minus MIRROR_OVERLAP, as for delta sync) are
+upserted, and sales of hard-deleted products (sync tombstones) are
+removed. A report refreshes the mirror first when the last refresh is
+older than ANALYTICS_MIRROR_REFRESH_SECONDS. Days that are still open are
+always read from the primary database.
+
+DuckDB allows one writing process per file: the mirror belongs to the API
+process. Needs the optional duckdb and duckdb-engine packages
+(requirements-analytics.txt).
+"""
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from typing import Iterator, Optional
+
+from sqlalchemy import Column, DateTime, MetaData, Table, Text, create_engine, delete, event, func, insert, inspect, select
+from sqlalchemy.orm import Session, sessionmaker
+
+from app.core.config import settings
+from app.crud import crud_export
+from app.models.models import Sale, Expense, Product, SyncTombstone
+
+logger = logging.getLogger(__name__)
+
+MIRRORED = (Sale.__table__, Expense.__table__)
+MIRROR_OVERLAP = timedelta(seconds=10)
+REFRESH_BATCH_ROWS = 50_000
+
+def _as_datetime(value) -> datetime:
+    """func.now() result as a datetime (SQLite returns a string)"""
+    return value if isinstance(value, datetime) else datetime.fromisoformat(str(value))
+
+class AnalyticsMirror:
+    """DuckDB copy of the report tables, refreshed from the primary database by watermark"""
+
+    def __init__(self, path: str, refresh_seconds: float = 60, timezone: str = "UTC"):
+        try:
+            import duckdb_engine  # noqa: F401 - registers the duckdb:// dialect
+        except ImportError as e:
+            raise RuntimeError(
+                "REPORT_BACKEND=duckdb needs the duckdb and duckdb-engine packages "
+                "(pip install -r requirements-analytics.txt)"
+            ) from e
+        self.engine = create_engine(f"duckdb:///{path}")
+        self.refresh_seconds = refresh_seconds
+        self.refreshes = 0
+
+        @event.listens_for(self.engine, "connect")
+        def _on_connect(dbapi_connection, connection_record):
+            # func.date() must group by the same calendar days as the primary
+            dbapi_connection.execute(f"SET TimeZone = '{timezone}'")
+
+        self.metadata = MetaData()
+        for table in MIRRORED:
+            # Columns only: no foreign keys or checks on a read copy
+            Table(table.name, self.metadata, *[
+                Column(column.name, column.type, primary_key=column.primary_key) for column in table.columns
+            ])
+        self.state = Table(
+            "mirror_state", self.metadata,
+            Column("table_name", Text, primary_key=True),
+            Column("watermark", DateTime(timezone=True), nullable=False)
+        )
+        self._drop_outdated_tables()
+        self.metadata.create_all(self.engine)
+        self.Session = sessionmaker(autocommit=False, autoflush=False, bind=self.engine)
+        self._lock = threading.Lock()
+        self._refreshed_at = None
+
+    def _drop_outdated_tables(self):
+        """A mirrored table whose columns changed upstream is rebuilt by a full refresh"""
+        existing = inspect(self.engine)
+        outdated = [
+            table.name for table in MIRRORED
+            if existing.has_table(table.name)
+            and [column["name"] for column in existing.get_columns(table.name)] != [column.name for column in table.columns]
+        ]
+        if outdated:
+            with self.engine.begin() as mirror:
+                for name in outdated:
+                    self.metadata.tables[name].drop(mirror)
+                if existing.has_table(self.state.name):
+                    mirror.execute(delete(self.state))
+
+    def refresh(self, db: Session) -> dict:
+        """Copy rows changed since the last refresh; returns rows copied per table"""
+        with self._lock:
+            now = _as_datetime(db.query(func.now()).scalar())
+            with self.engine.begin() as mirror:
+                watermarks = dict(mirror.execute(select(self.state.c.table_name, self.state.c.watermark)).all())
+                copied = {table.name: self._copy_changed(db, mirror, table, watermarks.get(table.name)) for table in MIRRORED}
+                self._drop_deleted_products(db, mirror, watermarks.get(SyncTombstone.__tablename__))
+                mirror.execute(delete(self.state))
+                mirror.execute(insert(self.state), [
+                    {"table_name": name, "watermark": now}
+                    for name in [table.name for table in MIRRORED] + [SyncTombstone.__tablename__]
+                ])
+            self._refreshed_at = time.monotonic()
+            self.refreshes += 1
+        logger.info("Analytics mirror refreshed: %s", copied)
+        return copied
+
+    def _copy_changed(self, db: Session, mirror, table: Table, since: Optional[datetime]) -> int:
+        """
+        Stream rows changed since `since` from a server-side cursor and
+        upsert them batch by batch as Arrow record batches (a columnar bulk
+        append; row-by-row INSERTs are far too slow into DuckDB)
+        """
+        columns = list(table.columns)
+        query = select(*columns)
+        if since is not None:
+            query = query.where(table.c.updated_at > since - MIRROR_OVERLAP)
+        schema = crud_export.arrow_schema(columns)
+        duck = mirror.connection.driver_connection
+        copied = 0
+        result = db.execute(query.execution_options(stream_results=True, yield_per=REFRESH_BATCH_ROWS))
+        for rows in result.partitions():
+            duck.register("mirror_batch", crud_export.record_batch(rows, schema))
+            duck.execute(f"INSERT OR REPLACE INTO {table.name} SELECT * FROM mirror_batch")
+            duck.unregister("mirror_batch")
+            copied += len(rows)
+        return copied
+
+    def _drop_deleted_products(self, db: Session, mirror, since: Optional[datetime]):
+        """Sales cascade away with a hard-deleted product (or company): drop them from the mirror too"""
+        if since is None:
+            return
+        deleted = db.query(SyncTombstone.id).filter(SyncTombstone.deleted_at > since - MIRROR_OVERLAP).first()
+        if deleted is None:
+            return
+        products = [row[0] for row in db.query(Product.id).all()]
+        sales = self.metadata.tables[Sale.__tablename__]
+        mirror.execute(delete(sales).where(sales.c.product_id != None, sales.c.product_id.not_in(products)))
+
+    def is_stale(self) -> bool:
+        return self._refreshed_at is None or time.monotonic() - self._refreshed_at >= self.refresh_seconds
+
+    @contextmanager
+    def session(self, db: Session) -> Iterator[Session]:
+        """Read-only mirror session, refreshed from `db` first when stale"""
+        if self.is_stale():
+            self.refresh(db)
+        mirror = self.Session()
+        try:
+            yield mirror
+        finally:
+            mirror.close()
+
+_mirror: Optional[AnalyticsMirror] = None
+_mirror_lock = threading.Lock()
+
+def get_mirror() -> Optional[AnalyticsMirror]:
+    """The process-wide mirror when REPORT_BACKEND=duckdb, else None"""
+    global _mirror
+    if settings.REPORT_BACKEND != "duckdb":
+        return None
+    with _mirror_lock:
+        if _mirror is None:
+            _mirror = AnalyticsMirror(
+                settings.ANALYTICS_MIRROR_PATH,
+                refresh_seconds=settings.ANALYTICS_MIRROR_REFRESH_SECONDS,
+                timezone=settings.ANALYTICS_MIRROR_TIMEZONE
+            )
+    return _mirror
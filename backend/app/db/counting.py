@@ -0,0 +1,52 @@
+"""
+Total counts for paged lists
+
+An exact COUNT(*) over a large filtered range reads every matching row. The
+count is first taken over at most EXACT_COUNT_LIMIT + 1 rows; only when
+that cap is hit does PostgreSQL fall back to the planner's row estimate
+(EXPLAIN), which costs no table access. Other databases always count
+exactly.
+"""
+import json
+import uuid
+from typing import Optional, Tuple
+
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+from sqlalchemy.sql import Select
+
+EXACT_COUNT_LIMIT = 10_000
+
+
+def planner_estimate(db: Session, query: Select) -> Optional[int]:
+    """Row count PostgreSQL's planner expects for `query`, or None on other databases"""
+    dialect = db.get_bind().dialect
+    if dialect.name != "postgresql":
+        return None
+    compiled = query.compile(dialect=dialect)
+    params = {
+        name: str(value) if isinstance(value, uuid.UUID) else value
+        for name, value in compiled.params.items()
+    }
+    plan = db.connection().exec_driver_sql(f"EXPLAIN (FORMAT JSON) {compiled}", params).scalar()
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return int(plan[0]["Plan"]["Plan Rows"])
+
+
+def count_with_estimate(db: Session, query: Select, exact_limit: int = EXACT_COUNT_LIMIT) -> Tuple[int, bool]:
+    """
+    (total, estimated) for the rows of `query` (without offset/limit/order).
+    Exact up to `exact_limit`; beyond that a planner estimate where available.
+    """
+    query = query.order_by(None)
+    capped = db.execute(
+        select(func.count()).select_from(query.limit(exact_limit + 1).subquery())
+    ).scalar()
+    if capped <= exact_limit:
+        return capped, False
+
+    estimate = planner_estimate(db, query)
+    if estimate is None:
+        return db.execute(select(func.count()).select_from(query.subquery())).scalar(), False
+    return max(estimate, capped), True
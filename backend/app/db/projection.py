@@ -0,0 +1,20 @@
+"""
+Column projections for read-only list queries
+
+List endpoints only serialize a handful of columns. Selecting exactly those
+columns returns plain Core rows: no entity construction, identity map,
+attribute instrumentation or relationship loaders. FastAPI validates the
+rows against the response schema by attribute name (from_attributes).
+"""
+from typing import Type
+
+from pydantic import BaseModel
+
+
+def columns_for(model, schema: Type[BaseModel]) -> list:
+    """The model's columns for every field of `schema`, labelled with the field name"""
+    return [
+        getattr(model, name).label(name)
+        for name in schema.model_fields
+        if hasattr(model, name)
+    ]
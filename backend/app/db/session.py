@@ -1,17 +1,81 @@
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import Engine, make_url
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.orm import Session, sessionmaker
+from fastapi import Request
 from app.core.config import settings
 
-# engine = create_engine(settings.DATABASE_URL, connect_args={"check_same_thread": False}) # SQLite version
-engine = create_engine(settings.DATABASE_URL)
+# Execution option set by begin_write()
+WRITE_TRANSACTION = "write_transaction"
+
+def configure_sqlite(engine):
+    """
+    Make a file-backed SQLite engine safe for concurrent writers: WAL lets
+    readers run alongside the writer and busy_timeout waits for the write
+    lock instead of failing. Write transactions (begin_write) start with
+    BEGIN IMMEDIATE, taking that lock up front so a read-then-write cannot
+    hit a stale snapshot; all other transactions keep the deferred BEGIN.
+    """
+    @event.listens_for(engine, "connect")
+    def _on_connect(dbapi_connection, connection_record):
+        # Let SQLAlchemy emit BEGIN itself (pysqlite defers it otherwise)
+        dbapi_connection.isolation_level = None
+        cursor = dbapi_connection.cursor()
+        cursor.execute("PRAGMA journal_mode=WAL")
+        cursor.execute("PRAGMA busy_timeout=30000")
+        cursor.close()
+
+    @event.listens_for(engine, "begin")
+    def _on_begin(connection):
+        if connection.get_execution_options().get(WRITE_TRANSACTION):
+            connection.exec_driver_sql("BEGIN IMMEDIATE")
+        else:
+            connection.exec_driver_sql("BEGIN")
+
+    return engine
+
+def begin_write(db: Session):
+    """
+    Mark the session's next transaction as a write transaction (BEGIN
+    IMMEDIATE on SQLite, nothing different elsewhere). Call before the first
+    query of a read-then-write unit; no-op once the transaction has begun.
+    """
+    # Rebinding to an option engine keeps the BEGIN lazy (a session bound
+    # to a Connection, as in tests, already runs inside its transaction)
+    if not db.in_transaction() and isinstance(db.bind, Engine):
+        db.bind = db.bind.execution_options(**{WRITE_TRANSACTION: True})
+
+def write_session(db: Session) -> Session:
+    """
+    New session on `db`'s engine (or test connection) for a short write
+    transaction of its own. Read requests store derived data (valuation
+    sync, report day cache) through it instead of committing the request
+    session. On SQLite a read transaction keeps the snapshot of its first
+    query, so use it before the request session's first read when that
+    session reads the stored rows back. Use as a context manager.
+    """
+    session = Session(bind=db.get_bind(), autoflush=False)
+    begin_write(session)
+    return session
+
+def make_engine(database_url: str, **kwargs):
+    """Engine for DATABASE_URL, with the SQLite concurrency settings applied when needed"""
+    if make_url(database_url).get_backend_name() == "sqlite":
+        kwargs.setdefault("connect_args", {"check_same_thread": False})
+        return configure_sqlite(create_engine(database_url, **kwargs))
+    return create_engine(database_url, **kwargs)
+
+engine = make_engine(settings.DATABASE_URL)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
 Base = declarative_base()
 
 # Dependency to get DB session
-def get_db():
+def get_db(request: Request):
     db = SessionLocal()
+    # Writes take the SQLite write lock up front; reads stay deferred
+    if request.method not in ("GET", "HEAD", "OPTIONS"):
+        begin_write(db)
     try:
         yield db
     finally:
@@ -1,36 +1,75 @@
-import uuid
-from sqlalchemy import Column, String, Integer, Numeric, ForeignKey, DateTime, Text, CheckConstraint, Boolean
+from sqlalchemy import Column, String, Integer, BigInteger, Numeric, ForeignKey, DateTime, Date, Text, CheckConstraint, Boolean, Index, UniqueConstraint
 from sqlalchemy.dialects.postgresql import UUID
-from sqlalchemy.sql import func
+from sqlalchemy.sql import func, text
 from sqlalchemy.orm import relationship
 from app.db.session import Base
+from app.core.ids import uuid7  # time-ordered keys: PK inserts append to the index instead of random pages
 
 class Company(Base):
     __tablename__ = "companies"
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid7)
     name = Column(Text, nullable=False)
     logo = Column(Text, nullable=True)  # Store logo filename (e.g., "Bayer.png")
     created_at = Column(DateTime(timezone=True), server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), index=True)  # Delta sync
     
     products = relationship("Product", back_populates="company")
 
 class Product(Base):
     __tablename__ = "products"
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid7)
     company_id = Column(UUID(as_uuid=True), ForeignKey("companies.id"))
     name = Column(Text, nullable=False)
     category = Column(Text)
     unit = Column(Text, nullable=False)
     purchase_price = Column(Numeric(12, 2), default=0.0)
     min_stock = Column(Integer, default=5)
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), index=True)  # Delta sync
 
     company = relationship("Company", back_populates="products")
     transactions = relationship("StockTransaction", back_populates="product", cascade="all, delete-orphan")
     sales = relationship("Sale", back_populates="product", cascade="all, delete-orphan")
+    stock_snapshots = relationship("StockSnapshot", back_populates="product", cascade="all, delete-orphan")
+    price_history = relationship("ProductPriceHistory", back_populates="product", cascade="all, delete-orphan")
+    stock = relationship("ProductStock", back_populates="product", uselist=False, cascade="all, delete-orphan")
+
+class ProductStock(Base):
+    """
+    On-hand quantity per product, kept in step with the stock ledger.
+    Sales decrement it with a conditional UPDATE so concurrent sales of the
+    same product cannot take it below zero.
+    """
+    __tablename__ = "product_stock"
+    product_id = Column(UUID(as_uuid=True), ForeignKey("products.id", ondelete="CASCADE"), primary_key=True)
+    quantity = Column(Integer, nullable=False, default=0)
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+
+    product = relationship("Product", back_populates="stock")
+
+class ProductPriceHistory(Base):
+    """Purchase price of a product effective from a point in time"""
+    __tablename__ = "product_price_history"
+    __table_args__ = (
+        # As-of lookups: latest row with effective_at <= t is a single index probe
+        Index("idx_product_price_history_product_effective", "product_id", "effective_at"),
+    )
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid7)
+    product_id = Column(UUID(as_uuid=True), ForeignKey("products.id", ondelete="CASCADE"), nullable=False)
+    purchase_price = Column(Numeric(12, 2), nullable=False)
+    effective_at = Column(DateTime(timezone=True), nullable=False)
+    # IN receipt that set this price (NULL for manual product edits)
+    transaction_id = Column(UUID(as_uuid=True), ForeignKey("stock_transactions.id", ondelete="CASCADE"), nullable=True)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+
+    product = relationship("Product", back_populates="price_history")
 
 class StockTransaction(Base):
     __tablename__ = "stock_transactions"
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    __table_args__ = (
+        # Per-product ledger range scans (as-of balances, running history)
+        Index("idx_stock_transactions_product_created", "product_id", "created_at"),
+    )
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid7)
     product_id = Column(UUID(as_uuid=True), ForeignKey("products.id"))
     quantity = Column(Integer, nullable=False)
     party_name = Column(Text)
@@ -42,13 +81,119 @@ class StockTransaction(Base):
     # Soft delete support - for maintaining complete historical logs
     is_deleted = Column(Boolean, default=False, nullable=False)
     deleted_at = Column(DateTime(timezone=True), nullable=True)
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), index=True)  # Delta sync
 
     product = relationship("Product", back_populates="transactions")
     sale = relationship("Sale", back_populates="stock_transaction")
 
+class StockSnapshot(Base):
+    """Closing stock balance of a product at the end of a period (e.g. month-end)"""
+    __tablename__ = "stock_snapshots"
+    __table_args__ = (
+        UniqueConstraint("product_id", "snapshot_date", name="uq_stock_snapshots_product_date"),
+    )
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid7)
+    product_id = Column(UUID(as_uuid=True), ForeignKey("products.id", ondelete="CASCADE"), nullable=False)
+    snapshot_date = Column(Date, nullable=False)  # Balance as of the end of this day
+    cutoff_at = Column(DateTime(timezone=True), nullable=False)  # Covers transactions created before this instant
+    balance = Column(Integer, nullable=False)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+
+    product = relationship("Product", back_populates="stock_snapshots")
+
+class ValuationState(Base):
+    """Per-product inventory valuation state - how far the ledger has been processed"""
+    __tablename__ = "valuation_states"
+    product_id = Column(UUID(as_uuid=True), ForeignKey("products.id", ondelete="CASCADE"), primary_key=True)
+    # Ledger watermark: last processed (created_at, id)
+    last_created_at = Column(DateTime(timezone=True), nullable=True)
+    last_transaction_id = Column(UUID(as_uuid=True), nullable=True)
+    # last_created_at - VALUATION_OVERLAP: rows after this are rechecked for late commits
+    recheck_from = Column(DateTime(timezone=True), nullable=True)
+    quantity_on_hand = Column(Integer, nullable=False, default=0)
+    fifo_deficit = Column(Integer, nullable=False, default=0)  # Units sold beyond the available cost layers
+    average_cost_total = Column(BigInteger, nullable=False, default=0)  # Paisa - moving-average value of on-hand stock
+    last_unit_cost = Column(BigInteger, nullable=False, default=0)  # Paisa - fallback when a row has no price
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+
+class CostLayer(Base):
+    """
+    FIFO cost layer - remaining units of one IN receipt. Exhausted layers are
+    kept until they fall behind the product's recheck window, as the marker
+    that their receipt was valued.
+    """
+    __tablename__ = "cost_layers"
+    __table_args__ = (
+        Index("idx_cost_layers_product_received", "product_id", "received_at"),
+        # One layer per receipt: concurrent syncs cannot value a receipt twice
+        Index("uq_cost_layers_transaction", "transaction_id", unique=True),
+    )
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid7)
+    product_id = Column(UUID(as_uuid=True), ForeignKey("products.id", ondelete="CASCADE"), nullable=False)
+    transaction_id = Column(UUID(as_uuid=True), ForeignKey("stock_transactions.id", ondelete="CASCADE"), nullable=False)
+    received_at = Column(DateTime(timezone=True), nullable=False)
+    unit_cost = Column(BigInteger, nullable=False)  # Paisa
+    quantity_remaining = Column(Integer, nullable=False)
+
+class CogsEntry(Base):
+    """Cost of goods sold for one OUT ledger row, under both valuation methods"""
+    __tablename__ = "cogs_entries"
+    transaction_id = Column(UUID(as_uuid=True), ForeignKey("stock_transactions.id", ondelete="CASCADE"), primary_key=True)
+    product_id = Column(UUID(as_uuid=True), ForeignKey("products.id", ondelete="CASCADE"), nullable=False)
+    occurred_at = Column(DateTime(timezone=True), nullable=False, index=True)
+    quantity = Column(Integer, nullable=False)
+    fifo_cost = Column(BigInteger, nullable=False)  # Paisa
+    average_cost = Column(BigInteger, nullable=False)  # Paisa
+
+class ReorderDraft(Base):
+    """
+    Purchase order to one supplier (the products' company) drafted from the
+    reorder planner. Lines can be edited while it is a draft; receiving it
+    writes one IN stock transaction per line.
+    """
+    __tablename__ = "reorder_drafts"
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid7)
+    company_id = Column(UUID(as_uuid=True), ForeignKey("companies.id", ondelete="SET NULL"), nullable=True, index=True)
+    status = Column(Text, CheckConstraint("status IN ('draft', 'received', 'cancelled')"), nullable=False, default='draft')
+    # Planner settings the suggestions were computed with
+    lead_time_days = Column(Integer, nullable=False)
+    safety_days = Column(Integer, nullable=False)
+    review_days = Column(Integer, nullable=False)
+    line_count = Column(Integer, nullable=False, default=0)
+    total_quantity = Column(Integer, nullable=False, default=0)
+    total_cost = Column(Numeric(14, 2), nullable=False, default=0)  # sum(unit_cost * quantity)
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), index=True)
+    received_at = Column(DateTime(timezone=True), nullable=True)
+
+    lines = relationship("ReorderDraftLine", back_populates="draft", cascade="all, delete-orphan", order_by="ReorderDraftLine.id")
+
+class ReorderDraftLine(Base):
+    __tablename__ = "reorder_draft_lines"
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid7)
+    draft_id = Column(UUID(as_uuid=True), ForeignKey("reorder_drafts.id", ondelete="CASCADE"), nullable=False, index=True)
+    product_id = Column(UUID(as_uuid=True), ForeignKey("products.id", ondelete="CASCADE"), nullable=False)
+    suggested_quantity = Column(Integer, nullable=False)
+    quantity = Column(Integer, nullable=False)  # what will be ordered (edited suggestion)
+    unit_cost = Column(Numeric(12, 2), nullable=False)
+    transaction_id = Column(UUID(as_uuid=True), ForeignKey("stock_transactions.id", ondelete="SET NULL"), nullable=True)  # IN row written on receipt
+
+    draft = relationship("ReorderDraft", back_populates="lines")
+
+    __table_args__ = (UniqueConstraint("draft_id", "product_id", name="uq_reorder_draft_line_product"),)
+
 class Sale(Base):
     __tablename__ = "sales"
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    __table_args__ = (
+        # Per-customer credit scans in date order (aging report); customers are
+        # identified by normalized name, same as customers.name_key
+        Index("idx_sales_customer_created", func.lower(func.trim(text("customer_name"))), "created_at", "customer_phone"),
+        # Sales list: newest-first paging and date ranges over live rows,
+        # optionally narrowed by product or payment type
+        Index("idx_sales_live_created", "created_at", "id", postgresql_where=text("is_deleted = false")),
+        Index("idx_sales_product_created", "product_id", "created_at"),
+        Index("idx_sales_payment_created", "payment_type", "created_at"),
+    )
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid7)
     product_id = Column(UUID(as_uuid=True), ForeignKey("products.id"))
     customer_name = Column(Text, nullable=False)
     customer_phone = Column(String(11))
@@ -58,31 +203,180 @@ class Sale(Base):
     total_amount = Column(Numeric(12, 2), nullable=False)
     payment_type = Column(Text, CheckConstraint("payment_type IN ('Credit', 'Debit')"))
     created_at = Column(DateTime(timezone=True), server_default=func.now())
+    invoice_id = Column(UUID(as_uuid=True), ForeignKey("sale_invoices.id"), nullable=True, index=True)  # Line of a multi-line invoice
     
     # Soft delete support - for maintaining complete historical logs
     is_deleted = Column(Boolean, default=False, nullable=False)
     deleted_at = Column(DateTime(timezone=True), nullable=True)
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), index=True)  # Delta sync
 
     product = relationship("Product", back_populates="sales")
     stock_transaction = relationship("StockTransaction", back_populates="sale", uselist=False, cascade="all, delete")
+    invoice = relationship("SaleInvoice", back_populates="lines")
+
+class SaleInvoice(Base):
+    """Header of a multi-line sale; each line is a Sale row with invoice_id set"""
+    __tablename__ = "sale_invoices"
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid7)
+    customer_name = Column(Text, nullable=False)
+    customer_phone = Column(String(11))
+    payment_type = Column(Text, CheckConstraint("payment_type IN ('Credit', 'Debit')"))
+    # Totals over the live lines, stored so listings and reports read one row per invoice
+    line_count = Column(Integer, nullable=False, default=0)
+    total_quantity = Column(Integer, nullable=False, default=0)
+    total_amount = Column(Numeric(14, 2), nullable=False, default=0)
+    total_cost = Column(Numeric(14, 2), nullable=False, default=0)  # sum(purchase_price * quantity)
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), index=True)
+    
+    # Soft delete support - for maintaining complete historical logs
+    is_deleted = Column(Boolean, default=False, nullable=False)
+    deleted_at = Column(DateTime(timezone=True), nullable=True)
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), index=True)  # Delta sync
+
+    lines = relationship("Sale", back_populates="invoice")
+
+class Customer(Base):
+    """Credit customer, identified by normalized name (matches how the Payments page groups sales)"""
+    __tablename__ = "customers"
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid7)
+    name = Column(Text, nullable=False)
+    name_key = Column(Text, nullable=False, unique=True)  # lower(trim(name))
+    phone = Column(String(11), nullable=True)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), index=True)  # Delta sync
+
+    balance = relationship("CustomerBalance", back_populates="customer", uselist=False, cascade="all, delete-orphan")
+    payments = relationship("CustomerPayment", back_populates="customer", cascade="all, delete-orphan")
+
+class CustomerPayment(Base):
+    """Money received from a customer against credit sales"""
+    __tablename__ = "customer_payments"
+    __table_args__ = (
+        Index("idx_customer_payments_customer_paid", "customer_id", "paid_at"),
+    )
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid7)
+    customer_id = Column(UUID(as_uuid=True), ForeignKey("customers.id", ondelete="CASCADE"), nullable=False)
+    amount = Column(Numeric(12, 2), nullable=False)
+    notes = Column(Text, nullable=True)
+    paid_at = Column(DateTime(timezone=True), server_default=func.now())
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    
+    # Soft delete support - for maintaining complete historical logs
+    is_deleted = Column(Boolean, default=False, nullable=False)
+    deleted_at = Column(DateTime(timezone=True), nullable=True)
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), index=True)  # Delta sync
+
+    customer = relationship("Customer", back_populates="payments")
+
+class CustomerBalance(Base):
+    """Running receivables totals per customer, maintained on sale and payment writes"""
+    __tablename__ = "customer_balances"
+    customer_id = Column(UUID(as_uuid=True), ForeignKey("customers.id", ondelete="CASCADE"), primary_key=True)
+    total_credit = Column(Numeric(14, 2), nullable=False, default=0)  # Credit sales
+    total_cash = Column(Numeric(14, 2), nullable=False, default=0)  # Debit (paid on the spot) sales
+    total_paid = Column(Numeric(14, 2), nullable=False, default=0)  # Payments received against credit
+    outstanding = Column(Numeric(14, 2), nullable=False, default=0, index=True)  # total_credit - total_paid
+    sales_count = Column(Integer, nullable=False, default=0)
+    last_transaction_at = Column(DateTime(timezone=True), nullable=True)
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), index=True)  # Delta sync
+
+    customer = relationship("Customer", back_populates="balance")
 
 class Expense(Base):
     __tablename__ = "expenses"
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid7)
     name = Column(Text, nullable=False)
     amount = Column(Numeric(12, 2), nullable=False)  # Can be negative (expense) or positive (income/gift)
     quantity = Column(Integer, default=1)
     details = Column(Text, nullable=True)
+    category = Column(Text, nullable=True)  # NULL on rows that predate categories ("General")
     expense_date = Column(DateTime(timezone=True), server_default=func.now())
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     
     # Soft delete support - for maintaining complete historical logs
     is_deleted = Column(Boolean, default=False, nullable=False)
     deleted_at = Column(DateTime(timezone=True), nullable=True)
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), index=True)  # Delta sync
+
+class ExpenseMonthlyRollup(Base):
+    """
+    Live expense totals per calendar month and category, kept in step with
+    the expenses table on every create, update and delete so analytics
+    never scan the raw rows
+    """
+    __tablename__ = "expense_monthly_rollups"
+    month = Column(Date, primary_key=True)  # first day of the month
+    category = Column(Text, primary_key=True)
+    expense_total = Column(Numeric(14, 2), nullable=False, default=0)  # sum of negative amounts
+    income_total = Column(Numeric(14, 2), nullable=False, default=0)  # sum of positive amounts
+    count = Column(Integer, nullable=False, default=0)
+
+class DailyReportCache(Base):
+    """
+    Sales and expense totals of one closed day (integer paisa and counts),
+    reused by period reports. Writes that touch a day delete its row.
+    """
+    __tablename__ = "daily_report_cache"
+    day = Column(Date, primary_key=True)
+    sales_count = Column(BigInteger, nullable=False, default=0)
+    quantity_sold = Column(BigInteger, nullable=False, default=0)
+    revenue = Column(BigInteger, nullable=False, default=0)
+    cost = Column(BigInteger, nullable=False, default=0)
+    gross_profit = Column(BigInteger, nullable=False, default=0)
+    total_credit = Column(BigInteger, nullable=False, default=0)
+    total_cash = Column(BigInteger, nullable=False, default=0)
+    credit_count = Column(BigInteger, nullable=False, default=0)
+    cash_count = Column(BigInteger, nullable=False, default=0)
+    total_expenses = Column(BigInteger, nullable=False, default=0)
+    total_income = Column(BigInteger, nullable=False, default=0)
+    net_expense = Column(BigInteger, nullable=False, default=0)
+    expense_count = Column(BigInteger, nullable=False, default=0)
+    computed_at = Column(DateTime(timezone=True), server_default=func.now())
+
+class LeaderboardCounter(Base):
+    """
+    Per-day sales totals of one product or customer for the days of the
+    current week and month, kept in step with sales writes so the
+    today / this week / this month leaderboards never scan the sales table
+    """
+    __tablename__ = "leaderboard_counters"
+    day = Column(Date, primary_key=True)
+    entity = Column(String(10), primary_key=True)  # 'product' or 'customer'
+    entity_key = Column(Text, primary_key=True)  # product id, or customer name key (lower(trim(name)))
+    revenue = Column(BigInteger, nullable=False, default=0)  # Paisa
+    profit = Column(BigInteger, nullable=False, default=0)  # Paisa
+    credit = Column(BigInteger, nullable=False, default=0)  # Paisa
+    quantity = Column(BigInteger, nullable=False, default=0)
+    sales_count = Column(Integer, nullable=False, default=0)
+
+class SyncTombstone(Base):
+    """Hard-deleted row (companies, products) reported to delta sync clients"""
+    __tablename__ = "sync_tombstones"
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid7)
+    table_name = Column(Text, nullable=False)
+    row_id = Column(UUID(as_uuid=True), nullable=False)
+    deleted_at = Column(DateTime(timezone=True), server_default=func.now(), index=True)
+
+class IdempotencyKey(Base):
+    """Stored outcome of a POST made with an Idempotency-Key header"""
+    __tablename__ = "idempotency_keys"
+    __table_args__ = (
+        # Concurrent duplicates: the second insert fails and its transaction
+        # (including the sale it was creating) rolls back
+        UniqueConstraint("key", "endpoint", name="uq_idempotency_keys_key_endpoint"),
+    )
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid7)
+    key = Column(Text, nullable=False)
+    endpoint = Column(Text, nullable=False)  # e.g. "POST /sales"
+    request_hash = Column(Text, nullable=False)  # sha256 of the request body
+    status_code = Column(Integer, nullable=True)  # NULL until the response is stored
+    response_body = Column(Text, nullable=True)  # JSON
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    expires_at = Column(DateTime(timezone=True), nullable=False, index=True)
 
 class User(Base):
     __tablename__ = "users"
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid7)
     full_name = Column(String, index=True)
     email = Column(String, unique=True, index=True, nullable=False)
     hashed_password = Column(String, nullable=False)
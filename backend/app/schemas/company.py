@@ -1,7 +1,8 @@
 from pydantic import BaseModel, ConfigDict
 from uuid import UUID
-from datetime import datetime
-from typing import Optional
+from datetime import date, datetime
+from decimal import Decimal
+from typing import List, Optional
 
 class CompanyBase(BaseModel):
     name: str
@@ -18,3 +19,20 @@ class Company(CompanyBase):
     created_at: datetime
 
     model_config = ConfigDict(from_attributes=True)
+
+class CompanySummary(BaseModel):
+    company_id: UUID
+    company_name: str
+    product_count: int
+    total_stock: int
+    stock_value: Decimal
+    low_stock_count: int
+    sales_count: int
+    quantity_sold: int
+    revenue: Decimal
+    profit: Decimal
+
+class CompanySummaryReport(BaseModel):
+    start_date: Optional[date] = None
+    end_date: Optional[date] = None
+    companies: List[CompanySummary]
@@ -0,0 +1,47 @@
+from pydantic import BaseModel, ConfigDict, Field
+from uuid import UUID
+from datetime import datetime
+from typing import Optional, List
+from decimal import Decimal
+
+# --- Customer Payment Schemas ---
+class CustomerPaymentCreate(BaseModel):
+    customer_name: str = Field(..., min_length=1)
+    customer_phone: Optional[str] = None
+    amount: Decimal = Field(..., gt=0, description="Amount received from the customer")
+    notes: Optional[str] = None
+    paid_at: Optional[datetime] = Field(None, description="Date of payment (defaults to now)")
+
+class CustomerPayment(BaseModel):
+    id: UUID
+    customer_id: UUID
+    amount: Decimal
+    notes: Optional[str] = None
+    paid_at: datetime
+    created_at: datetime
+
+    model_config = ConfigDict(from_attributes=True)
+
+# --- Customer Balance Schemas ---
+class CustomerBalance(BaseModel):
+    customer_id: UUID
+    customer_name: str
+    customer_phone: Optional[str] = None
+    total_credit: Decimal
+    total_cash: Decimal
+    total_paid: Decimal
+    outstanding: Decimal
+    sales_count: int
+    last_transaction_at: Optional[datetime] = None
+
+    model_config = ConfigDict(from_attributes=True)
+
+class CustomerBalancePage(BaseModel):
+    total: int
+    skip: int
+    limit: int
+    total_outstanding: Decimal
+    total_paid: Decimal
+    customers_with_debt: int
+    total_customers: int
+    items: List[CustomerBalance]
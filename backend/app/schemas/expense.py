@@ -1,7 +1,7 @@
 from pydantic import BaseModel, Field
 from uuid import UUID
-from datetime import datetime
-from typing import Optional
+from datetime import date, datetime
+from typing import List, Literal, Optional
 from decimal import Decimal
 
 class ExpenseBase(BaseModel):
@@ -9,6 +9,7 @@ class ExpenseBase(BaseModel):
     amount: Decimal = Field(..., description="Amount - negative for expenses, positive for income/gifts")
     quantity: int = Field(default=1, ge=1, description="Quantity of items")
     details: Optional[str] = Field(None, description="Additional details about the expense")
+    category: Optional[str] = Field(None, max_length=100, description="Expense category (defaults to General)")
     expense_date: Optional[datetime] = Field(None, description="Date of expense (defaults to now)")
 
 class ExpenseCreate(ExpenseBase):
@@ -19,6 +20,7 @@ class ExpenseUpdate(BaseModel):
     amount: Optional[Decimal] = None
     quantity: Optional[int] = Field(None, ge=1)
     details: Optional[str] = None
+    category: Optional[str] = Field(None, max_length=100)
     expense_date: Optional[datetime] = None
 
 class Expense(ExpenseBase):
@@ -29,3 +31,25 @@ class Expense(ExpenseBase):
     
     class Config:
         from_attributes = True
+
+
+class ExpenseTotals(BaseModel):
+    expense_total: Decimal  # negative: money out
+    income_total: Decimal
+    net: Decimal
+    count: int
+
+class ExpenseCategoryTotals(ExpenseTotals):
+    category: str
+
+class ExpensePeriod(ExpenseTotals):
+    period: str  # 2026-10, 2026-Q4 or 2026
+    start_date: date
+    categories: List[ExpenseCategoryTotals]
+
+class ExpenseAnalytics(ExpenseTotals):
+    period_type: Literal['month', 'quarter', 'year']
+    start_date: Optional[date] = None
+    end_date: Optional[date] = None
+    periods: List[ExpensePeriod]
+    categories: List[ExpenseCategoryTotals]
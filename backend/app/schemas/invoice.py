@@ -0,0 +1,36 @@
+from pydantic import BaseModel, ConfigDict, Field
+from uuid import UUID
+from datetime import datetime
+from typing import Optional, List, Literal
+from decimal import Decimal
+from app.schemas.transactions import Sale
+
+# --- Sale Invoice Schemas ---
+class SaleInvoiceLineCreate(BaseModel):
+    product_id: UUID
+    quantity: int = Field(..., gt=0)
+    selling_price: Decimal = Field(..., ge=0)
+
+class SaleInvoiceCreate(BaseModel):
+    customer_name: str = Field(..., min_length=1)
+    customer_phone: Optional[str] = None
+    payment_type: Literal['Credit', 'Debit']
+    # created_at is optional - if not provided, will use current time
+    created_at: Optional[datetime] = None
+    lines: List[SaleInvoiceLineCreate] = Field(..., min_length=1)
+
+class SaleInvoiceSummary(BaseModel):
+    id: UUID
+    customer_name: str
+    customer_phone: Optional[str] = None
+    payment_type: Literal['Credit', 'Debit']
+    line_count: int
+    total_quantity: int
+    total_amount: Decimal
+    total_cost: Decimal
+    created_at: datetime
+
+    model_config = ConfigDict(from_attributes=True)
+
+class SaleInvoice(SaleInvoiceSummary):
+    lines: List[Sale]
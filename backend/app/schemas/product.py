@@ -1,7 +1,7 @@
 from pydantic import BaseModel, ConfigDict
 from uuid import UUID
-from datetime import datetime
-from typing import Optional
+from datetime import datetime, date
+from typing import Optional, List
 from decimal import Decimal
 
 # Base Product Schema
@@ -33,6 +33,78 @@ class Product(ProductBase):
     
     model_config = ConfigDict(from_attributes=True)
 
+# Purchase price history schema
+class PriceHistoryEntry(BaseModel):
+    id: UUID
+    purchase_price: Decimal
+    effective_at: datetime
+    transaction_id: Optional[UUID] = None
+
+    model_config = ConfigDict(from_attributes=True)
+
+# Point-in-time stock schemas
+class ProductStockAsOf(BaseModel):
+    product_id: UUID
+    product_name: str
+    stock_balance: int
+    snapshot_date: Optional[date] = None  # Snapshot the balance was built from, if any
+
+    model_config = ConfigDict(from_attributes=True)
+
+class StockAsOfReport(BaseModel):
+    as_of: date
+    products: List[ProductStockAsOf]
+
+class StockHistoryEntry(BaseModel):
+    id: UUID
+    created_at: datetime
+    type: str
+    quantity: int
+    party_name: Optional[str] = None
+    balance: int  # Running balance after this entry
+
+    model_config = ConfigDict(from_attributes=True)
+
+class StockHistory(BaseModel):
+    product_id: UUID
+    start_date: date
+    end_date: date
+    opening_balance: int
+    entries: List[StockHistoryEntry]
+
+# Product detail page schemas
+class ProductMovement(BaseModel):
+    """One ledger row of a product; sale fields are set when it belongs to a sale"""
+    id: UUID
+    created_at: datetime
+    type: str
+    quantity: int
+    party_name: Optional[str] = None
+    purchase_price: Optional[Decimal] = None
+    sale_id: Optional[UUID] = None
+    customer_name: Optional[str] = None
+    customer_phone: Optional[str] = None
+    payment_type: Optional[str] = None
+    total_amount: Optional[Decimal] = None
+
+    model_config = ConfigDict(from_attributes=True)
+
+class ProductDetail(BaseModel):
+    product: Product
+    company_name: Optional[str] = None
+    current_stock: int
+    total_in: int
+    total_out: int
+    sales_count: int
+    revenue: Decimal
+    profit: Decimal
+    last_purchase_price: Optional[Decimal] = None
+    last_purchase_at: Optional[datetime] = None
+    movements_total: int
+    skip: int
+    limit: int
+    movements: List[ProductMovement]
+
 # Company Schema
 class CompanyBase(BaseModel):
     name: str
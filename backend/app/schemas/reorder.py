@@ -0,0 +1,85 @@
+from pydantic import BaseModel, ConfigDict, Field
+from uuid import UUID
+from datetime import date, datetime
+from typing import Optional, List, Literal
+from decimal import Decimal
+
+# --- Reorder Planner Schemas ---
+class ReorderSettings(BaseModel):
+    lead_time_days: int = Field(7, ge=0, le=365, description="Days between ordering and receiving")
+    safety_days: int = Field(7, ge=0, le=365, description="Days of demand kept as safety stock (never below min_stock)")
+    review_days: int = Field(14, ge=1, le=365, description="Days of demand an order should cover after it arrives")
+    window_days: int = Field(28, ge=1, le=365, description="Days of OUT history used for demand")
+    alpha: float = Field(0.3, gt=0, le=1, description="Exponential smoothing factor")
+
+class ReorderSuggestionLine(BaseModel):
+    product_id: UUID
+    product_name: str
+    unit: str
+    stock_balance: int
+    on_order: int = Field(0, description="Quantity already on open drafts")
+    min_stock: int
+    daily_demand: float
+    days_of_cover: Optional[float] = None
+    reorder_point: int
+    target_stock: int
+    suggested_quantity: int
+    unit_cost: Decimal
+    line_cost: Decimal
+
+class ReorderSupplier(BaseModel):
+    company_id: Optional[UUID] = None
+    company_name: Optional[str] = None
+    line_count: int
+    total_quantity: int
+    total_cost: Decimal
+    lines: List[ReorderSuggestionLine]
+
+class ReorderSuggestions(ReorderSettings):
+    as_of: date
+    products_checked: int
+    line_count: int
+    total_cost: Decimal
+    suppliers: List[ReorderSupplier]
+
+class ReorderDraftCreate(ReorderSettings):
+    company_id: Optional[UUID] = Field(None, description="Draft only this supplier's suggestions")
+    product_ids: Optional[List[UUID]] = Field(None, description="Draft only these products' suggestions")
+
+class ReorderLineUpdate(BaseModel):
+    product_id: UUID
+    quantity: int = Field(..., ge=0, description="0 removes the line")
+    unit_cost: Optional[Decimal] = Field(None, ge=0)
+
+class ReorderDraftLinesUpdate(BaseModel):
+    lines: List[ReorderLineUpdate] = Field(..., min_length=1)
+
+class ReorderDraftLine(BaseModel):
+    id: UUID
+    product_id: UUID
+    product_name: Optional[str] = None
+    suggested_quantity: int
+    quantity: int
+    unit_cost: Decimal
+    transaction_id: Optional[UUID] = None
+
+    model_config = ConfigDict(from_attributes=True)
+
+class ReorderDraftSummary(BaseModel):
+    id: UUID
+    company_id: Optional[UUID] = None
+    company_name: Optional[str] = None
+    status: Literal['draft', 'received', 'cancelled']
+    lead_time_days: int
+    safety_days: int
+    review_days: int
+    line_count: int
+    total_quantity: int
+    total_cost: Decimal
+    created_at: datetime
+    received_at: Optional[datetime] = None
+
+    model_config = ConfigDict(from_attributes=True)
+
+class ReorderDraft(ReorderDraftSummary):
+    lines: List[ReorderDraftLine]
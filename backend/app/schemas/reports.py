@@ -1,6 +1,8 @@
 from pydantic import BaseModel
 from decimal import Decimal
-from typing import Dict, List
+from datetime import date, datetime
+from typing import Dict, List, Literal, Optional
+from uuid import UUID
 
 class DashboardStats(BaseModel):
     total_inventory_value: Decimal
@@ -19,3 +21,95 @@ class WeeklySalesData(BaseModel):
 class DashboardReport(BaseModel):
     stats: DashboardStats
     weekly_sales: List[WeeklySalesData]
+
+class ProductValuation(BaseModel):
+    product_id: UUID
+    product_name: str
+    quantity: int
+    value: Decimal
+    unit_cost: Decimal
+
+class InventoryValuation(BaseModel):
+    method: Literal['fifo', 'average']
+    total_value: Decimal
+    products: List[ProductValuation]
+
+class AgingBuckets(BaseModel):
+    days_0_30: Decimal
+    days_31_60: Decimal
+    days_61_90: Decimal
+    days_over_90: Decimal
+    total_outstanding: Decimal
+
+class CustomerAging(AgingBuckets):
+    customer_id: Optional[UUID] = None
+    customer_name: str
+    customer_phone: Optional[str] = None
+    oldest_unpaid_at: Optional[datetime] = None
+
+class CreditAgingReport(BaseModel):
+    as_of: date
+    customer_count: int
+    totals: AgingBuckets
+    customers: List[CustomerAging]
+
+class LeaderboardProduct(BaseModel):
+    product_id: UUID
+    product_name: str
+    revenue: Decimal
+    profit: Decimal
+    quantity: int
+    sales_count: int
+
+class LeaderboardCustomer(BaseModel):
+    customer_name: str
+    spend: Decimal
+    credit: Decimal
+    sales_count: int
+
+class ProductLeaderboards(BaseModel):
+    revenue: List[LeaderboardProduct]
+    profit: List[LeaderboardProduct]
+    quantity: List[LeaderboardProduct]
+
+class CustomerLeaderboards(BaseModel):
+    spend: List[LeaderboardCustomer]
+    credit: List[LeaderboardCustomer]
+
+class Leaderboards(BaseModel):
+    period: Literal['today', 'week', 'month', 'custom']
+    start_date: date
+    end_date: date
+    source: Literal['counters', 'sales']
+    products: ProductLeaderboards
+    customers: CustomerLeaderboards
+
+class StockForecastItem(BaseModel):
+    product_id: UUID
+    product_name: str
+    unit: str
+    company_id: Optional[UUID] = None
+    company_name: Optional[str] = None
+    stock_balance: int
+    min_stock: int
+    moving_average: float
+    smoothed_demand: float
+    days_of_cover: Optional[float] = None  # None without demand
+    stockout_date: Optional[date] = None
+    min_stock_date: Optional[date] = None
+    status: Literal['out_of_stock', 'at_risk', 'low_stock', 'ok', 'no_demand']
+
+class StockForecastCounts(BaseModel):
+    out_of_stock: int
+    at_risk: int
+    low_stock: int
+    ok: int
+    no_demand: int
+
+class StockForecast(BaseModel):
+    as_of: date
+    window_days: int
+    alpha: float
+    horizon_days: int
+    counts: StockForecastCounts
+    products: List[StockForecastItem]
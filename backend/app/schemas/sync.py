@@ -0,0 +1,25 @@
+from pydantic import BaseModel
+from uuid import UUID
+from typing import List, Literal
+from app.schemas.company import Company
+from app.schemas.product import Product
+from app.schemas.transactions import Sale, StockTransaction
+from app.schemas.customer import CustomerBalance, CustomerPayment
+from app.schemas.invoice import SaleInvoiceSummary
+from app.schemas.expense import Expense
+
+class SyncDeleted(BaseModel):
+    table: Literal['companies', 'products', 'transactions', 'sales', 'payments', 'invoices', 'expenses']
+    id: UUID
+
+class SyncChanges(BaseModel):
+    token: str
+    companies: List[Company]
+    products: List[Product]
+    transactions: List[StockTransaction]
+    sales: List[Sale]
+    customers: List[CustomerBalance]
+    payments: List[CustomerPayment]
+    invoices: List[SaleInvoiceSummary]
+    expenses: List[Expense]
+    deleted: List[SyncDeleted]
@@ -1,4 +1,4 @@
-from pydantic import BaseModel, ConfigDict
+from pydantic import BaseModel, ConfigDict, Field
 from uuid import UUID
 from datetime import datetime
 from typing import Optional, Literal
@@ -7,7 +7,7 @@ from decimal import Decimal
 # --- Stock Transaction Schemas ---
 class StockTransactionBase(BaseModel):
     product_id: UUID
-    quantity: int
+    quantity: int = Field(..., gt=0)
     party_name: Optional[str] = None
     purchase_price: Optional[Decimal] = None
     type: Literal['IN', 'OUT']
@@ -26,7 +26,7 @@ class SaleBase(BaseModel):
     product_id: UUID
     customer_name: str
     customer_phone: Optional[str] = None
-    quantity: int
+    quantity: int = Field(..., gt=0)
     selling_price: Decimal
     payment_type: Literal['Credit', 'Debit']
 
@@ -40,7 +40,7 @@ class SaleUpdate(BaseModel):
     product_id: Optional[UUID] = None
     customer_name: Optional[str] = None
     customer_phone: Optional[str] = None
-    quantity: Optional[int] = None
+    quantity: Optional[int] = Field(None, gt=0)
     selling_price: Optional[Decimal] = None
     payment_type: Optional[Literal['Credit', 'Debit']] = None
 
@@ -49,6 +49,7 @@ class Sale(SaleBase):
     purchase_price: Decimal
     total_amount: Decimal
     created_at: datetime
+    invoice_id: Optional[UUID] = None
 
     model_config = ConfigDict(from_attributes=True)
 
@@ -0,0 +1,175 @@
+#!/usr/bin/env python
+"""
+Benchmark: heavy reports on the primary database vs the DuckDB mirror
+
+Inserts --rows scratch sales (and --rows / 20 expenses) spread over --years
+years, then runs the closed-day report work on both backends:
+  1. daily totals - crud_report._compute_days over the whole range
+     (what a multi-year period summary or comparison computes before the
+     closed-day cache holds anything)
+  2. leaderboard  - crud_leaderboard._from_sales over the whole range
+     (a custom-range leaderboard)
+The mirror is first filled with a full refresh; an incremental refresh
+after a handful of new sales is timed too.
+
+Usage:
+    python benchmarks/bench_analytics_mirror.py [--rows 2000000] [--years 3] [--repeat 3]
+
+Uses DATABASE_URL (PostgreSQL or SQLite) and a scratch DuckDB file in a
+temporary directory. Needs requirements-analytics.txt. The scratch rows
+are deleted afterwards.
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+from decimal import Decimal
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import insert
+from sqlalchemy.orm import sessionmaker
+
+from app.core.config import settings
+from app.core.ids import uuid7
+from app.crud import crud_leaderboard, crud_report
+from app.db.analytics import AnalyticsMirror
+from app.db.session import Base, make_engine
+from app.models.models import Company, Expense, Product, Sale
+
+BATCH = 50_000
+BENCH_EXPENSE = "Bench Analytics Expense"
+
+
+def sale_rows(product_ids, start: datetime, seconds: int, count: int, rng: random.Random):
+    for _ in range(count):
+        quantity = rng.randint(1, 5)
+        price = Decimal(rng.randint(110, 180))
+        created_at = start + timedelta(seconds=rng.randrange(seconds))
+        yield {
+            "id": uuid7(),
+            "product_id": rng.choice(product_ids),
+            "customer_name": f"Bench Customer {rng.randint(0, 999)}",
+            "quantity": quantity,
+            "selling_price": price,
+            "purchase_price": Decimal("100.00"),
+            "total_amount": price * quantity,
+            "payment_type": rng.choice(("Credit", "Debit")),
+            "created_at": created_at,
+            "updated_at": created_at,
+            "is_deleted": False
+        }
+
+
+def setup(Session, rows: int, years: int, products: int):
+    """Scratch history; updated_at is backdated so only later writes count as changes"""
+    rng = random.Random(42)
+    end = datetime.combine(crud_report.first_open_day() - timedelta(days=1), datetime.min.time())
+    start = end - timedelta(days=365 * years)
+    seconds = int((end - start).total_seconds())
+    with Session() as db:
+        company = Company(name="Bench Analytics Mirror")
+        db.add_all([
+            Product(company=company, name=f"Bench Product {i}", unit="Bags", purchase_price=Decimal("100.00"))
+            for i in range(products)
+        ])
+        db.flush()
+        product_ids = [product.id for product in company.products]
+        written = 0
+        while written < rows:
+            count = min(BATCH, rows - written)
+            db.execute(insert(Sale), list(sale_rows(product_ids, start, seconds, count, rng)))
+            written += count
+        expense_dates = [start + timedelta(seconds=rng.randrange(seconds)) for _ in range(max(rows // 20, 1))]
+        db.execute(insert(Expense), [
+            {
+                "id": uuid7(),
+                "name": BENCH_EXPENSE,
+                "amount": Decimal(-rng.randint(100, 5000)),
+                "quantity": 1,
+                "category": rng.choice(("Fuel", "Wages", "Rent")),
+                "expense_date": expense_date,
+                "updated_at": expense_date,
+                "is_deleted": False
+            }
+            for expense_date in expense_dates
+        ])
+        db.commit()
+        return company.id, product_ids, start.date(), end.date()
+
+
+def best_of(repeat: int, fn):
+    timings = []
+    result = None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = fn()
+        timings.append(time.perf_counter() - started)
+    return min(timings), result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--database-url", default=settings.DATABASE_URL)
+    parser.add_argument("--rows", type=int, default=2_000_000, help="Sales to insert")
+    parser.add_argument("--years", type=int, default=3)
+    parser.add_argument("--products", type=int, default=500)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    engine = make_engine(args.database_url)
+    Base.metadata.create_all(bind=engine)
+    Session = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    print(f"Inserting {args.rows:,} sales over {args.years} years...")
+    company_id, product_ids, first, last = setup(Session, args.rows, args.years, args.products)
+    workdir = tempfile.TemporaryDirectory()
+
+    try:
+        mirror = AnalyticsMirror(os.path.join(workdir.name, "bench.duckdb"), timezone=settings.ANALYTICS_MIRROR_TIMEZONE)
+        with Session() as db:
+            started = time.perf_counter()
+            mirror.refresh(db)
+            full_refresh = time.perf_counter() - started
+            rng = random.Random(7)
+            new_sales = list(sale_rows(product_ids, datetime.combine(first, datetime.min.time()), 86_400, 100, rng))
+            for sale in new_sales:
+                del sale["updated_at"]  # written now
+            db.execute(insert(Sale), new_sales)
+            db.commit()
+            started = time.perf_counter()
+            mirror.refresh(db)
+            incremental_refresh = time.perf_counter() - started
+
+            with mirror.Session() as mirror_db:
+                primary_days, primary_totals = best_of(args.repeat, lambda: crud_report._compute_days(db, first, last))
+                mirror_days, mirror_totals = best_of(args.repeat, lambda: crud_report._compute_days(mirror_db, first, last))
+                assert primary_totals == mirror_totals
+                primary_board, primary_top = best_of(
+                    args.repeat, lambda: crud_leaderboard._from_sales(db, first, last, 10)
+                )
+                mirror_board, mirror_top = best_of(
+                    args.repeat, lambda: crud_leaderboard._from_sales(db, first, last, 10, source=mirror_db)
+                )
+                assert primary_top == mirror_top
+
+        print(f"Database:  {engine.url.get_backend_name()}, {args.rows:,} sales, {first} .. {last}, best of {args.repeat}")
+        print(f"Mirror:    full refresh {full_refresh:.1f}s, incremental (100 new sales) {incremental_refresh * 1000:.0f}ms")
+        print(f"{'':14} {'primary':>10} {'duckdb':>10} {'speedup':>9}")
+        print(f"{'daily totals':14} {primary_days:>9.2f}s {mirror_days:>9.2f}s {primary_days / mirror_days:>8.1f}x")
+        print(f"{'leaderboard':14} {primary_board:>9.2f}s {mirror_board:>9.2f}s {primary_board / mirror_board:>8.1f}x")
+    finally:
+        with Session() as db:
+            db.query(Sale).filter(Sale.product_id.in_(product_ids)).delete(synchronize_session=False)
+            db.query(Expense).filter(Expense.name == BENCH_EXPENSE).delete(synchronize_session=False)
+            db.query(Product).filter(Product.company_id == company_id).delete(synchronize_session=False)
+            db.query(Company).filter(Company.id == company_id).delete(synchronize_session=False)
+            db.commit()
+        engine.dispose()
+        workdir.cleanup()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,141 @@
+#!/usr/bin/env python
+"""
+Benchmark: concurrent sales through the oversell-safe sale path
+
+Worker threads call crud_transaction.create_sale against a small set of
+products (so they contend on the same product_stock rows) until every
+product is sold out. Reports committed sales per second and rejected
+attempts, then checks that no product went below zero and that
+product_stock still matches the ledger.
+
+Usage:
+    python benchmarks/bench_concurrent_sales.py [--threads 16] [--products 4] [--stock 250]
+    python benchmarks/bench_concurrent_sales.py --database-url sqlite:///./bench.db
+
+Uses DATABASE_URL by default (PostgreSQL, or SQLite in WAL mode). The
+scratch company and products are deleted afterwards.
+"""
+import argparse
+import os
+import sys
+import threading
+import time
+from decimal import Decimal
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fastapi import HTTPException
+from sqlalchemy.orm import sessionmaker
+
+from app.core.config import settings
+from app.db.session import Base, make_engine
+from app.crud import crud_company, crud_product, crud_transaction
+from app.crud.crud_stock import ledger_balance
+from app.models.models import ProductStock
+from app.schemas.company import CompanyCreate
+from app.schemas.product import ProductCreate
+from app.schemas.transactions import SaleCreate, StockTransactionCreate
+
+
+def setup(Session, products: int, stock: int):
+    with Session() as db:
+        company = crud_company.create_company(db, CompanyCreate(name="Bench Concurrent Sales"))
+        product_ids = []
+        for i in range(products):
+            product = crud_product.create_product(db, ProductCreate(
+                company_id=company.id,
+                name=f"Bench Product {i}",
+                unit="Bags",
+                purchase_price=Decimal("100.00"),
+                min_stock=0
+            ))
+            crud_transaction.create_transaction(db, StockTransactionCreate(
+                product_id=product.id, quantity=stock, purchase_price=Decimal("100.00"), type="IN"
+            ))
+            product_ids.append(product.id)
+        return company.id, product_ids
+
+
+def run(Session, product_ids, threads: int, quantity: int):
+    sold, rejected, errors = [0] * threads, [0] * threads, []
+    start = threading.Barrier(threads)
+
+    def seller(worker: int):
+        open_products = list(product_ids)
+        start.wait()
+        attempt = worker
+        while open_products:
+            product_id = open_products[attempt % len(open_products)]
+            attempt += 1
+            with Session() as db:
+                try:
+                    crud_transaction.create_sale(db, SaleCreate(
+                        product_id=product_id,
+                        customer_name=f"Bench Customer {worker}",
+                        quantity=quantity,
+                        selling_price=Decimal("120.00"),
+                        payment_type="Debit"
+                    ))
+                    sold[worker] += 1
+                except HTTPException:
+                    rejected[worker] += 1
+                    open_products.remove(product_id)
+                except Exception as e:
+                    errors.append(e)
+                    return
+
+    workers = [threading.Thread(target=seller, args=(i,)) for i in range(threads)]
+    started = time.perf_counter()
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    return sum(sold), sum(rejected), errors, time.perf_counter() - started
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--database-url", default=settings.DATABASE_URL)
+    parser.add_argument("--threads", type=int, default=16)
+    parser.add_argument("--products", type=int, default=4)
+    parser.add_argument("--stock", type=int, default=250, help="Units received per product")
+    parser.add_argument("--quantity", type=int, default=1, help="Units per sale")
+    args = parser.parse_args()
+
+    engine = make_engine(args.database_url, pool_size=args.threads, max_overflow=0)
+    Base.metadata.create_all(bind=engine)
+    Session = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+    company_id, product_ids = setup(Session, args.products, args.stock)
+    try:
+        sold, rejected, errors, elapsed = run(Session, product_ids, args.threads, args.quantity)
+
+        print(f"Database:  {engine.url.get_backend_name()}")
+        print(f"Threads:   {args.threads}, products: {args.products}, stock: {args.stock} each")
+        print(f"Sold:      {sold} sales in {elapsed:.2f}s ({sold / elapsed:,.0f} sales/s)")
+        print(f"Rejected:  {rejected} attempts (insufficient stock)")
+        if errors:
+            print(f"Errors:    {len(errors)} (first: {errors[0]!r})")
+
+        expected = args.products * (args.stock // args.quantity)
+        with Session() as db:
+            for product_id in product_ids:
+                on_hand = db.get(ProductStock, product_id).quantity
+                ledger = ledger_balance(db, product_id)
+                if on_hand < 0 or on_hand != ledger:
+                    print(f"❌ Product {product_id}: product_stock={on_hand}, ledger={ledger}")
+                    sys.exit(1)
+        if sold != expected:
+            print(f"❌ Expected {expected} sales, got {sold}")
+            sys.exit(1)
+        print("✅ No oversell: every product sold out exactly, product_stock matches the ledger")
+    finally:
+        with Session() as db:
+            for product_id in product_ids:
+                crud_product.delete_product(db, product_id)
+            crud_company.delete_company(db, company_id)
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,129 @@
+#!/usr/bin/env python
+"""
+Benchmark: commit-per-sale vs group commit
+
+The same number of sales is written by the same number of threads twice:
+  1. direct - each sale is crud_transaction.create_sale (own commit + refresh)
+  2. queued - each sale goes through GroupCommitQueue (WRITE_QUEUE_ENABLED),
+     sharing commits with whatever else arrived within the window
+
+Usage:
+    python benchmarks/bench_group_commit.py [--threads 32] [--sales 2000] [--window-ms 5]
+    python benchmarks/bench_group_commit.py --database-url sqlite:///./bench.db
+
+Uses DATABASE_URL by default (PostgreSQL, or SQLite in WAL mode). The
+scratch company and products are deleted afterwards.
+"""
+import argparse
+import os
+import sys
+import threading
+import time
+from decimal import Decimal
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy.orm import sessionmaker
+
+from app.core.config import settings
+from app.core.group_commit import GroupCommitQueue
+from app.db.session import Base, make_engine
+from app.crud import crud_company, crud_product, crud_transaction
+from app.schemas.company import CompanyCreate
+from app.schemas.product import ProductCreate
+from app.schemas.transactions import SaleCreate, StockTransactionCreate
+
+
+def setup(Session, products: int, stock: int):
+    with Session() as db:
+        company = crud_company.create_company(db, CompanyCreate(name="Bench Group Commit"))
+        product_ids = []
+        for i in range(products):
+            product = crud_product.create_product(db, ProductCreate(
+                company_id=company.id, name=f"Bench Product {i}", unit="Bags", purchase_price=Decimal("100.00")
+            ))
+            crud_transaction.create_transaction(db, StockTransactionCreate(
+                product_id=product.id, quantity=stock, purchase_price=Decimal("100.00"), type="IN"
+            ))
+            product_ids.append(product.id)
+        return company.id, product_ids
+
+
+def sale_for(product_ids, i: int) -> SaleCreate:
+    return SaleCreate(
+        product_id=product_ids[i % len(product_ids)],
+        customer_name=f"Bench Customer {i % 50}",
+        quantity=1,
+        selling_price=Decimal("120.00"),
+        payment_type="Debit" if i % 2 else "Credit"
+    )
+
+
+def run_threads(threads: int, sales: int, sell) -> float:
+    per_thread = sales // threads
+    start = threading.Barrier(threads)
+
+    def worker(t: int):
+        start.wait()
+        for n in range(per_thread):
+            sell(t * per_thread + n)
+
+    workers = [threading.Thread(target=worker, args=(t,)) for t in range(threads)]
+    started = time.perf_counter()
+    for w in workers:
+        w.start()
+    for w in workers:
+        w.join()
+    return time.perf_counter() - started
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--database-url", default=settings.DATABASE_URL)
+    parser.add_argument("--threads", type=int, default=32)
+    parser.add_argument("--sales", type=int, default=2000, help="Sales per mode")
+    parser.add_argument("--products", type=int, default=20)
+    parser.add_argument("--window-ms", type=float, default=settings.WRITE_QUEUE_WINDOW_MS)
+    parser.add_argument("--max-batch", type=int, default=settings.WRITE_QUEUE_MAX_BATCH)
+    args = parser.parse_args()
+
+    engine = make_engine(args.database_url, pool_size=args.threads + 1, max_overflow=0)
+    Base.metadata.create_all(bind=engine)
+    Session = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    company_id, product_ids = setup(Session, args.products, args.sales * 2)
+    sales = args.sales // args.threads * args.threads
+
+    def direct(i: int):
+        with Session() as db:
+            crud_transaction.create_sale(db, sale_for(product_ids, i))
+
+    write_queue = GroupCommitQueue(Session, window_ms=args.window_ms, max_batch=args.max_batch)
+
+    def queued(i: int):
+        sale = sale_for(product_ids, i)
+        write_queue.submit(
+            lambda db: crud_transaction.add_sale(db, sale),
+            after_commit=crud_transaction.publish_sale_created
+        )
+
+    try:
+        direct_time = run_threads(args.threads, sales, direct)
+        queued_time = run_threads(args.threads, sales, queued)
+
+        print(f"Database:  {engine.url.get_backend_name()}, {args.threads} threads, {sales} sales per mode")
+        print(f"Direct:    {sales / direct_time:>8,.0f} sales/s  ({direct_time:.2f}s, {sales} commits)")
+        print(
+            f"Queued:    {sales / queued_time:>8,.0f} sales/s  ({queued_time:.2f}s, {write_queue.batches} commits, "
+            f"avg batch {write_queue.jobs / max(write_queue.batches, 1):.1f}, window {args.window_ms}ms)"
+        )
+        print(f"Speedup:   {direct_time / queued_time:.1f}x")
+    finally:
+        with Session() as db:
+            for product_id in product_ids:
+                crud_product.delete_product(db, product_id)
+            crud_company.delete_company(db, company_id)
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
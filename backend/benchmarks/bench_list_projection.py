@@ -0,0 +1,126 @@
+#!/usr/bin/env python
+"""
+Benchmark: ORM entities vs column-projected rows for list endpoints
+
+Inserts --rows scratch sales and then serializes them to the API response
+(List[schemas.Sale] -> JSON) two ways:
+  1. entities - db.query(Sale): full ORM objects in the identity map
+  2. rows     - select(*columns_for(Sale, schemas.Sale)): plain Core rows,
+                as crud_transaction.get_sales does now
+
+Reports best-of-N wall time and tracemalloc peak memory for each.
+
+Usage:
+    python benchmarks/bench_list_projection.py [--rows 10000] [--repeat 5]
+
+Uses DATABASE_URL (PostgreSQL or SQLite). The scratch rows are deleted afterwards.
+"""
+import argparse
+import os
+import sys
+import time
+import tracemalloc
+from decimal import Decimal
+from typing import List
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from pydantic import TypeAdapter
+from sqlalchemy import insert, select
+from sqlalchemy.orm import sessionmaker
+
+from app.core.config import settings
+from app.core.ids import uuid7
+from app.db.projection import columns_for
+from app.db.session import Base, make_engine
+from app.models.models import Company, Product, Sale
+from app.schemas import transactions
+
+RESPONSE = TypeAdapter(List[transactions.Sale])
+
+
+def setup(Session, rows: int):
+    with Session() as db:
+        company = Company(name="Bench List Projection")
+        product = Product(company=company, name="Bench Product", unit="Bags", purchase_price=Decimal("100.00"))
+        db.add(product)
+        db.flush()
+        db.execute(insert(Sale), [
+            {
+                "id": uuid7(),
+                "product_id": product.id,
+                "customer_name": f"Bench Customer {i % 200}",
+                "customer_phone": "03001234567",
+                "quantity": 1 + i % 5,
+                "selling_price": Decimal("120.00"),
+                "purchase_price": Decimal("100.00"),
+                "total_amount": Decimal("120.00") * (1 + i % 5),
+                "payment_type": "Credit" if i % 3 else "Debit",
+                "is_deleted": False
+            }
+            for i in range(rows)
+        ])
+        db.commit()
+        return company.id, product.id
+
+
+def with_entities(Session, product_id):
+    with Session() as db:
+        sales = db.query(Sale).filter(Sale.product_id == product_id, Sale.is_deleted == False).all()
+        return RESPONSE.dump_json(RESPONSE.validate_python(sales, from_attributes=True))
+
+
+def with_rows(Session, product_id):
+    with Session() as db:
+        sales = db.execute(
+            select(*columns_for(Sale, transactions.Sale)).where(Sale.product_id == product_id, Sale.is_deleted == False)
+        ).all()
+        return RESPONSE.dump_json(RESPONSE.validate_python(sales, from_attributes=True))
+
+
+def measure(repeat: int, fn):
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - started)
+    tracemalloc.start()
+    fn()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return min(timings), peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--database-url", default=settings.DATABASE_URL)
+    parser.add_argument("--rows", type=int, default=10_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    engine = make_engine(args.database_url)
+    Base.metadata.create_all(bind=engine)
+    Session = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    company_id, product_id = setup(Session, args.rows)
+
+    try:
+        assert with_entities(Session, product_id) == with_rows(Session, product_id)
+        entity_time, entity_peak = measure(args.repeat, lambda: with_entities(Session, product_id))
+        row_time, row_peak = measure(args.repeat, lambda: with_rows(Session, product_id))
+
+        print(f"Database:  {engine.url.get_backend_name()}, {args.rows:,} sales, best of {args.repeat}")
+        print(f"{'':10} {'time':>10} {'peak memory':>14}")
+        print(f"{'entities':10} {entity_time * 1000:>8.1f}ms {entity_peak / 1_048_576:>11.1f} MB")
+        print(f"{'rows':10} {row_time * 1000:>8.1f}ms {row_peak / 1_048_576:>11.1f} MB")
+        print(f"Reduction: {entity_time / row_time:.1f}x faster, {entity_peak / row_peak:.1f}x less memory")
+    finally:
+        with Session() as db:
+            db.query(Sale).filter(Sale.product_id == product_id).delete(synchronize_session=False)
+            db.query(Product).filter(Product.id == product_id).delete(synchronize_session=False)
+            db.query(Company).filter(Company.id == company_id).delete(synchronize_session=False)
+            db.commit()
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,148 @@
+#!/usr/bin/env python
+"""
+Benchmark: Decimal vs integer-paisa money aggregation
+
+Two measurements over the same synthetic data:
+  1. In-process accumulation, shaped like the inventory valuation loop in
+     get_dashboard_stats (price * stock_balance summed over many rows)
+  2. End-to-end SQL aggregation over a scratch `sales`-shaped table:
+     SUM over Numeric columns fetched as Decimal vs SUM over BIGINT paisa
+
+Usage:
+    python benchmarks/bench_money_aggregation.py [--rows 1000000] [--repeat 5]
+
+Uses DATABASE_URL (PostgreSQL or SQLite). The scratch table is dropped afterwards.
+"""
+import argparse
+import os
+import random
+import sys
+import time
+from decimal import Decimal
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import Column, Integer, MetaData, Numeric, Table, create_engine, func, select
+
+from app.core.config import settings
+from app.core.money import Money, paisa
+
+
+def best_of(repeat: int, fn) -> float:
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - started)
+    return min(timings)
+
+
+def bench_in_process(rows: int, repeat: int):
+    rng = random.Random(42)
+    decimal_rows = [(Decimal(rng.randint(100, 500_000)) / 100, rng.randint(0, 500)) for _ in range(rows)]
+    paisa_rows = [(int(price * 100), qty) for price, qty in decimal_rows]
+
+    def with_decimal():
+        total = Decimal("0.00")
+        for price, qty in decimal_rows:
+            if qty > 0:
+                total += price * qty
+        return total
+
+    def with_paisa():
+        total = 0
+        for price, qty in paisa_rows:
+            if qty > 0:
+                total += price * qty
+        return Money(total)
+
+    assert with_paisa().to_decimal() == with_decimal()
+    return best_of(repeat, with_decimal), best_of(repeat, with_paisa)
+
+
+def bench_sql(database_url: str, rows: int, repeat: int):
+    engine = create_engine(database_url)
+    metadata = MetaData()
+    table = Table(
+        "bench_money_sales",
+        metadata,
+        Column("id", Integer, primary_key=True),
+        Column("quantity", Integer, nullable=False),
+        Column("selling_price", Numeric(12, 2), nullable=False),
+        Column("purchase_price", Numeric(12, 2), nullable=False),
+        Column("total_amount", Numeric(12, 2), nullable=False),
+    )
+    metadata.drop_all(engine)
+    metadata.create_all(engine)
+
+    rng = random.Random(7)
+    try:
+        batch = []
+        for i in range(rows):
+            qty = rng.randint(1, 50)
+            buy = Decimal(rng.randint(100, 400_000)) / 100
+            sell = buy + Decimal(rng.randint(0, 50_000)) / 100
+            batch.append({"id": i, "quantity": qty, "selling_price": sell, "purchase_price": buy, "total_amount": sell * qty})
+            if len(batch) == 10_000:
+                with engine.begin() as conn:
+                    conn.execute(table.insert(), batch)
+                batch = []
+        if batch:
+            with engine.begin() as conn:
+                conn.execute(table.insert(), batch)
+
+        decimal_query = select(
+            func.sum(table.c.total_amount),
+            func.sum(table.c.purchase_price * table.c.quantity),
+            func.sum(table.c.total_amount - table.c.purchase_price * table.c.quantity),
+        )
+        paisa_query = select(
+            func.sum(paisa(table.c.total_amount)),
+            func.sum(paisa(table.c.purchase_price) * table.c.quantity),
+            func.sum(paisa(table.c.total_amount) - paisa(table.c.purchase_price) * table.c.quantity),
+        )
+
+        def run_decimal():
+            with engine.connect() as conn:
+                revenue, cost, profit = conn.execute(decimal_query).one()
+                return [float(revenue or 0), float(cost or 0), float(profit or 0)]
+
+        def run_paisa():
+            with engine.connect() as conn:
+                revenue, cost, profit = conn.execute(paisa_query).one()
+                return [Money.from_paisa(revenue), Money.from_paisa(cost), Money.from_paisa(profit)]
+
+        exact = run_paisa()
+        approx = run_decimal()
+        drift = max(abs(float(e) - a) for e, a in zip(exact, approx))
+
+        return best_of(repeat, run_decimal), best_of(repeat, run_paisa), drift
+    finally:
+        metadata.drop_all(engine)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--database-url", default=settings.DATABASE_URL)
+    parser.add_argument("--skip-sql", action="store_true")
+    args = parser.parse_args()
+
+    print(f"🔬 Money aggregation benchmark: {args.rows} rows, best of {args.repeat}")
+
+    dec, pai = bench_in_process(args.rows, args.repeat)
+    print("\nIn-process accumulation (price * qty)")
+    print(f"  Decimal : {dec * 1000:10.1f} ms")
+    print(f"  paisa   : {pai * 1000:10.1f} ms   ({dec / pai:.1f}x faster)")
+
+    if not args.skip_sql:
+        dec, pai, drift = bench_sql(args.database_url, args.rows, args.repeat)
+        print("\nSQL aggregation (revenue, cost, profit)")
+        print(f"  Numeric + float() : {dec * 1000:10.1f} ms")
+        print(f"  BIGINT paisa      : {pai * 1000:10.1f} ms   ({dec / pai:.1f}x)")
+        print(f"  Max float drift vs exact paisa: {drift:.6f} PKR")
+
+
+if __name__ == "__main__":
+    main()
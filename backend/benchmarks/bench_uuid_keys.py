@@ -0,0 +1,128 @@
+#!/usr/bin/env python
+"""
+Benchmark: uuid4 vs UUIDv7 primary keys
+
+Inserts the same number of rows into two scratch tables shaped like
+`stock_transactions` (one keyed by uuid4, one by UUIDv7) and reports insert
+throughput and the size of the primary key index for each.
+
+Usage:
+    python benchmarks/bench_uuid_keys.py [--rows 200000] [--batch 1000]
+
+Uses DATABASE_URL (PostgreSQL or SQLite). Scratch tables are dropped afterwards.
+"""
+import argparse
+import os
+import sys
+import time
+import uuid
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import Column, DateTime, Integer, MetaData, Table, Text, create_engine, text
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.sql import func
+
+from app.core.config import settings
+from app.core.ids import uuid7
+
+SCHEMES = {
+    "uuid4": uuid.uuid4,
+    "uuid7": uuid7,
+}
+
+
+def build_table(metadata: MetaData, name: str) -> Table:
+    return Table(
+        name,
+        metadata,
+        Column("id", UUID(as_uuid=True), primary_key=True),
+        Column("product_id", UUID(as_uuid=True)),
+        Column("quantity", Integer, nullable=False),
+        Column("party_name", Text),
+        Column("created_at", DateTime(timezone=True), server_default=func.now()),
+    )
+
+
+def index_size_bytes(conn, table_name: str) -> int:
+    """Size of the primary key index in bytes"""
+    if conn.dialect.name == "postgresql":
+        return conn.execute(
+            text("SELECT pg_relation_size(:idx)"),
+            {"idx": f"{table_name}_pkey"},
+        ).scalar()
+    if conn.dialect.name == "sqlite":
+        return conn.execute(
+            text("SELECT COALESCE(SUM(pgsize), 0) FROM dbstat WHERE name = :idx"),
+            {"idx": f"sqlite_autoindex_{table_name}_1"},
+        ).scalar()
+    return -1
+
+
+def run_scheme(engine, name: str, generator, rows: int, batch: int) -> dict:
+    metadata = MetaData()
+    table = build_table(metadata, f"bench_pk_{name}")
+    metadata.drop_all(engine)
+    metadata.create_all(engine)
+
+    product_ids = [uuid.uuid4() for _ in range(50)]
+    started = time.perf_counter()
+    inserted = 0
+    try:
+        while inserted < rows:
+            size = min(batch, rows - inserted)
+            payload = [
+                {
+                    "id": generator(),
+                    "product_id": product_ids[(inserted + i) % len(product_ids)],
+                    "quantity": 1 + (inserted + i) % 20,
+                    "party_name": "Benchmark",
+                }
+                for i in range(size)
+            ]
+            # One commit per batch, like a steady stream of checkout writes
+            with engine.begin() as conn:
+                conn.execute(table.insert(), payload)
+            inserted += size
+        elapsed = time.perf_counter() - started
+
+        with engine.begin() as conn:
+            if conn.dialect.name == "postgresql":
+                conn.execute(text(f"ANALYZE {table.name}"))
+            idx_bytes = index_size_bytes(conn, table.name)
+    finally:
+        metadata.drop_all(engine)
+
+    return {
+        "scheme": name,
+        "rows": rows,
+        "seconds": elapsed,
+        "rows_per_sec": rows / elapsed if elapsed else 0.0,
+        "index_bytes": idx_bytes,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=200_000)
+    parser.add_argument("--batch", type=int, default=1000)
+    parser.add_argument("--database-url", default=settings.DATABASE_URL)
+    args = parser.parse_args()
+
+    engine = create_engine(args.database_url)
+    print(f"🔬 PK benchmark on {engine.dialect.name}: {args.rows} rows, batch {args.batch}")
+
+    results = [run_scheme(engine, name, gen, args.rows, args.batch) for name, gen in SCHEMES.items()]
+
+    print(f"\n{'scheme':<8} {'rows/s':>12} {'seconds':>10} {'pk index':>14}")
+    for r in results:
+        print(f"{r['scheme']:<8} {r['rows_per_sec']:>12.0f} {r['seconds']:>10.2f} {r['index_bytes'] / 1024:>11.0f} KiB")
+
+    base, v7 = results
+    if base["index_bytes"] > 0:
+        print(f"\n📉 Index size uuid7 / uuid4: {v7['index_bytes'] / base['index_bytes']:.2f}x")
+    print(f"📈 Throughput uuid7 / uuid4: {v7['rows_per_sec'] / base['rows_per_sec']:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
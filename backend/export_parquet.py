@@ -0,0 +1,56 @@
+"""
+Parquet export of the ledgers for analytics tooling
+Same output as GET /api/v1/export/{table}.parquet, written to a local file:
+
+    python export_parquet.py sales                          # -> sales.parquet
+    python export_parquet.py stock_transactions --start-date 2025-01-01 --end-date 2025-06-30
+    python export_parquet.py expenses --columns id,amount,category,expense_date -o expenses_h1.parquet
+"""
+import sys
+import os
+import argparse
+from datetime import date
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(__file__))
+
+from app.db.session import SessionLocal
+from app.crud.crud_export import EXPORT_TABLES, write_parquet
+
+def main():
+    parser = argparse.ArgumentParser(description="Export a table to Parquet")
+    parser.add_argument("table", choices=list(EXPORT_TABLES))
+    parser.add_argument("-o", "--output", default=None, help="Output file (default: <table>.parquet)")
+    parser.add_argument("--columns", default=None, help="Comma-separated columns (default: all)")
+    parser.add_argument("--start-date", type=date.fromisoformat, default=None)
+    parser.add_argument("--end-date", type=date.fromisoformat, default=None)
+    parser.add_argument("--include-deleted", action="store_true", help="Include soft-deleted rows")
+    parser.add_argument("--batch-rows", type=int, default=None, help="Rows per row group (default: EXPORT_BATCH_ROWS)")
+    args = parser.parse_args()
+
+    output = args.output or f"{args.table}.parquet"
+    columns = [name.strip() for name in args.columns.split(",")] if args.columns else None
+
+    print(f"📤 Exporting {args.table} to {output}...")
+    db = SessionLocal()
+    try:
+        rows = write_parquet(
+            db, args.table, output,
+            columns=columns,
+            start_date=args.start_date,
+            end_date=args.end_date,
+            include_deleted=args.include_deleted,
+            batch_size=args.batch_rows
+        )
+        print(f"✅ {rows:,} rows written")
+    except ValueError as e:
+        print(f"❌ {e}")
+        sys.exit(2)
+    except Exception as e:
+        print(f"❌ Export failed: {e}")
+        sys.exit(1)
+    finally:
+        db.close()
+
+if __name__ == "__main__":
+    main()
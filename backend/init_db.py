@@ -1,7 +1,12 @@
 from app.db.session import SessionLocal, engine, Base
-from app.models.models import User, Company
+from app.models.models import User, Company, Product, ProductStock, Expense, ExpenseMonthlyRollup, Sale, CustomerBalance
+from app.crud.crud_stock import rebuild_product_stock
+from app.crud.crud_expense import rebuild_expense_rollups
+from app.crud.crud_leaderboard import rebuild_counters
+from app.crud.crud_customer import rebuild_customer_balances
 from app.core.security import get_password_hash
 from sqlalchemy import text, inspect
+from sqlalchemy.schema import CreateIndex
 
 # Predefined companies based on logos (excluding agrimanage-logo.png)
 PREDEFINED_COMPANIES = [
@@ -64,6 +69,82 @@ def init_db():
                 print(f"⚠️  sales already has soft delete columns or error: {e}")
                 db.rollback()
         
+        # Link sales to multi-line invoices
+        columns = [col['name'] for col in inspector.get_columns('sales')]
+        if 'invoice_id' not in columns:
+            try:
+                db.execute(text("ALTER TABLE sales ADD COLUMN invoice_id UUID REFERENCES sale_invoices(id)"))
+                db.commit()
+                print("✅ Added invoice_id column to sales")
+            except Exception as e:
+                print(f"⚠️  sales already has invoice_id column or error: {e}")
+                db.rollback()
+        
+        # Expense categories
+        columns = [col['name'] for col in inspector.get_columns('expenses')]
+        if 'category' not in columns:
+            try:
+                db.execute(text("ALTER TABLE expenses ADD COLUMN category TEXT"))
+                db.commit()
+                print("✅ Added category column to expenses")
+            except Exception as e:
+                print(f"⚠️  expenses already has category column or error: {e}")
+                db.rollback()
+        
+        # Add updated_at (delta sync) to existing tables
+        for table_name in (
+            "companies", "products", "stock_transactions", "sales", "expenses", "customer_payments", "customers"
+        ):
+            columns = [col['name'] for col in inspector.get_columns(table_name)]
+            if 'updated_at' not in columns:
+                try:
+                    db.execute(text(f"ALTER TABLE {table_name} ADD COLUMN updated_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP"))
+                    db.commit()
+                    print(f"✅ Added updated_at column to {table_name}")
+                except Exception as e:
+                    print(f"⚠️  {table_name} already has updated_at column or error: {e}")
+                    db.rollback()
+        
+        # Valuation recheck window (late-committed ledger rows)
+        columns = [col['name'] for col in inspector.get_columns('valuation_states')]
+        if 'recheck_from' not in columns:
+            try:
+                db.execute(text("ALTER TABLE valuation_states ADD COLUMN recheck_from TIMESTAMP WITH TIME ZONE"))
+                db.commit()
+                print("✅ Added recheck_from column to valuation_states")
+            except Exception as e:
+                print(f"⚠️  valuation_states already has recheck_from column or error: {e}")
+                db.rollback()
+        
+        # Create indexes declared on models that are missing from existing tables
+        # (create_all only creates indexes together with new tables). IF NOT
+        # EXISTS rather than checkfirst: SQLite reflection does not report
+        # expression indexes, so checkfirst would try to create them again.
+        with engine.begin() as connection:
+            for table in Base.metadata.sorted_tables:
+                for index in table.indexes:
+                    connection.execute(CreateIndex(index, if_not_exists=True))
+        print("✅ Model indexes verified")
+        
+        # Backfill on-hand quantities for products created before product_stock existed
+        if db.query(ProductStock).first() is None and db.query(Product.id).first() is not None:
+            count = rebuild_product_stock(db)
+            print(f"✅ Backfilled product_stock for {count} products")
+        
+        # Backfill monthly expense rollups for expenses recorded before the rollup existed
+        if db.query(ExpenseMonthlyRollup).first() is None and db.query(Expense.id).first() is not None:
+            count = rebuild_expense_rollups(db)
+            print(f"✅ Backfilled {count} monthly expense rollups")
+        
+        # Backfill customers and receivables balances for sales recorded before the balance table existed
+        if db.query(CustomerBalance).first() is None and db.query(Sale.id).first() is not None:
+            count = rebuild_customer_balances(db)
+            print(f"✅ Backfilled balances for {count} customers")
+        
+        # Leaderboard counters cover the current week and month only: recompute them
+        count = rebuild_counters(db)
+        print(f"✅ Rebuilt {count} leaderboard counters")
+        
     except Exception as e:
         print(f"⚠️  Schema migration note: {e}")
         db.rollback()
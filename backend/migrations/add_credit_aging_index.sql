@@ -0,0 +1,6 @@
+-- Database Migration Script for the Credit Aging Report
+-- Serves the per-customer, date-ordered credit scan of /reports/credit-aging.
+-- Run manually using psql, or run `python init_db.py` (creates missing model indexes).
+
+CREATE INDEX IF NOT EXISTS idx_sales_customer_created
+    ON sales(lower(trim(customer_name)), created_at, customer_phone);
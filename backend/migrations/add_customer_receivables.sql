@@ -0,0 +1,43 @@
+-- Database Migration Script for Customer Receivables
+-- Keeps a running balance per customer so the Payments page reads one row per
+-- customer instead of aggregating every sale in the browser.
+-- Run manually using psql, then `python rebuild_receivables.py` to backfill balances.
+
+CREATE TABLE IF NOT EXISTS customers (
+    id UUID PRIMARY KEY,
+    name TEXT NOT NULL,
+    name_key TEXT NOT NULL UNIQUE,
+    phone VARCHAR(11),
+    created_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP
+);
+
+CREATE TABLE IF NOT EXISTS customer_payments (
+    id UUID PRIMARY KEY,
+    customer_id UUID NOT NULL REFERENCES customers(id) ON DELETE CASCADE,
+    amount NUMERIC(12, 2) NOT NULL,
+    notes TEXT,
+    paid_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP,
+    created_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP,
+    is_deleted BOOLEAN NOT NULL DEFAULT FALSE,
+    deleted_at TIMESTAMP WITH TIME ZONE
+);
+
+CREATE INDEX IF NOT EXISTS idx_customer_payments_customer_paid
+    ON customer_payments(customer_id, paid_at);
+
+CREATE TABLE IF NOT EXISTS customer_balances (
+    customer_id UUID PRIMARY KEY REFERENCES customers(id) ON DELETE CASCADE,
+    total_credit NUMERIC(14, 2) NOT NULL DEFAULT 0,
+    total_cash NUMERIC(14, 2) NOT NULL DEFAULT 0,
+    total_paid NUMERIC(14, 2) NOT NULL DEFAULT 0,
+    outstanding NUMERIC(14, 2) NOT NULL DEFAULT 0,
+    sales_count INTEGER NOT NULL DEFAULT 0,
+    last_transaction_at TIMESTAMP WITH TIME ZONE,
+    updated_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP
+);
+
+CREATE INDEX IF NOT EXISTS ix_customer_balances_outstanding
+    ON customer_balances(outstanding);
+
+COMMENT ON TABLE customer_balances IS 'Receivables per customer, updated incrementally on sale and payment writes';
+COMMENT ON COLUMN customer_balances.outstanding IS 'total_credit - total_paid';
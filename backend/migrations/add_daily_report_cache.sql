@@ -0,0 +1,24 @@
+-- Database Migration Script for the Closed-Day Report Cache
+-- Period reports reuse per-day sales and expense totals (integer paisa) for
+-- days older than REPORT_CACHE_CLOSED_AFTER_DAYS and query only newer days
+-- live. Rows are filled on first use; a backdated sale or an edit or soft
+-- delete touching a cached day deletes just that day's row.
+-- Run manually using psql.
+
+CREATE TABLE IF NOT EXISTS daily_report_cache (
+    day DATE PRIMARY KEY,
+    sales_count BIGINT NOT NULL DEFAULT 0,
+    quantity_sold BIGINT NOT NULL DEFAULT 0,
+    revenue BIGINT NOT NULL DEFAULT 0,
+    cost BIGINT NOT NULL DEFAULT 0,
+    gross_profit BIGINT NOT NULL DEFAULT 0,
+    total_credit BIGINT NOT NULL DEFAULT 0,
+    total_cash BIGINT NOT NULL DEFAULT 0,
+    credit_count BIGINT NOT NULL DEFAULT 0,
+    cash_count BIGINT NOT NULL DEFAULT 0,
+    total_expenses BIGINT NOT NULL DEFAULT 0,
+    total_income BIGINT NOT NULL DEFAULT 0,
+    net_expense BIGINT NOT NULL DEFAULT 0,
+    expense_count BIGINT NOT NULL DEFAULT 0,
+    computed_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP
+);
@@ -0,0 +1,27 @@
+-- Database Migration Script for Expense Categories and Monthly Rollups
+-- Adds a category to expenses and a per-month, per-category rollup that
+-- crud_expense keeps current on create, update and delete. /expenses/analytics
+-- reads only the rollup, so its cost does not grow with the expenses table.
+-- Run manually using psql; the INSERT backfills the rollup from existing rows.
+
+ALTER TABLE expenses ADD COLUMN IF NOT EXISTS category TEXT;
+
+CREATE TABLE IF NOT EXISTS expense_monthly_rollups (
+    month DATE NOT NULL,
+    category TEXT NOT NULL,
+    expense_total NUMERIC(14, 2) NOT NULL DEFAULT 0,
+    income_total NUMERIC(14, 2) NOT NULL DEFAULT 0,
+    count INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (month, category)
+);
+
+INSERT INTO expense_monthly_rollups (month, category, expense_total, income_total, count)
+SELECT date_trunc('month', expense_date)::date,
+       COALESCE(category, 'General'),
+       COALESCE(SUM(amount) FILTER (WHERE amount < 0), 0),
+       COALESCE(SUM(amount) FILTER (WHERE amount > 0), 0),
+       COUNT(*)
+FROM expenses
+WHERE is_deleted = FALSE
+GROUP BY 1, 2
+ON CONFLICT (month, category) DO NOTHING;
@@ -0,0 +1,21 @@
+-- Database Migration Script for Idempotency Keys
+-- Stores the response of POST /sales, /transactions and /invoices requests
+-- sent with an Idempotency-Key header so client retries replay it instead of
+-- creating duplicates. Rows expire after IDEMPOTENCY_TTL_HOURS.
+-- Run manually using psql, or run `python init_db.py`.
+
+CREATE TABLE IF NOT EXISTS idempotency_keys (
+    id UUID PRIMARY KEY,
+    key TEXT NOT NULL,
+    endpoint TEXT NOT NULL,
+    request_hash TEXT NOT NULL,
+    status_code INTEGER,
+    response_body TEXT,
+    created_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP,
+    expires_at TIMESTAMP WITH TIME ZONE NOT NULL,
+    CONSTRAINT uq_idempotency_keys_key_endpoint UNIQUE (key, endpoint)
+);
+
+CREATE INDEX IF NOT EXISTS ix_idempotency_keys_expires_at ON idempotency_keys(expires_at);
+
+COMMENT ON COLUMN idempotency_keys.status_code IS 'NULL while the first request is still storing its response';
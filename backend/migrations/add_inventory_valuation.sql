@@ -0,0 +1,44 @@
+-- Database Migration Script for the Inventory Valuation Engine
+-- Persisted FIFO cost layers, moving-average state and per-OUT COGS entries.
+-- Run manually using psql, or run `python init_db.py` (creates missing tables).
+
+CREATE TABLE IF NOT EXISTS valuation_states (
+    product_id UUID PRIMARY KEY REFERENCES products(id) ON DELETE CASCADE,
+    last_created_at TIMESTAMP WITH TIME ZONE,
+    last_transaction_id UUID,
+    recheck_from TIMESTAMP WITH TIME ZONE,
+    quantity_on_hand INTEGER NOT NULL DEFAULT 0,
+    fifo_deficit INTEGER NOT NULL DEFAULT 0,
+    average_cost_total BIGINT NOT NULL DEFAULT 0,
+    last_unit_cost BIGINT NOT NULL DEFAULT 0,
+    updated_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP
+);
+
+CREATE TABLE IF NOT EXISTS cost_layers (
+    id UUID PRIMARY KEY,
+    product_id UUID NOT NULL REFERENCES products(id) ON DELETE CASCADE,
+    transaction_id UUID NOT NULL REFERENCES stock_transactions(id) ON DELETE CASCADE,
+    received_at TIMESTAMP WITH TIME ZONE NOT NULL,
+    unit_cost BIGINT NOT NULL,
+    quantity_remaining INTEGER NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS cogs_entries (
+    transaction_id UUID PRIMARY KEY REFERENCES stock_transactions(id) ON DELETE CASCADE,
+    product_id UUID NOT NULL REFERENCES products(id) ON DELETE CASCADE,
+    occurred_at TIMESTAMP WITH TIME ZONE NOT NULL,
+    quantity INTEGER NOT NULL,
+    fifo_cost BIGINT NOT NULL,
+    average_cost BIGINT NOT NULL
+);
+
+-- Tables created before the recheck window and the one-layer-per-receipt rule
+ALTER TABLE valuation_states ADD COLUMN IF NOT EXISTS recheck_from TIMESTAMP WITH TIME ZONE;
+
+CREATE INDEX IF NOT EXISTS idx_cost_layers_product_received ON cost_layers(product_id, received_at);
+CREATE UNIQUE INDEX IF NOT EXISTS uq_cost_layers_transaction ON cost_layers(transaction_id);
+CREATE INDEX IF NOT EXISTS ix_cogs_entries_occurred_at ON cogs_entries(occurred_at);
+
+COMMENT ON TABLE cost_layers IS 'FIFO cost layers (remaining units per IN receipt), amounts in paisa; exhausted layers are pruned once behind the recheck window';
+COMMENT ON TABLE cogs_entries IS 'Cost of goods sold per OUT stock transaction under FIFO and moving average, in paisa';
+COMMENT ON COLUMN valuation_states.last_created_at IS 'Ledger watermark - rows after (last_created_at, last_transaction_id) are not yet valued';
@@ -0,0 +1,18 @@
+-- Database Migration Script for Leaderboard Counters
+-- Per-day revenue, profit, credit, quantity and sale counts per product and
+-- per customer for the days of the current week and month. Sales, invoices,
+-- edits and deletes adjust them incrementally; the backend rebuilds them from
+-- the sales table at startup.
+-- Run manually using psql.
+
+CREATE TABLE IF NOT EXISTS leaderboard_counters (
+    day DATE NOT NULL,
+    entity VARCHAR(10) NOT NULL,
+    entity_key TEXT NOT NULL,
+    revenue BIGINT NOT NULL DEFAULT 0,
+    profit BIGINT NOT NULL DEFAULT 0,
+    credit BIGINT NOT NULL DEFAULT 0,
+    quantity BIGINT NOT NULL DEFAULT 0,
+    sales_count INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (day, entity, entity_key)
+);
@@ -0,0 +1,30 @@
+-- Database Migration Script for Purchase Price History
+-- Keeps every purchase price a product has had, so backdated sales are costed
+-- at the price in effect on their date instead of the latest one.
+-- Run manually using psql, or run `python init_db.py` (creates the table, no backfill).
+
+CREATE TABLE IF NOT EXISTS product_price_history (
+    id UUID PRIMARY KEY,
+    product_id UUID NOT NULL REFERENCES products(id) ON DELETE CASCADE,
+    purchase_price NUMERIC(12, 2) NOT NULL,
+    effective_at TIMESTAMP WITH TIME ZONE NOT NULL,
+    transaction_id UUID REFERENCES stock_transactions(id) ON DELETE CASCADE,
+    created_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP
+);
+
+CREATE INDEX IF NOT EXISTS idx_product_price_history_product_effective
+    ON product_price_history(product_id, effective_at);
+
+-- Backfill from existing IN receipts
+INSERT INTO product_price_history (id, product_id, purchase_price, effective_at, transaction_id)
+SELECT gen_random_uuid(), st.product_id, st.purchase_price, st.created_at, st.id
+FROM stock_transactions st
+WHERE st.type = 'IN'
+  AND st.purchase_price IS NOT NULL
+  AND st.is_deleted = FALSE
+  AND NOT EXISTS (
+      SELECT 1 FROM product_price_history h WHERE h.transaction_id = st.id
+  );
+
+COMMENT ON TABLE product_price_history IS 'Purchase price per product effective from effective_at';
+COMMENT ON COLUMN product_price_history.transaction_id IS 'IN receipt that set the price (NULL for manual product edits)';
@@ -0,0 +1,19 @@
+-- Database Migration Script for Oversell-Safe Sales
+-- Keeps the on-hand quantity of each product in one row. Sales take stock with
+-- UPDATE product_stock SET quantity = quantity - n WHERE quantity >= n, so
+-- concurrent sales of the same product cannot take it below zero.
+-- Run manually using psql; the INSERT backfills balances from the ledger.
+
+CREATE TABLE IF NOT EXISTS product_stock (
+    product_id UUID PRIMARY KEY REFERENCES products(id) ON DELETE CASCADE,
+    quantity INTEGER NOT NULL DEFAULT 0,
+    updated_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP
+);
+
+INSERT INTO product_stock (product_id, quantity)
+SELECT p.id,
+       COALESCE(SUM(CASE WHEN t.type = 'IN' THEN t.quantity ELSE -t.quantity END), 0)
+FROM products p
+LEFT JOIN stock_transactions t ON t.product_id = p.id AND t.is_deleted = FALSE
+GROUP BY p.id
+ON CONFLICT (product_id) DO NOTHING;
@@ -0,0 +1,35 @@
+-- Database Migration Script for Reorder Drafts
+-- Purchase drafts built from the reorder planner's suggestions, one per
+-- supplier (company). Lines can be edited while a draft is open; receiving a
+-- draft writes one IN stock transaction per line and links it here.
+-- Run manually using psql.
+
+CREATE TABLE IF NOT EXISTS reorder_drafts (
+    id UUID PRIMARY KEY,
+    company_id UUID REFERENCES companies(id) ON DELETE SET NULL,
+    status TEXT NOT NULL DEFAULT 'draft' CHECK (status IN ('draft', 'received', 'cancelled')),
+    lead_time_days INTEGER NOT NULL,
+    safety_days INTEGER NOT NULL,
+    review_days INTEGER NOT NULL,
+    line_count INTEGER NOT NULL DEFAULT 0,
+    total_quantity INTEGER NOT NULL DEFAULT 0,
+    total_cost NUMERIC(14, 2) NOT NULL DEFAULT 0,
+    created_at TIMESTAMPTZ DEFAULT NOW(),
+    received_at TIMESTAMPTZ
+);
+
+CREATE INDEX IF NOT EXISTS ix_reorder_drafts_company_id ON reorder_drafts(company_id);
+CREATE INDEX IF NOT EXISTS ix_reorder_drafts_created_at ON reorder_drafts(created_at);
+
+CREATE TABLE IF NOT EXISTS reorder_draft_lines (
+    id UUID PRIMARY KEY,
+    draft_id UUID NOT NULL REFERENCES reorder_drafts(id) ON DELETE CASCADE,
+    product_id UUID NOT NULL REFERENCES products(id) ON DELETE CASCADE,
+    suggested_quantity INTEGER NOT NULL,
+    quantity INTEGER NOT NULL,
+    unit_cost NUMERIC(12, 2) NOT NULL,
+    transaction_id UUID REFERENCES stock_transactions(id) ON DELETE SET NULL,
+    CONSTRAINT uq_reorder_draft_line_product UNIQUE (draft_id, product_id)
+);
+
+CREATE INDEX IF NOT EXISTS ix_reorder_draft_lines_draft_id ON reorder_draft_lines(draft_id);
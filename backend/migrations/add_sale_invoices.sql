@@ -0,0 +1,27 @@
+-- Database Migration Script for Multi-line Sale Invoices
+-- An invoice header groups several sale lines (one per product) sold to a
+-- customer in one request; totals are stored on the header.
+-- Run manually using psql, or run `python init_db.py`.
+
+CREATE TABLE IF NOT EXISTS sale_invoices (
+    id UUID PRIMARY KEY,
+    customer_name TEXT NOT NULL,
+    customer_phone VARCHAR(11),
+    payment_type TEXT CHECK (payment_type IN ('Credit', 'Debit')),
+    line_count INTEGER NOT NULL DEFAULT 0,
+    total_quantity INTEGER NOT NULL DEFAULT 0,
+    total_amount NUMERIC(14, 2) NOT NULL DEFAULT 0,
+    total_cost NUMERIC(14, 2) NOT NULL DEFAULT 0,
+    created_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP,
+    is_deleted BOOLEAN NOT NULL DEFAULT FALSE,
+    deleted_at TIMESTAMP WITH TIME ZONE,
+    updated_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP
+);
+
+CREATE INDEX IF NOT EXISTS ix_sale_invoices_created_at ON sale_invoices(created_at);
+CREATE INDEX IF NOT EXISTS ix_sale_invoices_updated_at ON sale_invoices(updated_at);
+
+ALTER TABLE sales ADD COLUMN IF NOT EXISTS invoice_id UUID REFERENCES sale_invoices(id);
+CREATE INDEX IF NOT EXISTS ix_sales_invoice_id ON sales(invoice_id);
+
+COMMENT ON COLUMN sales.invoice_id IS 'Invoice this sale is a line of (NULL for single-product sales)';
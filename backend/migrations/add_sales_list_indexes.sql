@@ -0,0 +1,20 @@
+-- Database Migration Script for Server-Side Sales Filtering
+-- Indexes behind GET /sales?start_date=&end_date=&product_id=&payment_type=&sort=
+-- Run manually using psql (init_db.py also creates the model indexes).
+
+-- Newest-first paging and date ranges over live sales
+CREATE INDEX IF NOT EXISTS idx_sales_live_created
+    ON sales(created_at, id) WHERE is_deleted = false;
+
+-- Product filter (also per-product detail pages)
+CREATE INDEX IF NOT EXISTS idx_sales_product_created
+    ON sales(product_id, created_at);
+
+CREATE INDEX IF NOT EXISTS idx_sales_payment_created
+    ON sales(payment_type, created_at);
+
+-- Optional: substring customer search (?customer=) without a sequential scan.
+-- Needs the pg_trgm extension, which may require a superuser.
+-- CREATE EXTENSION IF NOT EXISTS pg_trgm;
+-- CREATE INDEX IF NOT EXISTS idx_sales_customer_trgm
+--     ON sales USING gin (lower(customer_name) gin_trgm_ops);
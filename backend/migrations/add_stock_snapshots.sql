@@ -0,0 +1,19 @@
+-- Database Migration Script for Point-in-Time Stock Balances
+-- Adds month-end stock snapshots and the per-product ledger index used by
+-- /products/stock-as-of and /products/{id}/stock-history.
+-- Run manually using psql, or run `python init_db.py` (creates missing tables and indexes).
+
+CREATE TABLE IF NOT EXISTS stock_snapshots (
+    id UUID PRIMARY KEY,
+    product_id UUID NOT NULL REFERENCES products(id) ON DELETE CASCADE,
+    snapshot_date DATE NOT NULL,
+    cutoff_at TIMESTAMP WITH TIME ZONE NOT NULL,
+    balance INTEGER NOT NULL,
+    created_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP,
+    CONSTRAINT uq_stock_snapshots_product_date UNIQUE (product_id, snapshot_date)
+);
+
+CREATE INDEX IF NOT EXISTS idx_stock_transactions_product_created ON stock_transactions(product_id, created_at);
+
+COMMENT ON TABLE stock_snapshots IS 'Closing stock balance per product at period end (written by snapshot_stock.py)';
+COMMENT ON COLUMN stock_snapshots.cutoff_at IS 'Snapshot covers stock transactions created before this instant';
@@ -0,0 +1,41 @@
+-- Database Migration Script for Delta Sync
+-- Adds updated_at to every synced table so GET /sync?since=<token> returns
+-- only rows created, changed or soft-deleted since the last call, and a
+-- tombstone table for hard deletes (companies, products).
+-- Run manually using psql, or run `python init_db.py` (adds columns and indexes, no backfill).
+
+ALTER TABLE companies ADD COLUMN IF NOT EXISTS updated_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP;
+ALTER TABLE products ADD COLUMN IF NOT EXISTS updated_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP;
+ALTER TABLE stock_transactions ADD COLUMN IF NOT EXISTS updated_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP;
+ALTER TABLE sales ADD COLUMN IF NOT EXISTS updated_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP;
+ALTER TABLE expenses ADD COLUMN IF NOT EXISTS updated_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP;
+ALTER TABLE customer_payments ADD COLUMN IF NOT EXISTS updated_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP;
+ALTER TABLE customers ADD COLUMN IF NOT EXISTS updated_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP;
+
+-- Existing rows: last change is the delete or the insert
+UPDATE companies SET updated_at = created_at WHERE created_at IS NOT NULL;
+UPDATE stock_transactions SET updated_at = COALESCE(deleted_at, created_at);
+UPDATE sales SET updated_at = COALESCE(deleted_at, created_at);
+UPDATE expenses SET updated_at = COALESCE(deleted_at, created_at);
+UPDATE customer_payments SET updated_at = COALESCE(deleted_at, created_at);
+UPDATE customers SET updated_at = created_at WHERE created_at IS NOT NULL;
+
+CREATE INDEX IF NOT EXISTS ix_companies_updated_at ON companies(updated_at);
+CREATE INDEX IF NOT EXISTS ix_products_updated_at ON products(updated_at);
+CREATE INDEX IF NOT EXISTS ix_stock_transactions_updated_at ON stock_transactions(updated_at);
+CREATE INDEX IF NOT EXISTS ix_sales_updated_at ON sales(updated_at);
+CREATE INDEX IF NOT EXISTS ix_expenses_updated_at ON expenses(updated_at);
+CREATE INDEX IF NOT EXISTS ix_customer_payments_updated_at ON customer_payments(updated_at);
+CREATE INDEX IF NOT EXISTS ix_customers_updated_at ON customers(updated_at);
+CREATE INDEX IF NOT EXISTS ix_customer_balances_updated_at ON customer_balances(updated_at);
+
+CREATE TABLE IF NOT EXISTS sync_tombstones (
+    id UUID PRIMARY KEY,
+    table_name TEXT NOT NULL,
+    row_id UUID NOT NULL,
+    deleted_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP
+);
+
+CREATE INDEX IF NOT EXISTS ix_sync_tombstones_deleted_at ON sync_tombstones(deleted_at);
+
+COMMENT ON TABLE sync_tombstones IS 'Hard-deleted rows reported by GET /sync';
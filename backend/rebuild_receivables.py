@@ -0,0 +1,32 @@
+"""
+Customer receivables backfill
+Recomputes every customer balance from sales and payments. init_db backfills
+an empty balance table at startup; run this any time balances are suspected
+to have drifted:
+
+    python rebuild_receivables.py
+"""
+import sys
+import os
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(__file__))
+
+from app.db.session import SessionLocal
+from app.crud.crud_customer import rebuild_customer_balances
+
+def main():
+    print("💰 Rebuilding customer balances...")
+    db = SessionLocal()
+    try:
+        count = rebuild_customer_balances(db)
+        print(f"✅ Balances rebuilt for {count} customers")
+    except Exception as e:
+        print(f"❌ Rebuild failed: {e}")
+        db.rollback()
+        sys.exit(1)
+    finally:
+        db.close()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,42 @@
+"""
+Month-end stock snapshot job
+Writes closing stock balances per product for every completed month that is
+missing a snapshot. Schedule it daily (e.g. cron) - re-runs are cheap:
+
+    python snapshot_stock.py                    # up to the last completed month
+    python snapshot_stock.py --through 2025-06-30
+"""
+import sys
+import os
+import argparse
+from datetime import date
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(__file__))
+
+from app.db.session import SessionLocal
+from app.crud.crud_stock import write_month_end_snapshots
+
+def main():
+    parser = argparse.ArgumentParser(description="Write month-end stock snapshots")
+    parser.add_argument("--through", type=date.fromisoformat, default=None,
+                        help="Last date to snapshot (default: end of last completed month)")
+    args = parser.parse_args()
+
+    print("📦 Writing month-end stock snapshots...")
+    db = SessionLocal()
+    try:
+        written = write_month_end_snapshots(db, through=args.through)
+        for month_end in written:
+            print(f"  ✅ Snapshot written for {month_end}")
+        if not written:
+            print("✅ Snapshots already up to date")
+    except Exception as e:
+        print(f"❌ Snapshot job failed: {e}")
+        db.rollback()
+        sys.exit(1)
+    finally:
+        db.close()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+"""
+Test cases for the DuckDB analytical mirror
+Reports over the mirror match the primary database and follow later writes
+"""
+from datetime import date, datetime, timedelta
+from decimal import Decimal
+
+import pytest
+from sqlalchemy.orm import sessionmaker
+
+pytest.importorskip("duckdb_engine")
+
+from app.db.analytics import AnalyticsMirror
+from app.db.session import Base, make_engine
+from app.crud import crud_company, crud_product, crud_report, crud_transaction
+from app.schemas.company import CompanyCreate
+from app.schemas.product import ProductCreate
+from app.schemas.transactions import SaleCreate, StockTransactionCreate
+
+DAY = date.today() - timedelta(days=30)
+
+
+@pytest.fixture
+def session_factory(tmp_path):
+    engine = make_engine(f"sqlite:///{tmp_path / 'primary.db'}")
+    Base.metadata.create_all(bind=engine)
+    yield sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    engine.dispose()
+
+
+@pytest.fixture
+def product_id(session_factory):
+    with session_factory() as db:
+        company = crud_company.create_company(db, CompanyCreate(name="Mirror Company"))
+        product = crud_product.create_product(db, ProductCreate(
+            company_id=company.id, name="Mirror Product", unit="Bags", purchase_price=Decimal("100.00")
+        ))
+        crud_transaction.create_transaction(db, StockTransactionCreate(
+            product_id=product.id, quantity=50, purchase_price=Decimal("100.00"), type="IN"
+        ))
+        return product.id
+
+
+def sell(db, product_id, quantity):
+    return crud_transaction.create_sale(db, SaleCreate(
+        product_id=product_id,
+        customer_name="Mirror Customer",
+        quantity=quantity,
+        selling_price=Decimal("150.00"),
+        payment_type="Credit",
+        created_at=datetime.combine(DAY, datetime.min.time()) + timedelta(hours=10)
+    ))
+
+
+class TestAnalyticsMirror:
+    """Test suite for app.db.analytics"""
+
+    def test_mirror_matches_primary_after_refreshes(self, session_factory, product_id, tmp_path):
+        """Test daily totals from the mirror equal the primary's after inserts and a soft delete"""
+        mirror = AnalyticsMirror(str(tmp_path / "mirror.duckdb"))
+        with session_factory() as db:
+            first = sell(db, product_id, 2)
+            assert mirror.refresh(db) == {"sales": 1, "expenses": 0}
+
+            def compare():
+                with mirror.Session() as mirror_db:
+                    mirrored = crud_report._compute_days(mirror_db, DAY, DAY)
+                assert mirrored == crud_report._compute_days(db, DAY, DAY)
+                return mirrored[DAY]
+
+            assert compare()["revenue"] == 30000  # paisa
+            sell(db, product_id, 1)
+            crud_transaction.delete_sale(db, first.id)
+            mirror.refresh(db)
+            totals = compare()
+            assert totals["sales_count"] == 1
+            assert totals["quantity_sold"] == 1
@@ -169,3 +169,50 @@ class TestCompanyEndpoints:
         """Test that endpoints require authentication"""
         response = client.get("/api/v1/companies/")
         assert response.status_code == 401
+
+    def test_company_summary(self, client, auth_headers):
+        """Test per-company stock and sales totals from the summary endpoint"""
+        company_id = client.post(
+            "/api/v1/companies/", json={"name": "Summary Test Company"}, headers=auth_headers
+        ).json()["id"]
+        client.post("/api/v1/companies/", json={"name": "Summary Empty Company"}, headers=auth_headers)
+        for name, quantity in (("Summary Urea", 20), ("Summary DAP", 3)):
+            product_id = client.post("/api/v1/products/", json={
+                "company_id": company_id,
+                "name": name,
+                "unit": "Bags",
+                "purchase_price": 1000.00,
+                "min_stock": 5
+            }, headers=auth_headers).json()["id"]
+            client.post("/api/v1/transactions/", json={
+                "product_id": product_id, "quantity": quantity, "purchase_price": 1000.00, "type": "IN"
+            }, headers=auth_headers)
+        client.post("/api/v1/sales/", json={
+            "product_id": product_id,
+            "customer_name": "Summary Customer",
+            "quantity": 1,
+            "selling_price": 1200.00,
+            "payment_type": "Debit"
+        }, headers=auth_headers)
+
+        response = client.get("/api/v1/companies/summary", headers=auth_headers)
+
+        assert response.status_code == 200
+        companies = {c["company_name"]: c for c in response.json()["companies"]}
+        summary = companies["Summary Test Company"]
+        assert summary["product_count"] == 2
+        assert summary["total_stock"] == 22
+        assert float(summary["stock_value"]) == 22000.00
+        assert summary["low_stock_count"] == 1
+        assert summary["sales_count"] == 1
+        assert float(summary["revenue"]) == 1200.00
+        assert float(summary["profit"]) == 200.00
+        assert companies["Summary Empty Company"]["product_count"] == 0
+
+        past = client.get(
+            "/api/v1/companies/summary?start_date=2000-01-01&end_date=2000-12-31", headers=auth_headers
+        ).json()
+        past_summary = next(c for c in past["companies"] if c["company_name"] == "Summary Test Company")
+        assert past_summary["sales_count"] == 0
+        assert float(past_summary["revenue"]) == 0
+        assert past_summary["total_stock"] == 22
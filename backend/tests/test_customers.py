@@ -0,0 +1,111 @@
+"""
+Test cases for Customer receivables endpoints
+Tests balances maintained on sale writes and payments
+"""
+import pytest
+
+class TestCustomerEndpoints:
+    """Test suite for /api/v1/customers endpoints"""
+    
+    @pytest.fixture
+    def test_product_with_stock(self, client, auth_headers):
+        """Create product and add stock, return product ID"""
+        company_response = client.post(
+            "/api/v1/companies/",
+            json={"name": "Receivables Test Company"},
+            headers=auth_headers
+        )
+        company_id = company_response.json()["id"]
+        
+        product_response = client.post(
+            "/api/v1/products/",
+            json={
+                "company_id": company_id,
+                "name": "Receivables Test Product",
+                "category": "Fertilizer",
+                "unit": "Bags",
+                "purchase_price": 1000.00,
+                "min_stock": 5
+            },
+            headers=auth_headers
+        )
+        product_id = product_response.json()["id"]
+        
+        client.post(
+            "/api/v1/transactions/",
+            json={
+                "product_id": product_id,
+                "quantity": 100,
+                "party_name": "Initial Stock",
+                "purchase_price": 1000.00,
+                "type": "IN"
+            },
+            headers=auth_headers
+        )
+        return product_id
+    
+    def _balance(self, client, auth_headers, name):
+        response = client.get(
+            "/api/v1/customers/balances",
+            params={"search": name},
+            headers=auth_headers
+        )
+        assert response.status_code == 200
+        items = response.json()["items"]
+        return items[0] if items else None
+    
+    def test_credit_sale_and_payment(self, client, auth_headers, test_product_with_stock):
+        """Test credit sales raise the balance and payments reduce it"""
+        sale_response = client.post("/api/v1/sales/", json={
+            "product_id": test_product_with_stock,
+            "customer_name": "Receivables Farmer",
+            "customer_phone": "03001112233",
+            "quantity": 2,
+            "selling_price": 1500.00,
+            "payment_type": "Credit"
+        }, headers=auth_headers)
+        assert sale_response.status_code == 201
+        
+        balance = self._balance(client, auth_headers, "Receivables Farmer")
+        assert float(balance["outstanding"]) == 3000.00
+        assert balance["sales_count"] == 1
+        
+        payment_response = client.post("/api/v1/customers/payments", json={
+            "customer_name": "receivables farmer ",
+            "amount": 1000.00
+        }, headers=auth_headers)
+        assert payment_response.status_code == 201
+        
+        balance = self._balance(client, auth_headers, "Receivables Farmer")
+        assert float(balance["outstanding"]) == 2000.00
+        assert float(balance["total_paid"]) == 1000.00
+        
+        client.delete(f"/api/v1/sales/{sale_response.json()['id']}", headers=auth_headers)
+        balance = self._balance(client, auth_headers, "Receivables Farmer")
+        assert float(balance["outstanding"]) == -1000.00
+        assert balance["sales_count"] == 0
+    
+    def test_payment_validation(self, client, auth_headers):
+        """Test payments must be positive"""
+        response = client.post("/api/v1/customers/payments", json={
+            "customer_name": "Nobody",
+            "amount": 0
+        }, headers=auth_headers)
+        assert response.status_code == 422
+    
+    def test_product_delete_reverses_balance(self, client, auth_headers, test_product_with_stock):
+        """Test deleting a product takes its sales out of the customer balance"""
+        client.post("/api/v1/sales/", json={
+            "product_id": test_product_with_stock,
+            "customer_name": "Deleted Product Farmer",
+            "quantity": 1,
+            "selling_price": 1500.00,
+            "payment_type": "Credit"
+        }, headers=auth_headers)
+        
+        response = client.delete(f"/api/v1/products/{test_product_with_stock}", headers=auth_headers)
+        assert response.status_code in [200, 204]
+        
+        balance = self._balance(client, auth_headers, "Deleted Product Farmer")
+        assert float(balance["outstanding"]) == 0.00
+        assert balance["sales_count"] == 0
@@ -0,0 +1,77 @@
+"""
+Test cases for the Parquet export endpoint
+Types survive the round trip, columns and dates filter, bad input is rejected
+"""
+import uuid
+from decimal import Decimal
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+import pytest
+
+class TestExportEndpoints:
+    """Test suite for /api/v1/export endpoints"""
+    
+    @pytest.fixture
+    def test_product_id(self, client, auth_headers):
+        """Create test company and product, return product ID"""
+        company_response = client.post(
+            "/api/v1/companies/",
+            json={"name": "Export Test Company"},
+            headers=auth_headers
+        )
+        company_id = company_response.json()["id"]
+        
+        product_response = client.post(
+            "/api/v1/products/",
+            json={
+                "company_id": company_id,
+                "name": "Export Test Product",
+                "category": "Fertilizer",
+                "unit": "Bags",
+                "purchase_price": 1000.00,
+                "min_stock": 5
+            },
+            headers=auth_headers
+        )
+        return product_response.json()["id"]
+    
+    def test_export_sales_parquet(self, client, auth_headers, test_product_id):
+        """Test sales export keeps UUID, DECIMAL and timestamp types and honours column selection"""
+        client.post("/api/v1/transactions/", json={
+            "product_id": test_product_id,
+            "quantity": 10,
+            "purchase_price": 1000.00,
+            "type": "IN"
+        }, headers=auth_headers)
+        client.post("/api/v1/sales/", json={
+            "product_id": test_product_id,
+            "customer_name": "Export Customer",
+            "quantity": 2,
+            "selling_price": 1250.50,
+            "payment_type": "Credit",
+            "created_at": "2004-04-04T10:00:00"
+        }, headers=auth_headers)
+        
+        response = client.get(
+            "/api/v1/export/sales.parquet?start_date=2004-04-01&end_date=2004-04-30"
+            "&columns=id,customer_name,total_amount,created_at",
+            headers=auth_headers
+        )
+        assert response.status_code == 200
+        table = pq.read_table(pa.BufferReader(response.content))
+        assert table.column_names == ["id", "customer_name", "total_amount", "created_at"]
+        assert table.num_rows == 1
+        row = table.to_pylist()[0]
+        assert isinstance(row["id"], uuid.UUID)
+        assert row["customer_name"] == "Export Customer"
+        assert row["total_amount"] == Decimal("2501.00")
+        assert table.schema.field("created_at").type.tz == "UTC"
+    
+    def test_export_rejects_bad_input(self, client, auth_headers):
+        """Test unknown tables, unknown columns and date filters on products"""
+        assert client.get("/api/v1/export/users.parquet", headers=auth_headers).status_code == 404
+        assert client.get("/api/v1/export/sales.parquet?columns=secret", headers=auth_headers).status_code == 400
+        assert client.get(
+            "/api/v1/export/products.parquet?start_date=2024-01-01", headers=auth_headers
+        ).status_code == 400
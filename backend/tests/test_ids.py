@@ -0,0 +1,30 @@
+"""
+Test cases for time-ordered UUIDv7 primary key generation
+"""
+from datetime import datetime, timedelta, timezone
+
+from app.core.ids import uuid7, uuid7_floor, uuid7_time
+
+
+class TestUUID7:
+    """Test suite for app.core.ids"""
+
+    def test_version_and_variant(self):
+        value = uuid7()
+        assert value.version == 7
+        assert value.variant == "specified in RFC 4122"
+
+    def test_monotonic_within_process(self):
+        ids = [uuid7() for _ in range(5000)]
+        assert ids == sorted(ids)
+        assert len(set(ids)) == len(ids)
+
+    def test_embedded_timestamp(self):
+        before = datetime.now(timezone.utc) - timedelta(seconds=1)
+        value = uuid7()
+        after = datetime.now(timezone.utc) + timedelta(seconds=1)
+        assert before <= uuid7_time(value) <= after
+
+    def test_floor_is_lower_bound(self):
+        moment = datetime.now(timezone.utc) - timedelta(milliseconds=5)
+        assert uuid7_floor(moment) < uuid7()
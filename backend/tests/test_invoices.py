@@ -0,0 +1,92 @@
+"""
+Test cases for Sale Invoice endpoints
+Tests multi-line invoice creation, stored totals and soft delete
+"""
+import pytest
+
+class TestInvoiceEndpoints:
+    """Test suite for /api/v1/invoices endpoints"""
+    
+    @pytest.fixture
+    def test_products(self, client, auth_headers):
+        """Create two stocked products, return their IDs"""
+        company_id = client.post(
+            "/api/v1/companies/",
+            json={"name": "Invoice Test Company"},
+            headers=auth_headers
+        ).json()["id"]
+        
+        product_ids = []
+        for name, price in [("Invoice Urea", 1000.00), ("Invoice DAP", 500.00)]:
+            product_id = client.post("/api/v1/products/", json={
+                "company_id": company_id,
+                "name": name,
+                "category": "Fertilizer",
+                "unit": "Bags",
+                "purchase_price": price,
+                "min_stock": 5
+            }, headers=auth_headers).json()["id"]
+            client.post("/api/v1/transactions/", json={
+                "product_id": product_id,
+                "quantity": 50,
+                "party_name": "Initial Stock",
+                "purchase_price": price,
+                "type": "IN"
+            }, headers=auth_headers)
+            product_ids.append(product_id)
+        return product_ids
+    
+    def test_create_invoice(self, client, auth_headers, test_products):
+        """Test creating an invoice with several lines"""
+        urea, dap = test_products
+        response = client.post("/api/v1/invoices/", json={
+            "customer_name": "Invoice Farmer",
+            "payment_type": "Debit",
+            "lines": [
+                {"product_id": urea, "quantity": 2, "selling_price": 1100.00},
+                {"product_id": dap, "quantity": 3, "selling_price": 600.00}
+            ]
+        }, headers=auth_headers)
+        
+        assert response.status_code == 201
+        data = response.json()
+        assert data["line_count"] == 2
+        assert float(data["total_amount"]) == 4000.00
+        assert float(data["total_cost"]) == 3500.00
+        assert {line["invoice_id"] for line in data["lines"]} == {data["id"]}
+    
+    def test_invoice_unknown_product(self, client, auth_headers, test_products):
+        """Test an unknown product rejects the whole invoice"""
+        response = client.post("/api/v1/invoices/", json={
+            "customer_name": "Invoice Farmer",
+            "payment_type": "Debit",
+            "lines": [
+                {"product_id": test_products[0], "quantity": 1, "selling_price": 1100.00},
+                {"product_id": "00000000-0000-0000-0000-000000000000", "quantity": 1, "selling_price": 1.00}
+            ]
+        }, headers=auth_headers)
+        
+        assert response.status_code == 404
+    
+    def test_delete_line_updates_totals(self, client, auth_headers, test_products):
+        """Test deleting one line through /sales updates the stored header totals"""
+        urea, dap = test_products
+        invoice = client.post("/api/v1/invoices/", json={
+            "customer_name": "Invoice Farmer",
+            "payment_type": "Credit",
+            "lines": [
+                {"product_id": urea, "quantity": 1, "selling_price": 1100.00},
+                {"product_id": dap, "quantity": 1, "selling_price": 600.00}
+            ]
+        }, headers=auth_headers).json()
+        
+        client.delete(f"/api/v1/sales/{invoice['lines'][0]['id']}", headers=auth_headers)
+        
+        response = client.get(f"/api/v1/invoices/{invoice['id']}", headers=auth_headers)
+        assert response.status_code == 200
+        assert response.json()["line_count"] == 1
+        assert float(response.json()["total_amount"]) == 600.00
+        
+        response = client.delete(f"/api/v1/invoices/{invoice['id']}", headers=auth_headers)
+        assert response.status_code == 204
+        assert client.get(f"/api/v1/invoices/{invoice['id']}", headers=auth_headers).status_code == 404
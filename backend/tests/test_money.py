@@ -0,0 +1,36 @@
+"""
+Test cases for the integer-paisa Money type used by report aggregation
+"""
+from decimal import Decimal
+
+import pytest
+
+from app.core.money import Money
+
+
+class TestMoney:
+    """Test suite for app.core.money"""
+
+    def test_decimal_round_trip(self):
+        assert Money.from_decimal(Decimal("1200.50")).paisa == 120050
+        assert Money(120050).to_decimal() == Decimal("1200.50")
+        assert Money.from_decimal(None) == Money(0)
+
+    def test_rounding_half_up(self):
+        assert Money.from_decimal("0.005").paisa == 1
+        assert Money.from_decimal(-0.015).paisa == -2
+
+    def test_arithmetic_is_exact(self):
+        total = sum((Money.from_decimal("0.10") for _ in range(10)), Money(0))
+        assert total == Money.from_decimal("1.00")
+        assert Money(250) * 4 == Money(1000)
+        assert abs(Money(-500)) - Money(100) == Money(400)
+
+    def test_builtin_sum(self):
+        assert sum([Money(150), Money(250)]) == Money(400)
+        with pytest.raises(TypeError):
+            5 + Money(100)
+
+    def test_ratio(self):
+        assert Money(2500).ratio(Money(10000)) == 0.25
+        assert Money(100).ratio(Money(0)) == 0.0
@@ -185,3 +185,40 @@ class TestProductEndpoints:
         data = response.json()
         assert len(data) >= 1
         assert any("Urea" in p["name"] for p in data)
+    
+    def test_product_detail(self, client, auth_headers, test_company_id):
+        """Test the aggregated product detail with totals and paged movements"""
+        product_id = client.post("/api/v1/products/", json={
+            "company_id": test_company_id,
+            "name": "Detail Test Product",
+            "unit": "Bags",
+            "purchase_price": 1000.00,
+            "min_stock": 5
+        }, headers=auth_headers).json()["id"]
+        client.post("/api/v1/transactions/", json={
+            "product_id": product_id, "quantity": 20, "purchase_price": 1100.00, "type": "IN"
+        }, headers=auth_headers)
+        client.post("/api/v1/sales/", json={
+            "product_id": product_id,
+            "customer_name": "Detail Customer",
+            "quantity": 5,
+            "selling_price": 1300.00,
+            "payment_type": "Credit"
+        }, headers=auth_headers)
+        
+        response = client.get(f"/api/v1/products/{product_id}/detail?limit=1", headers=auth_headers)
+        
+        assert response.status_code == 200
+        data = response.json()
+        assert data["current_stock"] == 15
+        assert data["total_in"] == 20
+        assert data["total_out"] == 5
+        assert float(data["revenue"]) == 6500.00
+        assert float(data["profit"]) == 1000.00
+        assert float(data["last_purchase_price"]) == 1100.00
+        assert data["movements_total"] == 2
+        assert len(data["movements"]) == 1
+        assert data["movements"][0]["customer_name"] == "Detail Customer"
+        
+        missing = client.get(f"/api/v1/products/{uuid4()}/detail", headers=auth_headers)
+        assert missing.status_code == 404
@@ -0,0 +1,116 @@
+"""
+Test cases for Reorder planner endpoints
+Tests suggestions per supplier, draft editing and receiving a draft as IN stock
+"""
+import pytest
+
+class TestReorderEndpoints:
+    """Test suite for /api/v1/reorders endpoints"""
+
+    @pytest.fixture
+    def test_supplier(self, client, auth_headers):
+        """Create a company with a product below min_stock, return (company_id, product_id)"""
+        company_id = client.post(
+            "/api/v1/companies/",
+            json={"name": "Reorder Test Company"},
+            headers=auth_headers
+        ).json()["id"]
+        product_id = client.post("/api/v1/products/", json={
+            "company_id": company_id,
+            "name": "Reorder Urea",
+            "category": "Fertilizer",
+            "unit": "Bags",
+            "purchase_price": 1000.00,
+            "min_stock": 10
+        }, headers=auth_headers).json()["id"]
+        client.post("/api/v1/transactions/", json={
+            "product_id": product_id,
+            "quantity": 4,
+            "party_name": "Initial Stock",
+            "purchase_price": 1000.00,
+            "type": "IN"
+        }, headers=auth_headers)
+        return company_id, product_id
+
+    def test_suggestions(self, client, auth_headers, test_supplier):
+        """Test a product below min_stock is suggested back up to it (no demand history)"""
+        company_id, product_id = test_supplier
+        response = client.get(f"/api/v1/reorders/suggestions?company_id={company_id}", headers=auth_headers)
+
+        assert response.status_code == 200
+        data = response.json()
+        assert len(data["suppliers"]) == 1
+        supplier = data["suppliers"][0]
+        assert supplier["company_name"] == "Reorder Test Company"
+        line = supplier["lines"][0]
+        assert line["product_id"] == product_id
+        assert line["reorder_point"] == 10
+        assert line["suggested_quantity"] == 6
+        assert float(supplier["total_cost"]) == 6000.00
+
+    def test_draft_edit_and_receive(self, client, auth_headers, test_supplier):
+        """Test a draft is edited, received as IN stock once, and then closed"""
+        company_id, product_id = test_supplier
+        response = client.post("/api/v1/reorders/drafts", json={"company_id": company_id}, headers=auth_headers)
+        assert response.status_code == 201
+        draft = response.json()[0]
+        assert draft["status"] == "draft"
+        assert draft["lines"][0]["quantity"] == 6
+
+        response = client.put(f"/api/v1/reorders/drafts/{draft['id']}/lines", json={
+            "lines": [{"product_id": product_id, "quantity": 20, "unit_cost": 1050.00}]
+        }, headers=auth_headers)
+        assert response.status_code == 200
+        assert float(response.json()["total_cost"]) == 21000.00
+
+        response = client.post(f"/api/v1/reorders/drafts/{draft['id']}/receive", headers=auth_headers)
+        assert response.status_code == 200
+        received = response.json()
+        assert received["status"] == "received"
+        assert received["lines"][0]["transaction_id"] is not None
+
+        detail = client.get(f"/api/v1/products/{product_id}/detail", headers=auth_headers).json()
+        assert detail["current_stock"] == 24
+        assert float(detail["product"]["purchase_price"]) == 1050.00
+
+        # Received drafts are closed
+        response = client.post(f"/api/v1/reorders/drafts/{draft['id']}/receive", headers=auth_headers)
+        assert response.status_code == 409
+        response = client.delete(f"/api/v1/reorders/drafts/{draft['id']}", headers=auth_headers)
+        assert response.status_code == 409
+
+    def test_cancel_draft(self, client, auth_headers, test_supplier):
+        """Test a cancelled draft cannot be received"""
+        company_id, _ = test_supplier
+        draft = client.post(
+            "/api/v1/reorders/drafts", json={"company_id": company_id}, headers=auth_headers
+        ).json()[0]
+
+        response = client.delete(f"/api/v1/reorders/drafts/{draft['id']}", headers=auth_headers)
+        assert response.status_code == 204
+        response = client.post(f"/api/v1/reorders/drafts/{draft['id']}/receive", headers=auth_headers)
+        assert response.status_code == 409
+
+    def test_open_drafts_count_as_ordered(self, client, auth_headers, test_supplier):
+        """Test the quantity on an open draft is not suggested or drafted again"""
+        company_id, product_id = test_supplier
+        client.post("/api/v1/reorders/drafts", json={"company_id": company_id}, headers=auth_headers)
+
+        response = client.get(f"/api/v1/reorders/suggestions?company_id={company_id}", headers=auth_headers)
+        assert response.json()["suppliers"] == []
+        response = client.post("/api/v1/reorders/drafts", json={"company_id": company_id}, headers=auth_headers)
+        assert response.json() == []
+
+    def test_product_delete_updates_draft(self, client, auth_headers, test_supplier):
+        """Test deleting a product removes its draft line and the header totals follow"""
+        company_id, product_id = test_supplier
+        draft = client.post(
+            "/api/v1/reorders/drafts", json={"company_id": company_id}, headers=auth_headers
+        ).json()[0]
+
+        client.delete(f"/api/v1/products/{product_id}", headers=auth_headers)
+        detail = client.get(f"/api/v1/reorders/drafts/{draft['id']}", headers=auth_headers).json()
+        assert detail["lines"] == []
+        assert detail["line_count"] == 0
+        assert detail["total_quantity"] == 0
+        assert float(detail["total_cost"]) == 0.00
@@ -0,0 +1,333 @@
+"""
+Test cases for Reports endpoints
+Tests dashboard, period summary and inventory valuation
+"""
+import pytest
+from datetime import date, timedelta
+
+class TestReportEndpoints:
+    """Test suite for /api/v1/reports endpoints"""
+    
+    @pytest.fixture
+    def test_product_id(self, client, auth_headers):
+        """Create test company and product, return product ID"""
+        company_response = client.post(
+            "/api/v1/companies/",
+            json={"name": "Report Test Company"},
+            headers=auth_headers
+        )
+        company_id = company_response.json()["id"]
+        
+        product_response = client.post(
+            "/api/v1/products/",
+            json={
+                "company_id": company_id,
+                "name": "Report Test Product",
+                "category": "Fertilizer",
+                "unit": "Bags",
+                "purchase_price": 1000.00,
+                "min_stock": 5
+            },
+            headers=auth_headers
+        )
+        return product_response.json()["id"]
+    
+    def test_dashboard(self, client, auth_headers):
+        """Test dashboard summary"""
+        response = client.get("/api/v1/reports/", headers=auth_headers)
+        
+        assert response.status_code == 200
+        data = response.json()
+        assert "stats" in data
+        assert len(data["weekly_sales"]) == 7
+    
+    def test_fifo_valuation(self, client, auth_headers, test_product_id):
+        """Test FIFO inventory valuation consumes the oldest cost layer first"""
+        for quantity, price in [(10, 1000.00), (10, 1200.00)]:
+            client.post("/api/v1/transactions/", json={
+                "product_id": test_product_id,
+                "quantity": quantity,
+                "party_name": "Valuation Supplier",
+                "purchase_price": price,
+                "type": "IN"
+            }, headers=auth_headers)
+        client.post("/api/v1/transactions/", json={
+            "product_id": test_product_id,
+            "quantity": 15,
+            "party_name": "Valuation Issue",
+            "type": "OUT"
+        }, headers=auth_headers)
+        
+        response = client.get(
+            "/api/v1/reports/inventory-valuation",
+            params={"method": "fifo"},
+            headers=auth_headers
+        )
+        
+        assert response.status_code == 200
+        products = {p["product_id"]: p for p in response.json()["products"]}
+        assert products[test_product_id]["quantity"] == 5
+        assert float(products[test_product_id]["value"]) == 6000.00
+        
+        response = client.get(
+            "/api/v1/reports/inventory-valuation",
+            params={"method": "average"},
+            headers=auth_headers
+        )
+        products = {p["product_id"]: p for p in response.json()["products"]}
+        assert float(products[test_product_id]["value"]) == 5500.00
+    
+    def test_credit_aging(self, client, auth_headers, test_product_id):
+        """Test credit aging buckets with payments applied to the oldest sales first"""
+        from datetime import datetime, timedelta
+        client.post("/api/v1/transactions/", json={
+            "product_id": test_product_id,
+            "quantity": 10,
+            "party_name": "Aging Supplier",
+            "purchase_price": 1000.00,
+            "type": "IN"
+        }, headers=auth_headers)
+        for amount, days_ago in [(1000.00, 100), (2000.00, 45)]:
+            client.post("/api/v1/sales/", json={
+                "product_id": test_product_id,
+                "customer_name": "Aging Test Farmer",
+                "quantity": 1,
+                "selling_price": amount,
+                "payment_type": "Credit",
+                "created_at": (datetime.now() - timedelta(days=days_ago)).isoformat()
+            }, headers=auth_headers)
+        client.post("/api/v1/customers/payments", json={
+            "customer_name": "Aging Test Farmer",
+            "amount": 1500.00
+        }, headers=auth_headers)
+        
+        response = client.get("/api/v1/reports/credit-aging", headers=auth_headers)
+        
+        assert response.status_code == 200
+        customers = {c["customer_name"]: c for c in response.json()["customers"]}
+        aging = customers["Aging Test Farmer"]
+        assert float(aging["days_over_90"]) == 0.00
+        assert float(aging["days_31_60"]) == 1500.00
+        assert float(aging["total_outstanding"]) == 1500.00
+    
+    def test_expense_analytics(self, client, auth_headers):
+        """Test category rollups follow expense create, update and delete"""
+        def add(name, amount, category, day):
+            return client.post("/api/v1/expenses/", json={
+                "name": name, "amount": amount, "category": category, "expense_date": f"{day}T10:00:00"
+            }, headers=auth_headers).json()["id"]
+        
+        fuel = add("Fuel", -500.00, "Transport", "2001-01-10")
+        lunch = add("Lunch", -200.00, None, "2001-02-03")
+        add("Gift", 1000.00, "Income", "2001-04-03")
+        client.put(f"/api/v1/expenses/{lunch}", json={"amount": -300.00}, headers=auth_headers)
+        client.delete(f"/api/v1/expenses/{fuel}", headers=auth_headers)
+        
+        response = client.get(
+            "/api/v1/expenses/analytics?period=quarter&start_date=2001-01-01&end_date=2001-12-31",
+            headers=auth_headers
+        )
+        
+        assert response.status_code == 200
+        data = response.json()
+        assert [p["period"] for p in data["periods"]] == ["2001-Q1", "2001-Q2"]
+        q1 = data["periods"][0]
+        assert float(q1["expense_total"]) == -300.00
+        assert q1["count"] == 1
+        assert q1["categories"][0]["category"] == "General"
+        assert float(data["income_total"]) == 1000.00
+        assert float(data["net"]) == 700.00
+    
+    def test_period_comparison(self, client, auth_headers, test_product_id):
+        """Test several periods are summarized together with deltas between them"""
+        client.post("/api/v1/transactions/", json={
+            "product_id": test_product_id,
+            "quantity": 10,
+            "purchase_price": 1000.00,
+            "type": "IN"
+        }, headers=auth_headers)
+        for amount, day in [(1000.00, "2002-01-15"), (1500.00, "2002-02-15")]:
+            client.post("/api/v1/sales/", json={
+                "product_id": test_product_id,
+                "customer_name": "Compare Customer",
+                "quantity": 1,
+                "selling_price": amount,
+                "payment_type": "Debit",
+                "created_at": f"{day}T10:00:00"
+            }, headers=auth_headers)
+        
+        response = client.get(
+            "/api/v1/reports/compare",
+            params=[("periods", "2002-01-01:2002-01-31"), ("periods", "2002-02-01:2002-02-28")],
+            headers=auth_headers
+        )
+        
+        assert response.status_code == 200
+        data = response.json()
+        assert [p["sales_summary"]["total_revenue"] for p in data["periods"]] == [1000.00, 1500.00]
+        revenue = data["changes"][0]["metrics"]["sales_summary"]["total_revenue"]
+        assert revenue["delta"] == 500.00
+        assert revenue["percent_change"] == 50.00
+        
+        single = client.get("/api/v1/reports/compare?periods=2002-01-01:2002-01-31", headers=auth_headers)
+        assert single.status_code == 400
+    
+    def test_closed_day_cache_invalidation(self, client, auth_headers, test_product_id):
+        """Test a backdated sale and a delete on a cached closed day show up in the period summary"""
+        client.post("/api/v1/transactions/", json={
+            "product_id": test_product_id,
+            "quantity": 10,
+            "purchase_price": 1000.00,
+            "type": "IN"
+        }, headers=auth_headers)
+        
+        def backdated_sale(amount):
+            return client.post("/api/v1/sales/", json={
+                "product_id": test_product_id,
+                "customer_name": "Cache Customer",
+                "quantity": 1,
+                "selling_price": amount,
+                "payment_type": "Debit",
+                "created_at": "2003-03-10T10:00:00"
+            }, headers=auth_headers).json()["id"]
+        
+        def march_revenue():
+            response = client.get(
+                "/api/v1/reports/period-summary?start_date=2003-03-01&end_date=2003-03-31",
+                headers=auth_headers
+            )
+            assert response.status_code == 200
+            return response.json()["sales_summary"]["total_revenue"]
+        
+        first = backdated_sale(1000.00)
+        assert march_revenue() == 1000.00  # computes and caches the closed days
+        backdated_sale(500.00)
+        assert march_revenue() == 1500.00
+        client.delete(f"/api/v1/sales/{first}", headers=auth_headers)
+        assert march_revenue() == 500.00
+    
+    def test_leaderboards(self, client, auth_headers, test_product_id):
+        """Test today's counter leaderboard follows sales and deletes and matches a custom range"""
+        client.post("/api/v1/transactions/", json={
+            "product_id": test_product_id,
+            "quantity": 10,
+            "purchase_price": 1000.00,
+            "type": "IN"
+        }, headers=auth_headers)
+        
+        def sale(name, quantity, payment_type):
+            return client.post("/api/v1/sales/", json={
+                "product_id": test_product_id,
+                "customer_name": name,
+                "quantity": quantity,
+                "selling_price": 1500.00,
+                "payment_type": payment_type
+            }, headers=auth_headers).json()["id"]
+        
+        sale("Leader Customer", 3, "Credit")
+        dropped = sale("Other Customer", 1, "Debit")
+        client.delete(f"/api/v1/sales/{dropped}", headers=auth_headers)
+        
+        response = client.get("/api/v1/reports/leaderboards?period=today", headers=auth_headers)
+        assert response.status_code == 200
+        today = response.json()
+        assert today["source"] == "counters"
+        top_product = today["products"]["revenue"][0]
+        assert top_product["product_id"] == test_product_id
+        assert top_product["quantity"] == 3
+        assert float(top_product["revenue"]) == 4500.00
+        assert [c["customer_name"] for c in today["customers"]["spend"]] == ["Leader Customer"]
+        assert float(today["customers"]["credit"][0]["credit"]) == 4500.00
+        
+        custom = client.get(
+            f"/api/v1/reports/leaderboards?period=custom&start_date={today['start_date']}&end_date={today['end_date']}",
+            headers=auth_headers
+        ).json()
+        assert custom["source"] == "sales"
+        assert custom["products"] == today["products"]
+        assert custom["customers"] == today["customers"]
+        
+        missing = client.get("/api/v1/reports/leaderboards?period=custom", headers=auth_headers)
+        assert missing.status_code == 400
+    
+    def test_leaderboard_product_delete(self, client, auth_headers, test_product_id):
+        """Test deleting a product drops its sales from today's counters"""
+        client.post("/api/v1/transactions/", json={
+            "product_id": test_product_id,
+            "quantity": 10,
+            "purchase_price": 1000.00,
+            "type": "IN"
+        }, headers=auth_headers)
+        client.post("/api/v1/sales/", json={
+            "product_id": test_product_id,
+            "customer_name": "Deleted Product Customer",
+            "quantity": 2,
+            "selling_price": 1500.00,
+            "payment_type": "Debit"
+        }, headers=auth_headers)
+        client.delete(f"/api/v1/products/{test_product_id}", headers=auth_headers)
+        
+        today = client.get("/api/v1/reports/leaderboards?period=today", headers=auth_headers).json()
+        assert test_product_id not in [p["product_id"] for p in today["products"]["revenue"]]
+        assert "Deleted Product Customer" not in [c["customer_name"] for c in today["customers"]["spend"]]
+    
+    def test_stock_forecast(self, client, auth_headers, test_product_id):
+        """Test days of cover follow past sales and the cached forecast is dropped by a stock write"""
+        client.post("/api/v1/transactions/", json={
+            "product_id": test_product_id,
+            "quantity": 100,
+            "purchase_price": 1000.00,
+            "type": "IN"
+        }, headers=auth_headers)
+        for days_ago in range(1, 8):
+            client.post("/api/v1/sales/", json={
+                "product_id": test_product_id,
+                "customer_name": "Forecast Customer",
+                "quantity": 4,
+                "selling_price": 1500.00,
+                "payment_type": "Debit",
+                "created_at": f"{date.today() - timedelta(days=days_ago)}T10:00:00"
+            }, headers=auth_headers)
+        
+        def forecast():
+            response = client.get("/api/v1/reports/stock-forecast?window_days=7&alpha=0.5", headers=auth_headers)
+            assert response.status_code == 200
+            return next(p for p in response.json()["products"] if p["product_id"] == test_product_id)
+        
+        before = forecast()
+        assert before["stock_balance"] == 72
+        assert before["moving_average"] == 4.0
+        assert before["smoothed_demand"] == 4.0
+        assert before["days_of_cover"] == 18.0
+        
+        client.post("/api/v1/transactions/", json={
+            "product_id": test_product_id,
+            "quantity": 36,
+            "purchase_price": 1000.00,
+            "type": "IN"
+        }, headers=auth_headers)
+        assert forecast()["days_of_cover"] == 27.0
+    
+    def test_stock_forecast_sparse_demand(self, client, auth_headers, test_product_id):
+        """Test a single old sale against a large balance gives no out-of-range dates"""
+        client.post("/api/v1/transactions/", json={
+            "product_id": test_product_id,
+            "quantity": 500,
+            "purchase_price": 1000.00,
+            "type": "IN"
+        }, headers=auth_headers)
+        client.post("/api/v1/sales/", json={
+            "product_id": test_product_id,
+            "customer_name": "Forecast Customer",
+            "quantity": 1,
+            "selling_price": 1500.00,
+            "payment_type": "Debit",
+            "created_at": f"{date.today() - timedelta(days=28)}T10:00:00"
+        }, headers=auth_headers)
+        
+        response = client.get("/api/v1/reports/stock-forecast", headers=auth_headers)
+        assert response.status_code == 200
+        product = next(p for p in response.json()["products"] if p["product_id"] == test_product_id)
+        assert product["days_of_cover"] > 1_000_000
+        assert product["stockout_date"] is None
+        assert product["min_stock_date"] is None
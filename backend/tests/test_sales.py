@@ -138,7 +138,26 @@ class TestSalesEndpoints:
         
         # Should fail with 400 or similar
         assert response.status_code in [400, 422]
-    
+
+    def test_sale_non_positive_quantity(self, client, auth_headers, test_product_with_stock):
+        """Test that zero or negative quantities are rejected for sales and OUT transactions"""
+        for quantity in [0, -5]:
+            response = client.post("/api/v1/sales/", json={
+                "product_id": test_product_with_stock,
+                "customer_name": "Negative Customer",
+                "quantity": quantity,
+                "selling_price": 1200.00,
+                "payment_type": "Debit"
+            }, headers=auth_headers)
+            assert response.status_code == 422
+
+            response = client.post("/api/v1/transactions/", json={
+                "product_id": test_product_with_stock,
+                "quantity": quantity,
+                "type": "OUT"
+            }, headers=auth_headers)
+            assert response.status_code == 422
+
     def test_phone_validation(self, client, auth_headers, test_product_with_stock):
         """Test phone number validation"""
         # Valid 11-digit phone
@@ -162,3 +181,92 @@ class TestSalesEndpoints:
             "payment_type": "Debit"
         }, headers=auth_headers)
         # May or may not fail depending on validation
+    
+    def test_backdated_sale_uses_historical_price(self, client, auth_headers, test_product_with_stock):
+        """Test that a backdated sale is costed at the purchase price in effect on its date"""
+        # New receipt raises the current purchase price
+        client.post("/api/v1/transactions/", json={
+            "product_id": test_product_with_stock,
+            "quantity": 10,
+            "party_name": "Price Change Supplier",
+            "purchase_price": 1300.00,
+            "type": "IN"
+        }, headers=auth_headers)
+        
+        response = client.post("/api/v1/sales/", json={
+            "product_id": test_product_with_stock,
+            "customer_name": "Backdated Customer",
+            "quantity": 1,
+            "selling_price": 1500.00,
+            "payment_type": "Debit",
+            "created_at": "2000-01-01T10:00:00"
+        }, headers=auth_headers)
+        
+        assert float(response.json()["purchase_price"]) == 1000.00
+        
+        history = client.get(
+            f"/api/v1/products/{test_product_with_stock}/price-history",
+            headers=auth_headers
+        ).json()
+        assert float(history[0]["purchase_price"]) == 1300.00
+    
+    def test_idempotent_sale_retry(self, client, auth_headers, test_product_with_stock):
+        """Test a retried sale with the same Idempotency-Key is not created twice"""
+        from uuid import uuid4
+        sale_data = {
+            "product_id": test_product_with_stock,
+            "customer_name": "Retry Farmer",
+            "quantity": 1,
+            "selling_price": 1200.00,
+            "payment_type": "Debit"
+        }
+        headers = {**auth_headers, "Idempotency-Key": str(uuid4())}
+        
+        first = client.post("/api/v1/sales/", json=sale_data, headers=headers)
+        retry = client.post("/api/v1/sales/", json=sale_data, headers=headers)
+        
+        assert first.status_code == 201
+        assert retry.status_code == 201
+        assert retry.json()["id"] == first.json()["id"]
+        assert retry.headers["Idempotent-Replayed"] == "true"
+        
+        # Same key with a different body is rejected
+        conflict = client.post("/api/v1/sales/", json={**sale_data, "quantity": 2}, headers=headers)
+        assert conflict.status_code == 422
+
+    
+    def test_filter_and_sort_sales(self, client, auth_headers, test_product_with_stock):
+        """Test server-side filters, sort keys and the total count header"""
+        for name, quantity, payment_type in [
+            ("Filter Farmer One", 1, "Debit"),
+            ("Filter Farmer Two", 4, "Credit"),
+            ("Other Buyer", 2, "Credit")
+        ]:
+            client.post("/api/v1/sales/", json={
+                "product_id": test_product_with_stock,
+                "customer_name": name,
+                "quantity": quantity,
+                "selling_price": 1000.00,
+                "payment_type": payment_type
+            }, headers=auth_headers)
+        
+        response = client.get("/api/v1/sales/", params={
+            "product_id": test_product_with_stock,
+            "customer": "filter farmer",
+            "sort": "amount_desc"
+        }, headers=auth_headers)
+        assert response.status_code == 200
+        assert [s["customer_name"] for s in response.json()] == ["Filter Farmer Two", "Filter Farmer One"]
+        assert response.headers["X-Total-Count"] == "2"
+        assert response.headers["X-Total-Count-Estimated"] == "false"
+        
+        response = client.get("/api/v1/sales/", params={
+            "product_id": test_product_with_stock,
+            "payment_type": "Credit",
+            "limit": 1
+        }, headers=auth_headers)
+        assert len(response.json()) == 1
+        assert response.headers["X-Total-Count"] == "2"
+        
+        response = client.get("/api/v1/sales/", params={"sort": "unknown"}, headers=auth_headers)
+        assert response.status_code == 422
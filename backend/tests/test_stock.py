@@ -106,7 +106,27 @@ class TestStockEndpoints:
         list_response = client.get("/api/v1/transactions/", headers=auth_headers)
         transaction_ids = [t["id"] for t in list_response.json()]
         # Note: Soft deleted transactions might still appear depending on implementation
-    
+
+    def test_delete_receipt_restores_purchase_price(self, client, auth_headers, test_product_id):
+        """Test deleting an IN receipt puts the product back on the previous purchase price"""
+        create_response = client.post(
+            "/api/v1/transactions/",
+            json={
+                "product_id": test_product_id,
+                "quantity": 10,
+                "purchase_price": 1300.00,
+                "type": "IN"
+            },
+            headers=auth_headers
+        )
+        detail = client.get(f"/api/v1/products/{test_product_id}/detail", headers=auth_headers).json()
+        assert float(detail["product"]["purchase_price"]) == 1300.00
+
+        client.delete(f"/api/v1/transactions/{create_response.json()['id']}", headers=auth_headers)
+
+        detail = client.get(f"/api/v1/products/{test_product_id}/detail", headers=auth_headers).json()
+        assert float(detail["product"]["purchase_price"]) == 1000.00
+
     def test_stock_balance_calculation(self, client, auth_headers, test_product_id):
         """Test that stock balance is calculated correctly"""
         # Add stock multiple times
@@ -123,3 +143,54 @@ class TestStockEndpoints:
         
         assert response.status_code == 200
         # Stock calculations are done via aggregation
+    
+    def test_stock_as_of(self, client, auth_headers, test_product_id):
+        """Test point-in-time stock balance"""
+        client.post("/api/v1/transactions/", json={
+            "product_id": test_product_id,
+            "quantity": 40,
+            "party_name": "Supplier 1",
+            "purchase_price": 1000.00,
+            "type": "IN"
+        }, headers=auth_headers)
+        
+        response = client.get(
+            "/api/v1/products/stock-as-of",
+            params={"date": "2099-12-31"},
+            headers=auth_headers
+        )
+        
+        assert response.status_code == 200
+        balances = {p["product_id"]: p["stock_balance"] for p in response.json()["products"]}
+        assert balances[test_product_id] == 40
+        
+        # Nothing was in stock before the product existed
+        response = client.get(
+            "/api/v1/products/stock-as-of",
+            params={"date": "2000-01-01"},
+            headers=auth_headers
+        )
+        balances = {p["product_id"]: p["stock_balance"] for p in response.json()["products"]}
+        assert balances[test_product_id] == 0
+    
+    def test_stock_history_running_balance(self, client, auth_headers, test_product_id):
+        """Test running balance in per-product stock history"""
+        for quantity, kind in [(50, "IN"), (20, "OUT"), (5, "IN")]:
+            client.post("/api/v1/transactions/", json={
+                "product_id": test_product_id,
+                "quantity": quantity,
+                "party_name": "History Test",
+                "purchase_price": 1000.00,
+                "type": kind
+            }, headers=auth_headers)
+        
+        response = client.get(
+            f"/api/v1/products/{test_product_id}/stock-history",
+            params={"start_date": "2000-01-01", "end_date": "2099-12-31"},
+            headers=auth_headers
+        )
+        
+        assert response.status_code == 200
+        data = response.json()
+        assert data["opening_balance"] == 0
+        assert [e["balance"] for e in data["entries"]] == [50, 30, 35]
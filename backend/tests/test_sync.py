@@ -0,0 +1,68 @@
+"""
+Test cases for the delta sync endpoint
+Tests that only rows changed since the token are returned
+"""
+import pytest
+
+class TestSyncEndpoints:
+    """Test suite for /api/v1/sync"""
+    
+    def test_sync_without_token(self, client, auth_headers):
+        """Test first call returns a token and no rows"""
+        response = client.get("/api/v1/sync", headers=auth_headers)
+        
+        assert response.status_code == 200
+        data = response.json()
+        assert data["token"]
+        assert data["sales"] == [] and data["deleted"] == []
+    
+    def test_sync_returns_changes_and_deletes(self, client, auth_headers):
+        """Test created rows and deletes show up in the delta"""
+        token = client.get("/api/v1/sync", headers=auth_headers).json()["token"]
+        
+        company_id = client.post(
+            "/api/v1/companies/",
+            json={"name": "Sync Test Company"},
+            headers=auth_headers
+        ).json()["id"]
+        
+        data = client.get("/api/v1/sync", params={"since": token}, headers=auth_headers).json()
+        assert company_id in [c["id"] for c in data["companies"]]
+        
+        client.delete(f"/api/v1/companies/{company_id}", headers=auth_headers)
+        
+        data = client.get("/api/v1/sync", params={"since": token}, headers=auth_headers).json()
+        assert {"table": "companies", "id": company_id} in data["deleted"]
+    
+    def test_invalid_token(self, client, auth_headers):
+        """Test malformed token is rejected"""
+        response = client.get("/api/v1/sync", params={"since": "not-a-token"}, headers=auth_headers)
+        assert response.status_code == 400
+    
+    def test_sync_receivables_and_expenses(self, client, auth_headers):
+        """Test payments, customer balances and expenses show up in the delta"""
+        token = client.get("/api/v1/sync", headers=auth_headers).json()["token"]
+        
+        payment_id = client.post("/api/v1/customers/payments", json={
+            "customer_name": "Sync Test Farmer",
+            "amount": 500.00
+        }, headers=auth_headers).json()["id"]
+        expense_id = client.post("/api/v1/expenses/", json={
+            "name": "Sync Test Fuel",
+            "amount": -200.00
+        }, headers=auth_headers).json()["id"]
+        
+        data = client.get("/api/v1/sync", params={"since": token}, headers=auth_headers).json()
+        assert payment_id in [p["id"] for p in data["payments"]]
+        assert expense_id in [e["id"] for e in data["expenses"]]
+        farmer = next(c for c in data["customers"] if c["customer_name"] == "Sync Test Farmer")
+        assert float(farmer["outstanding"]) == -500.00
+        
+        client.delete(f"/api/v1/customers/payments/{payment_id}", headers=auth_headers)
+        client.delete(f"/api/v1/expenses/{expense_id}", headers=auth_headers)
+        
+        data = client.get("/api/v1/sync", params={"since": token}, headers=auth_headers).json()
+        assert {"table": "payments", "id": payment_id} in data["deleted"]
+        assert {"table": "expenses", "id": expense_id} in data["deleted"]
+        farmer = next(c for c in data["customers"] if c["customer_name"] == "Sync Test Farmer")
+        assert float(farmer["outstanding"]) == 0.00
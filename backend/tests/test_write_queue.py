@@ -0,0 +1,95 @@
+"""
+Test cases for the group-commit write queue
+Concurrent sales share commits, each caller gets its own result or error
+"""
+import threading
+from decimal import Decimal
+
+import pytest
+from fastapi import HTTPException
+from sqlalchemy.orm import sessionmaker
+
+from app.core.group_commit import GroupCommitQueue
+from app.db.session import Base, make_engine
+from app.crud import crud_company, crud_product, crud_transaction
+from app.models.models import Sale
+from app.schemas.company import CompanyCreate
+from app.schemas.product import ProductCreate
+from app.schemas.transactions import SaleCreate, StockTransactionCreate
+
+THREADS = 20
+
+
+@pytest.fixture
+def session_factory(tmp_path):
+    engine = make_engine(f"sqlite:///{tmp_path / 'write_queue.db'}")
+    Base.metadata.create_all(bind=engine)
+    yield sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    engine.dispose()
+
+
+@pytest.fixture
+def product_id(session_factory):
+    with session_factory() as db:
+        company = crud_company.create_company(db, CompanyCreate(name="Write Queue Company"))
+        product = crud_product.create_product(db, ProductCreate(
+            company_id=company.id, name="Write Queue Product", unit="Bags", purchase_price=Decimal("100.00")
+        ))
+        crud_transaction.create_transaction(db, StockTransactionCreate(
+            product_id=product.id, quantity=THREADS - 5, purchase_price=Decimal("100.00"), type="IN"
+        ))
+        return product.id
+
+
+class TestGroupCommitQueue:
+    """Test suite for app.core.group_commit"""
+
+    def test_concurrent_sales_share_commits(self, session_factory, product_id):
+        """Test sales submitted together commit in fewer batches, failures stay per caller"""
+        write_queue = GroupCommitQueue(session_factory, window_ms=50, max_batch=THREADS)
+        results, errors = [], []
+        start = threading.Barrier(THREADS)
+
+        def seller(i):
+            start.wait()
+            try:
+                results.append(write_queue.submit(lambda db: crud_transaction.add_sale(db, SaleCreate(
+                    product_id=product_id,
+                    customer_name=f"Queue Customer {i}",
+                    quantity=1,
+                    selling_price=Decimal("150.00"),
+                    payment_type="Debit"
+                ))))
+            except HTTPException as e:
+                errors.append(e.status_code)
+
+        threads = [threading.Thread(target=seller, args=(i,)) for i in range(THREADS)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert len(results) == THREADS - 5
+        assert errors == [400] * 5
+        assert write_queue.batches < THREADS
+        # Results are committed, reloaded and usable outside the writer's session
+        assert all(sale.created_at is not None and sale.total_amount == Decimal("150.00") for sale in results)
+        with session_factory() as db:
+            assert db.query(Sale).count() == THREADS - 5
+
+    def test_after_commit_hook(self, session_factory, product_id):
+        """Test after_commit runs with the committed result"""
+        write_queue = GroupCommitQueue(session_factory, window_ms=1)
+        seen = []
+        sale = write_queue.submit(
+            lambda db: crud_transaction.add_sale(db, SaleCreate(
+                product_id=product_id,
+                customer_name="Hook Customer",
+                quantity=2,
+                selling_price=Decimal("150.00"),
+                payment_type="Credit"
+            )),
+            after_commit=lambda db, result: seen.append(result.id)
+        )
+        write_queue.submit(lambda db: None)  # next batch starts after the previous hooks ran
+        assert seen == [sale.id]
@@ -1,6 +1,7 @@
-import React, { createContext, useContext, useState, useEffect } from 'react';
+import React, { createContext, useContext, useState, useEffect, useRef } from 'react';
 import { Company, Product, Stock, Sale, StockTransaction } from '../types';
-import api from '../utils/api';
+import api, { postIdempotent } from '../utils/api';
+import { subscribeEvents } from '../utils/events';
 import { useAuth } from './AuthContext';
 
 interface DataContextType {
@@ -26,6 +27,70 @@ interface DataContextType {
 
 const DataContext = createContext<DataContextType | undefined>(undefined);
 
+// Map backend rows to frontend types
+const mapCompany = (c: any): Company => ({
+  id: c.id,
+  name: c.name,
+  createdAt: c.created_at
+});
+
+const mapProduct = (p: any): Product => ({
+  id: p.id,
+  companyId: p.company_id,
+  name: p.name,
+  category: p.category,
+  unit: p.unit,
+  purchasePrice: parseFloat(p.purchase_price),
+  minStock: p.min_stock
+});
+
+// Stock type uses current_stock returned from backend
+const mapStock = (p: any): Stock => ({
+  productId: p.id,
+  totalIn: 0, // Backend doesn't return totalIn/Out directly in list, but we have current_stock
+  totalOut: 0,
+  remaining: p.current_stock || 0
+});
+
+const mapTransaction = (t: any): StockTransaction => ({
+  id: t.id,
+  productId: t.product_id,
+  quantity: t.quantity,
+  partyName: t.party_name,
+  purchasePrice: parseFloat(t.purchase_price || 0),
+  type: t.type,
+  date: t.created_at
+});
+
+const mapSale = (s: any): Sale => ({
+  id: s.id,
+  productId: s.product_id,
+  quantity: s.quantity,
+  sellingPrice: parseFloat(s.selling_price),
+  purchasePrice: parseFloat(s.purchase_price),
+  customerName: s.customer_name,
+  customerPhone: s.customer_phone,
+  totalAmount: parseFloat(s.total_amount),
+  paymentType: s.payment_type,
+  date: s.created_at
+});
+
+// Replace changed rows by key, append new ones and drop removed ones
+const mergeRows = <T,>(current: T[], changed: T[], removed: Set<string>, key: (row: T) => string): T[] => {
+  if (changed.length === 0 && removed.size === 0) return current;
+  const updates = new Map(changed.map(row => [key(row), row]));
+  const merged = current
+    .filter(row => !removed.has(key(row)))
+    .map(row => {
+      const updated = updates.get(key(row));
+      if (updated) updates.delete(key(row));
+      return updated || row;
+    });
+  return [...merged, ...updates.values()];
+};
+
+const byName = (a: Company, b: Company) => a.name.localeCompare(b.name);
+
 export const DataProvider: React.FC<{ children: React.ReactNode }> = ({ children }) => {
   const [companies, setCompanies] = useState<Company[]>([]);
   const [products, setProducts] = useState<Product[]>([]);
@@ -35,65 +100,27 @@ export const DataProvider: React.FC<{ children: React.ReactNode }> = ({ children
   const [loading, setLoading] = useState(true);
   const { isLoggedIn } = useAuth();
 
+  // Token of the last /sync call; writes fetch only the rows changed since
+  const syncToken = useRef<string | null>(null);
+
   const refreshData = async () => {
     if (!isLoggedIn) return;
     setLoading(true);
     try {
-      const [prodRes, transRes, saleRes, compRes] = await Promise.all([
+      const [syncRes, prodRes, transRes, saleRes, compRes] = await Promise.all([
+        api.get('/sync'),
         api.get('/products/'),
         api.get('/transactions'),
         api.get('/sales'),
         api.get('/companies/')
       ]);
 
-      setCompanies(compRes.data.map((c: any) => ({
-        id: c.id,
-        name: c.name,
-        createdAt: c.created_at
-      })).sort((a: any, b: any) => a.name.localeCompare(b.name)));
-
-      // Map backend products to frontend Product type
-      const mappedProducts: Product[] = prodRes.data.map((p: any) => ({
-        id: p.id,
-        companyId: p.company_id,
-        name: p.name,
-        category: p.category,
-        unit: p.unit,
-        purchasePrice: parseFloat(p.purchase_price),
-        minStock: p.min_stock
-      }));
-
-      // Map backend products to Stock type (using current_stock returned from backend)
-      const mappedStocks: Stock[] = prodRes.data.map((p: any) => ({
-        productId: p.id,
-        totalIn: 0, // Backend doesn't return totalIn/Out directly in list, but we have current_stock
-        totalOut: 0,
-        remaining: p.current_stock || 0
-      }));
-
-      setProducts(mappedProducts);
-      setStocks(mappedStocks);
-      setStockTransactions(transRes.data.map((t: any) => ({
-        id: t.id,
-        productId: t.product_id,
-        quantity: t.quantity,
-        partyName: t.party_name,
-        purchasePrice: parseFloat(t.purchase_price || 0),
-        type: t.type,
-        date: t.created_at
-      })));
-      setSales(saleRes.data.map((s: any) => ({
-        id: s.id,
-        productId: s.product_id,
-        quantity: s.quantity,
-        sellingPrice: parseFloat(s.selling_price),
-        purchasePrice: parseFloat(s.purchase_price),
-        customerName: s.customer_name,
-        customerPhone: s.customer_phone,
-        totalAmount: parseFloat(s.total_amount),
-        paymentType: s.payment_type,
-        date: s.created_at
-      })));
+      syncToken.current = syncRes.data.token;
+      setCompanies(compRes.data.map(mapCompany).sort(byName));
+      setProducts(prodRes.data.map(mapProduct));
+      setStocks(prodRes.data.map(mapStock));
+      setStockTransactions(transRes.data.map(mapTransaction));
+      setSales(saleRes.data.map(mapSale));
     } catch (error) {
       console.error('Failed to fetch data:', error);
     } finally {
@@ -101,14 +128,60 @@ export const DataProvider: React.FC<{ children: React.ReactNode }> = ({ children
     }
   };
 
+  // Apply only the rows created, changed or deleted since the last sync
+  const syncData = async () => {
+    if (!isLoggedIn) return;
+    if (!syncToken.current) return refreshData();
+    try {
+      const { data } = await api.get('/sync', { params: { since: syncToken.current } });
+      syncToken.current = data.token;
+
+      const removed: Record<string, Set<string>> = {
+        companies: new Set(), products: new Set(), transactions: new Set(), sales: new Set()
+      };
+      data.deleted.forEach((d: any) => removed[d.table].add(d.id));
+
+      // Deleting a product also removes its ledger rows and sales
+      const removedProducts = removed.products;
+      const keepProduct = (row: { productId: string }) => !removedProducts.has(row.productId);
+
+      setCompanies(prev => mergeRows(prev, data.companies.map(mapCompany), removed.companies, c => c.id).sort(byName));
+      setProducts(prev => mergeRows(prev, data.products.map(mapProduct), removedProducts, p => p.id));
+      setStocks(prev => mergeRows(prev, data.products.map(mapStock), removedProducts, s => s.productId));
+      setStockTransactions(prev => mergeRows(prev, data.transactions.map(mapTransaction), removed.transactions, t => t.id).filter(keepProduct));
+      setSales(prev => mergeRows(prev, data.sales.map(mapSale), removed.sales, s => s.id).filter(keepProduct));
+    } catch (error) {
+      console.error('Failed to sync data:', error);
+      await refreshData();
+    }
+  };
+
   useEffect(() => {
     refreshData();
   }, [isLoggedIn]);
 
+  // Writes made by other staff arrive as live events; pull them in via /sync
+  const syncRef = useRef(syncData);
+  syncRef.current = syncData;
+  useEffect(() => {
+    if (!isLoggedIn) return;
+    let timer: ReturnType<typeof setTimeout> | undefined;
+    const unsubscribe = subscribeEvents((event) => {
+      if (event.type.startsWith('sale.') || event.type === 'stock.changed') {
+        clearTimeout(timer);
+        timer = setTimeout(() => syncRef.current(), 300);
+      }
+    });
+    return () => {
+      clearTimeout(timer);
+      unsubscribe();
+    };
+  }, [isLoggedIn]);
+
   const addCompany = async (name: string) => {
     try {
       await api.post('/companies/', { name });
-      await refreshData();
+      await syncData();
     } catch (error) {
       console.error('Failed to add company:', error);
     }
@@ -117,7 +190,7 @@ export const DataProvider: React.FC<{ children: React.ReactNode }> = ({ children
   const updateCompany = async (id: string, name: string) => {
     try {
       await api.put(`/companies/${id}`, { name });
-      await refreshData();
+      await syncData();
     } catch (error) {
       console.error('Failed to update company:', error);
     }
@@ -126,7 +199,7 @@ export const DataProvider: React.FC<{ children: React.ReactNode }> = ({ children
   const deleteCompany = async (id: string): Promise<boolean> => {
     try {
       await api.delete(`/companies/${id}`);
-      await refreshData();
+      await syncData();
       return true;
     } catch (error) {
       console.error('Failed to delete company:', error);
@@ -143,7 +216,7 @@ export const DataProvider: React.FC<{ children: React.ReactNode }> = ({ children
         min_stock: productData.minStock,
         company_id: productData.companyId
       });
-      await refreshData();
+      await syncData();
     } catch (error) {
       console.error('Failed to add product:', error);
     }
@@ -159,7 +232,7 @@ export const DataProvider: React.FC<{ children: React.ReactNode }> = ({ children
         min_stock: productData.minStock,
         company_id: productData.companyId
       });
-      await refreshData();
+      await syncData();
     } catch (error) {
       console.error('Failed to update product:', error);
     }
@@ -168,7 +241,7 @@ export const DataProvider: React.FC<{ children: React.ReactNode }> = ({ children
   const deleteProduct = async (id: string) => {
     try {
       await api.delete(`/products/${id}`);
-      await refreshData();
+      await syncData();
     } catch (error) {
       console.error('Failed to delete product:', error);
     }
@@ -176,14 +249,14 @@ export const DataProvider: React.FC<{ children: React.ReactNode }> = ({ children
 
   const addStock = async (productId: string, quantity: number, partyName: string, purchasePrice: number) => {
     try {
-      await api.post('/transactions', {
+      await postIdempotent('/transactions', {
         product_id: productId,
         quantity,
         party_name: partyName,
         purchase_price: purchasePrice,
         type: 'IN'
       });
-      await refreshData();
+      await syncData();
     } catch (error) {
       console.error('Failed to add stock:', error);
     }
@@ -205,8 +278,8 @@ export const DataProvider: React.FC<{ children: React.ReactNode }> = ({ children
         payload.created_at = saleDate.toISOString();
       }
 
-      await api.post('/sales', payload);
-      await refreshData();
+      await postIdempotent('/sales', payload);
+      await syncData();
       return true;
     } catch (error) {
       console.error('Failed to add sale:', error);
@@ -225,7 +298,7 @@ export const DataProvider: React.FC<{ children: React.ReactNode }> = ({ children
       if (updates.paymentType !== undefined) payload.payment_type = updates.paymentType;
 
       await api.put(`/sales/${id}`, payload);
-      await refreshData();
+      await syncData();
       return true;
     } catch (error) {
       console.error('Failed to update sale:', error);
@@ -236,7 +309,7 @@ export const DataProvider: React.FC<{ children: React.ReactNode }> = ({ children
   const deleteSale = async (id: string) => {
     try {
       await api.delete(`/sales/${id}`);
-      await refreshData();
+      await syncData();
     } catch (error) {
       console.error('Failed to delete sale:', error);
     }
@@ -245,7 +318,7 @@ export const DataProvider: React.FC<{ children: React.ReactNode }> = ({ children
   const deleteStockTransaction = async (id: string) => {
     try {
       await api.delete(`/transactions/${id}`);
-      await refreshData();
+      await syncData();
     } catch (error) {
       console.error('Failed to delete transaction:', error);
     }
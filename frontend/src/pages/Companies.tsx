@@ -1,13 +1,21 @@
 /// <reference types="vite/client" />
-import React, { useState } from 'react';
+import React, { useState, useEffect } from 'react';
 import { useNavigate } from 'react-router-dom';
 import { useData } from '../context/DataContext';
+import api from '../utils/api';
 import { Plus, Edit2, Trash2, Building2, Search, X } from 'lucide-react';
 import ConfirmDialog from '../components/ConfirmDialog';
 
+interface CompanySummary {
+  company_id: string;
+  product_count: number;
+  total_stock: number;
+  stock_value: string;
+  low_stock_count: number;
+}
 
 const Companies: React.FC = () => {
-  const { companies, addCompany, updateCompany, deleteCompany } = useData();
+  const { companies, products, sales, stockTransactions, addCompany, updateCompany, deleteCompany } = useData();
   const navigate = useNavigate();
   const [searchTerm, setSearchTerm] = useState('');
   const [isModalOpen, setIsModalOpen] = useState(false);
@@ -22,6 +30,21 @@ const Companies: React.FC = () => {
   });
 
 
+  // Per-company totals come from one grouped query instead of per-company requests
+  const [summaries, setSummaries] = useState<Record<string, CompanySummary>>({});
+
+  useEffect(() => {
+    api.get('/companies/summary')
+      .then(response => {
+        const byCompany: Record<string, CompanySummary> = {};
+        for (const summary of response.data.companies) {
+          byCompany[summary.company_id] = summary;
+        }
+        setSummaries(byCompany);
+      })
+      .catch(error => console.error('Failed to fetch company summary:', error));
+  }, [companies, products, sales, stockTransactions]);
+
   const filteredCompanies = companies.filter(c =>
     c.name.toLowerCase().includes(searchTerm.toLowerCase())
   );
@@ -113,6 +136,7 @@ const Companies: React.FC = () => {
         <div className="grid grid-cols-1 md:grid-cols-2 lg:grid-cols-3 gap-6">
           {filteredCompanies.map((company) => {
             const logo = getCompanyLogo(company.name);
+            const summary = summaries[company.id];
             return (
               <div
                 key={company.id}
@@ -148,6 +172,22 @@ const Companies: React.FC = () => {
                     </button>
                   </div>
                 </div>
+                {summary && (
+                  <div className="grid grid-cols-3 gap-3 mt-6 pt-4 border-t border-slate-100 dark:border-slate-700 text-center">
+                    <div>
+                      <p className="text-[10px] font-black uppercase tracking-widest text-slate-400">Products</p>
+                      <p className="font-bold text-slate-900 dark:text-white">{summary.product_count}</p>
+                    </div>
+                    <div>
+                      <p className="text-[10px] font-black uppercase tracking-widest text-slate-400">Stock Value</p>
+                      <p className="font-bold text-slate-900 dark:text-white">Rs. {Number(summary.stock_value).toLocaleString()}</p>
+                    </div>
+                    <div>
+                      <p className="text-[10px] font-black uppercase tracking-widest text-slate-400">Low Stock</p>
+                      <p className={`font-bold ${summary.low_stock_count > 0 ? 'text-red-500' : 'text-slate-900 dark:text-white'}`}>{summary.low_stock_count}</p>
+                    </div>
+                  </div>
+                )}
               </div>
             );
           })}
@@ -4,6 +4,7 @@ import { useData } from '../context/DataContext';
 import StatCard from '../components/StatCard';
 import { Building2, Package, TrendingUp, DollarSign, Banknote, CreditCard, Wallet, Loader2, ShoppingCart, TrendingDown } from 'lucide-react';
 import api from '../utils/api';
+import { subscribeEvents } from '../utils/events';
 import { LineChart, Line, XAxis, YAxis, CartesianGrid, Tooltip, ResponsiveContainer } from 'recharts';
 
 const Dashboard: React.FC = () => {
@@ -23,20 +24,21 @@ const Dashboard: React.FC = () => {
       }
     };
     fetchReport();
-  }, []);
 
-  // Reload report every 5 seconds to get latest expense data
-  useEffect(() => {
-    const interval = setInterval(async () => {
-      try {
-        const response = await api.get('/reports/');
-        setReport(response.data);
-      } catch (error) {
-        console.error('Failed to refresh report:', error);
+    // Reload the report when the server pushes a change instead of polling;
+    // bursts of events (sale + stock + totals) collapse into one request
+    let timer: ReturnType<typeof setTimeout> | undefined;
+    const unsubscribe = subscribeEvents((event) => {
+      if (event.type === 'dashboard.changed' || event.type.startsWith('stock.')) {
+        clearTimeout(timer);
+        timer = setTimeout(fetchReport, 300);
       }
-    }, 5000);
+    });
 
-    return () => clearInterval(interval);
+    return () => {
+      clearTimeout(timer);
+      unsubscribe();
+    };
   }, []);
 
   if (loading || dataLoading) {
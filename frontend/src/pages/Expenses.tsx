@@ -9,6 +9,7 @@ const ExpensesPage: React.FC = () => {
     const [expenses, setExpenses] = useState<Expense[]>([]);
     const [selectedDate, setSelectedDate] = useState<Date>(new Date()); // Use Date object
     const [dailyTotal, setDailyTotal] = useState<number>(0);
+    const [categories, setCategories] = useState<string[]>([]);
     const [isAdding, setIsAdding] = useState(false);
     const [editingId, setEditingId] = useState<string | null>(null);
     const [expenseType, setExpenseType] = useState<'expense' | 'income'>('expense');
@@ -19,6 +20,7 @@ const ExpensesPage: React.FC = () => {
         amount: 0,
         quantity: 1,
         details: '',
+        category: '',
     });
 
     // Confirmation dialog state
@@ -33,6 +35,13 @@ const ExpensesPage: React.FC = () => {
         loadDailyTotal();
     }, [selectedDate]);
 
+    // Category suggestions come from the all-time rollup, not from the day's rows
+    useEffect(() => {
+        expenseService.getAnalytics('year')
+            .then(data => setCategories(data.categories.map(c => c.category)))
+            .catch(error => console.error('Failed to load expense categories:', error));
+    }, [expenses]);
+
     const loadExpenses = async () => {
         try {
             const dateString = selectedDate.toISOString().split('T')[0];
@@ -67,6 +76,7 @@ const ExpensesPage: React.FC = () => {
                 amount: finalAmount,
                 quantity: formData.quantity,
                 details: formData.details,
+                category: formData.category,
                 expense_date: dateString
             });
 
@@ -76,6 +86,7 @@ const ExpensesPage: React.FC = () => {
                 amount: 0,
                 quantity: 1,
                 details: '',
+                category: '',
             });
             setExpenseType('expense');
             setIsAdding(false);
@@ -97,6 +108,7 @@ const ExpensesPage: React.FC = () => {
                 amount: finalAmount,
                 quantity: formData.quantity,
                 details: formData.details,
+                category: formData.category,
             });
             setEditingId(null);
             setFormData({
@@ -104,6 +116,7 @@ const ExpensesPage: React.FC = () => {
                 amount: 0,
                 quantity: 1,
                 details: '',
+                category: '',
             });
             setExpenseType('expense');
             loadExpenses();
@@ -135,6 +148,7 @@ const ExpensesPage: React.FC = () => {
             amount: Math.abs(expense.amount), // Always show positive in form
             quantity: expense.quantity,
             details: expense.details || '',
+            category: expense.category || '',
         });
     };
 
@@ -145,6 +159,7 @@ const ExpensesPage: React.FC = () => {
             amount: 0,
             quantity: 1,
             details: '',
+            category: '',
         });
         setExpenseType('expense');
     };
@@ -296,6 +311,24 @@ const ExpensesPage: React.FC = () => {
                             </div>
                         </div>
 
+                        {/* Category - Full Width */}
+                        <div>
+                            <label className="block text-sm font-semibold text-slate-700 dark:text-slate-300 mb-2">
+                                Category
+                            </label>
+                            <input
+                                type="text"
+                                list="expense-categories"
+                                value={formData.category}
+                                onChange={(e) => setFormData({ ...formData, category: e.target.value })}
+                                placeholder="General"
+                                className="w-full px-4 py-3 rounded-xl border-2 border-slate-200 dark:border-slate-700 bg-white dark:bg-slate-900 focus:border-purple-500 dark:focus:border-purple-500 focus:outline-none transition-colors"
+                            />
+                            <datalist id="expense-categories">
+                                {categories.map(category => <option key={category} value={category} />)}
+                            </datalist>
+                        </div>
+
                         {/* Details - Full Width */}
                         <div>
                             <label className="block text-sm font-semibold text-slate-700 dark:text-slate-300 mb-2">
@@ -389,6 +422,7 @@ const ExpensesPage: React.FC = () => {
                                         </td>
                                         <td className="px-6 py-4">
                                             <div className="font-semibold text-slate-900 dark:text-white">{expense.name}</div>
+                                            <div className="text-xs text-slate-500 dark:text-slate-400">{expense.category || 'General'}</div>
                                         </td>
                                         <td className="px-6 py-4">
                                             <span className="font-bold text-slate-900 dark:text-white">
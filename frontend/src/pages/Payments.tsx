@@ -1,5 +1,5 @@
-import React, { useState, useMemo } from 'react';
-import { useData } from '../context/DataContext';
+import React, { useState, useEffect } from 'react';
+import api from '../utils/api';
 import { Wallet, Search, User, TrendingDown, TrendingUp, Edit } from 'lucide-react';
 
 interface CustomerPayment {
@@ -12,11 +12,19 @@ interface CustomerPayment {
     salesCount: number;
 }
 
+const PAGE_SIZE = 100;
+
 const PaymentsPage: React.FC = () => {
-    const { sales } = useData();
     const [searchTerm, setSearchTerm] = useState('');
     const [filterType, setFilterType] = useState<'all' | 'outstanding' | 'paid'>('all');
 
+    // Balances are maintained server-side; we only fetch one page
+    const [filteredCustomers, setFilteredCustomers] = useState<CustomerPayment[]>([]);
+    const [totalOutstanding, setTotalOutstanding] = useState(0);
+    const [totalPaid, setTotalPaid] = useState(0);
+    const [customersWithDebt, setCustomersWithDebt] = useState(0);
+    const [totalCustomers, setTotalCustomers] = useState(0);
+
     // Adjustment modal state
     const [adjustmentModal, setAdjustmentModal] = useState({
         isOpen: false,
@@ -26,78 +34,63 @@ const PaymentsPage: React.FC = () => {
         notes: ''
     });
 
-    // Aggregate payments by customer
-    const customerPayments = useMemo(() => {
-        const customersMap = new Map<string, CustomerPayment>();
-
-        sales.forEach(sale => {
-            const key = sale.customerName.toLowerCase();
-
-            if (!customersMap.has(key)) {
-                customersMap.set(key, {
-                    customerName: sale.customerName,
-                    customerPhone: sale.customerPhone,
-                    totalCredit: 0,
-                    totalPaid: 0,
-                    outstanding: 0,
-                    lastTransaction: sale.date,
-                    salesCount: 0
-                });
-            }
-
-            const customer = customersMap.get(key)!;
-            customer.salesCount++;
-
-            if (sale.paymentType === 'Credit') {
-                customer.totalCredit += sale.totalAmount;
-            } else {
-                customer.totalPaid += sale.totalAmount;
-            }
-
-            // Update last transaction date
-            if (new Date(sale.date) > new Date(customer.lastTransaction)) {
-                customer.lastTransaction = sale.date;
-            }
-        });
-
-        // Calculate outstanding for each customer
-        customersMap.forEach(customer => {
-            customer.outstanding = customer.totalCredit - customer.totalPaid;
-        });
-
-        return Array.from(customersMap.values());
-    }, [sales]);
-
-    const filteredCustomers = useMemo(() => {
-        return customerPayments.filter(customer => {
-            const matchesSearch = customer.customerName.toLowerCase().includes(searchTerm.toLowerCase()) ||
-                (customer.customerPhone && customer.customerPhone.includes(searchTerm));
-
-            const matchesFilter =
-                filterType === 'all' ||
-                (filterType === 'outstanding' && customer.outstanding > 0) ||
-                (filterType === 'paid' && customer.outstanding <= 0);
-
-            return matchesSearch && matchesFilter;
-        }).sort((a, b) => b.outstanding - a.outstanding);
-    }, [customerPayments, searchTerm, filterType]);
+    const loadBalances = async () => {
+        try {
+            const res = await api.get('/customers/balances', {
+                params: {
+                    limit: PAGE_SIZE,
+                    sort: 'outstanding_desc',
+                    search: searchTerm || undefined,
+                    status: filterType === 'paid' ? 'settled' : filterType
+                }
+            });
+            setFilteredCustomers(res.data.items.map((c: any) => ({
+                customerName: c.customer_name,
+                customerPhone: c.customer_phone,
+                totalCredit: parseFloat(c.total_credit),
+                totalPaid: parseFloat(c.total_paid),
+                outstanding: parseFloat(c.outstanding),
+                lastTransaction: c.last_transaction_at,
+                salesCount: c.sales_count
+            })));
+            setTotalOutstanding(parseFloat(res.data.total_outstanding));
+            setTotalPaid(parseFloat(res.data.total_paid));
+            setCustomersWithDebt(res.data.customers_with_debt);
+            setTotalCustomers(res.data.total_customers);
+        } catch (error) {
+            console.error('Failed to fetch customer balances:', error);
+        }
+    };
 
-    const totalOutstanding = customerPayments.reduce((sum, c) => sum + (c.outstanding > 0 ? c.outstanding : 0), 0);
-    const totalPaid = customerPayments.reduce((sum, c) => sum + c.totalPaid, 0);
-    const customersWithDebt = customerPayments.filter(c => c.outstanding > 0).length;
+    useEffect(() => {
+        // Debounce typing in the search box
+        const timer = setTimeout(loadBalances, 250);
+        return () => clearTimeout(timer);
+    }, [searchTerm, filterType]);
 
-    const handleAdjustment = (type: 'received' | 'credit') => {
+    const handleAdjustment = async (type: 'received' | 'credit') => {
         if (!adjustmentModal.amount || parseFloat(adjustmentModal.amount) <= 0) {
             alert('Please enter a valid amount');
             return;
         }
 
-        const message = type === 'received'
-            ? `Customer paid Rs. ${parseFloat(adjustmentModal.amount).toLocaleString()}`
-            : `Given additional credit of Rs. ${parseFloat(adjustmentModal.amount).toLocaleString()}`;
+        if (type === 'credit') {
+            alert(`Given additional credit of Rs. ${parseFloat(adjustmentModal.amount).toLocaleString()}\n\nRecord a Credit sale to add credit.`);
+            return;
+        }
 
-        alert(`${message}\n\nThis feature will be fully implemented soon!`);
-        setAdjustmentModal({ isOpen: false, customerName: '', currentOutstanding: 0, amount: '', notes: '' });
+        try {
+            await api.post('/customers/payments', {
+                customer_name: adjustmentModal.customerName,
+                amount: parseFloat(adjustmentModal.amount),
+                notes: adjustmentModal.notes || undefined
+            });
+            setAdjustmentModal({ isOpen: false, customerName: '', currentOutstanding: 0, amount: '', notes: '' });
+            await loadBalances();
+        } catch (error) {
+            console.error('Failed to record payment:', error);
+            alert('Failed to record payment');
+        }
     };
 
     return (
@@ -145,7 +138,7 @@ const PaymentsPage: React.FC = () => {
                             Total Customers
                         </span>
                     </div>
-                    <div className="text-4xl font-black">{customerPayments.length}</div>
+                    <div className="text-4xl font-black">{totalCustomers}</div>
                     <div className="mt-3 text-sm opacity-90">Active customers</div>
                 </div>
             </div>
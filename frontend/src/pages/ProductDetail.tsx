@@ -1,28 +1,81 @@
 
-import React, { useState } from 'react';
+import React, { useState, useEffect } from 'react';
 import { useParams, useNavigate } from 'react-router-dom';
 import { useData } from '../context/DataContext';
+import api from '../utils/api';
 import { ArrowLeft, Package, ShoppingCart, Layers, Plus, TrendingUp, User, Building2, Calendar, History, Phone, CreditCard, Wallet, Banknote, X, Trash2 } from 'lucide-react';
 import ConfirmDialog from '../components/ConfirmDialog';
 
+interface ProductMovement {
+  id: string;
+  date: string;
+  type: 'IN' | 'OUT';
+  quantity: number;
+  partyName?: string;
+  purchasePrice: number;
+  saleId?: string;
+  customerName?: string;
+  customerPhone?: string;
+  paymentType?: 'Credit' | 'Debit';
+  totalAmount: number;
+}
+
+interface ProductSummary {
+  currentStock: number;
+  totalIn: number;
+  totalOut: number;
+  movementsTotal: number;
+  movements: ProductMovement[];
+}
+
+const PAGE_SIZE = 50;
+
 const ProductDetail: React.FC = () => {
   const { productId } = useParams<{ productId: string }>();
   const navigate = useNavigate();
-  const { products, stocks, sales, companies, addStock, addSale, stockTransactions, deleteSale, deleteStockTransaction } = useData();
+  const { products, sales, companies, addStock, addSale, stockTransactions, deleteSale, deleteStockTransaction } = useData();
 
   const product = products.find(p => p.id === productId);
-  const stock = stocks.find(s => s.productId === productId);
   const company = companies.find(c => c.id === product?.companyId);
-  const productSales = sales.filter(s => s.productId === productId);
-  const productLogs = stockTransactions.filter(t => t.productId === productId && t.type === 'IN');
 
-  const combinedHistory = React.useMemo(() => {
-    const history = [
-      ...productLogs.map(l => ({ ...l, entryType: 'REFILL' as const })),
-      ...productSales.map(s => ({ ...s, entryType: 'SALE' as const }))
-    ];
-    return history.sort((a, b) => new Date(b.date).getTime() - new Date(a.date).getTime());
-  }, [productLogs, productSales]);
+  // Totals and history come from /products/{id}/detail, one page at a time
+  const [page, setPage] = useState(0);
+  const [summary, setSummary] = useState<ProductSummary | null>(null);
+
+  useEffect(() => {
+    if (!productId) return;
+    let cancelled = false;
+    api.get(`/products/${productId}/detail`, { params: { skip: page * PAGE_SIZE, limit: PAGE_SIZE } })
+      .then(res => {
+        if (cancelled) return;
+        setSummary({
+          currentStock: res.data.current_stock,
+          totalIn: res.data.total_in,
+          totalOut: res.data.total_out,
+          movementsTotal: res.data.movements_total,
+          movements: res.data.movements.map((m: any) => ({
+            id: m.id,
+            date: m.created_at,
+            type: m.type,
+            quantity: m.quantity,
+            partyName: m.party_name,
+            purchasePrice: parseFloat(m.purchase_price || 0),
+            saleId: m.sale_id || undefined,
+            customerName: m.customer_name,
+            customerPhone: m.customer_phone,
+            paymentType: m.payment_type,
+            totalAmount: parseFloat(m.total_amount || 0)
+          }))
+        });
+      })
+      .catch(error => console.error('Failed to fetch product detail:', error));
+    return () => { cancelled = true; };
+    // Refetch when a write or sync changed the loaded sales/ledger
+  }, [productId, page, sales, stockTransactions]);
+
+  const stock = summary ? { remaining: summary.currentStock, totalIn: summary.totalIn, totalOut: summary.totalOut } : undefined;
+  const combinedHistory = summary?.movements || [];
+  const pageCount = Math.max(1, Math.ceil((summary?.movementsTotal || 0) / PAGE_SIZE));
 
   const [isAddModalOpen, setIsAddModalOpen] = useState(false);
   const [isSellModalOpen, setIsSellModalOpen] = useState(false);
@@ -180,24 +233,25 @@ const ProductDetail: React.FC = () => {
             </thead>
             <tbody className="divide-y divide-slate-100 dark:divide-slate-700">
               {combinedHistory.map(entry => {
-                const isRefill = entry.entryType === 'REFILL';
+                const isRefill = entry.type === 'IN';
+                const isSale = !!entry.saleId;
                 return (
                   <tr key={entry.id} className="hover:bg-slate-50 dark:hover:bg-slate-900/20 group transition-colors">
                     <td className="px-8 py-5">
                       <div className="flex flex-col">
                         <span className="text-sm font-bold text-slate-500">{new Date(entry.date).toLocaleDateString()}</span>
-                        <span className={`text-[9px] font-black uppercase tracking-tighter mt-0.5 ${isRefill ? 'text-emerald-500' : 'text-blue-500'}`}>
-                          {isRefill ? 'Inventory Refill' : 'Customer Sale'}
+                        <span className={`text-[9px] font-black uppercase tracking-tighter mt-0.5 ${isRefill ? 'text-emerald-500' : isSale ? 'text-blue-500' : 'text-orange-500'}`}>
+                          {isRefill ? 'Inventory Refill' : isSale ? 'Customer Sale' : 'Stock Out'}
                         </span>
                       </div>
                     </td>
                     <td className="px-8 py-5">
                       <p className="text-sm font-black text-slate-900 dark:text-white">
-                        {isRefill ? (entry as any).partyName : (entry as any).customerName}
+                        {isSale ? entry.customerName : entry.partyName}
                       </p>
-                      {!isRefill && (entry as any).customerPhone && (
+                      {isSale && entry.customerPhone && (
                         <p className="text-[10px] text-slate-400 font-bold flex items-center gap-1 mt-0.5">
-                          <Phone className="w-2.5 h-2.5" /> {(entry as any).customerPhone}
+                          <Phone className="w-2.5 h-2.5" /> {entry.customerPhone}
                         </p>
                       )}
                     </td>
@@ -207,26 +261,26 @@ const ProductDetail: React.FC = () => {
                       </span>
                     </td>
                     <td className="px-8 py-5 text-center">
-                      {!isRefill ? (
-                        <span className={`px-3 py-1 rounded-full text-[9px] font-black uppercase tracking-widest ${(entry as any).paymentType === 'Debit' ? 'bg-emerald-100 text-emerald-700' : 'bg-rose-100 text-rose-700'}`}>
-                          {(entry as any).paymentType}
+                      {isSale ? (
+                        <span className={`px-3 py-1 rounded-full text-[9px] font-black uppercase tracking-widest ${entry.paymentType === 'Debit' ? 'bg-emerald-100 text-emerald-700' : 'bg-rose-100 text-rose-700'}`}>
+                          {entry.paymentType}
                         </span>
                       ) : (
                         <span className="text-[9px] font-black text-slate-300 uppercase tracking-widest">N/A</span>
                       )}
                     </td>
                     <td className="px-8 py-5 text-right font-black text-sm">
-                      Rs. {(isRefill ? (entry as any).purchasePrice : (entry as any).totalAmount).toLocaleString()}
+                      Rs. {(isSale ? entry.totalAmount : entry.purchasePrice).toLocaleString()}
                     </td>
                     <td className="px-8 py-5 text-right">
                       <button
                         onClick={() => {
                           setConfirmDialog({
                             isOpen: true,
-                            entryId: entry.id,
-                            isRefill: isRefill,
-                            partyName: isRefill ? (entry as any).partyName : '',
-                            customerName: !isRefill ? (entry as any).customerName : ''
+                            entryId: isSale ? entry.saleId! : entry.id,
+                            isRefill: !isSale,
+                            partyName: !isSale ? entry.partyName || '' : '',
+                            customerName: isSale ? entry.customerName || '' : ''
                           });
                         }}
                         className="p-2 text-slate-300 hover:text-rose-500 transition-colors bg-white dark:bg-slate-800 border border-slate-100 dark:border-slate-700 rounded-xl"
@@ -248,6 +302,13 @@ const ProductDetail: React.FC = () => {
             </tbody>
           </table>
         </div>
+        {pageCount > 1 && (
+          <div className="p-6 flex items-center justify-between border-t border-slate-100 dark:border-slate-700 text-xs font-bold text-slate-500">
+            <button onClick={() => setPage(p => Math.max(0, p - 1))} disabled={page === 0} className="px-4 py-2 rounded-xl bg-slate-50 dark:bg-slate-900 disabled:opacity-40">Newer</button>
+            <span>Page {page + 1} of {pageCount}</span>
+            <button onClick={() => setPage(p => Math.min(pageCount - 1, p + 1))} disabled={page >= pageCount - 1} className="px-4 py-2 rounded-xl bg-slate-50 dark:bg-slate-900 disabled:opacity-40">Older</button>
+          </div>
+        )}
       </div>
 
       {/* MODALS */}
@@ -50,12 +50,44 @@ interface PeriodSummary {
   }>;
 }
 
+interface MetricChange {
+  delta: number;
+  percent_change: number | null;
+}
+
+interface PeriodComparison {
+  changes: Array<{
+    metrics: Record<string, Record<string, MetricChange>>;
+  }>;
+}
+
+// Same-length window ending the day before `start`
+const previousRange = (start: string, end: string) => {
+  const day = 24 * 60 * 60 * 1000;
+  const startTime = new Date(start).getTime();
+  const length = new Date(end).getTime() - startTime;
+  return {
+    start: new Date(startTime - day - length).toISOString().split('T')[0],
+    end: new Date(startTime - day).toISOString().split('T')[0]
+  };
+};
+
+const ChangeBadge: React.FC<{ change?: MetricChange }> = ({ change }) => {
+  if (!change || change.percent_change === null) return null;
+  return (
+    <p className="text-xs font-bold opacity-90 mt-1">
+      {change.percent_change >= 0 ? '▲' : '▼'} {Math.abs(change.percent_change)}% vs previous period
+    </p>
+  );
+};
+
 const Reports: React.FC = () => {
   const { sales, products, companies } = useData();
   const [selectedPeriod, setSelectedPeriod] = useState<PeriodType>('1month');
   const [customStartDate, setCustomStartDate] = useState<Date | null>(null);
   const [customEndDate, setCustomEndDate] = useState<Date | null>(null);
   const [periodSummary, setPeriodSummary] = useState<PeriodSummary | null>(null);
+  const [comparison, setComparison] = useState<PeriodComparison | null>(null);
   const [loading, setLoading] = useState(false);
 
   // Calculate date ranges based on selected period
@@ -113,11 +145,30 @@ const Reports: React.FC = () => {
     }
   };
 
+  // Both windows in one request; the backend aggregates them in a single pass
+  const fetchComparison = async () => {
+    try {
+      const current = getDateRange();
+      const previous = previousRange(current.start, current.end);
+      const params = new URLSearchParams();
+      params.append('periods', `${previous.start}:${previous.end}`);
+      params.append('periods', `${current.start}:${current.end}`);
+      const response = await axios.get(`${API_URL}/reports/compare`, { params });
+      setComparison(response.data);
+    } catch (error) {
+      console.error('Failed to fetch period comparison:', error);
+      setComparison(null);
+    }
+  };
+
   // Fetch data when period changes
   useEffect(() => {
     fetchPeriodSummary();
+    fetchComparison();
   }, [selectedPeriod, customStartDate, customEndDate]);
 
+  const changes = comparison?.changes[0]?.metrics;
+
   // Aggregate daily sales for current view (local calculation for comparison)
   const dailyData = useMemo(() => {
     const map = new Map();
@@ -270,6 +321,7 @@ const Reports: React.FC = () => {
               </div>
               <p className="text-3xl font-black">Rs. {periodSummary.sales_summary.total_revenue.toLocaleString()}</p>
               <p className="text-sm opacity-80 mt-2">{periodSummary.sales_summary.total_sales_count} sales</p>
+              <ChangeBadge change={changes?.sales_summary.total_revenue} />
             </div>
 
             {/* Gross Profit */}
@@ -280,6 +332,7 @@ const Reports: React.FC = () => {
               </div>
               <p className="text-3xl font-black">Rs. {periodSummary.sales_summary.gross_profit.toLocaleString()}</p>
               <p className="text-sm opacity-80 mt-2">{periodSummary.sales_summary.profit_margin}% margin</p>
+              <ChangeBadge change={changes?.sales_summary.gross_profit} />
             </div>
 
             {/* Net Profit */}
@@ -289,6 +342,7 @@ const Reports: React.FC = () => {
                 <h3 className="text-sm font-semibold opacity-90">Net Profit</h3>
               </div>
               <p className="text-3xl font-black">Rs. {periodSummary.overall.net_profit.toLocaleString()}</p>
+              <ChangeBadge change={changes?.overall.net_profit} />
               <p className="text-sm opacity-80 mt-2">After expenses</p>
             </div>
 
@@ -1,6 +1,6 @@
 import axios from 'axios';
 
-const API_BASE_URL = import.meta.env.VITE_API_URL || 'http://localhost:8000/api/v1';
+export const API_BASE_URL = import.meta.env.VITE_API_URL || 'http://localhost:8000/api/v1';
 
 const api = axios.create({
     baseURL: API_BASE_URL,
@@ -21,3 +21,18 @@ api.interceptors.request.use(
 );
 
 export default api;
+
+// POST that is safe to retry: every attempt carries the same Idempotency-Key,
+// so a retry after a dropped response returns the first result instead of
+// creating a duplicate row. Only network failures (no response) are retried.
+export const postIdempotent = async (url: string, data: any, attempts = 3) => {
+    const key = crypto.randomUUID();
+    for (let attempt = 1; ; attempt++) {
+        try {
+            return await api.post(url, data, { headers: { 'Idempotency-Key': key } });
+        } catch (error: any) {
+            if (error.response || attempt >= attempts) throw error;
+            await new Promise(resolve => setTimeout(resolve, 500 * attempt));
+        }
+    }
+};
@@ -0,0 +1,21 @@
+import { API_BASE_URL } from './api';
+
+export interface LiveEvent {
+    type: 'sale.created' | 'sale.updated' | 'sale.deleted' | 'stock.changed' | 'stock.low' | 'dashboard.changed';
+    data: any;
+    at: string;
+}
+
+const EVENT_TYPES: LiveEvent['type'][] = [
+    'sale.created', 'sale.updated', 'sale.deleted', 'stock.changed', 'stock.low', 'dashboard.changed'
+];
+
+// Subscribe to the server's live event stream (SSE). EventSource reconnects
+// on its own after network drops. Returns an unsubscribe function.
+export const subscribeEvents = (onEvent: (event: LiveEvent) => void) => {
+    const source = new EventSource(`${API_BASE_URL}/events`);
+    EVENT_TYPES.forEach(type => {
+        source.addEventListener(type, (e) => onEvent(JSON.parse((e as MessageEvent).data)));
+    });
+    return () => source.close();
+};
@@ -6,6 +6,7 @@ export interface Expense {
     amount: number;
     quantity: number;
     details?: string;
+    category?: string;
     expense_date: string;
     created_at: string;
     is_deleted: boolean;
@@ -17,6 +18,7 @@ export interface ExpenseCreate {
     amount: number;
     quantity?: number;
     details?: string;
+    category?: string;
     expense_date?: string;
 }
 
@@ -25,6 +27,29 @@ export interface DailyTotal {
     total: number;
 }
 
+export interface ExpenseTotals {
+    expense_total: string;
+    income_total: string;
+    net: string;
+    count: number;
+}
+
+export interface ExpenseCategoryTotals extends ExpenseTotals {
+    category: string;
+}
+
+export interface ExpensePeriod extends ExpenseTotals {
+    period: string;
+    start_date: string;
+    categories: ExpenseCategoryTotals[];
+}
+
+export interface ExpenseAnalytics extends ExpenseTotals {
+    period_type: 'month' | 'quarter' | 'year';
+    periods: ExpensePeriod[];
+    categories: ExpenseCategoryTotals[];
+}
+
 export const expenseService = {
     // Get all expenses, optionally filtered by date
     getExpenses: async (expense_date?: string): Promise<Expense[]> => {
@@ -71,5 +96,17 @@ export const expenseService = {
             params: { start_date, end_date }
         });
         return response.data;
+    },
+
+    // Month/quarter/year totals per category from the monthly rollup
+    getAnalytics: async (
+        period: 'month' | 'quarter' | 'year',
+        start_date?: string,
+        end_date?: string
+    ): Promise<ExpenseAnalytics> => {
+        const response = await api.get('/expenses/analytics', {
+            params: { period, start_date, end_date }
+        });
+        return response.data;
     }
 };